@@ -0,0 +1,120 @@
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Detects whether a load would write the same output into its table again.
+
+This file is copied into the `custom` folder of every pipeline that has an
+`output_check` block in its `pipeline.yaml`, and is run by the tasks that
+`generate_dag.py` adds around each of the listed load tasks:
+
+- `check` compares the `sha256` metadata that the images store on their output
+  objects with the one recorded when the table was last loaded. When they match
+  and the table wasn't modified since, it exits with code 99, which makes
+  Airflow skip the load.
+- `record` runs after the load succeeded, and records the fingerprint of the
+  object along with the version of the table it produced.
+
+Usage:
+
+    BUCKET=... OBJECT=... TABLE=... STATE_FILE=... python output_check.py check
+    BUCKET=... OBJECT=... TABLE=... STATE_FILE=... python output_check.py record
+"""
+
+import json
+import logging
+import os
+import pathlib
+import sys
+import typing
+
+from google.api_core import exceptions
+from google.cloud import bigquery, storage
+
+SKIP_EXIT_CODE = 99
+
+
+def check(
+    bucket: str, object_name: str, table_id: str, state_file: pathlib.Path
+) -> bool:
+    """Returns whether the output needs to be loaded"""
+    fingerprint = output_fingerprint(bucket, object_name)
+    if fingerprint is None:
+        logging.info(f"gs://{bucket}/{object_name} has no fingerprint")
+        return True
+    if not state_file.exists():
+        return True
+
+    state = json.loads(state_file.read_text())
+    if state.get("sha256") != fingerprint["sha256"]:
+        logging.info(f"gs://{bucket}/{object_name} changed since the last load")
+        return True
+    modified = table_modified(table_id)
+    if modified is None or state.get("table_modified") != modified:
+        logging.info(f"{table_id} was modified or deleted since the last load")
+        return True
+
+    logging.info(
+        f"gs://{bucket}/{object_name} ({fingerprint['row_count']} rows) is already "
+        f"loaded in {table_id}"
+    )
+    return False
+
+
+def record(
+    bucket: str, object_name: str, table_id: str, state_file: pathlib.Path
+) -> None:
+    fingerprint = output_fingerprint(bucket, object_name)
+    if fingerprint is None:
+        return
+
+    state_file.parent.mkdir(parents=True, exist_ok=True)
+    state_file.write_text(
+        json.dumps(
+            {**fingerprint, "table_modified": table_modified(table_id)}, indent=2
+        )
+    )
+    logging.info(f"Recorded the fingerprint of {table_id} in {state_file}")
+
+
+def output_fingerprint(
+    bucket: str, object_name: str
+) -> typing.Optional[typing.Dict[str, str]]:
+    blob = storage.Client().bucket(bucket).get_blob(object_name)
+    metadata = (blob.metadata if blob else None) or {}
+    if "sha256" not in metadata:
+        return None
+    return {"sha256": metadata["sha256"], "row_count": metadata.get("row_count")}
+
+
+def table_modified(table_id: str) -> typing.Optional[str]:
+    try:
+        return bigquery.Client().get_table(table_id).modified.isoformat()
+    except exceptions.NotFound:
+        return None
+
+
+if __name__ == "__main__":
+    logging.getLogger().setLevel(logging.INFO)
+
+    assert sys.argv[1:] in (["check"], ["record"]), "Expected `check` or `record`"
+    args = dict(
+        bucket=os.environ["BUCKET"],
+        object_name=os.environ["OBJECT"],
+        table_id=os.environ["TABLE"],
+        state_file=pathlib.Path(os.environ["STATE_FILE"]).expanduser(),
+    )
+    if sys.argv[1] == "record":
+        record(**args)
+    elif not check(**args):
+        sys.exit(SKIP_EXIT_CODE)
@@ -0,0 +1,163 @@
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Source file cache in GCS, shared by the pipelines that fetch the same files.
+
+A downloaded file is stored under a key derived from its URL and the validator
+the origin returns for it (its ETag or Last-Modified header). When the origin
+has no validator, the schedule window is used instead. Sibling pipelines that
+fetch the same source in the same window reuse a single download.
+
+All the entries of a URL share a prefix. Storing a new entry deletes the older
+ones, which hold versions the origin no longer serves or past windows, so the
+cache holds one entry per URL.
+
+This file is copied into the `custom` folder of the pipelines whose tasks run
+it, and into every image folder when the images are built.
+
+Usage:
+
+    CACHE_BUCKET=... CACHE_PREFIX=... CACHE_WINDOW={{ ds }} \
+        python source_cache.py URL TARGET_FILE [URL TARGET_FILE ...]
+"""
+
+import hashlib
+import logging
+import os
+import pathlib
+import sys
+import typing
+
+import requests
+from google.api_core import exceptions
+from google.cloud import storage
+
+CHUNK_SIZE = 1024 * 1024
+HTTP_TIMEOUT = 60
+
+
+def main(
+    sources: typing.List[typing.Tuple[str, pathlib.Path]],
+    cache_bucket: str,
+    cache_prefix: str,
+    window: str = None,
+):
+    bucket = storage.Client().bucket(cache_bucket)
+    with requests.Session() as session:
+        for source_url, target_file in sources:
+            target_file.parent.mkdir(parents=True, exist_ok=True)
+            fetch(source_url, target_file, bucket, cache_prefix, session, window)
+
+
+def fetch(
+    source_url: str,
+    target_file: pathlib.Path,
+    bucket: storage.Bucket,
+    cache_prefix: str,
+    session: requests.Session,
+    window: str = None,
+) -> bool:
+    """Copies the source into `target_file`, from the cache when it holds the
+    current version of it. Returns whether the cache was hit.
+    """
+    validator = source_validator(source_url, session)
+    if validator is None and window:
+        validator = f"window:{window}"
+    if validator is None:
+        logging.info(f"No validator for {source_url}, bypassing the cache")
+        download(source_url, target_file, session)
+        return False
+
+    blob = bucket.blob(f"{url_prefix(cache_prefix, source_url)}/{digest(validator)}")
+    try:
+        blob.download_to_filename(str(target_file))
+        logging.info(f"Copied {source_url} from gs://{bucket.name}/{blob.name}")
+        return True
+    except exceptions.NotFound:
+        pass
+
+    download(source_url, target_file, session)
+    blob.metadata = {"source_url": source_url, "validator": validator}
+    try:
+        # Never overwrite an entry, another pipeline may be reading it
+        blob.upload_from_filename(str(target_file), if_generation_match=0)
+        logging.info(f"Cached {source_url} in gs://{bucket.name}/{blob.name}")
+    except exceptions.PreconditionFailed:
+        logging.info(f"{source_url} was cached by another pipeline meanwhile")
+        return False
+
+    prune(bucket, url_prefix(cache_prefix, source_url), blob.name)
+    return False
+
+
+def prune(bucket: storage.Bucket, prefix: str, current: str) -> None:
+    """Deletes the entries under `prefix` other than `current`. A pipeline still
+    reading one of them gets a cache miss and downloads the source instead.
+    """
+    for blob in bucket.list_blobs(prefix=f"{prefix}/"):
+        if blob.name == current:
+            continue
+        try:
+            blob.delete()
+            logging.info(f"Deleted the old cache entry gs://{bucket.name}/{blob.name}")
+        except exceptions.NotFound:
+            pass
+
+
+def url_prefix(cache_prefix: str, source_url: str) -> str:
+    return f"{cache_prefix}/{digest(source_url)}"
+
+
+def digest(value: str) -> str:
+    return hashlib.sha256(value.encode()).hexdigest()
+
+
+def source_validator(
+    source_url: str, session: requests.Session
+) -> typing.Optional[str]:
+    try:
+        r = session.head(source_url, allow_redirects=True, timeout=HTTP_TIMEOUT)
+    except requests.RequestException as e:
+        logging.warning(f"Couldn't get a validator for {source_url}: {e}")
+        return None
+    if r.status_code != 200:
+        return None
+    return r.headers.get("ETag") or r.headers.get("Last-Modified")
+
+
+def download(
+    source_url: str, target_file: pathlib.Path, session: requests.Session
+) -> None:
+    logging.info(f"Downloading {source_url} into {target_file}")
+    with session.get(source_url, stream=True, timeout=HTTP_TIMEOUT) as r:
+        r.raise_for_status()
+        with open(target_file, "wb") as f:
+            for chunk in r.iter_content(chunk_size=CHUNK_SIZE):
+                f.write(chunk)
+
+
+if __name__ == "__main__":
+    logging.getLogger().setLevel(logging.INFO)
+
+    args = sys.argv[1:]
+    assert args and len(args) % 2 == 0, "Expected pairs of URL and TARGET_FILE"
+    main(
+        sources=[
+            (source_url, pathlib.Path(target_file).expanduser())
+            for source_url, target_file in zip(args[::2], args[1::2])
+        ],
+        cache_bucket=os.environ["CACHE_BUCKET"],
+        cache_prefix=os.environ["CACHE_PREFIX"],
+        window=os.getenv("CACHE_WINDOW"),
+    )
@@ -0,0 +1,142 @@
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Detects whether the sources of a pipeline changed since its last successful run.
+
+This file is copied into the `custom` folder of every pipeline that has a
+`source_check` block in its `pipeline.yaml`, and is run by the tasks that
+`generate_dag.py` adds around the pipeline's own tasks:
+
+- `check` sends a conditional request for every source, using the ETag,
+  Last-Modified and Content-Length stored for it. When none of them changed it
+  exits with code 99, which makes Airflow skip the task and everything
+  downstream of it. Otherwise, the new state is stored as pending.
+- `record` runs once all the tasks succeeded, and makes the pending state the
+  current one. A failed run is never recorded, so the next run retries it.
+
+Usage:
+
+    SOURCE_URLS='["https://..."]' STATE_FILE=... python source_check.py check
+    STATE_FILE=... python source_check.py record
+"""
+
+import json
+import logging
+import os
+import pathlib
+import sys
+import typing
+
+import requests
+
+HTTP_TIMEOUT = 60
+SKIP_EXIT_CODE = 99
+STATE_HEADERS = ("ETag", "Last-Modified", "Content-Length")
+
+
+def check(source_urls: typing.List[str], state_file: pathlib.Path) -> bool:
+    """Returns whether any of the sources changed, and stores their new state as
+    pending when they did.
+    """
+    state = json.loads(state_file.read_text()) if state_file.exists() else {}
+    new_state = {}
+    with requests.Session() as session:
+        for source_url in source_urls:
+            new_state[source_url] = source_state(
+                source_url, state.get(source_url), session
+            )
+
+    changed = [
+        url
+        for url in source_urls
+        if new_state[url] is None or new_state[url] != state.get(url)
+    ]
+    if not changed:
+        logging.info(f"None of the {len(source_urls)} sources changed")
+        # A pending state left by a failed run must not be recorded by this one
+        pending_file(state_file).unlink(missing_ok=True)
+        return False
+
+    logging.info(f"Changed sources: {changed}")
+    pending_file(state_file).parent.mkdir(parents=True, exist_ok=True)
+    pending_file(state_file).write_text(json.dumps(new_state, indent=2))
+    return True
+
+
+def record(state_file: pathlib.Path) -> None:
+    if not pending_file(state_file).exists():
+        logging.info("No pending source state to record")
+        return
+    os.replace(pending_file(state_file), state_file)
+    logging.info(f"Recorded the source state in {state_file}")
+
+
+def source_state(
+    source_url: str, stored: typing.Optional[dict], session: requests.Session
+) -> typing.Optional[dict]:
+    """Returns the validators of the source. Returns the stored ones if the origin
+    answers that it didn't change, and None when the origin can't tell, so the
+    source is always considered changed.
+    """
+    headers = {}
+    if stored and stored.get("ETag"):
+        headers["If-None-Match"] = stored["ETag"]
+    if stored and stored.get("Last-Modified"):
+        headers["If-Modified-Since"] = stored["Last-Modified"]
+
+    try:
+        r = session.head(
+            source_url, headers=headers, allow_redirects=True, timeout=HTTP_TIMEOUT
+        )
+        if r.status_code in (403, 405, 501):
+            # Some origins refuse HEAD requests, so ask for the body instead and
+            # only read the headers of the response
+            with session.get(
+                source_url,
+                headers=headers,
+                stream=True,
+                allow_redirects=True,
+                timeout=HTTP_TIMEOUT,
+            ) as r:
+                pass
+    except requests.RequestException as e:
+        logging.warning(f"Couldn't check {source_url}: {e}")
+        return None
+
+    if r.status_code == 304:
+        return stored
+    if r.status_code != 200:
+        logging.warning(f"Couldn't check {source_url}: HTTP {r.status_code}")
+        return None
+
+    state = {name: r.headers[name] for name in STATE_HEADERS if name in r.headers}
+    if "ETag" not in state and "Last-Modified" not in state:
+        logging.warning(f"{source_url} has no validators, it can't be skipped")
+        return None
+    return state
+
+
+def pending_file(state_file: pathlib.Path) -> pathlib.Path:
+    return state_file.with_name(f"{state_file.stem}.pending{state_file.suffix}")
+
+
+if __name__ == "__main__":
+    logging.getLogger().setLevel(logging.INFO)
+
+    assert sys.argv[1:] in (["check"], ["record"]), "Expected `check` or `record`"
+    state_file = pathlib.Path(os.environ["STATE_FILE"]).expanduser()
+    if sys.argv[1] == "record":
+        record(state_file)
+    elif not check(json.loads(os.environ["SOURCE_URLS"]), state_file):
+        sys.exit(SKIP_EXIT_CODE)
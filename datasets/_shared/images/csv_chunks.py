@@ -0,0 +1,124 @@
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Chunked CSV reads with the dtypes of a whole-file read, shared by the images.
+
+`pd.read_csv(..., chunksize=...)` infers the dtypes of every chunk separately,
+so an integer column with a null in only some chunks is written as `1` in some
+chunks and `1.0` in others. `read_csv` first reads the sources once to find the
+dtype that a single read of all of them would give each column, and then reads
+them again in chunks with those dtypes pinned. A column that only some sources
+have is read as it would be once the sources are concatenated, as if it were
+null in the others. Memory stays bounded by the chunk size in both passes.
+
+This file is copied into every image folder when the images are built.
+"""
+
+import contextlib
+import typing
+
+import pandas as pd
+from pandas.api import types
+
+# A path, or a function that opens a new file object on every call, e.g. for a
+# member of a zip file
+Source = typing.Union[str, typing.Callable[[], typing.IO]]
+
+
+def read_csv(
+    sources: typing.List[Source], chunksize: int, **kwargs
+) -> typing.Iterator[pd.DataFrame]:
+    """Yields the chunks of all the sources in turn, with the same dtypes"""
+    dtypes = infer_dtypes(sources, chunksize, **kwargs)
+    for source in sources:
+        with open_source(source) as f, pd.read_csv(
+            f, chunksize=chunksize, dtype=dtypes, **kwargs
+        ) as reader:
+            yield from reader
+
+
+def infer_dtypes(
+    sources: typing.List[Source], chunksize: int, **kwargs
+) -> typing.Dict[str, typing.Any]:
+    """Returns the dtype to read each column with. A column of booleans with
+    nulls is left out, as a single read gives it objects that no dtype gives:
+    its chunks then write the same values whatever dtype they are read with.
+    """
+    dtypes = {}
+    nullable = set()
+    for source in sources:
+        with open_source(source) as f, pd.read_csv(
+            f, chunksize=chunksize, **kwargs
+        ) as reader:
+            columns = set()
+            for chunk in reader:
+                columns.update(chunk.columns)
+                for column, values in chunk.items():
+                    dtypes[column] = merge_dtypes(
+                        dtypes.get(column), value_dtype(values)
+                    )
+                    if values.hasnans:
+                        nullable.add(column)
+        # Concatenated sources leave a column that a source doesn't have null
+        nullable.update(column for column in dtypes if column not in columns)
+
+    pinned = {}
+    for column, dtype in dtypes.items():
+        if dtype is None:
+            pinned[column] = "float64"
+        elif column in nullable and types.is_bool_dtype(dtype):
+            continue
+        elif column in nullable and types.is_integer_dtype(dtype):
+            pinned[column] = "float64"
+        # Dates are parsed by `parse_dates` in the second pass too
+        elif not types.is_datetime64_any_dtype(dtype):
+            pinned[column] = dtype
+    return pinned
+
+
+def value_dtype(values: pd.Series):
+    """Returns the dtype of the values of a chunk without its nulls, or None if
+    they are all null.
+    """
+    values = values.dropna()
+    if values.empty:
+        return None
+    if values.dtype == object and all(isinstance(value, bool) for value in values):
+        return "bool"
+    return values.dtype
+
+
+def merge_dtypes(left, right):
+    """Returns the dtype of a column read at once, given the dtypes of two of its
+    parts: integers with floats give floats, and any other mix gives strings.
+    """
+    if left is None or right is None:
+        return right if left is None else left
+    if left == right:
+        return left
+    if all(
+        types.is_numeric_dtype(dtype) and not types.is_bool_dtype(dtype)
+        for dtype in (left, right)
+    ):
+        return "float64"
+    return str
+
+
+@contextlib.contextmanager
+def open_source(source: Source) -> typing.Iterator[typing.Union[str, typing.IO]]:
+    if callable(source):
+        with source() as f:
+            yield f
+    else:
+        yield source
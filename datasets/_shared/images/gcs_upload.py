@@ -0,0 +1,225 @@
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Parallel composite uploads to GCS, shared by the container images.
+
+Files at or above `threshold` bytes are split into at most 32 parts that are
+uploaded concurrently as temporary objects, then composed server-side into the
+target object. The parts are always deleted afterwards, and the CRC32C of the
+composed object is checked against the one of the local file.
+
+With `fingerprint` set, the SHA-256 and the number of CSV rows of the file are
+stored in the `sha256` and `row_count` metadata of the object, so a later task can
+tell whether the output changed since it was last loaded.
+
+The client honours `STORAGE_EMULATOR_HOST`, so uploads can be pointed at a
+local GCS emulator.
+
+This file is copied into every image folder when the images are built.
+"""
+
+import base64
+import concurrent.futures
+import hashlib
+import io
+import logging
+import math
+import mimetypes
+import os
+import pathlib
+import typing
+import uuid
+
+import google_crc32c
+from google.api_core import exceptions
+from google.cloud import storage
+
+# GCS composes at most 32 source objects in a single request
+MAX_COMPOSE_COMPONENTS = 32
+MIN_PART_SIZE = 64 * 1024 * 1024
+PARALLEL_UPLOAD_THRESHOLD = 256 * 1024 * 1024
+MAX_WORKERS = 8
+READ_SIZE = 1024 * 1024
+
+
+class ChecksumMismatch(Exception):
+    """Raised when the uploaded object doesn't match the local file"""
+
+    pass
+
+
+class FileSlice(io.RawIOBase):
+    """Read-only view of `length` bytes of a file, starting at `offset`. Resumable
+    uploads expect to start reading at position 0 and may seek back on retries.
+    """
+
+    def __init__(self, f: typing.BinaryIO, offset: int, length: int):
+        self.f = f
+        self.offset = offset
+        self.length = length
+        self.position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.position
+
+    def seek(self, position: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            position += self.position
+        elif whence == io.SEEK_END:
+            position += self.length
+        self.position = min(max(position, 0), self.length)
+        return self.position
+
+    def read(self, size: int = -1) -> bytes:
+        remaining = self.length - self.position
+        size = remaining if size is None or size < 0 else min(size, remaining)
+        self.f.seek(self.offset + self.position)
+        data = self.f.read(size)
+        self.position += len(data)
+        return data
+
+
+def upload_file(
+    file_path: pathlib.Path,
+    gcs_bucket: str,
+    gcs_path: str,
+    client: storage.Client = None,
+    threshold: int = PARALLEL_UPLOAD_THRESHOLD,
+    min_part_size: int = MIN_PART_SIZE,
+    max_workers: int = MAX_WORKERS,
+    fingerprint: bool = False,
+) -> storage.Blob:
+    bucket = (client or storage.Client()).bucket(gcs_bucket)
+    blob = bucket.blob(gcs_path)
+    blob.content_type = mimetypes.guess_type(str(file_path))[0]
+
+    size = os.path.getsize(file_path)
+    if size < threshold:
+        if fingerprint:
+            _, blob.metadata = file_digests(file_path, fingerprint)
+        blob.upload_from_filename(str(file_path), checksum="crc32c")
+        return blob
+
+    parts = part_ranges(size, min_part_size)
+    logging.info(
+        f"Uploading {file_path} ({size} bytes) to gs://{gcs_bucket}/{gcs_path} "
+        f"in {len(parts)} parts"
+    )
+    part_blobs = [
+        bucket.blob(f"{gcs_path}.parts/{uuid.uuid4().hex}/{index:02d}")
+        for index in range(len(parts))
+    ]
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+            digests = pool.submit(file_digests, file_path, fingerprint)
+            futures = [
+                pool.submit(upload_part, file_path, part_blob, offset, length)
+                for part_blob, (offset, length) in zip(part_blobs, parts)
+            ]
+            for future in concurrent.futures.as_completed(futures):
+                future.result()
+
+        expected_crc32c, blob.metadata = digests.result()
+        blob.compose(part_blobs)
+        blob.reload()
+        if blob.crc32c != expected_crc32c:
+            blob.delete()
+            raise ChecksumMismatch(
+                f"gs://{gcs_bucket}/{gcs_path} has CRC32C {blob.crc32c}, "
+                f"expected {expected_crc32c}"
+            )
+    finally:
+        delete_parts(part_blobs)
+
+    return blob
+
+
+def part_ranges(size: int, min_part_size: int) -> typing.List[typing.Tuple[int, int]]:
+    """Returns the (offset, length) of every part, so that there are as few parts
+    as possible that are at least `min_part_size`, but never more than can be
+    composed in one request.
+    """
+    part_size = max(min_part_size, math.ceil(size / MAX_COMPOSE_COMPONENTS))
+    return [
+        (offset, min(part_size, size - offset)) for offset in range(0, size, part_size)
+    ]
+
+
+def upload_part(
+    file_path: pathlib.Path, part_blob: storage.Blob, offset: int, length: int
+) -> None:
+    with open(file_path, "rb") as f:
+        part_blob.upload_from_file(
+            FileSlice(f, offset, length), size=length, checksum="crc32c"
+        )
+
+
+def file_digests(
+    file_path: pathlib.Path, fingerprint: bool = False
+) -> typing.Tuple[str, typing.Optional[typing.Dict[str, str]]]:
+    """Returns the CRC32C of the file, encoded the way GCS reports it. With
+    `fingerprint` set, also returns the SHA-256 and number of CSV rows of the
+    file as object metadata, computed in the same pass.
+    """
+    crc32c = google_crc32c.Checksum()
+    sha256 = hashlib.sha256()
+    records = 0
+    in_quotes = False
+    last_byte = b"\n"
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(READ_SIZE), b""):
+            crc32c.update(chunk)
+            if fingerprint:
+                sha256.update(chunk)
+                chunk_records, in_quotes = count_csv_records(chunk, in_quotes)
+                records += chunk_records
+                last_byte = chunk[-1:]
+
+    if not fingerprint:
+        return base64.b64encode(crc32c.digest()).decode("utf-8"), None
+
+    # The last record may not end with a line break, and the first one is the header
+    records += last_byte != b"\n"
+    return base64.b64encode(crc32c.digest()).decode("utf-8"), {
+        "sha256": sha256.hexdigest(),
+        "row_count": str(max(records - 1, 0)),
+    }
+
+
+def count_csv_records(chunk: bytes, in_quotes: bool) -> typing.Tuple[int, bool]:
+    """Counts the line breaks in the chunk that end a CSV record, i.e. that aren't
+    inside a quoted field. Returns the count, and whether the chunk ends inside
+    a quoted field.
+    """
+    records = 0
+    for index, segment in enumerate(chunk.split(b'"')):
+        if index:
+            in_quotes = not in_quotes
+        if not in_quotes:
+            records += segment.count(b"\n")
+    return records, in_quotes
+
+
+def delete_parts(part_blobs: typing.List[storage.Blob]) -> None:
+    for part_blob in part_blobs:
+        try:
+            part_blob.delete()
+        except exceptions.NotFound:
+            pass
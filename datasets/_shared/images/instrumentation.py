@@ -0,0 +1,190 @@
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Per-stage timing and throughput metrics, shared by the container images.
+
+Stages are measured with the `stage` context manager, the `timed` decorator, or
+`iterate` for the chunks read from a source. Every time a stage ends, a JSON log
+line is emitted with its duration, the rows and bytes it processed, and the peak
+RSS of the process so far, e.g.
+
+    {"event": "stage", "stage": "parse", "seconds": 1.52, "rows": 100000, ...}
+
+The totals of every stage are kept for the whole run, and `write_metrics`
+writes them as an OpenMetrics text file. `upload_metrics` writes and uploads it
+next to the output of an image, as `<output>.metrics.txt`.
+
+This file is copied into every image folder when the images are built.
+"""
+
+import contextlib
+import dataclasses
+import functools
+import json
+import logging
+import pathlib
+import resource
+import time
+import typing
+
+import gcs_upload
+
+METRIC_PREFIX = "pipeline_stage"
+
+
+@dataclasses.dataclass
+class Stage:
+    """A single run of a stage. `rows` and `bytes` can be set while it runs."""
+
+    name: str
+    rows: typing.Optional[int] = None
+    bytes: typing.Optional[int] = None
+    seconds: float = 0.0
+    peak_rss_bytes: int = 0
+
+
+@dataclasses.dataclass
+class StageTotals:
+    calls: int = 0
+    seconds: float = 0.0
+    rows: int = 0
+    bytes: int = 0
+    peak_rss_bytes: int = 0
+
+
+totals: typing.Dict[str, StageTotals] = {}
+
+
+@contextlib.contextmanager
+def stage(
+    name: str, rows: typing.Optional[int] = None, bytes: typing.Optional[int] = None
+) -> typing.Iterator[Stage]:
+    current = Stage(name, rows, bytes)
+    start = time.perf_counter()
+    try:
+        yield current
+    finally:
+        current.seconds = time.perf_counter() - start
+        current.peak_rss_bytes = peak_rss_bytes()
+        record(current)
+
+
+def timed(name: str = None) -> typing.Callable:
+    """Decorates a function to measure each of its calls as a stage, named after
+    the function by default. When the first argument is a DataFrame, its number
+    of rows is recorded.
+    """
+
+    def decorator(func: typing.Callable) -> typing.Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            shape = getattr(args[0], "shape", None) if args else None
+            with stage(name or func.__name__, rows=shape[0] if shape else None):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def iterate(name: str, iterable: typing.Iterable) -> typing.Iterator:
+    """Yields the items of `iterable`, measuring the time spent producing each of
+    them as a stage, e.g. the chunks returned by `pd.read_csv(..., chunksize=...)`.
+    """
+    iterator = iter(iterable)
+    while True:
+        start = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return
+        shape = getattr(item, "shape", None)
+        record(
+            Stage(
+                name,
+                rows=shape[0] if shape else None,
+                seconds=time.perf_counter() - start,
+                peak_rss_bytes=peak_rss_bytes(),
+            )
+        )
+        yield item
+
+
+def record(current: Stage) -> None:
+    stage_totals = totals.setdefault(current.name, StageTotals())
+    stage_totals.calls += 1
+    stage_totals.seconds += current.seconds
+    stage_totals.rows += current.rows or 0
+    stage_totals.bytes += current.bytes or 0
+    stage_totals.peak_rss_bytes = max(
+        stage_totals.peak_rss_bytes, current.peak_rss_bytes
+    )
+
+    line = {"event": "stage", "stage": current.name, **dataclasses.asdict(current)}
+    del line["name"]
+    line["seconds"] = round(current.seconds, 6)
+    if current.rows is not None and current.seconds > 0:
+        line["rows_per_second"] = round(current.rows / current.seconds, 1)
+    logging.info(json.dumps(line))
+
+
+def peak_rss_bytes() -> int:
+    # Linux reports the maximum resident set size in KiB
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def write_metrics(
+    file_path: pathlib.Path, labels: typing.Dict[str, str] = None
+) -> pathlib.Path:
+    """Writes the totals of every stage as OpenMetrics text. `labels` are added to
+    every sample, e.g. to tell which output the metrics belong to.
+    """
+    families = [
+        ("seconds", "counter", "seconds", "Time spent in the stage"),
+        ("rows", "counter", None, "Rows processed by the stage"),
+        ("bytes", "counter", "bytes", "Bytes processed by the stage"),
+        ("calls", "counter", None, "Number of times the stage ran"),
+        ("peak_rss_bytes", "gauge", "bytes", "Peak RSS of the process after the stage"),
+    ]
+    lines = []
+    for field, metric_type, unit, help_text in families:
+        family = f"{METRIC_PREFIX}_{field}"
+        lines.append(f"# TYPE {family} {metric_type}")
+        if unit:
+            lines.append(f"# UNIT {family} {unit}")
+        lines.append(f"# HELP {family} {help_text}.")
+        sample = f"{family}_total" if metric_type == "counter" else family
+        for name, stage_totals in totals.items():
+            label_set = format_labels({**(labels or {}), "stage": name})
+            lines.append(f"{sample}{{{label_set}}} {getattr(stage_totals, field)}")
+    lines.append("# EOF")
+
+    file_path.write_text("\n".join(lines) + "\n")
+    return file_path
+
+
+def upload_metrics(target_file: pathlib.Path, gcs_bucket: str, gcs_path: str) -> None:
+    """Uploads the metrics of the run next to the output at `gcs_path`"""
+    metrics_file = write_metrics(
+        pathlib.Path(f"{target_file}.metrics.txt"),
+        labels={"output": f"gs://{gcs_bucket}/{gcs_path}"},
+    )
+    gcs_upload.upload_file(metrics_file, gcs_bucket, f"{gcs_path}.metrics.txt")
+
+
+def format_labels(labels: typing.Dict[str, str]) -> str:
+    def escape(value: str) -> str:
+        return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    return ",".join(f'{name}="{escape(str(value))}"' for name, value in labels.items())
@@ -0,0 +1,225 @@
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Opt-in profiling of the `main` function of the container images.
+
+Every image decorates its `main` with `profiled`, which reads the `PROFILE` env
+var when `main` is called:
+
+- unset, empty, `0` or `false`: `main` runs as is.
+- `sample`, `1` or `true`: the main thread's stack is sampled every
+  `PROFILE_INTERVAL` seconds (0.01 by default). The samples are written as
+  folded stacks, which flamegraph.pl and speedscope read, to `.profile.folded`.
+- `cprofile`: `main` runs under cProfile, whose stats are written to
+  `.profile.prof`, for snakeviz or flameprof.
+
+Both modes also write a summary of the `PROFILE_TOP` (30 by default) functions
+with the most time to `.profile.txt`. The files are uploaded next to the output,
+i.e. to `gs://TARGET_GCS_BUCKET/TARGET_GCS_PATH.profile.*`, or to
+`PROFILE_GCS_PATH.profile.*` when set, even when `main` fails.
+
+This file is copied into every image folder when the images are built.
+"""
+
+import collections
+import cProfile
+import functools
+import io
+import logging
+import os
+import pathlib
+import pstats
+import sys
+import threading
+import time
+import typing
+
+OFF_VALUES = ("", "0", "false")
+SAMPLE_VALUES = ("sample", "1", "true")
+DEFAULT_INTERVAL = 0.01
+DEFAULT_TOP = 30
+
+
+def profiled(func: typing.Callable) -> typing.Callable:
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        mode = os.environ.get("PROFILE", "").strip().lower()
+        if mode in OFF_VALUES:
+            return func(*args, **kwargs)
+        if mode not in SAMPLE_VALUES and mode != "cprofile":
+            logging.warning(f"Unknown PROFILE value {mode!r}, not profiling")
+            return func(*args, **kwargs)
+        return run_profiled(mode, func, args, kwargs)
+
+    return wrapper
+
+
+def run_profiled(
+    mode: str, func: typing.Callable, args: tuple, kwargs: dict
+) -> typing.Any:
+    name = pathlib.Path(sys.argv[0]).stem or func.__name__
+    top = int(os.environ.get("PROFILE_TOP", DEFAULT_TOP))
+    profiler = (
+        cProfile.Profile()
+        if mode == "cprofile"
+        else Sampler(float(os.environ.get("PROFILE_INTERVAL", DEFAULT_INTERVAL)))
+    )
+    logging.info(f"Profiling {name} with {type(profiler).__name__}")
+
+    start = time.perf_counter()
+    profiler.enable()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        profiler.disable()
+        seconds = time.perf_counter() - start
+        try:
+            files = write_profile(
+                profiler, pathlib.Path(f"{name}.profile"), seconds, top
+            )
+            upload_profile(files, name)
+        except Exception:
+            # A broken profile must not fail the run it profiled
+            logging.exception("Failed to write or upload the profile")
+
+
+class Sampler:
+    """Samples the stack of the thread that enables it, from a separate thread"""
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL):
+        self.interval = interval
+        self.stacks: typing.Counter[typing.Tuple[str, ...]] = collections.Counter()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def enable(self) -> None:
+        self.target = threading.get_ident()
+        self.thread.start()
+
+    def disable(self) -> None:
+        self.stopped.set()
+        self.thread.join()
+
+    def run(self) -> None:
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.target)
+            if frame is not None:
+                self.stacks[stack(frame)] += 1
+
+
+def stack(frame) -> typing.Tuple[str, ...]:
+    """Returns the functions on the stack of `frame`, from the outermost one"""
+    functions = []
+    while frame is not None:
+        code = frame.f_code
+        functions.append(
+            f"{code.co_name} ({os.path.basename(code.co_filename)}:"
+            f"{code.co_firstlineno})"
+        )
+        frame = frame.f_back
+    return tuple(reversed(functions))
+
+
+def write_profile(
+    profiler: typing.Union[cProfile.Profile, Sampler],
+    base_path: pathlib.Path,
+    seconds: float,
+    top: int = DEFAULT_TOP,
+) -> typing.List[pathlib.Path]:
+    """Writes the profile and its summary as `<base_path>.folded` or
+    `<base_path>.prof`, and `<base_path>.txt`, and returns their paths.
+    """
+    summary_path = base_path.with_name(f"{base_path.name}.txt")
+    if isinstance(profiler, Sampler):
+        profile_path = base_path.with_name(f"{base_path.name}.folded")
+        profile_path.write_text(
+            "".join(
+                f"{';'.join(functions)} {count}\n"
+                for functions, count in sorted(profiler.stacks.items())
+            )
+        )
+        summary = sample_summary(profiler, seconds, top)
+    else:
+        profile_path = base_path.with_name(f"{base_path.name}.prof")
+        profiler.dump_stats(profile_path)
+        summary = cprofile_summary(profiler, seconds, top)
+    summary_path.write_text(summary)
+    logging.info(f"Profile summary:\n{summary}")
+    return [profile_path, summary_path]
+
+
+def sample_summary(sampler: Sampler, seconds: float, top: int = DEFAULT_TOP) -> str:
+    """Returns the functions with the most samples on top of the stack (self) and
+    anywhere on the stack (total), as a share of all the samples.
+    """
+    own, total = collections.Counter(), collections.Counter()
+    for functions, count in sampler.stacks.items():
+        own[functions[-1]] += count
+        for function in set(functions):
+            total[function] += count
+
+    samples = sum(sampler.stacks.values())
+    lines = [
+        f"{samples} samples every {sampler.interval}s over {seconds:.3f}s wall time",
+    ]
+    for title, counter in (("Self", own), ("Total", total)):
+        lines += ["", f"{title:>7} {'%':>6}  function"]
+        for function, count in counter.most_common(top):
+            lines.append(f"{count:>7} {count / samples:>6.1%}  {function}")
+    return "\n".join(lines) + "\n"
+
+
+def cprofile_summary(
+    profiler: cProfile.Profile, seconds: float, top: int = DEFAULT_TOP
+) -> str:
+    stream = io.StringIO()
+    stream.write(f"cProfile over {seconds:.3f}s wall time\n")
+    stats = pstats.Stats(profiler, stream=stream)
+    stats.sort_stats("tottime").print_stats(top)
+    stats.sort_stats("cumulative").print_stats(top)
+    return stream.getvalue()
+
+
+def profile_destination(name: str) -> typing.Optional[typing.Tuple[str, str]]:
+    """Returns the bucket and the object name prefix of the profile files, next to
+    the output of the image, or None if the image has no GCS output.
+    """
+    gcs_path = os.environ.get("PROFILE_GCS_PATH")
+    if gcs_path:
+        bucket, _, prefix = gcs_path.replace("gs://", "", 1).partition("/")
+        return bucket, prefix
+
+    bucket = os.environ.get("TARGET_GCS_BUCKET") or os.environ.get("TARGET_BUCKET")
+    if not bucket:
+        return None
+    if os.environ.get("TARGET_GCS_PATH"):
+        return bucket, os.environ["TARGET_GCS_PATH"]
+    prefix = os.environ.get("TARGET_GCS_PREFIX", "profiles").rstrip("/")
+    return bucket, f"{prefix}/{name}"
+
+
+def upload_profile(files: typing.List[pathlib.Path], name: str) -> None:
+    destination = profile_destination(name)
+    if destination is None:
+        logging.info(f"No GCS output to upload the profile next to, kept {files}")
+        return
+
+    # Imported here, as not every image depends on google-cloud-storage
+    from google.cloud import storage
+
+    bucket = storage.Client().bucket(destination[0])
+    for file_path in files:
+        object_name = f"{destination[1]}{file_path.name[len(name) :]}"
+        logging.info(f"Uploading the profile to gs://{destination[0]}/{object_name}")
+        bucket.blob(object_name).upload_from_filename(str(file_path))
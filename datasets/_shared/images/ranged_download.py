@@ -0,0 +1,285 @@
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Parallel ranged downloads from GCS and HTTP(S), shared by the container images.
+
+Sources at or above `threshold` bytes are fetched as concurrent byte-range
+requests, each written straight to its offset in the target file. Sources that
+are smaller, or whose origin doesn't serve ranges, are fetched as a single
+stream. Either way, the download is checked afterwards:
+
+- `gs://` objects are pinned to their generation and checked against their
+  CRC32C.
+- HTTP(S) sources are checked against their Content-Length, and against their
+  CRC32C when the origin sends an `x-goog-hash` header. Ranges are requested
+  with `If-Range`, so a source that changes midway fails the download instead
+  of mixing two versions.
+
+The GCS client honours `STORAGE_EMULATOR_HOST`, so downloads can be pointed at a
+local GCS emulator.
+
+This file is copied into every image folder when the images are built.
+"""
+
+import concurrent.futures
+import functools
+import logging
+import os
+import pathlib
+import time
+import typing
+
+import gcs_upload
+import requests
+from google.cloud import storage
+
+PART_SIZE = 32 * 1024 * 1024
+PARALLEL_DOWNLOAD_THRESHOLD = 64 * 1024 * 1024
+MAX_WORKERS = 8
+MAX_RETRIES = 3
+BUFFER_SIZE = 1024 * 1024
+HTTP_TIMEOUT = 60
+
+
+class IntegrityError(Exception):
+    """Raised when the downloaded file doesn't match the source"""
+
+    pass
+
+
+def download_file(
+    source_url: str,
+    target_file: pathlib.Path,
+    client: storage.Client = None,
+    threshold: int = PARALLEL_DOWNLOAD_THRESHOLD,
+    part_size: int = PART_SIZE,
+    max_workers: int = MAX_WORKERS,
+) -> None:
+    logging.info(f"Downloading {source_url} into {target_file}")
+    if source_url.startswith("gs://"):
+        download_gcs_file(
+            source_url, target_file, client, threshold, part_size, max_workers
+        )
+    else:
+        download_http_file(source_url, target_file, threshold, part_size, max_workers)
+
+
+def download_gcs_file(
+    source_url: str,
+    target_file: pathlib.Path,
+    client: storage.Client = None,
+    threshold: int = PARALLEL_DOWNLOAD_THRESHOLD,
+    part_size: int = PART_SIZE,
+    max_workers: int = MAX_WORKERS,
+) -> None:
+    bucket_name, blob_name = source_url[len("gs://") :].split("/", 1)
+    bucket = (client or storage.Client()).bucket(bucket_name)
+    source_blob = bucket.get_blob(blob_name)
+    if source_blob is None:
+        raise FileNotFoundError(f"{source_url} doesn't exist")
+
+    # Pin every request to the generation that was looked up
+    blob = bucket.blob(blob_name, generation=source_blob.generation)
+    if source_blob.size < threshold:
+        blob.download_to_filename(str(target_file), raw_download=True, checksum=None)
+    else:
+        download_parts(
+            target_file,
+            source_blob.size,
+            part_size,
+            max_workers,
+            functools.partial(download_gcs_range, blob, target_file),
+        )
+
+    verify(source_url, target_file, source_blob.size, source_blob.crc32c)
+
+
+def download_http_file(
+    source_url: str,
+    target_file: pathlib.Path,
+    threshold: int = PARALLEL_DOWNLOAD_THRESHOLD,
+    part_size: int = PART_SIZE,
+    max_workers: int = MAX_WORKERS,
+) -> None:
+    with requests.Session() as session:
+        session.mount(
+            "https://",
+            requests.adapters.HTTPAdapter(
+                pool_connections=max_workers, pool_maxsize=max_workers
+            ),
+        )
+        r = session.head(source_url, allow_redirects=True, timeout=HTTP_TIMEOUT)
+        size = int(r.headers["Content-Length"]) if supports_ranges(r) else None
+        if size is None or size < threshold:
+            size = download_stream(source_url, target_file, session)
+        else:
+            # Ranges are requested from the final URL, after any redirects
+            validator = range_validator(r)
+            download_parts(
+                target_file,
+                size,
+                part_size,
+                max_workers,
+                functools.partial(
+                    download_http_range, r.url, target_file, validator, session
+                ),
+            )
+
+    # The hash of an encoded body is the one of the stored bytes, not the decoded
+    # ones, so it is only checked when the size is known
+    verify(
+        source_url,
+        target_file,
+        size,
+        gcs_crc32c(r.headers) if size is not None else None,
+    )
+
+
+def supports_ranges(r: requests.Response) -> bool:
+    """Whether the response allows the body to be fetched in byte ranges. Ranges of
+    an encoded body can't be stitched back together, so those are excluded.
+    """
+    return (
+        r.status_code == 200
+        and r.headers.get("Accept-Ranges") == "bytes"
+        and "Content-Length" in r.headers
+        and r.headers.get("Content-Encoding", "identity") == "identity"
+    )
+
+
+def range_validator(r: requests.Response) -> typing.Optional[str]:
+    """Returns the validator to send as `If-Range`. Weak ETags aren't allowed there,
+    so Last-Modified is used instead.
+    """
+    etag = r.headers.get("ETag")
+    if etag and not etag.startswith("W/"):
+        return etag
+    return r.headers.get("Last-Modified")
+
+
+def download_stream(
+    source_url: str, target_file: pathlib.Path, session: requests.Session
+) -> typing.Optional[int]:
+    """Downloads the source in a single stream. Returns its size, if known."""
+    with session.get(source_url, stream=True, timeout=HTTP_TIMEOUT) as r:
+        r.raise_for_status()
+        with open(target_file, "wb", buffering=BUFFER_SIZE) as f:
+            for chunk in r.iter_content(chunk_size=BUFFER_SIZE):
+                f.write(chunk)
+        if r.headers.get("Content-Encoding", "identity") != "identity":
+            return None
+        return (
+            int(r.headers["Content-Length"]) if "Content-Length" in r.headers else None
+        )
+
+
+def download_gcs_range(
+    blob: storage.Blob, target_file: pathlib.Path, offset: int, length: int
+) -> None:
+    with open(target_file, "r+b") as f:
+        f.seek(offset)
+        blob.download_to_file(
+            f,
+            start=offset,
+            end=offset + length - 1,
+            raw_download=True,
+            checksum=None,
+        )
+
+
+def download_http_range(
+    source_url: str,
+    target_file: pathlib.Path,
+    validator: typing.Optional[str],
+    session: requests.Session,
+    offset: int,
+    length: int,
+) -> None:
+    headers = {"Range": f"bytes={offset}-{offset + length - 1}"}
+    if validator:
+        headers["If-Range"] = validator
+
+    with session.get(
+        source_url, headers=headers, stream=True, timeout=HTTP_TIMEOUT
+    ) as r:
+        r.raise_for_status()
+        if r.status_code != 206:
+            raise IntegrityError(f"{source_url} changed while it was downloaded")
+
+        with open(target_file, "r+b", buffering=BUFFER_SIZE) as f:
+            f.seek(offset)
+            for chunk in r.iter_content(chunk_size=BUFFER_SIZE):
+                f.write(chunk)
+
+
+def download_parts(
+    target_file: pathlib.Path,
+    size: int,
+    part_size: int,
+    max_workers: int,
+    download_part: typing.Callable[[int, int], None],
+) -> None:
+    """Preallocates the target file, then calls `download_part` concurrently
+    for the (offset, length) of every part, retrying each part on failures.
+    """
+    with open(target_file, "wb") as f:
+        f.truncate(size)
+
+    parts = [
+        (offset, min(part_size, size - offset)) for offset in range(0, size, part_size)
+    ]
+    logging.info(f"Downloading {size} bytes in {len(parts)} parts")
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [
+            pool.submit(with_retries, download_part, offset, length)
+            for offset, length in parts
+        ]
+        for future in concurrent.futures.as_completed(futures):
+            future.result()
+
+
+def with_retries(download_part: typing.Callable[[int, int], None], *args) -> None:
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            return download_part(*args)
+        except (requests.RequestException, ConnectionError) as e:
+            if attempt == MAX_RETRIES:
+                raise
+            delay = 2 ** attempt
+            logging.warning(f"Retrying the part at {args[0]} in {delay}s: {e}")
+            time.sleep(delay)
+
+
+def verify(
+    source_url: str,
+    target_file: pathlib.Path,
+    size: typing.Optional[int],
+    crc32c: typing.Optional[str],
+) -> None:
+    actual_size = os.path.getsize(target_file)
+    if size is not None and actual_size != size:
+        raise IntegrityError(
+            f"{target_file} has {actual_size} bytes, {source_url} has {size}"
+        )
+    if crc32c and gcs_upload.file_digests(target_file)[0] != crc32c:
+        raise IntegrityError(f"{target_file} doesn't match the CRC32C of {source_url}")
+
+
+def gcs_crc32c(headers: typing.Mapping[str, str]) -> typing.Optional[str]:
+    """Returns the CRC32C from an `x-goog-hash: crc32c=...,md5=...` header"""
+    for value in headers.get("x-goog-hash", "").split(","):
+        name, _, digest = value.strip().partition("=")
+        if name == "crc32c":
+            return digest
+    return None
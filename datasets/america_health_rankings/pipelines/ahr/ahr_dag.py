@@ -31,6 +31,7 @@ with DAG(
     schedule_interval="@daily",
     catchup=False,
     default_view="graph",
+    params={"profile": ""},
 ) as dag:
 
     # Run CSV transform within kubernetes pod
@@ -50,6 +51,7 @@ with DAG(
             "TARGET_GCS_PATH": "data/america_health_rankings/ahr/data_output.csv",
             "CSV_HEADERS": '["edition","report_type","measure_name","state_name","subpopulation","value","lower_ci","upper_ci","source","source_date"]',
             "RENAME_MAPPINGS": '{"Edition": "edition","Report Type": "report_type","Measure Name": "measure_name","State Name": "state_name","Subpopulation": "subpopulation","Value": "value","Lower CI": "lower_ci","Upper CI": "upper_ci","Source": "source","Source Date": "source_date"}',
+            "PROFILE": "{{ dag_run.conf.get('profile', params.profile) if dag_run and dag_run.conf else params.profile }}",
         },
         resources={
             "request_memory": "2G",
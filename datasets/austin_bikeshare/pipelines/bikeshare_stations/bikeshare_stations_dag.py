@@ -31,6 +31,7 @@ with DAG(
     schedule_interval="@daily",
     catchup=False,
     default_view="graph",
+    params={"profile": ""},
 ) as dag:
 
     # Run CSV transform within kubernetes pod
@@ -50,6 +51,7 @@ with DAG(
             "PIPELINE_NAME": "bikeshare_stations",
             "CSV_HEADERS": '["station_id","name","status","address","alternate_name","city_asset_number","property_type","number_of_docks","power_type","footprint_length","footprint_width","notes","council_district","modified_date"]',
             "RENAME_MAPPINGS": '{"Kiosk ID": "station_id","Kiosk Name": "name","Kiosk Status": "status","Address": "address","Alternate Name": "alternate_name","City Asset Number": "city_asset_number","Property Type": "property_type","Number of Docks": "number_of_docks","Power Type": "power_type","Footprint Length": "footprint_length","Footprint Width": "footprint_width","Notes": "notes","Council District": "council_district","Modified Date": "modified_date"}',
+            "PROFILE": "{{ dag_run.conf.get('profile', params.profile) if dag_run and dag_run.conf else params.profile }}",
         },
         resources={
             "request_memory": "4G",
@@ -24,10 +24,14 @@ import re
 import subprocess
 import typing
 
+import csv_chunks
+import instrumentation
 import pandas as pd
+import profiler
 from google.cloud import storage
 
 
+@profiler.profiled
 def main(
     source_url: typing.List[str],
     source_file: typing.List[pathlib.Path],
@@ -37,6 +41,7 @@ def main(
     target_gcs_path: str,
     headers: typing.List[str],
     rename_mappings: dict,
+    chunksize: str,
 ) -> None:
 
     logging.info(
@@ -51,8 +56,31 @@ def main(
     download_file(source_url, source_file)
 
     logging.info("Opening files...")
-    df = read_files(source_files_path)
+    for chunk_number, chunk in enumerate(read_files(source_files_path, int(chunksize))):
+        logging.info(f"Processing batch {chunk_number}")
+        process_chunk(
+            chunk, target_file, headers, rename_mappings, append=(chunk_number > 0)
+        )
+
+    logging.info(
+        f"Uploading output file to.. gs://{target_gcs_bucket}/{target_gcs_path}"
+    )
+    upload_file_to_gcs(target_file, target_gcs_bucket, target_gcs_path)
+    instrumentation.upload_metrics(target_file, target_gcs_bucket, target_gcs_path)
 
+    logging.info(
+        "Austin crime process completed at "
+        + str(datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+    )
+
+
+def process_chunk(
+    df: pd.DataFrame,
+    target_file: pathlib.Path,
+    headers: typing.List[str],
+    rename_mappings: dict,
+    append: bool,
+) -> None:
     logging.info("Transform: Rename columns...")
     rename_headers(df, rename_mappings)
 
@@ -144,21 +172,12 @@ def main(
 
     logging.info(f"Saving to output file.. {target_file}")
     try:
-        save_to_new_file(df, file_path=str(target_file))
+        save_to_new_file(df, file_path=str(target_file), append=append)
     except Exception as e:
         logging.error(f"Error saving output file: {e}.")
 
-    logging.info(
-        f"Uploading output file to.. gs://{target_gcs_bucket}/{target_gcs_path}"
-    )
-    upload_file_to_gcs(target_file, target_gcs_bucket, target_gcs_path)
-
-    logging.info(
-        "Austin crime process completed at "
-        + str(datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-    )
-
 
+@instrumentation.timed("download")
 def download_file(
     source_url: typing.List[str], source_file: typing.List[pathlib.Path]
 ) -> None:
@@ -167,16 +186,25 @@ def download_file(
         subprocess.check_call(["gsutil", "cp", f"{url}", f"{file}"])
 
 
-def read_files(path: pathlib.Path) -> pd.DataFrame:
+def read_files(path: pathlib.Path, chunksize: int) -> typing.Iterator[pd.DataFrame]:
     all_files = glob.glob(path + "/*.csv")
-    df_temp = []
-    for filename in all_files:
-        frame = pd.read_csv(filename, index_col=None, header=0)
-        df_temp.append(frame)
-    df = pd.concat(df_temp, axis=0, ignore_index=True)
-    return df
+
+    # Give every batch the columns of all files, leaving the columns a file
+    # doesn't have empty, as concatenating the files would
+    columns = list(
+        dict.fromkeys(
+            column
+            for filename in all_files
+            for column in pd.read_csv(filename, nrows=0).columns
+        )
+    )
+
+    chunks = csv_chunks.read_csv(all_files, chunksize, index_col=None, header=0)
+    for chunk in instrumentation.iterate("parse", chunks):
+        yield chunk.reindex(columns=columns)
 
 
+@instrumentation.timed()
 def rename_headers(df: pd.DataFrame, rename_mappings: dict) -> None:
     df.rename(columns=rename_mappings, inplace=True)
 
@@ -230,10 +258,12 @@ def extract_lat_long(str_val: str, patter: str) -> str:
         return ""
 
 
+@instrumentation.timed()
 def delete_column(df: pd.DataFrame, column_name: str) -> None:
     df = df.drop(column_name, axis=1, inplace=True)
 
 
+@instrumentation.timed("upload")
 def upload_file_to_gcs(file_path: pathlib.Path, gcs_bucket: str, gcs_path: str) -> None:
     storage_client = storage.Client()
     bucket = storage_client.bucket(gcs_bucket)
@@ -241,8 +271,9 @@ def upload_file_to_gcs(file_path: pathlib.Path, gcs_bucket: str, gcs_path: str)
     blob.upload_from_filename(file_path)
 
 
-def save_to_new_file(df: pd.DataFrame, file_path: str) -> None:
-    df.to_csv(file_path, index=False)
+@instrumentation.timed("write")
+def save_to_new_file(df: pd.DataFrame, file_path: str, append: bool = False) -> None:
+    df.to_csv(file_path, index=False, mode="a" if append else "w", header=not append)
 
 
 if __name__ == "__main__":
@@ -257,4 +288,5 @@ if __name__ == "__main__":
         target_gcs_path=os.environ["TARGET_GCS_PATH"],
         headers=json.loads(os.environ["CSV_HEADERS"]),
         rename_mappings=json.loads(os.environ["RENAME_MAPPINGS"]),
+        chunksize=os.environ["CHUNKSIZE"],
     )
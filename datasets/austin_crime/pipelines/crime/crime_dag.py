@@ -31,6 +31,7 @@ with DAG(
     schedule_interval="@daily",
     catchup=False,
     default_view="graph",
+    params={"profile": ""},
 ) as dag:
 
     # Run CSV transform within kubernetes pod
@@ -47,12 +48,14 @@ with DAG(
             "TARGET_FILE": "files/data_output.csv",
             "TARGET_GCS_BUCKET": "{{ var.value.composer_bucket }}",
             "TARGET_GCS_PATH": "data/austin_crime/crime/data_output.csv",
+            "CHUNKSIZE": "100000",
             "FILE_PATH": "files/",
             "CSV_HEADERS": '["unique_key","address","census_tract","clearance_date","clearance_status","council_district_code","description","district","latitude","longitude","location","location_description","primary_type","timestamp","x_coordinate","y_coordinate","year","zipcode"]',
             "RENAME_MAPPINGS": '{"GO Primary Key" : "unique_key","Council District" : "council_district_code","GO Highest Offense Desc" : "description","Highest NIBRS/UCR Offense Description" : "primary_type","GO Report Date" : "timestamp","GO Location" : "location_description","Clearance Status" : "clearance_status","Clearance Date" : "clearance_date","GO District" : "district","GO Location Zip" : "zipcode","GO Census Tract" : "census_tract","GO X Coordinate" : "x_coordinate","GO Y Coordinate" : "y_coordinate","Location_1" : "temp_address"}',
+            "PROFILE": "{{ dag_run.conf.get('profile', params.profile) if dag_run and dag_run.conf else params.profile }}",
         },
         resources={
-            "request_memory": "4G",
+            "request_memory": "1G",
             "request_cpu": "1",
             "request_ephemeral_storage": "10G",
         },
@@ -20,11 +20,14 @@ import pathlib
 import typing
 from datetime import datetime
 
+import instrumentation
 import pandas as pd
+import profiler
 import requests
 from google.cloud import storage
 
 
+@profiler.profiled
 def main(
     source_url: str,
     source_file: pathlib.Path,
@@ -40,7 +43,9 @@ def main(
 
     logging.info(f"Downloading file {source_url}")
     download_file(source_url, source_file)
-    df = pd.read_csv(str(source_file))
+    with instrumentation.stage("parse") as stage:
+        df = pd.read_csv(str(source_file))
+        stage.rows = len(df)
 
     logging.info(f"Transforming.. {source_file}")
 
@@ -71,16 +76,20 @@ def main(
         f"Uploading output file to.. gs://{target_gcs_bucket}/{target_gcs_path}"
     )
     upload_file_to_gcs(target_file, target_gcs_bucket, target_gcs_path)
+    instrumentation.upload_metrics(target_file, target_gcs_bucket, target_gcs_path)
 
 
+@instrumentation.timed()
 def rename_headers(df: pd.DataFrame, rename_mappings: dict) -> None:
     df = df.rename(columns=rename_mappings, inplace=True)
 
 
+@instrumentation.timed("write")
 def save_to_new_file(df, file_path):
     df.to_csv(file_path, index=False)
 
 
+@instrumentation.timed("download")
 def download_file(source_url: str, source_file: pathlib.Path) -> None:
     logging.info(f"Downloading {source_url} into {source_file}")
     r = requests.get(source_url, stream=True)
@@ -92,6 +101,7 @@ def download_file(source_url: str, source_file: pathlib.Path) -> None:
         logging.error(f"Couldn't download {source_url}: {r.text}")
 
 
+@instrumentation.timed("upload")
 def upload_file_to_gcs(file_path: pathlib.Path, gcs_bucket: str, gcs_path: str) -> None:
     storage_client = storage.Client()
     bucket = storage_client.bucket(gcs_bucket)
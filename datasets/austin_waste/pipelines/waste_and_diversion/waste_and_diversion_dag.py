@@ -31,6 +31,7 @@ with DAG(
     schedule_interval="@daily",
     catchup=False,
     default_view="graph",
+    params={"profile": ""},
 ) as dag:
 
     # Run CSV transform within kubernetes pod
@@ -50,6 +51,7 @@ with DAG(
             "TARGET_GCS_PATH": "data/austin_waste/waste_and_diversion/data_output.csv",
             "CSV_HEADERS": '[ "load_id", "report_date", "load_type", "load_time", "load_weight", "dropoff_site", "route_type", "route_number"]',
             "RENAME_MAPPINGS": '{"Load ID": "load_id","Report Date": "report_date","Load Type": "load_type","Load Time": "load_time","Load Weight": "load_weight","Dropoff Site": "dropoff_site","Route Type": "route_type","Route Number": "route_number"}',
+            "PROFILE": "{{ dag_run.conf.get('profile', params.profile) if dag_run and dag_run.conf else params.profile }}",
         },
         resources={
             "request_memory": "2G",
@@ -21,10 +21,14 @@ import re
 import subprocess
 import typing
 
+import instrumentation
+import numpy as np
 import pandas as pd
+import profiler
 from google.cloud import storage
 
 
+@profiler.profiled
 def main(
     source_urls: typing.List[str],
     source_files: typing.List[pathlib.Path],
@@ -49,7 +53,7 @@ def main(
     download_file(source_urls, source_files)
 
     logging.info("Reading the file(s)....")
-    df = read_files(source_files, joining_key)
+    df = read_files(source_files, joining_key, headers + columns)
 
     logging.info("Transform: Removing whitespace from headers names...")
     df.columns = df.columns.str.strip()
@@ -75,6 +79,7 @@ def main(
         f"Uploading output file to.. gs://{target_gcs_bucket}/{target_gcs_path}"
     )
     upload_file_to_gcs(target_file, target_gcs_bucket, target_gcs_path)
+    instrumentation.upload_metrics(target_file, target_gcs_bucket, target_gcs_path)
 
     logging.info(
         f"BLS {pipeline_name} process completed at "
@@ -82,10 +87,12 @@ def main(
     )
 
 
+@instrumentation.timed("write")
 def save_to_new_file(df: pd.DataFrame, file_path: pathlib.Path) -> None:
     df.to_csv(file_path, index=False)
 
 
+@instrumentation.timed("download")
 def download_file(
     source_urls: typing.List[str], source_files: typing.List[pathlib.Path]
 ) -> None:
@@ -94,21 +101,64 @@ def download_file(
         subprocess.check_call(["gsutil", "cp", f"{url}", f"{file}"])
 
 
-def read_files(source_files, joining_key):
-    df = pd.DataFrame()
-    for source_file in source_files:
-        if os.path.splitext(source_file)[1] == ".csv":
-            _df = pd.read_csv(source_file)
-        else:
-            _df = pd.read_csv(source_file, sep="\t")
-
-        if df.empty:
-            df = _df
-        else:
-            df = pd.merge(df, _df, how="left", on=joining_key)
-    return df
-
-
+def read_files(
+    source_files: typing.List[pathlib.Path],
+    joining_key: str,
+    columns: typing.List[str],
+) -> pd.DataFrame:
+    # Only read the columns that are used, their names may be padded with
+    # whitespace in the source files
+    used_columns = set(columns) | {joining_key}
+    frames = [
+        read_file(source_file, lambda column: column.strip() in used_columns)
+        for source_file in source_files
+    ]
+    df, lookups = frames[0], frames[1:]
+    if not lookups:
+        return df
+
+    if not all(lookup[joining_key].is_unique for lookup in lookups):
+        logging.info(f"{joining_key} isn't unique in all files, merging them in turn")
+        for lookup in lookups:
+            df = pd.merge(df, lookup, how="left", on=joining_key)
+        return df
+
+    return join_lookups(df, lookups, joining_key)
+
+
+@instrumentation.timed("parse")
+def read_file(
+    source_file: pathlib.Path, usecols: typing.Callable[[str], bool]
+) -> pd.DataFrame:
+    if os.path.splitext(source_file)[1] == ".csv":
+        return pd.read_csv(source_file, usecols=usecols)
+    return pd.read_csv(source_file, sep="\t", usecols=usecols)
+
+
+@instrumentation.timed()
+def join_lookups(
+    df: pd.DataFrame, lookups: typing.List[pd.DataFrame], joining_key: str
+) -> pd.DataFrame:
+    """Left joins lookup frames with unique keys to `df` in a single pass.
+
+    The keys of `df` are stored as categorical codes, so every lookup is only
+    aligned to the distinct keys once and then gathered into the result by code.
+    """
+    keys = df[joining_key].astype("category")
+    # Rows without a key are given the code of an extra NaN label, which matches
+    # a NaN key in the lookups like `pd.merge` does
+    labels = keys.cat.categories.append(pd.Index([np.nan]))
+    codes = keys.cat.codes.to_numpy()
+    codes = np.where(codes == -1, len(labels) - 1, codes)
+
+    joined = [df.assign(**{joining_key: keys})]
+    for lookup in lookups:
+        aligned = lookup.set_index(joining_key).reindex(labels)
+        joined.append(aligned.take(codes).reset_index(drop=True))
+    return pd.concat(joined, axis=1)
+
+
+@instrumentation.timed()
 def trim_white_spaces(df: pd.DataFrame, columns: typing.List[str]) -> None:
     for col in columns:
         df[col] = df[col].astype(str).str.strip()
@@ -118,6 +168,7 @@ def reg_exp_tranformation(str_value: str, search_pattern: str, replace_val: str)
     return re.sub(search_pattern, replace_val, str_value)
 
 
+@instrumentation.timed("upload")
 def upload_file_to_gcs(file_path: pathlib.Path, gcs_bucket: str, gcs_path: str) -> None:
     storage_client = storage.Client()
     bucket = storage_client.bucket(gcs_bucket)
@@ -31,6 +31,7 @@ with DAG(
     schedule_interval="@daily",
     catchup=False,
     default_view="graph",
+    params={"profile": ""},
 ) as dag:
 
     # Run CSV transform within kubernetes pod
@@ -52,6 +53,7 @@ with DAG(
             "JOINING_KEY": "series_id",
             "TRIM_SPACE": '["series_id","value","footnote_codes","series_title"]',
             "CSV_HEADERS": '["series_id","year","period","value","footnote_codes","date","series_title"]',
+            "PROFILE": "{{ dag_run.conf.get('profile', params.profile) if dag_run and dag_run.conf else params.profile }}",
         },
         resources={
             "request_memory": "12G",
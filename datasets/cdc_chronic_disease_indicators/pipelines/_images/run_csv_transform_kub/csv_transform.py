@@ -19,11 +19,15 @@ import os
 import pathlib
 import typing
 
+import csv_chunks
+import instrumentation
 import pandas as pd
+import profiler
 import requests
 from google.cloud import storage
 
 
+@profiler.profiled
 def main(
     source_url: str,
     source_file: pathlib.Path,
@@ -33,6 +37,7 @@ def main(
     headers: typing.List[str],
     rename_mappings: dict,
     pipeline_name: str,
+    chunksize: str,
 ) -> None:
 
     logging.info("Creating 'files' folder")
@@ -42,24 +47,22 @@ def main(
     download_file(source_url, source_file)
 
     logging.info(f"Opening file {source_file}")
-    df = pd.read_csv(str(source_file))
-
-    logging.info(f"Transformation Process Starting.. {source_file}")
-    rename_headers(df, rename_mappings)
-    df = df[headers]
-
-    logging.info(f"Transformation Process complete .. {source_file}")
-    logging.info(f"Saving to output file.. {target_file}")
-
-    try:
-        save_to_new_file(df, file_path=str(target_file))
-    except Exception as e:
-        logging.error(f"Error saving output file: {e}.")
+    chunks = csv_chunks.read_csv([str(source_file)], int(chunksize))
+    for chunk_number, chunk in enumerate(instrumentation.iterate("parse", chunks)):
+        logging.info(f"Processing batch {chunk_number}")
+        process_chunk(
+            chunk,
+            target_file,
+            headers,
+            rename_mappings,
+            append=(chunk_number > 0),
+        )
 
     logging.info(
         f"Uploading output file to.. gs://{target_gcs_bucket}/{target_gcs_path}"
     )
     upload_file_to_gcs(target_file, target_gcs_bucket, target_gcs_path)
+    instrumentation.upload_metrics(target_file, target_gcs_bucket, target_gcs_path)
 
     logging.info(
         f"CDC U.S. Chronic Disease Indicators (CDI) {pipeline_name} process completed at "
@@ -67,14 +70,43 @@ def main(
     )
 
 
+def process_chunk(
+    df: pd.DataFrame,
+    target_file: pathlib.Path,
+    headers: typing.List[str],
+    rename_mappings: dict,
+    append: bool,
+) -> None:
+    logging.info("Transformation Process Starting..")
+    rename_headers(df, rename_mappings)
+    df = df[headers]
+
+    logging.info("Transformation Process complete ..")
+    logging.info(f"Saving to output file.. {target_file}")
+
+    try:
+        save_to_new_file(df, file_path=str(target_file), append=append)
+    except Exception as e:
+        logging.error(f"Error saving output file: {e}.")
+
+
+@instrumentation.timed()
 def rename_headers(df: pd.DataFrame, rename_mappings: dict) -> None:
     df.rename(columns=rename_mappings, inplace=True)
 
 
-def save_to_new_file(df: pd.DataFrame, file_path: str) -> None:
-    df.to_csv(file_path, float_format="%.0f", index=False)
+@instrumentation.timed("write")
+def save_to_new_file(df: pd.DataFrame, file_path: str, append: bool = False) -> None:
+    df.to_csv(
+        file_path,
+        float_format="%.0f",
+        index=False,
+        mode="a" if append else "w",
+        header=not append,
+    )
 
 
+@instrumentation.timed("download")
 def download_file(source_url: str, source_file: pathlib.Path) -> None:
     logging.info(f"Downloading {source_url} into {source_file}")
     r = requests.get(source_url, stream=True)
@@ -86,6 +118,7 @@ def download_file(source_url: str, source_file: pathlib.Path) -> None:
         logging.error(f"Couldn't download {source_url}: {r.text}")
 
 
+@instrumentation.timed("upload")
 def upload_file_to_gcs(file_path: pathlib.Path, gcs_bucket: str, gcs_path: str) -> None:
     storage_client = storage.Client()
     bucket = storage_client.bucket(gcs_bucket)
@@ -105,4 +138,5 @@ if __name__ == "__main__":
         headers=json.loads(os.environ["CSV_HEADERS"]),
         rename_mappings=json.loads(os.environ["RENAME_MAPPINGS"]),
         pipeline_name=os.environ["PIPELINE_NAME"],
+        chunksize=os.environ["CHUNKSIZE"],
     )
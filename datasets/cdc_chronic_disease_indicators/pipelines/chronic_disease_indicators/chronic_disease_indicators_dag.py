@@ -31,6 +31,7 @@ with DAG(
     schedule_interval="@daily",
     catchup=False,
     default_view="graph",
+    params={"profile": ""},
 ) as dag:
 
     # Run CSV transform within kubernetes pod
@@ -48,12 +49,14 @@ with DAG(
             "TARGET_FILE": "files/data_output.csv",
             "TARGET_GCS_BUCKET": "{{ var.value.composer_bucket }}",
             "TARGET_GCS_PATH": "data/cdc_chronic_disease_indicators/chronic_disease_indicators/data_output.csv",
+            "CHUNKSIZE": "100000",
             "CSV_HEADERS": '["yearstart","yearend","locationabbr","locationdesc","datasource","topic","question","response","datavalueunit","datavaluetype","datavalue","datavaluealt","datavaluefootnotesymbol","datavaluefootnote","lowconfidencelimit","highconfidencelimit","stratificationcategory1","stratification1","stratificationcategory2","stratification2","stratificationcategory3","stratification3","geolocation","responseid","locationid","topicid","questionid","datavaluetypeid","stratificationcategoryid1","stratificationid1","stratificationcategoryid2","stratificationid2","stratificationcategoryid3","stratificationid3"]',
             "RENAME_MAPPINGS": '{"yearstart": "yearstart","yearend": "yearend","locationabbr": "locationabbr","locationdesc": "locationdesc","datasource": "datasource","topic": "topic","question": "question","response": "response","datavalueunit": "datavalueunit","datavaluetype": "datavaluetype","datavalue": "datavalue","datavaluealt": "datavaluealt","datavaluefootnotesymbol": "datavaluefootnotesymbol","datavaluefootnote": "datavaluefootnote","lowconfidencelimit": "lowconfidencelimit","highconfidencelimit": "highconfidencelimit","stratificationcategory1": "stratificationcategory1","stratification1": "stratification1","stratificationcategory2": "stratificationcategory2","stratification2": "stratification2","stratificationcategory3": "stratificationcategory3","stratification3": "stratification3","geolocation": "geolocation","responseid": "responseid","locationid": "locationid","topicid": "topicid","questionid": "questionid","datavaluetypeid": "datavaluetypeid","stratificationcategoryid1": "stratificationcategoryid1","stratificationid1": "stratificationid1","stratificationcategoryid2": "stratificationcategoryid2","stratificationid2": "stratificationid2","stratificationcategoryid3": "stratificationcategoryid3","stratificationid3": "stratificationid3"}',
             "PIPELINE_NAME": "chronic_disease_indicators",
+            "PROFILE": "{{ dag_run.conf.get('profile', params.profile) if dag_run and dag_run.conf else params.profile }}",
         },
         resources={
-            "request_memory": "2G",
+            "request_memory": "1G",
             "request_cpu": "1",
             "request_ephemeral_storage": "10G",
         },
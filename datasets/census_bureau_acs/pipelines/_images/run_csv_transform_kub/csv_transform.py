@@ -20,12 +20,15 @@ import os
 import pathlib
 import typing
 
+import instrumentation
 import numpy as np
 import pandas as pd
+import profiler
 import requests
 from google.cloud import storage
 
 
+@profiler.profiled
 def main(
     source_url: str,
     year_report: str,
@@ -98,6 +101,7 @@ def main(
         f"Uploading output file to.. gs://{target_gcs_bucket}/{target_gcs_path}"
     )
     upload_file_to_gcs(target_file, target_gcs_bucket, target_gcs_path)
+    instrumentation.upload_metrics(target_file, target_gcs_bucket, target_gcs_path)
 
     logging.info(
         f"ACS {pipeline_name} process completed at "
@@ -111,6 +115,7 @@ def string_replace(source_url, replace: dict) -> str:
     return source_url_new
 
 
+@instrumentation.timed("download")
 def extract_data_and_convert_to_df_national_level(
     group_id: dict, year_report: str, api_naming_convention: str, source_url: str
 ) -> pd.DataFrame:
@@ -144,6 +149,7 @@ def load_nested_list_into_df_without_headers(text: typing.List) -> pd.DataFrame:
     return frame
 
 
+@instrumentation.timed("download")
 def extract_data_and_convert_to_df_state_level(
     group_id: dict,
     state_code: dict,
@@ -179,6 +185,7 @@ def extract_data_and_convert_to_df_state_level(
     return df
 
 
+@instrumentation.timed()
 def create_geo_id(df: pd.DataFrame, concat_col: str) -> pd.DataFrame:
     df["geo_id"] = ""
     for col in concat_col:
@@ -193,15 +200,18 @@ def pad_zeroes_to_the_left(val: str, length: int) -> str:
         return str(val)
 
 
+@instrumentation.timed()
 def rename_headers(df: pd.DataFrame, rename_mappings: dict) -> None:
     rename_mappings = {int(k): str(v) for k, v in rename_mappings.items()}
     df.rename(columns=rename_mappings, inplace=True)
 
 
+@instrumentation.timed("write")
 def save_to_new_file(df: pd.DataFrame, file_path: str) -> None:
     df.to_csv(file_path, index=False)
 
 
+@instrumentation.timed("upload")
 def upload_file_to_gcs(file_path: pathlib.Path, gcs_bucket: str, gcs_path: str) -> None:
     storage_client = storage.Client()
     bucket = storage_client.bucket(gcs_bucket)
@@ -31,6 +31,7 @@ with DAG(
     schedule_interval="@daily",
     catchup=False,
     default_view="graph",
+    params={"profile": ""},
 ) as dag:
 
     # Run CSV transform within kubernetes pod
@@ -48,12 +49,14 @@ with DAG(
             "TARGET_FILE": "files/data_output.csv",
             "TARGET_GCS_BUCKET": "{{ var.value.composer_bucket }}",
             "TARGET_GCS_PATH": "data/census_opportunity_atlas/tract_covariates/data_output.csv",
+            "CHUNKSIZE": "100000",
             "CSV_HEADERS": '["state","county","tract","cz","czname","hhinc_mean2000","mean_commutetime2000","frac_coll_plus2000","frac_coll_plus2010","foreign_share2010","med_hhinc1990","med_hhinc2016","popdensity2000","poor_share2010","poor_share2000","poor_share1990","share_white2010","share_black2010","share_hisp2010","share_asian2010","share_black2000","share_white2000","share_hisp2000","share_asian2000","gsmn_math_g3_2013","rent_twobed2015","singleparent_share2010","singleparent_share1990","singleparent_share2000","traveltime15_2010","emp2000","mail_return_rate2010","ln_wage_growth_hs_grad","jobs_total_5mi_2015","jobs_highpay_5mi_2015","popdensity2010","ann_avg_job_growth_2004_2013","job_density_2013"]',
             "RENAME_MAPPINGS": '{"state": "state","county": "county","tract": "tract","cz": "cz","czname": "czname","hhinc_mean2000": "hhinc_mean2000","mean_commutetime2000": "mean_commutetime2000","frac_coll_plus2000": "frac_coll_plus2000","frac_coll_plus2010": "frac_coll_plus2010","foreign_share2010": "foreign_share2010","med_hhinc1990": "med_hhinc1990","med_hhinc2016": "med_hhinc2016","popdensity2000": "popdensity2000","poor_share2010": "poor_share2010","poor_share2000": "poor_share2000","poor_share1990": "poor_share1990","share_white2010": "share_white2010","share_black2010": "share_black2010","share_hisp2010": "share_hisp2010","share_asian2010": "share_asian2010","share_black2000": "share_black2000","share_white2000": "share_white2000","share_hisp2000": "share_hisp2000","share_asian2000": "share_asian2000","gsmn_math_g3_2013": "gsmn_math_g3_2013","rent_twobed2015": "rent_twobed2015","singleparent_share2010": "singleparent_share2010","singleparent_share1990": "singleparent_share1990","singleparent_share2000": "singleparent_share2000","traveltime15_2010": "traveltime15_2010","emp2000": "emp2000","mail_return_rate2010": "mail_return_rate2010","ln_wage_growth_hs_grad": "ln_wage_growth_hs_grad","jobs_total_5mi_2015": "jobs_total_5mi_2015","jobs_highpay_5mi_2015": "jobs_highpay_5mi_2015","popdensity2010": "popdensity2010","ann_avg_job_growth_2004_2013": "ann_avg_job_growth_2004_2013","job_density_2013": "job_density_2013"}',
             "PIPELINE_NAME": "tract_covariates",
+            "PROFILE": "{{ dag_run.conf.get('profile', params.profile) if dag_run and dag_run.conf else params.profile }}",
         },
         resources={
-            "request_memory": "2G",
+            "request_memory": "1G",
             "request_cpu": "1",
             "request_ephemeral_storage": "10G",
         },
@@ -20,12 +20,15 @@ import os
 import pathlib
 import typing
 
+import instrumentation
 import numpy as np
 import pandas as pd
+import profiler
 import requests
 from google.cloud import storage
 
 
+@profiler.profiled
 def main(
     source_url: str,
     source_file: pathlib.Path,
@@ -49,7 +52,9 @@ def main(
     download_file(source_url, source_file)
 
     logging.info(f"Opening file {source_file}...")
-    df = pd.read_csv(str(source_file), compression="zip")
+    with instrumentation.stage("parse") as stage:
+        df = pd.read_csv(str(source_file), compression="zip")
+        stage.rows = len(df)
 
     logging.info(f"Transforming {source_file}... ")
 
@@ -80,6 +85,7 @@ def main(
         f"Uploading output file to.. gs://{target_gcs_bucket}/{target_gcs_path}"
     )
     upload_file_to_gcs(target_file, target_gcs_bucket, target_gcs_path)
+    instrumentation.upload_metrics(target_file, target_gcs_bucket, target_gcs_path)
 
     logging.info(
         f"CFPB Complaints {pipeline_name} process completed at "
@@ -87,14 +93,17 @@ def main(
     )
 
 
+@instrumentation.timed()
 def rename_headers(df: pd.DataFrame, rename_mappings: dict) -> None:
     df.rename(columns=rename_mappings, inplace=True)
 
 
+@instrumentation.timed("write")
 def save_to_new_file(df: pd.DataFrame, file_path: str) -> None:
     df.to_csv(file_path, index=False)
 
 
+@instrumentation.timed("download")
 def download_file(source_url: str, source_file: pathlib.Path) -> None:
     logging.info(f"Downloading {source_url} into {source_file}")
     r = requests.get(source_url, stream=True)
@@ -106,6 +115,7 @@ def download_file(source_url: str, source_file: pathlib.Path) -> None:
         logging.error(f"Couldn't download {source_url}: {r.text}")
 
 
+@instrumentation.timed("upload")
 def upload_file_to_gcs(file_path: pathlib.Path, gcs_bucket: str, gcs_path: str) -> None:
     storage_client = storage.Client()
     bucket = storage_client.bucket(gcs_bucket)
@@ -14,6 +14,7 @@
 
 
 from airflow import DAG
+from airflow.operators import bash
 from airflow.providers.cncf.kubernetes.operators import kubernetes_pod
 from airflow.providers.google.cloud.transfers import gcs_to_bigquery
 
@@ -31,8 +32,22 @@ with DAG(
     schedule_interval="@daily",
     catchup=False,
     default_view="graph",
+    params={"profile": ""},
 ) as dag:
 
+    # Skip the DAG run if none of the sources changed since the last successful run
+    check_source_changes = bash.BashOperator(
+        task_id="check_source_changes",
+        bash_command="python $airflow_home/dags/$dataset/$pipeline/custom/source_check.py check",
+        env={
+            "airflow_home": "{{ var.value.airflow_home }}",
+            "dataset": "cfpb_complaints",
+            "pipeline": "complaint_database",
+            "STATE_FILE": "{{ var.value.airflow_data_folder }}/cfpb_complaints/complaint_database/source_state.json",
+            "SOURCE_URLS": '["http://files.consumerfinance.gov/ccdb/complaints.csv.zip"]',
+        },
+    )
+
     # Run CSV transform within kubernetes pod
     complaint_database_transform_csv = kubernetes_pod.KubernetesPodOperator(
         task_id="complaint_database_transform_csv",
@@ -51,6 +66,7 @@ with DAG(
             "PIPELINE_NAME": "complaint_database",
             "CSV_HEADERS": '["date_received","product","subproduct","issue","subissue","consumer_complaint_narrative","company_public_response","company_name","state","zip_code","tags","consumer_consent_provided","submitted_via","date_sent_to_company","company_response_to_consumer","timely_response","consumer_disputed","complaint_id"]',
             "RENAME_MAPPINGS": '{"Complaint ID":"complaint_id","Date received":"date_received","Product":"product","Sub-product":"subproduct","Issue":"issue","Sub-issue":"subissue","Consumer complaint narrative":"consumer_complaint_narrative","Company response to consumer":"company_response_to_consumer","Company public response":"company_public_response","Company":"company_name","State":"state","ZIP code":"zip_code","Tags":"tags","Consumer consent provided?":"consumer_consent_provided","Submitted via":"submitted_via","Date sent to company":"date_sent_to_company","Timely response?":"timely_response","Consumer disputed?":"consumer_disputed"}',
+            "PROFILE": "{{ dag_run.conf.get('profile', params.profile) if dag_run and dag_run.conf else params.profile }}",
         },
         resources={
             "request_memory": "3G",
@@ -181,4 +197,19 @@ with DAG(
         ],
     )
 
+    # Record the state of the sources once the DAG run succeeded
+    record_source_state = bash.BashOperator(
+        task_id="record_source_state",
+        bash_command="python $airflow_home/dags/$dataset/$pipeline/custom/source_check.py record",
+        env={
+            "airflow_home": "{{ var.value.airflow_home }}",
+            "dataset": "cfpb_complaints",
+            "pipeline": "complaint_database",
+            "STATE_FILE": "{{ var.value.airflow_data_folder }}/cfpb_complaints/complaint_database/source_state.json",
+        },
+        trigger_rule="none_failed",
+    )
+
     complaint_database_transform_csv >> load_complaint_database_to_bq
+    check_source_changes >> [complaint_database_transform_csv]
+    [load_complaint_database_to_bq] >> record_source_state
@@ -21,11 +21,14 @@ import pathlib
 import subprocess
 import typing
 
+import gcs_upload
+import instrumentation
 import pandas as pd
-import requests
-from google.cloud import storage
+import profiler
+import ranged_download
 
 
+@profiler.profiled
 def main(
     source_url: str,
     source_file: pathlib.Path,
@@ -50,7 +53,7 @@ def main(
         source_file,
         chunksize=int(chunk_size),
     ) as reader:
-        for chunk_number, chunk in enumerate(reader):
+        for chunk_number, chunk in enumerate(instrumentation.iterate("parse", reader)):
             logging.info(f"Processing batch {chunk_number}")
             target_file_batch = str(target_file).replace(
                 ".csv", "-" + str(chunk_number) + ".csv"
@@ -119,6 +122,7 @@ def main(
         f"Uploading output file to.. gs://{target_gcs_bucket}/{target_gcs_path}"
     )
     upload_file_to_gcs(target_file, target_gcs_bucket, target_gcs_path)
+    instrumentation.upload_metrics(target_file, target_gcs_bucket, target_gcs_path)
 
     logging.info(
         "Chicago crime process completed at "
@@ -142,6 +146,7 @@ def resolve_nan(input: typing.Union[str, float]) -> str:
     return str(input).replace("None", "")
 
 
+@instrumentation.timed()
 def removing_nan_values(df: pd.DataFrame) -> None:
     cols = ["x_coordinate", "y_coordinate", "latitude", "longitude"]
     for cols in cols:
@@ -155,6 +160,7 @@ def convert_to_integer_string(input: typing.Union[str, float]) -> str:
     return str(int(round(input, 0)))
 
 
+@instrumentation.timed()
 def convert_values_to_integer_string(df: pd.DataFrame) -> None:
     cols = ["unique_key", "beat", "district", "ward", "community_area", "year"]
 
@@ -162,6 +168,7 @@ def convert_values_to_integer_string(df: pd.DataFrame) -> None:
         df[cols] = df[cols].apply(convert_to_integer_string)
 
 
+@instrumentation.timed()
 def rename_headers(df: pd.DataFrame) -> None:
     header_names = {
         "ID": "unique_key",
@@ -202,6 +209,7 @@ def convert_dt_format(dt_str: str) -> str:
         )
 
 
+@instrumentation.timed()
 def convert_values(df: pd.DataFrame) -> None:
     dt_cols = ["date", "updated_on"]
 
@@ -209,30 +217,26 @@ def convert_values(df: pd.DataFrame) -> None:
         df[dt_col] = df[dt_col].apply(convert_dt_format)
 
 
+@instrumentation.timed()
 def filter_null_rows(df: pd.DataFrame) -> None:
     df = df[df.unique_key != ""]
 
 
 def save_to_new_file(df: pd.DataFrame, file_path: pathlib.Path) -> None:
-    df.to_csv(file_path, index=False)
+    with instrumentation.stage("write", rows=len(df)) as stage:
+        df.to_csv(file_path, index=False)
+        stage.bytes = os.path.getsize(file_path)
 
 
 def download_file(source_url: str, source_file: pathlib.Path) -> None:
-    logging.info(f"Downloading {source_url} into {source_file}")
-    r = requests.get(source_url, stream=True)
-    if r.status_code == 200:
-        with open(source_file, "wb") as f:
-            for chunk in r:
-                f.write(chunk)
-    else:
-        logging.error(f"Couldn't download {source_url}: {r.text}")
+    with instrumentation.stage("download") as stage:
+        ranged_download.download_file(source_url, source_file)
+        stage.bytes = os.path.getsize(source_file)
 
 
 def upload_file_to_gcs(file_path: pathlib.Path, gcs_bucket: str, gcs_path: str) -> None:
-    storage_client = storage.Client()
-    bucket = storage_client.bucket(gcs_bucket)
-    blob = bucket.blob(gcs_path)
-    blob.upload_from_filename(file_path)
+    with instrumentation.stage("upload", bytes=os.path.getsize(file_path)):
+        gcs_upload.upload_file(file_path, gcs_bucket, gcs_path, fingerprint=True)
 
 
 if __name__ == "__main__":
@@ -14,6 +14,7 @@
 
 
 from airflow import DAG
+from airflow.operators import bash
 from airflow.providers.google.cloud.operators import kubernetes_engine
 from airflow.providers.google.cloud.transfers import gcs_to_bigquery
 
@@ -31,6 +32,7 @@ with DAG(
     schedule_interval="@daily",
     catchup=False,
     default_view="graph",
+    params={"profile": ""},
 ) as dag:
     create_cluster = kubernetes_engine.GKECreateClusterOperator(
         task_id="create_cluster",
@@ -68,6 +70,22 @@ with DAG(
             "TARGET_GCS_BUCKET": "{{ var.value.composer_bucket }}",
             "TARGET_GCS_PATH": "data/chicago_crime/crime/data_output.csv",
             "CHUNK_SIZE": "1000000",
+            "PROFILE": "{{ dag_run.conf.get('profile', params.profile) if dag_run and dag_run.conf else params.profile }}",
+        },
+    )
+
+    # Skip the load if its output is already in the table
+    check_load_chicago_crime_to_bq_output = bash.BashOperator(
+        task_id="check_load_chicago_crime_to_bq_output",
+        bash_command="python $airflow_home/dags/$dataset/$pipeline/custom/output_check.py check",
+        env={
+            "airflow_home": "{{ var.value.airflow_home }}",
+            "dataset": "chicago_crime",
+            "pipeline": "crime",
+            "BUCKET": "{{ var.value.composer_bucket }}",
+            "OBJECT": "data/chicago_crime/crime/data_output.csv",
+            "TABLE": "chicago_crime.crime",
+            "STATE_FILE": "{{ var.value.airflow_data_folder }}/chicago_crime/crime/load_chicago_crime_to_bq_output_state.json",
         },
     )
 
@@ -105,11 +123,27 @@ with DAG(
             {"name": "location", "type": "string", "mode": "nullable"},
         ],
     )
+
+    # Record the fingerprint of the loaded output
+    record_load_chicago_crime_to_bq_output = bash.BashOperator(
+        task_id="record_load_chicago_crime_to_bq_output",
+        bash_command="python $airflow_home/dags/$dataset/$pipeline/custom/output_check.py record",
+        env={
+            "airflow_home": "{{ var.value.airflow_home }}",
+            "dataset": "chicago_crime",
+            "pipeline": "crime",
+            "BUCKET": "{{ var.value.composer_bucket }}",
+            "OBJECT": "data/chicago_crime/crime/data_output.csv",
+            "TABLE": "chicago_crime.crime",
+            "STATE_FILE": "{{ var.value.airflow_data_folder }}/chicago_crime/crime/load_chicago_crime_to_bq_output_state.json",
+        },
+    )
     delete_cluster = kubernetes_engine.GKEDeleteClusterOperator(
         task_id="delete_cluster",
         project_id="{{ var.value.gcp_project }}",
         location="us-central1-c",
         name="chicago-crime--crime",
+        trigger_rule="none_failed",
     )
 
     (
@@ -118,3 +152,9 @@ with DAG(
         >> load_chicago_crime_to_bq
         >> delete_cluster
     )
+    [chicago_crime_transform_csv] >> check_load_chicago_crime_to_bq_output
+    (
+        check_load_chicago_crime_to_bq_output
+        >> load_chicago_crime_to_bq
+        >> record_load_chicago_crime_to_bq_output
+    )
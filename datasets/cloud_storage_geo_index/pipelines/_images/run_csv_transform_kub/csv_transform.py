@@ -19,11 +19,14 @@ import pathlib
 import subprocess
 import typing
 
+import gcs_upload
+import instrumentation
 import pandas as pd
-import requests
-from google.cloud import storage
+import profiler
+import ranged_download
 
 
+@profiler.profiled
 def main(
     source_url: str,
     source_file: pathlib.Path,
@@ -52,7 +55,7 @@ def main(
         compression="gzip",
         chunksize=chunksz,
     ) as reader:
-        for chunk_number, chunk in enumerate(reader):
+        for chunk_number, chunk in enumerate(instrumentation.iterate("parse", reader)):
             logging.info(f"Processing batch {chunk_number}")
             target_file_batch = str(target_file).replace(
                 ".csv", "-" + str(chunk_number) + ".csv"
@@ -83,6 +86,7 @@ def main(
         f"Uploading output file to.. gs://{target_gcs_bucket}/{target_gcs_path}"
     )
     upload_file_to_gcs(target_file, target_gcs_bucket, target_gcs_path)
+    instrumentation.upload_metrics(target_file, target_gcs_bucket, target_gcs_path)
 
 
 def process_chunk(df: pd.DataFrame, target_file_batch: str) -> None:
@@ -95,30 +99,26 @@ def process_chunk(df: pd.DataFrame, target_file_batch: str) -> None:
     logging.info("..Done!")
 
 
+@instrumentation.timed()
 def rename_headers(df: pd.DataFrame, rename_mappings: dict) -> None:
     df = df.rename(columns=rename_mappings, inplace=True)
 
 
 def save_to_new_file(df: pd.DataFrame, file_path) -> None:
-    df.to_csv(file_path, index=False)
+    with instrumentation.stage("write", rows=len(df)) as stage:
+        df.to_csv(file_path, index=False)
+        stage.bytes = os.path.getsize(file_path)
 
 
 def download_file(source_url: str, source_file: pathlib.Path) -> None:
-    logging.info(f"Downloading {source_url} into {source_file}")
-    r = requests.get(source_url, stream=True)
-    if r.status_code == 200:
-        with open(source_file, "wb") as f:
-            for chunk in r:
-                f.write(chunk)
-    else:
-        logging.error(f"Couldn't download {source_url}: {r.text}")
+    with instrumentation.stage("download") as stage:
+        ranged_download.download_file(source_url, source_file)
+        stage.bytes = os.path.getsize(source_file)
 
 
 def upload_file_to_gcs(file_path: pathlib.Path, gcs_bucket: str, gcs_path: str) -> None:
-    storage_client = storage.Client()
-    bucket = storage_client.bucket(gcs_bucket)
-    blob = bucket.blob(gcs_path)
-    blob.upload_from_filename(file_path)
+    with instrumentation.stage("upload", bytes=os.path.getsize(file_path)):
+        gcs_upload.upload_file(file_path, gcs_bucket, gcs_path, fingerprint=True)
 
 
 if __name__ == "__main__":
@@ -14,6 +14,7 @@
 
 
 from airflow import DAG
+from airflow.operators import bash
 from airflow.providers.cncf.kubernetes.operators import kubernetes_pod
 from airflow.providers.google.cloud.transfers import gcs_to_bigquery
 
@@ -31,6 +32,7 @@ with DAG(
     schedule_interval="@daily",
     catchup=False,
     default_view="graph",
+    params={"profile": ""},
 ) as dag:
 
     # Run CSV transform within kubernetes pod
@@ -52,6 +54,7 @@ with DAG(
             "PIPELINE_NAME": "landsat_index",
             "CSV_HEADERS": '["scene_id","product_id","spacecraft_id","sensor_id","date_acquired","sensing_time","collection_number","collection_category","data_type","wrs_path","wrs_row","cloud_cover","north_lat","south_lat","west_lon","east_lon","total_size","base_url"]',
             "RENAME_MAPPINGS": '{"SCENE_ID" : "scene_id","SPACECRAFT_ID" : "spacecraft_id","SENSOR_ID" : "sensor_id","DATE_ACQUIRED" : "date_acquired","COLLECTION_NUMBER" : "collection_number","COLLECTION_CATEGORY" : "collection_category","DATA_TYPE" : "data_type","WRS_PATH" : "wrs_path","WRS_ROW" : "wrs_row","CLOUD_COVER" : "cloud_cover","NORTH_LAT" : "north_lat","SOUTH_LAT" : "south_lat","WEST_LON" : "west_lon","EAST_LON" : "east_lon","TOTAL_SIZE" : "total_size","BASE_URL" : "base_url","PRODUCT_ID" : "product_id","SENSING_TIME" : "sensing_time"}',
+            "PROFILE": "{{ dag_run.conf.get('profile', params.profile) if dag_run and dag_run.conf else params.profile }}",
         },
         resources={
             "request_memory": "4G",
@@ -60,6 +63,21 @@ with DAG(
         },
     )
 
+    # Skip the load if its output is already in the table
+    check_load_landsat_index_to_bq_output = bash.BashOperator(
+        task_id="check_load_landsat_index_to_bq_output",
+        bash_command="python $airflow_home/dags/$dataset/$pipeline/custom/output_check.py check",
+        env={
+            "airflow_home": "{{ var.value.airflow_home }}",
+            "dataset": "cloud_storage_geo_index",
+            "pipeline": "landsat_index",
+            "BUCKET": "{{ var.value.composer_bucket }}",
+            "OBJECT": "data/cloud_storage_geo_index/landsat_index/data_output.csv",
+            "TABLE": "cloud_storage_geo_index.landsat_index",
+            "STATE_FILE": "{{ var.value.airflow_data_folder }}/cloud_storage_geo_index/landsat_index/load_landsat_index_to_bq_output_state.json",
+        },
+    )
+
     # Task to load CSV data to a BigQuery table
     load_landsat_index_to_bq = gcs_to_bigquery.GCSToBigQueryOperator(
         task_id="load_landsat_index_to_bq",
@@ -91,4 +109,25 @@ with DAG(
         ],
     )
 
+    # Record the fingerprint of the loaded output
+    record_load_landsat_index_to_bq_output = bash.BashOperator(
+        task_id="record_load_landsat_index_to_bq_output",
+        bash_command="python $airflow_home/dags/$dataset/$pipeline/custom/output_check.py record",
+        env={
+            "airflow_home": "{{ var.value.airflow_home }}",
+            "dataset": "cloud_storage_geo_index",
+            "pipeline": "landsat_index",
+            "BUCKET": "{{ var.value.composer_bucket }}",
+            "OBJECT": "data/cloud_storage_geo_index/landsat_index/data_output.csv",
+            "TABLE": "cloud_storage_geo_index.landsat_index",
+            "STATE_FILE": "{{ var.value.airflow_data_folder }}/cloud_storage_geo_index/landsat_index/load_landsat_index_to_bq_output_state.json",
+        },
+    )
+
     landsat_index_transform_csv >> load_landsat_index_to_bq
+    [landsat_index_transform_csv] >> check_load_landsat_index_to_bq_output
+    (
+        check_load_landsat_index_to_bq_output
+        >> load_landsat_index_to_bq
+        >> record_load_landsat_index_to_bq_output
+    )
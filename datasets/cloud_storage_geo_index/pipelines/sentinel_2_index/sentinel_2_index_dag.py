@@ -14,6 +14,7 @@
 
 
 from airflow import DAG
+from airflow.operators import bash
 from airflow.providers.cncf.kubernetes.operators import kubernetes_pod
 from airflow.providers.google.cloud.transfers import gcs_to_bigquery
 
@@ -31,6 +32,7 @@ with DAG(
     schedule_interval="@daily",
     catchup=False,
     default_view="graph",
+    params={"profile": ""},
 ) as dag:
 
     # Run CSV transform within kubernetes pod
@@ -52,6 +54,7 @@ with DAG(
             "PIPELINE_NAME": "sentinel_2_index",
             "CSV_HEADERS": '["granule_id","product_id","datatake_identifier","mgrs_tile","sensing_time","geometric_quality_flag","generation_time","north_lat","south_lat","west_lon","east_lon","base_url","total_size","cloud_cover"]',
             "RENAME_MAPPINGS": '{"GRANULE_ID": "granule_id","PRODUCT_ID": "product_id","DATATAKE_IDENTIFIER": "datatake_identifier","MGRS_TILE": "mgrs_tile","SENSING_TIME": "sensing_time","TOTAL_SIZE": "total_size","CLOUD_COVER": "cloud_cover","GEOMETRIC_QUALITY_FLAG": "geometric_quality_flag","GENERATION_TIME": "generation_time", "NORTH_LAT": "north_lat","SOUTH_LAT": "south_lat","WEST_LON": "west_lon","EAST_LON": "east_lon","BASE_URL": "base_url"}',
+            "PROFILE": "{{ dag_run.conf.get('profile', params.profile) if dag_run and dag_run.conf else params.profile }}",
         },
         resources={
             "request_memory": "4G",
@@ -60,6 +63,21 @@ with DAG(
         },
     )
 
+    # Skip the load if its output is already in the table
+    check_load_sentinel_2_index_to_bq_output = bash.BashOperator(
+        task_id="check_load_sentinel_2_index_to_bq_output",
+        bash_command="python $airflow_home/dags/$dataset/$pipeline/custom/output_check.py check",
+        env={
+            "airflow_home": "{{ var.value.airflow_home }}",
+            "dataset": "cloud_storage_geo_index",
+            "pipeline": "sentinel_2_index",
+            "BUCKET": "{{ var.value.composer_bucket }}",
+            "OBJECT": "data/cloud_storage_geo_index/sentinel_2_index/data_output.csv",
+            "TABLE": "cloud_storage_geo_index.sentinel_2_index",
+            "STATE_FILE": "{{ var.value.airflow_data_folder }}/cloud_storage_geo_index/sentinel_2_index/load_sentinel_2_index_to_bq_output_state.json",
+        },
+    )
+
     # Task to load CSV data to a BigQuery table
     load_sentinel_2_index_to_bq = gcs_to_bigquery.GCSToBigQueryOperator(
         task_id="load_sentinel_2_index_to_bq",
@@ -89,4 +107,25 @@ with DAG(
         ],
     )
 
+    # Record the fingerprint of the loaded output
+    record_load_sentinel_2_index_to_bq_output = bash.BashOperator(
+        task_id="record_load_sentinel_2_index_to_bq_output",
+        bash_command="python $airflow_home/dags/$dataset/$pipeline/custom/output_check.py record",
+        env={
+            "airflow_home": "{{ var.value.airflow_home }}",
+            "dataset": "cloud_storage_geo_index",
+            "pipeline": "sentinel_2_index",
+            "BUCKET": "{{ var.value.composer_bucket }}",
+            "OBJECT": "data/cloud_storage_geo_index/sentinel_2_index/data_output.csv",
+            "TABLE": "cloud_storage_geo_index.sentinel_2_index",
+            "STATE_FILE": "{{ var.value.airflow_data_folder }}/cloud_storage_geo_index/sentinel_2_index/load_sentinel_2_index_to_bq_output_state.json",
+        },
+    )
+
     sentinel_2_index_transform_csv >> load_sentinel_2_index_to_bq
+    [sentinel_2_index_transform_csv] >> check_load_sentinel_2_index_to_bq_output
+    (
+        check_load_sentinel_2_index_to_bq_output
+        >> load_sentinel_2_index_to_bq
+        >> record_load_sentinel_2_index_to_bq_output
+    )
@@ -21,7 +21,10 @@ import pathlib
 import typing
 from zipfile import ZipFile
 
+import csv_chunks
+import instrumentation
 import pandas as pd
+import profiler
 import requests
 from google.cloud import storage
 
@@ -40,6 +43,7 @@ PIPELINES_NAME_OUTPATIENT = [
 ]
 
 
+@profiler.profiled
 def main(
     source_url: str,
     source_file: pathlib.Path,
@@ -49,6 +53,7 @@ def main(
     headers: typing.List[str],
     rename_mappings: dict,
     pipeline_name: str,
+    chunksize: str,
 ) -> None:
 
     logging.info("Creating 'files' folder")
@@ -63,12 +68,66 @@ def main(
         with ZipFile(source_file) as zipped_files:
             file_list = zipped_files.namelist()
             csv_file = fnmatch.filter(file_list, "*.csv")
-            data = zipped_files.open(*csv_file)
-            df = pd.read_csv(data)
+            process_file(
+                lambda: zipped_files.open(*csv_file),
+                target_file,
+                headers,
+                rename_mappings,
+                pipeline_name,
+                int(chunksize),
+            )
     else:
-        df = pd.read_csv(str(source_file))
+        process_file(
+            str(source_file),
+            target_file,
+            headers,
+            rename_mappings,
+            pipeline_name,
+            int(chunksize),
+        )
 
-    logging.info(f"Transformation Process Starting.. {source_file}")
+    logging.info(
+        f"Uploading output file to.. gs://{target_gcs_bucket}/{target_gcs_path}"
+    )
+    upload_file_to_gcs(target_file, target_gcs_bucket, target_gcs_path)
+    instrumentation.upload_metrics(target_file, target_gcs_bucket, target_gcs_path)
+
+    logging.info(
+        "CMS Medicare process completed at "
+        + str(datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+    )
+
+
+def process_file(
+    source: csv_chunks.Source,
+    target_file: pathlib.Path,
+    headers: typing.List[str],
+    rename_mappings: dict,
+    pipeline_name: str,
+    chunksize: int,
+) -> None:
+    chunks = csv_chunks.read_csv([source], chunksize)
+    for chunk_number, chunk in enumerate(instrumentation.iterate("parse", chunks)):
+        logging.info(f"Processing batch {chunk_number}")
+        process_chunk(
+            chunk,
+            target_file,
+            headers,
+            rename_mappings,
+            pipeline_name,
+            append=(chunk_number > 0),
+        )
+
+
+def process_chunk(
+    df: pd.DataFrame,
+    target_file: pathlib.Path,
+    headers: typing.List[str],
+    rename_mappings: dict,
+    pipeline_name: str,
+    append: bool,
+) -> None:
+    logging.info("Transformation Process Starting..")
 
     rename_headers(df, rename_mappings)
 
@@ -78,30 +137,22 @@ def main(
 
     df = df[headers]
 
-    logging.info(f"Transformation Process complete .. {source_file}")
+    logging.info("Transformation Process complete ..")
 
     logging.info(f"Saving to output file.. {target_file}")
 
     try:
-        save_to_new_file(df, file_path=str(target_file))
+        save_to_new_file(df, file_path=str(target_file), append=append)
     except Exception as e:
         logging.error(f"Error saving output file: {e}.")
 
-    logging.info(
-        f"Uploading output file to.. gs://{target_gcs_bucket}/{target_gcs_path}"
-    )
-    upload_file_to_gcs(target_file, target_gcs_bucket, target_gcs_path)
-
-    logging.info(
-        "CMS Medicare process completed at "
-        + str(datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-    )
-
 
+@instrumentation.timed()
 def rename_headers(df: pd.DataFrame, rename_mappings: dict) -> None:
     df.rename(columns=rename_mappings, inplace=True)
 
 
+@instrumentation.timed()
 def filter_null_rows(
     df: pd.DataFrame,
     PIPELINES_NAME_INPATIENT: typing.List[str],
@@ -116,10 +167,18 @@ def filter_null_rows(
         return df
 
 
-def save_to_new_file(df: pd.DataFrame, file_path: str) -> None:
-    df.to_csv(file_path, float_format="%.0f", index=False)
+@instrumentation.timed("write")
+def save_to_new_file(df: pd.DataFrame, file_path: str, append: bool = False) -> None:
+    df.to_csv(
+        file_path,
+        float_format="%.0f",
+        index=False,
+        mode="a" if append else "w",
+        header=not append,
+    )
 
 
+@instrumentation.timed("download")
 def download_file(source_url: str, source_file: pathlib.Path) -> None:
     logging.info(f"Downloading {source_url} into {source_file}")
     r = requests.get(source_url, stream=True)
@@ -131,6 +190,7 @@ def download_file(source_url: str, source_file: pathlib.Path) -> None:
         logging.error(f"Couldn't download {source_url}: {r.text}")
 
 
+@instrumentation.timed("upload")
 def upload_file_to_gcs(file_path: pathlib.Path, gcs_bucket: str, gcs_path: str) -> None:
     storage_client = storage.Client()
     bucket = storage_client.bucket(gcs_bucket)
@@ -150,4 +210,5 @@ if __name__ == "__main__":
         headers=json.loads(os.environ["CSV_HEADERS"]),
         rename_mappings=json.loads(os.environ["RENAME_MAPPINGS"]),
         pipeline_name=os.environ["PIPELINE_NAME"],
+        chunksize=os.environ["CHUNKSIZE"],
     )
@@ -14,6 +14,7 @@
 
 
 from airflow import DAG
+from airflow.operators import bash
 from airflow.providers.cncf.kubernetes.operators import kubernetes_pod
 from airflow.providers.google.cloud.transfers import gcs_to_bigquery
 
@@ -31,8 +32,22 @@ with DAG(
     schedule_interval="@once",
     catchup=False,
     default_view="graph",
+    params={"profile": ""},
 ) as dag:
 
+    # Skip the DAG run if none of the sources changed since the last successful run
+    check_source_changes = bash.BashOperator(
+        task_id="check_source_changes",
+        bash_command="python $airflow_home/dags/$dataset/$pipeline/custom/source_check.py check",
+        env={
+            "airflow_home": "{{ var.value.airflow_home }}",
+            "dataset": "cms_medicare",
+            "pipeline": "inpatient_charges",
+            "STATE_FILE": "{{ var.value.airflow_data_folder }}/cms_medicare/inpatient_charges/source_state.json",
+            "SOURCE_URLS": '["https://www.cms.gov/Research-Statistics-Data-and-Systems/Statistics-Trends-and-Reports/Medicare-Provider-Charge-Data/Downloads/Inpatient_Data_2011_CSV.zip", "https://www.cms.gov/Research-Statistics-Data-and-Systems/Statistics-Trends-and-Reports/Medicare-Provider-Charge-Data/Downloads/Inpatient_Data_2012_CSV.zip", "https://www.cms.gov/Research-Statistics-Data-and-Systems/Statistics-Trends-and-Reports/Medicare-Provider-Charge-Data/Downloads/Inpatient_Data_2013_CSV.zip", "https://www.cms.gov/Research-Statistics-Data-and-Systems/Statistics-Trends-and-Reports/Medicare-Provider-Charge-Data/Downloads/Inpatient_Data_2014_CSV.zip", "https://www.cms.gov/Research-Statistics-Data-and-Systems/Statistics-Trends-and-Reports/Medicare-Provider-Charge-Data/Downloads/Inpatient_Data_2015_CSV.zip"]',
+        },
+    )
+
     # Run CSV transform within kubernetes pod
     inpatient_2011_transform_csv = kubernetes_pod.KubernetesPodOperator(
         task_id="inpatient_2011_transform_csv",
@@ -48,11 +63,13 @@ with DAG(
             "TARGET_FILE": "files/data_output.csv",
             "TARGET_GCS_BUCKET": "{{ var.value.composer_bucket }}",
             "TARGET_GCS_PATH": "data/cms_medicare/inpatient_charges_2011/data_output.csv",
+            "CHUNKSIZE": "100000",
             "CSV_HEADERS": '["provider_id","provider_name","provider_street_address","provider_city","provider_state","provider_zipcode","drg_definition","hospital_referral_region_description","total_discharges","average_covered_charges","average_total_payments","average_medicare_payments"]',
             "RENAME_MAPPINGS": '{"Provider Id": "provider_id","Provider Name": "provider_name","Provider Street Address": "provider_street_address","Provider City": "provider_city","Provider State": "provider_state","Provider Zip Code": "provider_zipcode","DRG Definition": "drg_definition","Hospital Referral Region (HRR) Description": "hospital_referral_region_description","Total Discharges": "total_discharges","Average Covered Charges": "average_covered_charges","Average Total Payments": "average_total_payments","Average Medicare Payments": "average_medicare_payments"}',
             "PIPELINE_NAME": "inpatient_charges_2011",
+            "PROFILE": "{{ dag_run.conf.get('profile', params.profile) if dag_run and dag_run.conf else params.profile }}",
         },
-        resources={"limit_memory": "2G", "limit_cpu": "1"},
+        resources={"limit_memory": "1G", "limit_cpu": "1"},
     )
 
     # Run CSV transform within kubernetes pod
@@ -70,11 +87,13 @@ with DAG(
             "TARGET_FILE": "files/data_output.csv",
             "TARGET_GCS_BUCKET": "{{ var.value.composer_bucket }}",
             "TARGET_GCS_PATH": "data/cms_medicare/inpatient_charges_2012/data_output.csv",
+            "CHUNKSIZE": "100000",
             "CSV_HEADERS": '["provider_id","provider_name","provider_street_address","provider_city","provider_state","provider_zipcode","drg_definition","hospital_referral_region_description","total_discharges","average_covered_charges","average_total_payments","average_medicare_payments"]',
             "RENAME_MAPPINGS": '{"Provider Id": "provider_id","Provider Name": "provider_name","Provider Street Address": "provider_street_address","Provider City": "provider_city","Provider State": "provider_state","Provider Zip Code": "provider_zipcode","DRG Definition": "drg_definition","Hospital Referral Region (HRR) Description": "hospital_referral_region_description","Total Discharges": "total_discharges","Average Covered Charges": "average_covered_charges","Average Total Payments": "average_total_payments","Average Medicare Payments": "average_medicare_payments"}',
             "PIPELINE_NAME": "inpatient_charges_2012",
+            "PROFILE": "{{ dag_run.conf.get('profile', params.profile) if dag_run and dag_run.conf else params.profile }}",
         },
-        resources={"limit_memory": "2G", "limit_cpu": "1"},
+        resources={"limit_memory": "1G", "limit_cpu": "1"},
     )
 
     # Run CSV transform within kubernetes pod
@@ -92,11 +111,13 @@ with DAG(
             "TARGET_FILE": "files/data_output.csv",
             "TARGET_GCS_BUCKET": "{{ var.value.composer_bucket }}",
             "TARGET_GCS_PATH": "data/cms_medicare/inpatient_charges_2013/data_output.csv",
+            "CHUNKSIZE": "100000",
             "CSV_HEADERS": '["provider_id","provider_name","provider_street_address","provider_city","provider_state","provider_zipcode","drg_definition","hospital_referral_region_description","total_discharges","average_covered_charges","average_total_payments","average_medicare_payments"]',
             "RENAME_MAPPINGS": '{"Provider Id": "provider_id","Provider Name": "provider_name","Provider Street Address": "provider_street_address","Provider City": "provider_city","Provider State": "provider_state","Provider Zip Code": "provider_zipcode","DRG Definition": "drg_definition","Hospital Referral Region (HRR) Description": "hospital_referral_region_description","Total Discharges": "total_discharges","Average Covered Charges": "average_covered_charges","Average Total Payments": "average_total_payments","Average Medicare Payments": "average_medicare_payments"}',
             "PIPELINE_NAME": "inpatient_charges_2013",
+            "PROFILE": "{{ dag_run.conf.get('profile', params.profile) if dag_run and dag_run.conf else params.profile }}",
         },
-        resources={"limit_memory": "2G", "limit_cpu": "1"},
+        resources={"limit_memory": "1G", "limit_cpu": "1"},
     )
 
     # Run CSV transform within kubernetes pod
@@ -114,11 +135,13 @@ with DAG(
             "TARGET_FILE": "files/data_output.csv",
             "TARGET_GCS_BUCKET": "{{ var.value.composer_bucket }}",
             "TARGET_GCS_PATH": "data/cms_medicare/inpatient_charges_2014/data_output.csv",
+            "CHUNKSIZE": "100000",
             "CSV_HEADERS": '["provider_id","provider_name","provider_street_address","provider_city","provider_state","provider_zipcode","drg_definition","hospital_referral_region_description","total_discharges","average_covered_charges","average_total_payments","average_medicare_payments"]',
             "RENAME_MAPPINGS": '{"Provider Id": "provider_id","Provider Name": "provider_name","Provider Street Address": "provider_street_address","Provider City": "provider_city","Provider State": "provider_state","Provider Zip Code": "provider_zipcode","DRG Definition": "drg_definition","Hospital Referral Region (HRR) Description": "hospital_referral_region_description","Total Discharges": "total_discharges","Average Covered Charges": "average_covered_charges","Average Total Payments": "average_total_payments","Average Medicare Payments": "average_medicare_payments"}',
             "PIPELINE_NAME": "inpatient_charges_2014",
+            "PROFILE": "{{ dag_run.conf.get('profile', params.profile) if dag_run and dag_run.conf else params.profile }}",
         },
-        resources={"limit_memory": "2G", "limit_cpu": "1"},
+        resources={"limit_memory": "1G", "limit_cpu": "1"},
     )
 
     # Run CSV transform within kubernetes pod
@@ -136,11 +159,13 @@ with DAG(
             "TARGET_FILE": "files/data_output.csv",
             "TARGET_GCS_BUCKET": "{{ var.value.composer_bucket }}",
             "TARGET_GCS_PATH": "data/cms_medicare/inpatient_charges_2015/data_output.csv",
+            "CHUNKSIZE": "100000",
             "CSV_HEADERS": '["provider_id","provider_name","provider_street_address","provider_city","provider_state","provider_zipcode","drg_definition","hospital_referral_region_description","total_discharges","average_covered_charges","average_total_payments","average_medicare_payments"]',
             "RENAME_MAPPINGS": '{"Provider Id": "provider_id","Provider Name": "provider_name","Provider Street Address": "provider_street_address","Provider City": "provider_city","Provider State": "provider_state","Provider Zip Code": "provider_zipcode","DRG Definition": "drg_definition","Hospital Referral Region (HRR) Description": "hospital_referral_region_description","Total Discharges": "total_discharges","Average Covered Charges": "average_covered_charges","Average Total Payments": "average_total_payments","Average Medicare Payments": "average_medicare_payments"}',
             "PIPELINE_NAME": "inpatient_charges_2015",
+            "PROFILE": "{{ dag_run.conf.get('profile', params.profile) if dag_run and dag_run.conf else params.profile }}",
         },
-        resources={"limit_memory": "2G", "limit_cpu": "1"},
+        resources={"limit_memory": "1G", "limit_cpu": "1"},
     )
 
     # Task to load CSV data to a BigQuery table
@@ -568,8 +593,35 @@ with DAG(
         ],
     )
 
+    # Record the state of the sources once the DAG run succeeded
+    record_source_state = bash.BashOperator(
+        task_id="record_source_state",
+        bash_command="python $airflow_home/dags/$dataset/$pipeline/custom/source_check.py record",
+        env={
+            "airflow_home": "{{ var.value.airflow_home }}",
+            "dataset": "cms_medicare",
+            "pipeline": "inpatient_charges",
+            "STATE_FILE": "{{ var.value.airflow_data_folder }}/cms_medicare/inpatient_charges/source_state.json",
+        },
+        trigger_rule="none_failed",
+    )
+
     inpatient_2011_transform_csv >> load_inpatient_2011_to_bq
     inpatient_2012_transform_csv >> load_inpatient_2012_to_bq
     inpatient_2013_transform_csv >> load_inpatient_2013_to_bq
     inpatient_2014_transform_csv >> load_inpatient_2014_to_bq
     inpatient_2015_transform_csv >> load_inpatient_2015_to_bq
+    check_source_changes >> [
+        inpatient_2011_transform_csv,
+        inpatient_2012_transform_csv,
+        inpatient_2013_transform_csv,
+        inpatient_2014_transform_csv,
+        inpatient_2015_transform_csv,
+    ]
+    [
+        load_inpatient_2011_to_bq,
+        load_inpatient_2012_to_bq,
+        load_inpatient_2013_to_bq,
+        load_inpatient_2014_to_bq,
+        load_inpatient_2015_to_bq,
+    ] >> record_source_state
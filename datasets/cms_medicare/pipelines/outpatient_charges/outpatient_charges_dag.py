@@ -14,6 +14,7 @@
 
 
 from airflow import DAG
+from airflow.operators import bash
 from airflow.providers.cncf.kubernetes.operators import kubernetes_pod
 from airflow.providers.google.cloud.transfers import gcs_to_bigquery
 
@@ -31,8 +32,22 @@ with DAG(
     schedule_interval="@once",
     catchup=False,
     default_view="graph",
+    params={"profile": ""},
 ) as dag:
 
+    # Skip the DAG run if none of the sources changed since the last successful run
+    check_source_changes = bash.BashOperator(
+        task_id="check_source_changes",
+        bash_command="python $airflow_home/dags/$dataset/$pipeline/custom/source_check.py check",
+        env={
+            "airflow_home": "{{ var.value.airflow_home }}",
+            "dataset": "cms_medicare",
+            "pipeline": "outpatient_charges",
+            "STATE_FILE": "{{ var.value.airflow_data_folder }}/cms_medicare/outpatient_charges/source_state.json",
+            "SOURCE_URLS": '["https://www.cms.gov/Research-Statistics-Data-and-Systems/Statistics-Trends-and-Reports/Medicare-Provider-Charge-Data/Downloads/Outpatient_Data_2011_CSV.zip", "https://www.cms.gov/Research-Statistics-Data-and-Systems/Statistics-Trends-and-Reports/Medicare-Provider-Charge-Data/Downloads/Outpatient_Data_2012_CSV.zip", "https://www.cms.gov/Research-Statistics-Data-and-Systems/Statistics-Trends-and-Reports/Medicare-Provider-Charge-Data/Downloads/Outpatient_Data_2013_CSV_v2.zip", "https://www.cms.gov/Research-Statistics-Data-and-Systems/Statistics-Trends-and-Reports/Medicare-Provider-Charge-Data/Downloads/Outpatient_Data_2014_CSV.zip"]',
+        },
+    )
+
     # Run CSV transform within kubernetes pod
     outpatient_2011_transform_csv = kubernetes_pod.KubernetesPodOperator(
         task_id="outpatient_2011_transform_csv",
@@ -48,9 +63,11 @@ with DAG(
             "TARGET_FILE": "files/data_output.csv",
             "TARGET_GCS_BUCKET": "{{ var.value.composer_bucket }}",
             "TARGET_GCS_PATH": "data/cms_medicare/outpatient_charges_2011/data_output.csv",
+            "CHUNKSIZE": "100000",
             "CSV_HEADERS": '["provider_id","provider_name","provider_street_address","provider_city","provider_state","provider_zipcode","apc","hospital_referral_region","outpatient_services","average_estimated_submitted_charges","average_total_payments"]',
             "RENAME_MAPPINGS": '{"Provider Id": "provider_id","Provider Name": "provider_name","Provider Street Address": "provider_street_address","Provider City": "provider_city","Provider State": "provider_state","Provider Zip Code": "provider_zipcode","APC": "apc","Hospital Referral Region (HRR) Description": "hospital_referral_region","Outpatient Services": "outpatient_services","Average  Estimated Submitted Charges": "average_estimated_submitted_charges","Average Total Payments": "average_total_payments"}',
             "PIPELINE_NAME": "outpatient_charges_2011",
+            "PROFILE": "{{ dag_run.conf.get('profile', params.profile) if dag_run and dag_run.conf else params.profile }}",
         },
     )
 
@@ -69,9 +86,11 @@ with DAG(
             "TARGET_FILE": "files/data_output.csv",
             "TARGET_GCS_BUCKET": "{{ var.value.composer_bucket }}",
             "TARGET_GCS_PATH": "data/cms_medicare/outpatient_charges_2012/data_output.csv",
+            "CHUNKSIZE": "100000",
             "CSV_HEADERS": '["provider_id","provider_name","provider_street_address","provider_city","provider_state","provider_zipcode","apc","hospital_referral_region","outpatient_services","average_estimated_submitted_charges","average_total_payments"]',
             "RENAME_MAPPINGS": '{"Provider Id": "provider_id","Provider Name": "provider_name","Provider Street Address": "provider_street_address","Provider City": "provider_city","Provider State": "provider_state","Provider Zip Code": "provider_zipcode","APC": "apc","Hospital Referral Region (HRR) Description": "hospital_referral_region","Outpatient Services": "outpatient_services","Average  Estimated Submitted Charges": "average_estimated_submitted_charges","Average Total Payments": "average_total_payments"}',
             "PIPELINE_NAME": "outpatient_charges_2012",
+            "PROFILE": "{{ dag_run.conf.get('profile', params.profile) if dag_run and dag_run.conf else params.profile }}",
         },
     )
 
@@ -90,9 +109,11 @@ with DAG(
             "TARGET_FILE": "files/data_output.csv",
             "TARGET_GCS_BUCKET": "{{ var.value.composer_bucket }}",
             "TARGET_GCS_PATH": "data/cms_medicare/outpatient_charges_2013/data_output.csv",
+            "CHUNKSIZE": "100000",
             "CSV_HEADERS": '["provider_id","provider_name","provider_street_address","provider_city","provider_state","provider_zipcode","apc","hospital_referral_region","outpatient_services","average_estimated_submitted_charges","average_total_payments"]',
             "RENAME_MAPPINGS": '{"Provider Id": "provider_id","Provider Name": "provider_name","Provider Street Address": "provider_street_address","Provider City": "provider_city","Provider State": "provider_state","Provider Zip Code": "provider_zipcode","APC": "apc","Hospital Referral Region (HRR) Description": "hospital_referral_region","Outpatient Services": "outpatient_services","Average  Estimated Submitted Charges": "average_estimated_submitted_charges","Average Total Payments": "average_total_payments"}',
             "PIPELINE_NAME": "outpatient_charges_2013",
+            "PROFILE": "{{ dag_run.conf.get('profile', params.profile) if dag_run and dag_run.conf else params.profile }}",
         },
     )
 
@@ -111,11 +132,13 @@ with DAG(
             "TARGET_FILE": "files/data_output.csv",
             "TARGET_GCS_BUCKET": "{{ var.value.composer_bucket }}",
             "TARGET_GCS_PATH": "data/cms_medicare/outpatient_charges_2014/data_output.csv",
+            "CHUNKSIZE": "100000",
             "CSV_HEADERS": '["provider_id","provider_name","provider_street_address","provider_city","provider_state","provider_zipcode","apc","hospital_referral_region","outpatient_services","average_estimated_submitted_charges","average_total_payments"]',
             "RENAME_MAPPINGS": '{"provider_id": "provider_id","provider_name": "provider_name","Provider_Street_Address": "provider_street_address","Provider_City": "provider_city","Provider_State": "provider_state","Provider_Zip_Code": "provider_zipcode","apc": "apc","Hospital_Referral_Region": "hospital_referral_region","Outpatient_Services": "outpatient_services","Average_Estimated_Submitted_Charges": "average_estimated_submitted_charges","Average_Total_Payments": "average_total_payments"}',
             "PIPELINE_NAME": "outpatient_charges_2014",
+            "PROFILE": "{{ dag_run.conf.get('profile', params.profile) if dag_run and dag_run.conf else params.profile }}",
         },
-        resources={"limit_memory": "4G", "limit_cpu": "1"},
+        resources={"limit_memory": "1G", "limit_cpu": "1"},
     )
 
     # Task to load CSV data to a BigQuery table
@@ -434,7 +457,32 @@ with DAG(
         ],
     )
 
+    # Record the state of the sources once the DAG run succeeded
+    record_source_state = bash.BashOperator(
+        task_id="record_source_state",
+        bash_command="python $airflow_home/dags/$dataset/$pipeline/custom/source_check.py record",
+        env={
+            "airflow_home": "{{ var.value.airflow_home }}",
+            "dataset": "cms_medicare",
+            "pipeline": "outpatient_charges",
+            "STATE_FILE": "{{ var.value.airflow_data_folder }}/cms_medicare/outpatient_charges/source_state.json",
+        },
+        trigger_rule="none_failed",
+    )
+
     outpatient_2011_transform_csv >> load_outpatient_2011_to_bq
     outpatient_2012_transform_csv >> load_outpatient_2012_to_bq
     outpatient_2013_transform_csv >> load_outpatient_2013_to_bq
     outpatient_2014_transform_csv >> load_outpatient_2014_to_bq
+    check_source_changes >> [
+        outpatient_2011_transform_csv,
+        outpatient_2012_transform_csv,
+        outpatient_2013_transform_csv,
+        outpatient_2014_transform_csv,
+    ]
+    [
+        load_outpatient_2011_to_bq,
+        load_outpatient_2012_to_bq,
+        load_outpatient_2013_to_bq,
+        load_outpatient_2014_to_bq,
+    ] >> record_source_state
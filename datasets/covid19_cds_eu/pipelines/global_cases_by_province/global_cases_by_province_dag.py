@@ -31,6 +31,7 @@ with DAG(
     schedule_interval="@daily",
     catchup=False,
     default_view="graph",
+    params={"profile": ""},
 ) as dag:
 
     # Run CSV transform within kubernetes pod
@@ -51,6 +52,7 @@ with DAG(
             "PIPELINE_NAME": "global_cases_by_province",
             "CSV_HEADERS": '["name","level","date","city","county","state","country","population","latitude","longitude","aggregate","tz","cases","deaths","recovered","active","tested","hospitalized","discharged","growth_factor","url","location_geom"]',
             "RENAME_MAPPINGS": '{"lat":"latitude","long":"longitude","growthFactor":"growth_factor"}',
+            "PROFILE": "{{ dag_run.conf.get('profile', params.profile) if dag_run and dag_run.conf else params.profile }}",
         },
         resources={"request_memory": "2G", "request_cpu": "1"},
     )
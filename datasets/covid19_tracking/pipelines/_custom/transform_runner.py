@@ -0,0 +1,77 @@
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Shared runner for the CSV transforms of the covid19_tracking pipelines.
+
+This file is copied into the `custom` folder of every pipeline in the dataset
+when its DAG is generated, so the custom scripts can import it directly.
+"""
+
+import concurrent.futures
+import csv
+import functools
+import itertools
+import logging
+import os
+import pathlib
+import typing
+from datetime import datetime
+
+BATCH_SIZE = 10000
+BUFFER_SIZE = 1024 * 1024
+
+# Takes the rows of the source CSV and yields the target headers, then rows
+Transform = typing.Callable[[typing.Iterator[list]], typing.Iterator[list]]
+
+
+@functools.lru_cache(maxsize=None)
+def parse_date(val: str) -> str:
+    """Converts a `YYYYMMDD` date to `YYYY-MM-DD`. Dates repeat on many rows, so
+    every distinct value is only parsed once.
+    """
+    return str(datetime.strptime(val, "%Y%m%d").date())
+
+
+def transform_csv(
+    source_path: pathlib.Path, target_path: pathlib.Path, transform: Transform
+) -> None:
+    with open(source_path, buffering=BUFFER_SIZE) as csv_source, open(
+        target_path, "w", buffering=BUFFER_SIZE
+    ) as csv_target:
+        csv_reader = csv.reader(csv_source, delimiter=",")
+        csv_writer = csv.writer(csv_target, delimiter=",")
+
+        rows = iter(transform(csv_reader))
+        csv_writer.writerow(next(rows))
+        for batch in iter(lambda: list(itertools.islice(rows, BATCH_SIZE)), []):
+            csv_writer.writerows(batch)
+
+    logging.info(f"Transformed {source_path} to {target_path}")
+
+
+def transform_csv_files(
+    source_targets: typing.List[typing.Tuple[pathlib.Path, pathlib.Path]],
+    transform: Transform,
+    num_workers: int = None,
+) -> None:
+    """Transforms every source CSV into its target CSV on a pool of processes"""
+    num_workers = min(num_workers or os.cpu_count(), len(source_targets) or 1)
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=num_workers) as executor:
+        futures = [
+            executor.submit(transform_csv, source_path, target_path, transform)
+            for source_path, target_path in source_targets
+        ]
+        for future in concurrent.futures.as_completed(futures):
+            future.result()
@@ -36,10 +36,14 @@ with DAG(
     # Task to copy full data for city-level cases and deaths from COVID-19 Tracking Project to GCS
     download_raw_csv_file = bash_operator.BashOperator(
         task_id="download_raw_csv_file",
-        bash_command="mkdir -p $airflow_data_folder/covid19_tracking/city_level_cases_and_deaths/{{ ds }}\ncurl -o $airflow_data_folder/covid19_tracking/city_level_cases_and_deaths/{{ ds }}/raw-data.csv -L $csv_source_url\n",
+        bash_command="mkdir -p $airflow_data_folder/covid19_tracking/city_level_cases_and_deaths/{{ ds }}\npython $airflow_home/dags/covid19_tracking/city_level_cases_and_deaths/custom/source_cache.py $csv_source_url $airflow_data_folder/covid19_tracking/city_level_cases_and_deaths/{{ ds }}/raw-data.csv\n",
         env={
             "csv_source_url": "https://docs.google.com/spreadsheets/d/e/2PACX-1vRg-dB5Pjt-zN38BZNoCdOk_RJ_MyYFAl3QIkK5fKSddUy44DUgJwZuhjCz8KPMpiFKRwhoIwfs0NbZ/pub?gid=0&single=true&output=csv",
             "airflow_data_folder": "{{ var.value.airflow_data_folder }}",
+            "airflow_home": "{{ var.value.airflow_home }}",
+            "CACHE_BUCKET": "{{ var.value.composer_bucket }}",
+            "CACHE_PREFIX": "data/covid19_tracking/source_cache",
+            "CACHE_WINDOW": "{{ ds }}",
         },
     )
 
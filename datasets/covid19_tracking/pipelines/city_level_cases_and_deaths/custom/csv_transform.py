@@ -13,24 +13,22 @@
 # limitations under the License.
 
 
-import csv
+import logging
 import os
 import pathlib
 import typing
-from datetime import datetime
+
+from transform_runner import parse_date, transform_csv
 
 
 def main(source_path: pathlib.Path, target_path: pathlib.Path):
-    with open(source_path) as csv_source:
-        csv_reader = csv.reader(csv_source, delimiter=",")
-        headers = parse_headers(next(csv_reader))
+    transform_csv(source_path, target_path, transform)
 
-        with open(target_path, "w") as csv_target:
-            csv_writer = csv.writer(csv_target, delimiter=",")
-            csv_writer.writerow(headers)
 
-            for row in csv_reader:
-                csv_writer.writerow(parse_row(row))
+def transform(csv_reader: typing.Iterator[list]) -> typing.Iterator[list]:
+    yield parse_headers(next(csv_reader))
+    for row in csv_reader:
+        yield parse_row(row)
 
 
 def parse_headers(raw_headers: typing.List[str]) -> typing.List[str]:
@@ -46,7 +44,7 @@ def parse_row(raw_row: list) -> list:
     row = []
     for idx, val in enumerate(raw_row):
         if idx == 0:  # index 0 is the `Date` field with format `YYYYMMDD`
-            val = str(datetime.strptime(val, "%Y%m%d").date())
+            val = parse_date(val)
 
         if idx >= 4:  # values that should be numeric start at the 4th column
             if val == "N/A" or val.startswith("<") or val.startswith("~"):
@@ -61,6 +59,8 @@ def parse_row(raw_row: list) -> list:
 
 
 if __name__ == "__main__":
+    logging.getLogger().setLevel(logging.INFO)
+
     assert os.environ["SOURCE_CSV"]
     assert os.environ["TARGET_CSV"]
     main(
@@ -36,10 +36,13 @@ with DAG(
     # Task to copy CRDT CSV file from COVID-19 Tracking Project to GCS
     download_raw_csv_file = bash_operator.BashOperator(
         task_id="download_raw_csv_file",
-        bash_command="mkdir -p $airflow_home/data/covid19_tracking/covid_racial_data_tracker\ncurl -o $airflow_home/data/covid19_tracking/covid_racial_data_tracker/raw-crdt-data-{{ ds }}.csv -L $csv_source_url\n",
+        bash_command="mkdir -p $airflow_home/data/covid19_tracking/covid_racial_data_tracker\npython $airflow_home/dags/covid19_tracking/covid_racial_data_tracker/custom/source_cache.py $csv_source_url $airflow_home/data/covid19_tracking/covid_racial_data_tracker/raw-crdt-data-{{ ds }}.csv\n",
         env={
             "csv_source_url": "https://docs.google.com/spreadsheets/d/e/2PACX-1vS8SzaERcKJOD_EzrtCDK1dX1zkoMochlA9iHoHg_RSw3V8bkpfk1mpw4pfL5RdtSOyx_oScsUtyXyk/pub?gid=43720681&single=true&output=csv",
             "airflow_home": "{{ var.value.airflow_home }}",
+            "CACHE_BUCKET": "{{ var.value.composer_bucket }}",
+            "CACHE_PREFIX": "data/covid19_tracking/source_cache",
+            "CACHE_WINDOW": "{{ ds }}",
         },
     )
 
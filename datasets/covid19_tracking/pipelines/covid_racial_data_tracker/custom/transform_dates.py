@@ -13,36 +13,35 @@
 # limitations under the License.
 
 
-import csv
+import logging
 import os
 import pathlib
-from datetime import datetime
+import typing
+
+from transform_runner import parse_date, transform_csv
 
 
 def main(source_path: pathlib.Path, target_path: pathlib.Path):
-    with open(source_path) as csv_source:
-        csv_reader = csv.reader(csv_source, delimiter=",")
-        headers = next(csv_reader)
+    transform_csv(source_path, target_path, transform)
 
-        with open(target_path, "w") as csv_target:
-            csv_writer = csv.writer(csv_target, delimiter=",")
-            csv_writer.writerow(headers)
 
-            for row in csv_reader:
-                csv_writer.writerow(parse_row(row))
+def transform(csv_reader: typing.Iterator[list]) -> typing.Iterator[list]:
+    yield next(csv_reader)
+    for row in csv_reader:
+        yield parse_row(row)
 
 
 def parse_row(raw_row: list) -> list:
-    row = []
-    for idx, val in enumerate(raw_row):
-        if idx == 0:  # index 0 is the `Date` field with format `YYYYMMDD`
-            val = str(datetime.strptime(val, "%Y%m%d").date())
+    if not raw_row:
+        return raw_row
 
-        row.append(val)
-    return row
+    # index 0 is the `Date` field with format `YYYYMMDD`
+    return [parse_date(raw_row[0]), *raw_row[1:]]
 
 
 if __name__ == "__main__":
+    logging.getLogger().setLevel(logging.INFO)
+
     assert os.environ["SOURCE_CSV"]
     assert os.environ["TARGET_CSV"]
     main(
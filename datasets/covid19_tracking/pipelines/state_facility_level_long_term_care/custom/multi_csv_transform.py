@@ -13,26 +13,26 @@
 # limitations under the License.
 
 
-import csv
+import logging
 import os
 import pathlib
 import typing
-from datetime import datetime
 
+from transform_runner import parse_date, transform_csv_files
 
-def main(working_dir: pathlib.Path):
-    for raw_csv_filename in csv_files(working_dir):
-        with open(working_dir / raw_csv_filename) as csv_source:
-            csv_reader = csv.reader(csv_source, delimiter=",")
-            headers = parse_headers(next(csv_reader))
 
-            target_filename = raw_csv_filename.replace("raw-", "")
-            with open(working_dir / target_filename, "w") as csv_target:
-                csv_writer = csv.writer(csv_target, delimiter=",")
-                csv_writer.writerow(headers)
-
-                for row in csv_reader:
-                    csv_writer.writerow(parse_row(row))
+def main(working_dir: pathlib.Path, num_workers: int = None):
+    transform_csv_files(
+        [
+            (
+                working_dir / raw_csv_filename,
+                working_dir / raw_csv_filename.replace("raw-", ""),
+            )
+            for raw_csv_filename in csv_files(working_dir)
+        ],
+        transform,
+        num_workers,
+    )
 
 
 def csv_files(dir_: pathlib.Path) -> typing.List[str]:
@@ -43,6 +43,12 @@ def csv_files(dir_: pathlib.Path) -> typing.List[str]:
     ]
 
 
+def transform(csv_reader: typing.Iterator[list]) -> typing.Iterator[list]:
+    yield parse_headers(next(csv_reader))
+    for row in csv_reader:
+        yield parse_row(row)
+
+
 def parse_headers(raw_headers: list) -> typing.List[str]:
     headers = []
     for header in raw_headers:
@@ -53,16 +59,20 @@ def parse_headers(raw_headers: list) -> typing.List[str]:
 
 
 def parse_row(raw_row: list) -> list:
-    row = []
-    for idx, val in enumerate(raw_row):
-        if idx == 0:  # index 0 is the `Date` field with format `YYYYMMDD`
-            val = str(datetime.strptime(val, "%Y%m%d").date())
-        row.append(val)
-    return row
+    if not raw_row:
+        return raw_row
+
+    # index 0 is the `Date` field with format `YYYYMMDD`
+    return [parse_date(raw_row[0]), *raw_row[1:]]
 
 
 if __name__ == "__main__":
+    logging.getLogger().setLevel(logging.INFO)
+
     assert os.environ["WORKING_DIR"]
     main(
         working_dir=pathlib.Path(os.environ["WORKING_DIR"]).expanduser(),
+        num_workers=int(os.environ["NUM_WORKERS"])
+        if os.getenv("NUM_WORKERS")
+        else None,
     )
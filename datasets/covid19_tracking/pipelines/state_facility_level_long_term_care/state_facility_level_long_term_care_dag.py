@@ -40,8 +40,11 @@ with DAG(
             "airflow_home": "{{ var.value.airflow_home }}",
             "dataset": "covid19_tracking",
             "pipeline": "state_facility_level_long_term_care",
+            "CACHE_BUCKET": "{{ var.value.composer_bucket }}",
+            "CACHE_PREFIX": "data/covid19_tracking/source_cache",
+            "CACHE_WINDOW": "{{ ds }}",
         },
-        bash_command="mkdir -p $airflow_home/data/$dataset/$pipeline\ncurl -o $airflow_home/data/$dataset/$pipeline/raw-facilities-ar.csv -L https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_ar.csv\ncurl -o $airflow_home/data/$dataset/$pipeline/raw-facilities-ga.csv https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_ga.csv\ncurl -o $airflow_home/data/$dataset/$pipeline/raw-facilities-in.csv https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_in.csv\ncurl -o $airflow_home/data/$dataset/$pipeline/raw-facilities-il.csv https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_il.csv\ncurl -o $airflow_home/data/$dataset/$pipeline/raw-facilities-ks.csv https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_ks.csv\ncurl -o $airflow_home/data/$dataset/$pipeline/raw-facilities-sc.csv https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_sc.csv\ncurl -o $airflow_home/data/$dataset/$pipeline/raw-facilities-hi.csv https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_hi.csv\ncurl -o $airflow_home/data/$dataset/$pipeline/raw-facilities-ny.csv https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_ny.csv\ncurl -o $airflow_home/data/$dataset/$pipeline/raw-facilities-ok.csv https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_ok.csv\ncurl -o $airflow_home/data/$dataset/$pipeline/raw-facilities-nm.csv https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_nm.csv\ncurl -o $airflow_home/data/$dataset/$pipeline/raw-facilities-wy.csv https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_wy.csv\ncurl -o $airflow_home/data/$dataset/$pipeline/raw-facilities-oh.csv https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_oh.csv\ncurl -o $airflow_home/data/$dataset/$pipeline/raw-facilities-md.csv https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_md.csv\ncurl -o $airflow_home/data/$dataset/$pipeline/raw-facilities-ms.csv https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_ms.csv\ncurl -o $airflow_home/data/$dataset/$pipeline/raw-facilities-co.csv https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_co.csv\ncurl -o $airflow_home/data/$dataset/$pipeline/raw-facilities-la.csv https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_la.csv\ncurl -o $airflow_home/data/$dataset/$pipeline/raw-facilities-me.csv https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_me.csv\ncurl -o $airflow_home/data/$dataset/$pipeline/raw-facilities-ar.csv https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_ar.csv\ncurl -o $airflow_home/data/$dataset/$pipeline/raw-facilities-nj.csv https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_nj.csv\ncurl -o $airflow_home/data/$dataset/$pipeline/raw-facilities-va.csv https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_va.csv\ncurl -o $airflow_home/data/$dataset/$pipeline/raw-facilities-ca.csv https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_ca.csv\ncurl -o $airflow_home/data/$dataset/$pipeline/raw-facilities-nd.csv https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_nd.csv\ncurl -o $airflow_home/data/$dataset/$pipeline/raw-facilities-ct.csv https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_ct.csv\ncurl -o $airflow_home/data/$dataset/$pipeline/raw-facilities-vt.csv https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_vt.csv\ncurl -o $airflow_home/data/$dataset/$pipeline/raw-facilities-mi.csv https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_mi.csv\ncurl -o $airflow_home/data/$dataset/$pipeline/raw-facilities-or.csv https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_or.csv\ncurl -o $airflow_home/data/$dataset/$pipeline/raw-facilities-tx.csv https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_tx.csv\ncurl -o $airflow_home/data/$dataset/$pipeline/raw-facilities-tn.csv https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_tn.csv\ncurl -o $airflow_home/data/$dataset/$pipeline/raw-facilities-mn.csv https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_mn.csv\ncurl -o $airflow_home/data/$dataset/$pipeline/raw-facilities-wv.csv https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_wv.csv\ncurl -o $airflow_home/data/$dataset/$pipeline/raw-facilities-nc.csv https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_nc.csv\ncurl -o $airflow_home/data/$dataset/$pipeline/raw-facilities-ia.csv https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_ia.csv\ncurl -o $airflow_home/data/$dataset/$pipeline/raw-facilities-fl.csv https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_fl.csv\ncurl -o $airflow_home/data/$dataset/$pipeline/raw-facilities-ri.csv https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_ri.csv\ncurl -o $airflow_home/data/$dataset/$pipeline/raw-facilities-pa.csv https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_pa.csv\ncurl -o $airflow_home/data/$dataset/$pipeline/raw-facilities-de.csv https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_de.csv\ncurl -o $airflow_home/data/$dataset/$pipeline/raw-facilities-ky.csv https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_ky.csv\ncurl -o $airflow_home/data/$dataset/$pipeline/raw-facilities-dc.csv https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_dc.csv\ncurl -o $airflow_home/data/$dataset/$pipeline/raw-facilities-id.csv https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_id.csv\n",
+        bash_command="mkdir -p $airflow_home/data/$dataset/$pipeline\npython $airflow_home/dags/$dataset/$pipeline/custom/source_cache.py \\\n  https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_ar.csv $airflow_home/data/$dataset/$pipeline/raw-facilities-ar.csv \\\n  https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_ga.csv $airflow_home/data/$dataset/$pipeline/raw-facilities-ga.csv \\\n  https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_in.csv $airflow_home/data/$dataset/$pipeline/raw-facilities-in.csv \\\n  https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_il.csv $airflow_home/data/$dataset/$pipeline/raw-facilities-il.csv \\\n  https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_ks.csv $airflow_home/data/$dataset/$pipeline/raw-facilities-ks.csv \\\n  https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_sc.csv $airflow_home/data/$dataset/$pipeline/raw-facilities-sc.csv \\\n  https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_hi.csv $airflow_home/data/$dataset/$pipeline/raw-facilities-hi.csv \\\n  https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_ny.csv $airflow_home/data/$dataset/$pipeline/raw-facilities-ny.csv \\\n  https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_ok.csv $airflow_home/data/$dataset/$pipeline/raw-facilities-ok.csv \\\n  https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_nm.csv $airflow_home/data/$dataset/$pipeline/raw-facilities-nm.csv \\\n  https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_wy.csv $airflow_home/data/$dataset/$pipeline/raw-facilities-wy.csv \\\n  https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_oh.csv $airflow_home/data/$dataset/$pipeline/raw-facilities-oh.csv \\\n  https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_md.csv $airflow_home/data/$dataset/$pipeline/raw-facilities-md.csv \\\n  https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_ms.csv $airflow_home/data/$dataset/$pipeline/raw-facilities-ms.csv \\\n  https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_co.csv $airflow_home/data/$dataset/$pipeline/raw-facilities-co.csv \\\n  https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_la.csv $airflow_home/data/$dataset/$pipeline/raw-facilities-la.csv \\\n  https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_me.csv $airflow_home/data/$dataset/$pipeline/raw-facilities-me.csv \\\n  https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_ar.csv $airflow_home/data/$dataset/$pipeline/raw-facilities-ar.csv \\\n  https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_nj.csv $airflow_home/data/$dataset/$pipeline/raw-facilities-nj.csv \\\n  https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_va.csv $airflow_home/data/$dataset/$pipeline/raw-facilities-va.csv \\\n  https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_ca.csv $airflow_home/data/$dataset/$pipeline/raw-facilities-ca.csv \\\n  https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_nd.csv $airflow_home/data/$dataset/$pipeline/raw-facilities-nd.csv \\\n  https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_ct.csv $airflow_home/data/$dataset/$pipeline/raw-facilities-ct.csv \\\n  https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_vt.csv $airflow_home/data/$dataset/$pipeline/raw-facilities-vt.csv \\\n  https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_mi.csv $airflow_home/data/$dataset/$pipeline/raw-facilities-mi.csv \\\n  https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_or.csv $airflow_home/data/$dataset/$pipeline/raw-facilities-or.csv \\\n  https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_tx.csv $airflow_home/data/$dataset/$pipeline/raw-facilities-tx.csv \\\n  https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_tn.csv $airflow_home/data/$dataset/$pipeline/raw-facilities-tn.csv \\\n  https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_mn.csv $airflow_home/data/$dataset/$pipeline/raw-facilities-mn.csv \\\n  https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_wv.csv $airflow_home/data/$dataset/$pipeline/raw-facilities-wv.csv \\\n  https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_nc.csv $airflow_home/data/$dataset/$pipeline/raw-facilities-nc.csv \\\n  https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_ia.csv $airflow_home/data/$dataset/$pipeline/raw-facilities-ia.csv \\\n  https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_fl.csv $airflow_home/data/$dataset/$pipeline/raw-facilities-fl.csv \\\n  https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_ri.csv $airflow_home/data/$dataset/$pipeline/raw-facilities-ri.csv \\\n  https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_pa.csv $airflow_home/data/$dataset/$pipeline/raw-facilities-pa.csv \\\n  https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_de.csv $airflow_home/data/$dataset/$pipeline/raw-facilities-de.csv \\\n  https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_ky.csv $airflow_home/data/$dataset/$pipeline/raw-facilities-ky.csv \\\n  https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_dc.csv $airflow_home/data/$dataset/$pipeline/raw-facilities-dc.csv \\\n  https://github.com/COVID19Tracking/long-term-care-data/raw/master/facilities_id.csv $airflow_home/data/$dataset/$pipeline/raw-facilities-id.csv\n",
     )
 
     # Run the custom/csv_transform.py script to process the raw CSV contents into a BigQuery friendly format
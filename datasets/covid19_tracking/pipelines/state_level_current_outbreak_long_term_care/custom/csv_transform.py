@@ -13,11 +13,12 @@
 # limitations under the License.
 
 
-import csv
+import logging
 import os
 import pathlib
 import typing
-from datetime import datetime
+
+from transform_runner import parse_date, transform_csv
 
 FACILITY_CATEGORY = (
     "nursing_homes",
@@ -44,22 +45,20 @@ FACILITY_COLS = (
 
 
 def main(source_path: pathlib.Path, target_path: pathlib.Path):
-    with open(source_path) as csv_source:
-        csv_reader = csv.reader(csv_source, delimiter=",")
+    transform_csv(source_path, target_path, transform)
 
-        # Skip the unnecessary first line in the raw CSV
-        next(csv_reader)
 
-        # The 2nd line contains the raw CSV headers
-        raw_headers = next(csv_reader)
-        headers, skip_col_indices = parse_headers(raw_headers)
+def transform(csv_reader: typing.Iterator[list]) -> typing.Iterator[list]:
+    # Skip the unnecessary first line in the raw CSV
+    next(csv_reader)
 
-        with open(target_path, "w") as csv_target:
-            csv_writer = csv.writer(csv_target, delimiter=",")
-            csv_writer.writerow(headers)
+    # The 2nd line contains the raw CSV headers
+    raw_headers = next(csv_reader)
+    headers, skip_col_indices = parse_headers(raw_headers)
+    yield headers
 
-            for row in csv_reader:
-                csv_writer.writerow(parse_row(row, skip_col_indices))
+    for row in csv_reader:
+        yield parse_row(row, skip_col_indices)
 
 
 def parse_headers(raw_headers: list) -> typing.Tuple[list, set]:
@@ -93,7 +92,7 @@ def parse_row(raw_row: list, skip_col_indices: set) -> list:
             continue
 
         if idx == 0:  # index 0 uses a BQ-improper date format `YYYYMMDD`
-            val = str(datetime.strptime(val, "%Y%m%d").date())
+            val = parse_date(val)
 
         if val.startswith("<") or val.startswith("~"):
             val = ""
@@ -107,6 +106,8 @@ def parse_row(raw_row: list, skip_col_indices: set) -> list:
 
 
 if __name__ == "__main__":
+    logging.getLogger().setLevel(logging.INFO)
+
     assert os.environ["SOURCE_CSV"]
     assert os.environ["TARGET_CSV"]
     main(
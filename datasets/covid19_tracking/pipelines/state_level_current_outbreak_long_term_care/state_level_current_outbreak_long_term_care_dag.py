@@ -36,10 +36,13 @@ with DAG(
     # Task to copy data from HTTP source to GCS or Airflow home dir
     download_raw_csv_file = bash_operator.BashOperator(
         task_id="download_raw_csv_file",
-        bash_command="mkdir -p $airflow_home/data/covid19_tracking/state_level_current_outbreak_long_term_care/{{ ds }}\ncurl -o $airflow_home/data/covid19_tracking/state_level_current_outbreak_long_term_care/{{ ds }}/raw-data.csv -L $csv_source_url\n",
+        bash_command="mkdir -p $airflow_home/data/covid19_tracking/state_level_current_outbreak_long_term_care/{{ ds }}\npython $airflow_home/dags/covid19_tracking/state_level_current_outbreak_long_term_care/custom/source_cache.py $csv_source_url $airflow_home/data/covid19_tracking/state_level_current_outbreak_long_term_care/{{ ds }}/raw-data.csv\n",
         env={
             "csv_source_url": "https://docs.google.com/spreadsheets/d/e/2PACX-1vRa9HnmEl83YXHfbgSPpt0fJe4SyuYLc0GuBAglF4yMYaoKSPRCyXASaWXMrTu1WEYp1oeJZIYHpj7t/pub?gid=467018747&single=true&output=csv",
             "airflow_home": "{{ var.value.airflow_home }}",
+            "CACHE_BUCKET": "{{ var.value.composer_bucket }}",
+            "CACHE_PREFIX": "data/covid19_tracking/source_cache",
+            "CACHE_WINDOW": "{{ ds }}",
         },
     )
 
@@ -13,58 +13,186 @@
 # limitations under the License.
 
 
+import collections
+import concurrent.futures
 import csv
+import logging
 import os
 import pathlib
+import random
+import threading
+import time
 import typing
-from multiprocessing.pool import ThreadPool
 
 import requests
 
-CPU_FRACTION = 0.5
-WORKER_THREADS = max(int(os.cpu_count() * CPU_FRACTION), 1)
-
-
-def download_item(source_target: typing.Tuple[str, pathlib.Path]):
-    """ThreadPool.imap_unordered accepts tuples as arguments to the callable"""
-    source_url, download_path = source_target
-    if not os.path.exists(download_path):
-        r = requests.get(source_url, stream=True)
-        if r.status_code == 200:
-            with open(download_path, "wb") as f:
-                for chunk in r:
+CHUNK_SIZE = 1024 * 1024
+HTTP_TIMEOUT = 60
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+PROGRESS_INTERVAL = 500
+
+
+class RetryableError(Exception):
+    """Raised when a download failed with a status code that's worth retrying"""
+
+    pass
+
+
+class Downloader:
+    """Downloads files on a single pool of worker threads sharing one keep-alive
+    session. At most `concurrency * 2` downloads are queued at any time, so rows
+    can be streamed from the CSV file without holding them all in memory.
+    """
+
+    def __init__(self, concurrency: int, max_retries: int):
+        self.max_retries = max_retries
+        self.session = requests.Session()
+        self.session.mount(
+            "https://",
+            requests.adapters.HTTPAdapter(
+                pool_connections=concurrency, pool_maxsize=concurrency
+            ),
+        )
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=concurrency)
+        self.slots = threading.BoundedSemaphore(concurrency * 2)
+
+        self.lock = threading.Lock()
+        self.counts = collections.Counter()
+        self.failed = []
+        self.bytes_downloaded = 0
+        self.started_at = time.monotonic()
+
+    def submit(self, source_url: str, download_path: pathlib.Path) -> None:
+        # Skip files that were downloaded by a previous run
+        if download_path.exists():
+            self._record("skipped")
+            return
+
+        self.slots.acquire()
+        future = self.executor.submit(self.download_item, source_url, download_path)
+        future.add_done_callback(
+            lambda future: self._on_done(future, source_url, download_path)
+        )
+
+    def wait(self) -> None:
+        self.executor.shutdown(wait=True)
+        self.session.close()
+        self.log_progress()
+
+        if self.failed:
+            raise RuntimeError(
+                f"Failed to download {len(self.failed)} files: {self.failed[:10]}"
+            )
+
+    def download_item(self, source_url: str, download_path: pathlib.Path) -> int:
+        for attempt in range(self.max_retries + 1):
+            try:
+                return self._download(source_url, download_path)
+            except (requests.RequestException, RetryableError) as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = random.uniform(0, min(2 ** attempt, 60))
+                logging.warning(f"Retrying {source_url} in {delay:.1f}s: {e}")
+                time.sleep(delay)
+
+    def _download(self, source_url: str, download_path: pathlib.Path) -> int:
+        with self.session.get(source_url, stream=True, timeout=HTTP_TIMEOUT) as r:
+            if r.status_code in RETRYABLE_STATUS_CODES:
+                raise RetryableError(f"HTTP {r.status_code}")
+            if r.status_code != 200:
+                logging.warning(f"Not found ({r.status_code}): {source_url}")
+                return 0
+
+            # Write to a partial file first, so an interrupted download is never
+            # mistaken for a finished one when resuming
+            partial_path = download_path.with_name(f"{download_path.name}.part")
+            size = 0
+            with open(partial_path, "wb") as f:
+                for chunk in r.iter_content(chunk_size=CHUNK_SIZE):
                     f.write(chunk)
+                    size += len(chunk)
+            partial_path.replace(download_path)
+            return size
+
+    def _on_done(
+        self,
+        future: concurrent.futures.Future,
+        source_url: str,
+        download_path: pathlib.Path,
+    ) -> None:
+        self.slots.release()
+        try:
+            size = future.result()
+        except Exception as e:
+            logging.error(f"Failed to download {source_url}: {e}")
+            with self.lock:
+                self.failed.append(source_url)
+            self._record("failed")
+            return
+
+        with self.lock:
+            self.bytes_downloaded += size
+        self._record("downloaded" if download_path.exists() else "not_found")
+
+    def _record(self, outcome: str) -> None:
+        with self.lock:
+            self.counts[outcome] += 1
+            total = sum(self.counts.values())
+        if total % PROGRESS_INTERVAL == 0:
+            self.log_progress()
+
+    def log_progress(self) -> None:
+        with self.lock:
+            counts = dict(self.counts)
+            bytes_downloaded = self.bytes_downloaded
+        elapsed = max(time.monotonic() - self.started_at, 1e-9)
+        logging.info(
+            f"Processed {sum(counts.values())} files {counts} in {elapsed:.0f}s: "
+            f"{counts.get('downloaded', 0) / elapsed:.1f} files/s, "
+            f"{bytes_downloaded / elapsed / 1024 / 1024:.2f} MiB/s"
+        )
+
+
+def main(
+    csv_path: pathlib.Path,
+    source_column: str,
+    download_prefix: str,
+    concurrency: int,
+    max_retries: int,
+):
+    download_dir = pathlib.Path(download_prefix)
+    downloader = Downloader(concurrency=concurrency, max_retries=max_retries)
 
-
-def download_parallel(source_targets: typing.List[typing.Tuple[str, pathlib.Path]]):
-    ThreadPool(WORKER_THREADS).imap_unordered(download_item, source_targets)
-
-
-def main(csv_path: pathlib.Path, source_column: str, download_prefix: str):
     with open(csv_path) as csv_file:
         csv_reader = csv.DictReader(csv_file, delimiter=",")
-        download_dir = pathlib.Path(download_prefix)
+        for source_url, download_path in source_targets(
+            csv_reader, source_column, download_dir
+        ):
+            downloader.submit(source_url, download_path)
 
-        row_num = 0
-        source_targets = []
-        for row in csv_reader:
-            # Example:
-            # https://covidtracking.com/screenshots/AL/AL-20210307-230802.png
-            source_url = row[source_column]
-            state, filename = row[source_column].split("/")[-2:]
+    downloader.wait()
 
-            (download_dir / state).mkdir(parents=True, exist_ok=True)
-            source_targets.append((source_url, download_dir / state / filename))
 
-            row_num += 1
-            if row_num % WORKER_THREADS == 0:
-                download_parallel(source_targets)
-                source_targets = []
+def source_targets(
+    rows: typing.Iterable[dict], source_column: str, download_dir: pathlib.Path
+) -> typing.Iterator[typing.Tuple[str, pathlib.Path]]:
+    created_dirs = set()
+    for row in rows:
+        # Example:
+        # https://covidtracking.com/screenshots/AL/AL-20210307-230802.png
+        source_url = row[source_column]
+        state, filename = source_url.split("/")[-2:]
+
+        if state not in created_dirs:
+            (download_dir / state).mkdir(parents=True, exist_ok=True)
+            created_dirs.add(state)
 
-        download_parallel(source_targets)
+        yield source_url, download_dir / state / filename
 
 
 if __name__ == "__main__":
+    logging.getLogger().setLevel(logging.INFO)
+
     assert os.environ["CSV_PATH"]
     assert os.environ["SOURCE_COLUMN"]
     assert os.environ["DOWNLOAD_PREFIX"]
@@ -72,4 +200,6 @@ if __name__ == "__main__":
         csv_path=pathlib.Path(os.environ["CSV_PATH"]).expanduser(),
         source_column=os.environ["SOURCE_COLUMN"],
         download_prefix=os.environ["DOWNLOAD_PREFIX"],
+        concurrency=int(os.getenv("DOWNLOAD_CONCURRENCY", 16)),
+        max_retries=int(os.getenv("MAX_RETRIES", 5)),
     )
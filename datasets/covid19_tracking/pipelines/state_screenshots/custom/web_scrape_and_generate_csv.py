@@ -13,7 +13,10 @@
 # limitations under the License.
 
 
+import concurrent.futures
 import csv
+import json
+import logging
 import os
 import pathlib
 import typing
@@ -21,6 +24,15 @@ from datetime import datetime
 
 import bs4
 import requests
+from urllib3.util.retry import Retry
+
+# Use the faster lxml parser backend when it's installed
+try:
+    import lxml  # noqa: F401
+
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
 
 CSV_HEADERS = [
     "state",
@@ -32,41 +44,125 @@ CSV_HEADERS = [
     "google_cloud_storage_uri",
 ]
 
+HTTP_TIMEOUT = 60
 
-def main(source_url: str, csv_output_path: pathlib.Path, screenshots_gcs_prefix: str):
-    response = requests.get(source_url)
 
-    if response.status_code == 200:
-        html = bs4.BeautifulSoup(response.text, "html.parser")
-    else:
-        raise requests.exceptions.HTTPError
+def main(
+    source_url: str,
+    csv_output_path: pathlib.Path,
+    screenshots_gcs_prefix: str,
+    cache_path: typing.Optional[pathlib.Path] = None,
+    concurrency: int = 8,
+    max_retries: int = 3,
+):
+    session = create_session(pool_size=concurrency, max_retries=max_retries)
 
-    csv_rows = generate_csv_data_from_html(source_url, html, screenshots_gcs_prefix)
+    response = session.get(source_url, timeout=HTTP_TIMEOUT)
+    response.raise_for_status()
+    html = bs4.BeautifulSoup(response.text, HTML_PARSER)
+
+    cache = load_cache(cache_path)
+    csv_rows = generate_csv_data_from_html(
+        source_url, html, screenshots_gcs_prefix, session, cache, concurrency
+    )
     write_to_csv(csv_rows, csv_output_path)
 
+    if cache_path:
+        save_cache(cache, cache_path)
+
+
+def create_session(pool_size: int, max_retries: int) -> requests.Session:
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=pool_size,
+        max_retries=Retry(
+            total=max_retries,
+            backoff_factor=1,
+            status_forcelist=[429, 500, 502, 503, 504],
+        ),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
 
 def generate_csv_data_from_html(
-    domain: str, html: bs4.BeautifulSoup, screenshots_gcs_prefix: str
+    domain: str,
+    html: bs4.BeautifulSoup,
+    screenshots_gcs_prefix: str,
+    session: requests.Session,
+    cache: dict,
+    concurrency: int,
 ) -> typing.List[dict]:
-    rows = []
-
     # Skip the first <a> tag because it's not a state-related link
-    for link in html.find_all("a")[1:]:
-        rows += generate_csv_rows(domain + link["href"], screenshots_gcs_prefix)
+    urls = [domain + link["href"] for link in html.find_all("a")[1:]]
+
+    rows = []
+    failed_urls = []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [
+            executor.submit(generate_csv_rows, url, session, cache.get(url))
+            for url in urls
+        ]
+        for url, future in zip(urls, futures):
+            try:
+                cache[url] = future.result()
+            except (requests.exceptions.RequestException, ValueError, KeyError) as e:
+                # Keep going with the other states, using the rows of the last
+                # successful scrape if there are any. A page whose layout
+                # changed fails to parse with a `ValueError` or `KeyError`.
+                logging.error(f"Failed to scrape {url}: {e}")
+                failed_urls.append(url)
+                if url not in cache:
+                    continue
+
+            rows += with_gcs_uris(cache[url]["rows"], screenshots_gcs_prefix)
+
+    if failed_urls:
+        logging.warning(f"Failed to scrape {len(failed_urls)} pages: {failed_urls}")
+    if len(failed_urls) == len(urls):
+        raise requests.exceptions.HTTPError(f"Failed to scrape all pages of {domain}")
 
     return rows
 
 
-def generate_csv_rows(url: str, gcs_path_prefix: str) -> typing.List[dict]:
-    response = requests.get(url)
+def generate_csv_rows(
+    url: str, session: requests.Session, cached: typing.Optional[dict] = None
+) -> dict:
+    """Scrape a state page. Returns the page validators and rows, which are used
+    to skip the page on the next run if it's unchanged.
+    """
+    headers = {}
+    if cached and cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+    if cached and cached.get("last_modified"):
+        headers["If-Modified-Since"] = cached["last_modified"]
+
+    response = session.get(url, headers=headers, timeout=HTTP_TIMEOUT)
 
-    if response.status_code == 200:
-        page = bs4.BeautifulSoup(response.text, "html.parser")
-    else:
+    if response.status_code == 304:
+        logging.info(f"Unchanged since the last run: {url}")
+        return cached
+
+    if response.status_code != 200:
         raise requests.exceptions.HTTPError(
             f"HTTP GET for {url} failed: {response.text}"
         )
 
+    # Only the table rows are parsed
+    page = bs4.BeautifulSoup(
+        response.text, HTML_PARSER, parse_only=bs4.SoupStrainer("tr")
+    )
+
+    return {
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "rows": parse_state_page(url, page),
+    }
+
+
+def parse_state_page(url: str, page: bs4.BeautifulSoup) -> typing.List[dict]:
     # Example `url`:
     # https://screenshots.covidtracking.com/alabama
     state_name = url.split("/")[-1]
@@ -88,7 +184,7 @@ def generate_csv_rows(url: str, gcs_path_prefix: str) -> typing.List[dict]:
             # Example:
             # https://covidtracking.com/screenshots/AL/AL-20200315-163235.png
             screenshot_url = link["href"]
-            *_, state, filename = screenshot_url.split("/")
+            *_, state, _ = screenshot_url.split("/")
 
             # Example: "4:22 pm"
             time_of_day = link.text
@@ -101,13 +197,33 @@ def generate_csv_rows(url: str, gcs_path_prefix: str) -> typing.List[dict]:
                     "source_type": td_source_type.text,
                     "time_of_day": time_of_day,
                     "source_url": screenshot_url,
-                    "google_cloud_storage_uri": f"{gcs_path_prefix}/{state}/{str(current_date)}/{filename}",
                 }
             )
 
     return rows
 
 
+def with_gcs_uris(rows: typing.List[dict], gcs_path_prefix: str) -> typing.List[dict]:
+    return [
+        {
+            **row,
+            "google_cloud_storage_uri": f"{gcs_path_prefix}/{row['state']}/{row['date']}/{row['source_url'].split('/')[-1]}",
+        }
+        for row in rows
+    ]
+
+
+def load_cache(cache_path: typing.Optional[pathlib.Path]) -> dict:
+    if cache_path and cache_path.exists():
+        return json.loads(cache_path.read_text())
+    return {}
+
+
+def save_cache(cache: dict, cache_path: pathlib.Path) -> None:
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    cache_path.write_text(json.dumps(cache))
+
+
 def write_to_csv(rows: typing.List[dict], output_path: pathlib.Path):
     with open(output_path, "w") as csv_file:
         csv_writer = csv.DictWriter(csv_file, fieldnames=CSV_HEADERS)
@@ -117,6 +233,8 @@ def write_to_csv(rows: typing.List[dict], output_path: pathlib.Path):
 
 
 if __name__ == "__main__":
+    logging.getLogger().setLevel(logging.INFO)
+
     assert os.environ["SOURCE_URL"]
     assert os.environ["GCS_PATH_PREFIX"]
     assert os.environ["CSV_OUTPUT_PATH"]
@@ -124,4 +242,11 @@ if __name__ == "__main__":
         source_url=os.environ["SOURCE_URL"],
         csv_output_path=pathlib.Path(os.environ["CSV_OUTPUT_PATH"]).expanduser(),
         screenshots_gcs_prefix=os.environ["GCS_PATH_PREFIX"],
+        cache_path=(
+            pathlib.Path(os.environ["CACHE_PATH"]).expanduser()
+            if os.getenv("CACHE_PATH")
+            else None
+        ),
+        concurrency=int(os.getenv("SCRAPE_CONCURRENCY", 8)),
+        max_retries=int(os.getenv("MAX_RETRIES", 3)),
     )
@@ -36,7 +36,7 @@ with DAG(
     # Run the custom/generate_csv.py script to scrape the webpage and generate a CSV file of the state screenshots
     generate_csv_data_from_web_scraping = bash_operator.BashOperator(
         task_id="generate_csv_data_from_web_scraping",
-        bash_command='mkdir -p $airflow_home/data/$dataset/$pipeline/run_date={{ ds }}\nSOURCE_URL=$source_url CSV_OUTPUT_PATH=$airflow_home/data/$dataset/$pipeline/run_date={{ ds }}/data.csv GCS_PATH_PREFIX="gs://$destination_bucket/datasets/$dataset/$pipeline/run_date={{ ds }}/screenshots" python $airflow_home/dags/$dataset/$pipeline/custom/web_scrape_and_generate_csv.py\n',
+        bash_command='mkdir -p $airflow_home/data/$dataset/$pipeline/run_date={{ ds }}\nSOURCE_URL=$source_url CSV_OUTPUT_PATH=$airflow_home/data/$dataset/$pipeline/run_date={{ ds }}/data.csv GCS_PATH_PREFIX="gs://$destination_bucket/datasets/$dataset/$pipeline/run_date={{ ds }}/screenshots" CACHE_PATH=$airflow_home/data/$dataset/$pipeline/scrape_cache.json python $airflow_home/dags/$dataset/$pipeline/custom/web_scrape_and_generate_csv.py\n',
         env={
             "airflow_home": "{{ var.value.airflow_home }}",
             "destination_bucket": "{{ var.json.covid19_tracking.destination_bucket }}",
@@ -49,7 +49,7 @@ with DAG(
     # Run the custom/download_screenshots.py script to download all the screenshots to the local file system (mounted GCS)
     download_screenshots = bash_operator.BashOperator(
         task_id="download_screenshots",
-        bash_command='CSV_PATH=$airflow_home/data/$dataset/$pipeline/run_date={{ ds }}/data.csv \\\nSOURCE_COLUMN="source_url" \\\nDOWNLOAD_PREFIX=$airflow_home/data/$dataset/$pipeline/run_date={{ ds }} \\\npython $airflow_home/dags/$dataset/$pipeline/custom/download_screenshots.py\n',
+        bash_command='CSV_PATH=$airflow_home/data/$dataset/$pipeline/run_date={{ ds }}/data.csv \\\nSOURCE_COLUMN="source_url" \\\nDOWNLOAD_PREFIX=$airflow_home/data/$dataset/$pipeline/run_date={{ ds }} \\\nDOWNLOAD_CONCURRENCY="16" \\\npython $airflow_home/dags/$dataset/$pipeline/custom/download_screenshots.py\n',
         env={
             "airflow_home": "{{ var.value.airflow_home }}",
             "dataset": "covid19_tracking",
@@ -21,11 +21,14 @@ import pathlib
 import typing
 import zipfile as zip
 
+import instrumentation
 import pandas as pd
+import profiler
 import requests
 from google.cloud import storage
 
 
+@profiler.profiled
 def main(
     source_url: str,
     start_year: int,
@@ -57,6 +60,7 @@ def main(
     process_source_file(source, target_file, data_names, data_dtypes, int(chunksize))
 
     upload_file_to_gcs(target_file, target_gcs_bucket, target_gcs_path)
+    instrumentation.upload_metrics(target_file, target_gcs_bucket, target_gcs_path)
 
     logging.info("Pipeline process completed")
 
@@ -78,6 +82,7 @@ def download_url_files_from_year_range(
             os.remove(dest_file)
 
 
+@instrumentation.timed("download")
 def download_file_http(
     source_url: str, source_file: pathlib.Path, continue_on_error: bool = False
 ) -> None:
@@ -185,7 +190,7 @@ def process_source_file(
         keep_default_na=True,
         na_values=[" "],
     ) as reader:
-        for chunk_number, chunk in enumerate(reader):
+        for chunk_number, chunk in enumerate(instrumentation.iterate("parse", reader)):
             target_file_batch = str(target_file).replace(
                 ".csv", "-" + str(chunk_number) + ".csv"
             )
@@ -205,6 +210,7 @@ def process_chunk(
     append_batch_file(target_file_batch, target_file, skip_header, not (skip_header))
 
 
+@instrumentation.timed()
 def resolve_date_format(df: pd.DataFrame, from_format: str) -> pd.DataFrame:
     logging.info("Resolving Date Format")
     for col in df.columns:
@@ -240,6 +246,7 @@ def convert_dt_format(dt_str: str, from_format: str) -> str:
     return rtnval
 
 
+@instrumentation.timed("write")
 def save_to_new_file(df, file_path, sep="|") -> None:
     logging.info(f"Saving to file {file_path} separator='{sep}'")
     df.to_csv(file_path, sep=sep, index=False)
@@ -266,6 +273,7 @@ def append_batch_file(
                 os.remove(batch_file_path)
 
 
+@instrumentation.timed("upload")
 def upload_file_to_gcs(file_path: pathlib.Path, gcs_bucket: str, gcs_path: str) -> None:
     logging.info(f"Uploading to GCS {gcs_bucket} in {gcs_path}")
     storage_client = storage.Client()
@@ -20,11 +20,14 @@ import pathlib
 import typing
 from zipfile import ZipFile
 
+import instrumentation
 import pandas as pd
+import profiler
 import requests
 from google.cloud import storage
 
 
+@profiler.profiled
 def main(
     source_url: str,
     source_file: pathlib.Path,
@@ -63,7 +66,7 @@ def main(
         chunksize=int(chunksize),  # size of batch data, in no. of records
         sep=",",  # data column separator, typically ","
     ) as reader:
-        for chunk_number, chunk in enumerate(reader):
+        for chunk_number, chunk in enumerate(instrumentation.iterate("parse", reader)):
             target_file_batch = str(target_file).replace(
                 ".csv", "-" + str(chunk_number) + ".csv"
             )
@@ -83,10 +86,12 @@ def main(
             )
 
     upload_file_to_gcs(target_file, target_gcs_bucket, target_gcs_path)
+    instrumentation.upload_metrics(target_file, target_gcs_bucket, target_gcs_path)
 
     logging.info(f"{logging_english_name} completed")
 
 
+@instrumentation.timed("download")
 def download_file(source_url: str, source_file: pathlib.Path) -> None:
     src_file = requests.get(source_url, stream=True)
     with open(source_file, "wb") as f:
@@ -111,6 +116,7 @@ def convert_json_file_to_csv(json_file: str, csv_dest_file: str):
     df.to_csv(csv_dest_file, index=False)
 
 
+@instrumentation.timed()
 def normalize_column_data(df: pd.DataFrame, flatten_column: str) -> pd.DataFrame:
     df_norm = pd.json_normalize(df[flatten_column])
     for col in df_norm.columns:
@@ -149,6 +155,7 @@ def process_chunk(
     append_batch_file(target_file_batch, target_file, skip_header, not (skip_header))
 
 
+@instrumentation.timed()
 def rename_headers(df: pd.DataFrame, header_list: dict) -> pd.DataFrame:
     logging.info("Renaming Headers")
     header_names = header_list
@@ -156,6 +163,7 @@ def rename_headers(df: pd.DataFrame, header_list: dict) -> pd.DataFrame:
     return df
 
 
+@instrumentation.timed()
 def replace_regex(df: pd.DataFrame, regex_list: dict) -> pd.DataFrame:
     for regex_item in regex_list:
         field_name = regex_item[0]
@@ -166,6 +174,7 @@ def replace_regex(df: pd.DataFrame, regex_list: dict) -> pd.DataFrame:
     return df
 
 
+@instrumentation.timed()
 def add_column(df: pd.DataFrame, new_column_list: list) -> pd.DataFrame:
     for col in new_column_list:
         logging.info(f"Adding column {col}")
@@ -173,6 +182,7 @@ def add_column(df: pd.DataFrame, new_column_list: list) -> pd.DataFrame:
     return df
 
 
+@instrumentation.timed()
 def resolve_date_format(df: pd.DataFrame, date_fields: list = []) -> pd.DataFrame:
     logging.info("Resolving Date Format")
     for dt_fld in date_fields:
@@ -211,12 +221,14 @@ def convert_dt_format(
         return datetime.datetime.strptime(dt_str, from_format).strftime(to_format)
 
 
+@instrumentation.timed()
 def reorder_headers(df: pd.DataFrame, headers_list: list) -> pd.DataFrame:
     logging.info("Reordering Headers")
     df = df[headers_list]
     return df
 
 
+@instrumentation.timed()
 def trim_whitespace(df: pd.DataFrame) -> pd.DataFrame:
     for col in df.columns:
         if df[col].dtypes == "object":
@@ -224,6 +236,7 @@ def trim_whitespace(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+@instrumentation.timed("write")
 def save_to_new_file(df: pd.DataFrame, file_path) -> None:
     df.to_csv(file_path, index=False)
 
@@ -249,6 +262,7 @@ def append_batch_file(
         os.remove(batch_file_path)
 
 
+@instrumentation.timed("upload")
 def upload_file_to_gcs(file_path: pathlib.Path, gcs_bucket: str, gcs_path: str) -> None:
     storage_client = storage.Client()
     bucket = storage_client.bucket(gcs_bucket)
@@ -14,6 +14,7 @@
 
 
 from airflow import DAG
+from airflow.operators import bash
 from airflow.providers.cncf.kubernetes.operators import kubernetes_pod
 from airflow.providers.google.cloud.transfers import gcs_to_bigquery
 
@@ -31,8 +32,22 @@ with DAG(
     schedule_interval="@daily",
     catchup=False,
     default_view="graph",
+    params={"profile": ""},
 ) as dag:
 
+    # Skip the DAG run if none of the sources changed since the last successful run
+    check_source_changes = bash.BashOperator(
+        task_id="check_source_changes",
+        bash_command="python $airflow_home/dags/$dataset/$pipeline/custom/source_check.py check",
+        env={
+            "airflow_home": "{{ var.value.airflow_home }}",
+            "dataset": "fda_drug",
+            "pipeline": "drug_enforcement",
+            "STATE_FILE": "{{ var.value.airflow_data_folder }}/fda_drug/drug_enforcement/source_state.json",
+            "SOURCE_URLS": '["https://download.open.fda.gov/drug/enforcement/drug-enforcement-0001-of-0001.json.zip"]',
+        },
+    )
+
     # Run CSV transform within kubernetes pod
     transform_csv = kubernetes_pod.KubernetesPodOperator(
         task_id="transform_csv",
@@ -55,6 +70,7 @@ with DAG(
             "NEW_COLUMN_LIST": '[\n  ["openfda_dosage_form"]\n]',
             "RENAME_HEADERS_LIST": '{\n  "classification": "classification",\n  "center_classification_date": "center_classification_date",\n  "report_date": "report_date",\n  "postal_code": "postal_code",\n  "termination_date": "termination_date",\n  "recall_initiation_date": "recall_initiation_date",\n  "recall_number": "recall_number",\n  "city": "city",\n  "more_code_info": "more_code_info",\n  "event_id": "event_id",\n  "distribution_pattern": "distribution_pattern",\n  "openfda_application_number": "openfda_application_number",\n  "openfda_brand_name": "openfda_brand_name",\n  "openfda_generic_name": "openfda_generic_name",\n  "openfda_manufacturer_name": "openfda_manufacturer_name",\n  "openfda_product_ndc": "openfda_product_ndc",\n  "openfda_product_type": "openfda_product_type",\n  "openfda_route": "openfda_route",\n  "openfda_substance_name": "openfda_substance_name",\n  "openfda_spl_id": "openfda_spl_id",\n  "openfda_spl_set_id": "openfda_spl_set_id",\n  "openfda_pharm_class_moa": "openfda_pharm_class_moa",\n  "openfda_pharm_class_cs": "openfda_pharm_class_cs",\n  "openfda_pharm_class_pe": "openfda_pharm_class_pe",\n  "openfda_pharm_class_epc": "openfda_pharm_class_epc",\n  "openfda_upc": "openfda_upc",\n  "openfda_unii": "openfda_unii",\n  "openfda_rxcui": "openfda_rxcui",\n  "recalling_firm": "recalling_firm",\n  "voluntary_mandated": "voluntary_mandated",\n  "state": "state",\n  "reason_for_recall": "reason_for_recall",\n  "initial_firm_notification": "initial_firm_notification",\n  "status": "status",\n  "product_type": "product_type",\n  "country": "country",\n  "product_description": "product_description",\n  "code_info": "code_info",\n  "address_1": "address_1",\n  "address_2": "address_2",\n  "product_quantity": "product_quantity",\n  "openfda_dosage_form": "openfda_dosage_form"\n}',
             "DATE_FORMAT_LIST": '[\n  ["center_classification_date", "%Y%m%d", "%Y-%m-%d"],\n  ["report_date", "%Y%m%d", "%Y-%m-%d"],\n  ["termination_date", "%Y%m%d", "%Y-%m-%d"],\n  ["recall_initiation_date", "%Y%m%d", "%Y-%m-%d"]\n]',
+            "PROFILE": "{{ dag_run.conf.get('profile', params.profile) if dag_run and dag_run.conf else params.profile }}",
         },
         resources={
             "request_memory": "4G",
@@ -329,4 +345,19 @@ with DAG(
         ],
     )
 
+    # Record the state of the sources once the DAG run succeeded
+    record_source_state = bash.BashOperator(
+        task_id="record_source_state",
+        bash_command="python $airflow_home/dags/$dataset/$pipeline/custom/source_check.py record",
+        env={
+            "airflow_home": "{{ var.value.airflow_home }}",
+            "dataset": "fda_drug",
+            "pipeline": "drug_enforcement",
+            "STATE_FILE": "{{ var.value.airflow_data_folder }}/fda_drug/drug_enforcement/source_state.json",
+        },
+        trigger_rule="none_failed",
+    )
+
     transform_csv >> load_to_bq
+    check_source_changes >> [transform_csv]
+    [load_to_bq] >> record_source_state
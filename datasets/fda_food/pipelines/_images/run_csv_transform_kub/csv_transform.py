@@ -20,12 +20,15 @@ import pathlib
 import typing
 import zipfile as zip
 
+import instrumentation
 import numpy as np
 import pandas as pd
+import profiler
 import requests
 from google.cloud import storage
 
 
+@profiler.profiled
 def main(
     pipeline: str,
     source_url: str,
@@ -67,6 +70,7 @@ def main(
     )
 
     upload_file_to_gcs(target_file, target_gcs_bucket, target_gcs_path)
+    instrumentation.upload_metrics(target_file, target_gcs_bucket, target_gcs_path)
 
     logging.info("Food and Drug Administration (FDA) - Food Events process completed")
 
@@ -96,7 +100,7 @@ def process_source_file(
         keep_default_na=True,
         na_values=[" "],
     ) as reader:
-        for chunk_number, chunk in enumerate(reader):
+        for chunk_number, chunk in enumerate(instrumentation.iterate("parse", reader)):
             target_file_batch = str(target_file).replace(
                 ".csv", "-" + str(chunk_number) + ".csv"
             )
@@ -168,6 +172,7 @@ def process_food_enforcement(df: pd.DataFrame, reorder_headers_list: list) -> No
     return df
 
 
+@instrumentation.timed()
 def replace_nan_data(df: pd.DataFrame) -> pd.DataFrame:
     logging.info("Replacing NaN data")
     df = df.replace(np.nan, "", regex=True)
@@ -175,6 +180,7 @@ def replace_nan_data(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+@instrumentation.timed()
 def format_list_data(df: pd.DataFrame, list_data: list) -> pd.DataFrame:
     logging.info("Formatting list data")
     for col in list_data:
@@ -185,6 +191,7 @@ def format_list_data(df: pd.DataFrame, list_data: list) -> pd.DataFrame:
     return df
 
 
+@instrumentation.timed()
 def replace_nulls(df: pd.DataFrame, col_list: list) -> pd.DataFrame:
     logging.info("Resolving null text in source data")
     for col in col_list:
@@ -193,6 +200,7 @@ def replace_nulls(df: pd.DataFrame, col_list: list) -> pd.DataFrame:
     return df
 
 
+@instrumentation.timed()
 def resolve_date_format(
     df: pd.DataFrame,
     date_col_list: list,
@@ -243,6 +251,7 @@ def convert_dt_format(
     return rtnval
 
 
+@instrumentation.timed()
 def trim_whitespace(df: pd.DataFrame) -> pd.DataFrame:
     logging.info("Trimming whitespace")
     for col in df.columns:
@@ -254,6 +263,7 @@ def trim_whitespace(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+@instrumentation.timed("write")
 def save_to_new_file(df, file_path) -> None:
     df.to_csv(file_path, index=False)
 
@@ -279,6 +289,7 @@ def append_batch_file(
         os.remove(batch_file_path)
 
 
+@instrumentation.timed("download")
 def download_file_http(
     source_url: str, source_file: pathlib.Path, continue_on_error: bool = False
 ) -> None:
@@ -304,12 +315,14 @@ def download_file_http(
             )
 
 
+@instrumentation.timed()
 def rename_headers(df: pd.DataFrame, rename_mappings: dict) -> None:
     df = df.rename(columns=rename_mappings)
 
     return df
 
 
+@instrumentation.timed()
 def reorder_headers(df: pd.DataFrame, reorder_headers_list: list) -> pd.DataFrame:
     logging.info("Re-ordering Headers")
     df = df.reindex(columns=reorder_headers_list)
@@ -360,6 +373,7 @@ def convert_json_to_csv(
     )
 
 
+@instrumentation.timed("upload")
 def upload_file_to_gcs(file_path: pathlib.Path, gcs_bucket: str, gcs_path: str) -> None:
     storage_client = storage.Client()
     bucket = storage_client.bucket(gcs_bucket)
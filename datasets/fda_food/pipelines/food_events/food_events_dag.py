@@ -14,6 +14,7 @@
 
 
 from airflow import DAG
+from airflow.operators import bash
 from airflow.providers.cncf.kubernetes.operators import kubernetes_pod
 from airflow.providers.google.cloud.transfers import gcs_to_bigquery
 
@@ -31,8 +32,22 @@ with DAG(
     schedule_interval="@daily",
     catchup=False,
     default_view="graph",
+    params={"profile": ""},
 ) as dag:
 
+    # Skip the DAG run if none of the sources changed since the last successful run
+    check_source_changes = bash.BashOperator(
+        task_id="check_source_changes",
+        bash_command="python $airflow_home/dags/$dataset/$pipeline/custom/source_check.py check",
+        env={
+            "airflow_home": "{{ var.value.airflow_home }}",
+            "dataset": "fda_food",
+            "pipeline": "food_events",
+            "STATE_FILE": "{{ var.value.airflow_data_folder }}/fda_food/food_events/source_state.json",
+            "SOURCE_URLS": '["https://download.open.fda.gov/food/event/food-event-0001-of-0001.json.zip"]',
+        },
+    )
+
     # Run CSV transform within kubernetes pod
     transform_csv = kubernetes_pod.KubernetesPodOperator(
         task_id="transform_csv",
@@ -55,6 +70,7 @@ with DAG(
             "REORDER_HEADERS": '[ "report_number", "reactions", "outcomes", "products_brand_name", "products_industry_code",\n  "products_role", "products_industry_name", "date_created", "date_started", "consumer_gender",\n  "consumer_age", "consumer_age_unit" ]',
             "RECORD_PATH": "products",
             "META": '[\n  "report_number", "outcomes", "date_created", "reactions", "date_started",\n  ["consumer", "age"], ["consumer", "age_unit"], ["consumer", "gender"]\n]',
+            "PROFILE": "{{ dag_run.conf.get('profile', params.profile) if dag_run and dag_run.conf else params.profile }}",
         },
         resources={
             "request_memory": "4G",
@@ -151,4 +167,19 @@ with DAG(
         ],
     )
 
+    # Record the state of the sources once the DAG run succeeded
+    record_source_state = bash.BashOperator(
+        task_id="record_source_state",
+        bash_command="python $airflow_home/dags/$dataset/$pipeline/custom/source_check.py record",
+        env={
+            "airflow_home": "{{ var.value.airflow_home }}",
+            "dataset": "fda_food",
+            "pipeline": "food_events",
+            "STATE_FILE": "{{ var.value.airflow_data_folder }}/fda_food/food_events/source_state.json",
+        },
+        trigger_rule="none_failed",
+    )
+
     transform_csv >> load_to_bq
+    check_source_changes >> [transform_csv]
+    [load_to_bq] >> record_source_state
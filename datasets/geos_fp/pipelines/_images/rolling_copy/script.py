@@ -13,43 +13,99 @@
 # limitations under the License.
 
 
+import collections
+import concurrent.futures
+import io
 import logging
 import os
-import pathlib
-import subprocess
+import random
+import threading
+import time
 import typing
+import uuid
 from datetime import date, timedelta
 
 import bs4
+import profiler
 import requests
+import urllib3
 from google.cloud import storage
+from google.cloud.storage.retry import DEFAULT_RETRY
 
-# The manifest file contains a list of files already downloaded for a given date
+# The manifest lists the files already stored for a given date. Every batch adds
+# a small shard under MANIFEST_DIR, and the shards are merged when read. The
+# single MANIFEST_FILE is the format written by earlier versions of this script.
 MANIFEST_FILE = "manifest.txt"
+MANIFEST_DIR = "manifest"
 
+# Temporary components left behind by gsutil's parallel composite uploads. See
+# https://cloud.google.com/storage/docs/uploads-downloads#gsutil-pcu
+PCU_COMPONENT_PREFIXES = (
+    "gsutil/tmp/parallel_composite_uploads/",
+    "/gsutil/tmp/parallel_composite_uploads/",
+)
 
+# Maximum number of calls in a single GCS batch request
+GCS_BATCH_SIZE = 100
+
+# Bytes read from the source and sent to GCS per resumable upload request. This
+# must be a multiple of 256 KiB.
+CHUNK_SIZE = 16 * 1024 * 1024
+
+# Seconds to wait for the source to connect or send the next bytes
+HTTP_TIMEOUT = 60
+
+# Storage clients are created once per transfer thread
+_thread_local = threading.local()
+
+
+@profiler.profiled
 def main(
     base_url: str,
-    dt: date,
-    download_dir: pathlib.Path,
+    dates: typing.List[date],
     target_bucket: str,
     batch_size: int,
+    concurrency: int = 4,
+    max_retries: int = 5,
 ) -> None:
-    # Get date prefix, e.g. Y2021/M01/D01, and create directories for them
-    date_prefix = _date_prefix(dt)
-    (download_dir / date_prefix).mkdir(parents=True, exist_ok=True)
+    # A single connection pool shared by all threads. Every request to the portal
+    # runs on a pool of `concurrency` threads, which is the global limit of
+    # concurrent requests sent to it.
+    session = create_session(pool_size=concurrency)
+
+    # Get date prefixes, e.g. Y2021/M01/D01, and find the files of every date
+    # that are present in the source webpage but not yet stored on GCS
+    date_prefixes = [_date_prefix(dt) for dt in dates]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency) as executor:
+        unstored_files = set().union(
+            *executor.map(
+                lambda date_prefix: get_unstored_files(
+                    base_url, date_prefix, target_bucket, session
+                ),
+                date_prefixes,
+            )
+        )
 
-    # Generate a set of all .nc4 files from the specified url and date
-    all_files = get_all_files(base_url, date_prefix)
+    download_and_store_new_files(
+        prioritize(unstored_files),
+        batch_size,
+        target_bucket,
+        base_url=base_url,
+        session=session,
+        concurrency=concurrency,
+        max_retries=max_retries,
+    )
 
-    stored_files = get_stored_files(target_bucket, date_prefix, download_dir)
+    # Files are no longer uploaded with gsutil, but earlier runs may have left
+    # parallel composite upload components behind
+    delete_temp_pcu_objects(target_bucket)
 
-    # Files present in the source webpage but not yet stored on GCS
-    unstored_files = all_files - stored_files
 
-    download_and_store_new_files(
-        download_dir, date_prefix, unstored_files, batch_size, target_bucket
-    )
+def date_range(start_date: date, end_date: date) -> typing.List[date]:
+    """All dates from `start_date` to `end_date`, inclusive"""
+    return [
+        start_date + timedelta(days=n) for n in range((end_date - start_date).days + 1)
+    ]
 
 
 def _date_prefix(dt: date) -> str:
@@ -59,10 +115,38 @@ def _date_prefix(dt: date) -> str:
     return f"Y{dt.year}/M{dt.month:0>2}/D{dt.day:0>2}"
 
 
-def get_all_files(base_url: str, date_prefix: str) -> typing.Set[str]:
+def create_session(pool_size: int) -> requests.Session:
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_unstored_files(
+    base_url: str, date_prefix: str, target_bucket: str, session: requests.Session
+) -> typing.Set[str]:
+    # Generate a set of all .nc4 files from the specified url and date
+    all_files = get_all_files(base_url, date_prefix, session)
+    stored_files = get_stored_files(target_bucket, date_prefix)
+    return all_files - stored_files
+
+
+def prioritize(file_paths: typing.Set[str]) -> typing.List[str]:
+    """Order the transfer queue by date, most recent first, then by file name"""
+    return sorted(
+        sorted(file_paths),
+        key=lambda file_path: file_path.rsplit("/", 1)[0],
+        reverse=True,
+    )
+
+
+def get_all_files(
+    base_url: str, date_prefix: str, session: requests.Session
+) -> typing.Set[str]:
     all_files = set()
     url = f"{base_url}/{date_prefix}"
-    response = requests.get(url)
+    response = session.get(url, timeout=HTTP_TIMEOUT)
     if response.status_code == 200:
         logging.info(f"Scraping .nc4 files in {url}")
         webpage = bs4.BeautifulSoup(response.text, "html.parser")
@@ -72,23 +156,50 @@ def get_all_files(base_url: str, date_prefix: str) -> typing.Set[str]:
     return all_files
 
 
-def get_stored_files(
-    bucket_name: str, date_prefix: str, download_dir: pathlib.Path
-) -> typing.Set[str]:
-    storage_client = storage.Client()
-    bucket = storage_client.bucket(bucket_name)
-    gcs_object = f"{date_prefix}/{MANIFEST_FILE}"
-    local_object = download_dir / MANIFEST_FILE
-
-    if storage.Blob(bucket=bucket, name=gcs_object).exists(storage_client):
-        logging.info(f"Manifest file found at gs://{bucket_name}/{gcs_object}")
-        blob = bucket.blob(gcs_object)
-        blob.download_to_filename(str(local_object))
-    else:
-        local_object.touch()
+def get_stored_files(bucket_name: str, date_prefix: str) -> typing.Set[str]:
+    """Files stored for the date, answered from a listing of the date prefix. Only
+    finished uploads appear in the listing, so a lost or stale manifest never
+    causes files to be downloaded again or skipped.
+    """
+    storage_client = _client()
+    stored_files = {
+        blob.name
+        for blob in storage_client.list_blobs(
+            bucket_name,
+            prefix=f"{date_prefix}/",
+            fields="items(name),nextPageToken",
+        )
+        if blob.name.endswith(".nc4")
+    }
+
+    manifest = read_manifest(bucket_name, date_prefix)
+    missing_files = manifest - stored_files
+    if missing_files:
+        logging.warning(
+            f"{len(missing_files)} files in the manifest are missing from "
+            f"gs://{bucket_name}/{date_prefix}, they will be copied again"
+        )
+    logging.info(f"Found {len(stored_files)} files stored for {date_prefix}")
+    return stored_files
+
+
+def read_manifest(bucket_name: str, date_prefix: str) -> typing.Set[str]:
+    """Merge the manifest shards of a date, including a legacy manifest file"""
+    storage_client = _client()
+    blobs = list(
+        storage_client.list_blobs(bucket_name, prefix=f"{date_prefix}/{MANIFEST_DIR}/")
+    )
+    legacy_manifest = storage_client.bucket(bucket_name).blob(
+        f"{date_prefix}/{MANIFEST_FILE}"
+    )
+    if legacy_manifest.exists():
+        blobs.append(legacy_manifest)
 
-    with open(local_object) as f:
-        return set(f.read().splitlines())
+    manifest = set()
+    for blob in blobs:
+        manifest.update(blob.download_as_bytes().decode("utf-8").splitlines())
+    manifest.discard("")
+    return manifest
 
 
 def scrape(source_path: str, webpage: bs4.BeautifulSoup) -> typing.List[str]:
@@ -106,121 +217,248 @@ def scrape(source_path: str, webpage: bs4.BeautifulSoup) -> typing.List[str]:
 
 
 def download_and_store_new_files(
-    download_dir: pathlib.Path,
-    date_prefix: str,
-    new_files: typing.Set[str],
+    new_files: typing.List[str],
     batch_size: int,
     target_bucket: str,
+    base_url: str,
+    session: requests.Session,
+    concurrency: int,
+    max_retries: int,
 ) -> None:
-    """In batches, download files from the source to the local filesystem
-    and upload them to the GCS target bucket
+    """Stream files from the source straight into the GCS target bucket, with up
+    to `concurrency` files in flight. Files are started in the order given, which
+    may span several dates. The manifest of a date is updated for every
+    `batch_size` files of that date stored.
     """
     total_files = len(new_files)
-    logging.info(f"Downloading {total_files} files.")
-    for n, batch in enumerate(batches(list(new_files), batch_size=batch_size), 1):
-        logging.info(
-            f"Processing batch {n}: {(n - 1) * batch_size + 1} to {min(total_files, n * batch_size)}"
+    logging.info(f"Transferring {total_files} files, {concurrency} at a time.")
+
+    failed_files = []
+    stored_batches = collections.defaultdict(list)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {
+            executor.submit(
+                transfer_file, session, base_url, target_bucket, file_path, max_retries
+            ): file_path
+            for file_path in new_files
+        }
+        for n, future in enumerate(concurrent.futures.as_completed(futures), 1):
+            file_path = futures[future]
+            try:
+                future.result()
+            except Exception as e:
+                logging.error(f"Failed to transfer {file_path}: {e}")
+                failed_files.append(file_path)
+                continue
+
+            logging.info(f"Stored file {n} of {total_files}: {file_path}")
+            date_prefix = file_path.rsplit("/", 1)[0]
+            stored_batches[date_prefix].append(file_path)
+            if len(stored_batches[date_prefix]) == batch_size:
+                update_manifest_file(
+                    stored_batches.pop(date_prefix), target_bucket, date_prefix
+                )
+
+    for date_prefix, stored_batch in stored_batches.items():
+        update_manifest_file(stored_batch, target_bucket, date_prefix)
+
+    if failed_files:
+        raise RuntimeError(f"Failed to transfer {len(failed_files)} files")
+
+
+def transfer_file(
+    session: requests.Session,
+    base_url: str,
+    target_bucket: str,
+    file_path: str,
+    max_retries: int,
+) -> None:
+    """Stream a single file from the source into a GCS resumable upload. Dropped
+    connections are resumed from the last byte read, other failures restart the
+    transfer with exponential backoff.
+    """
+    url = f"{base_url}/{file_path}"
+    blob = _bucket(target_bucket).blob(file_path, chunk_size=CHUNK_SIZE)
+
+    for attempt in range(max_retries + 1):
+        try:
+            source = RangeResumingReader(session, url, max_retries)
+            with source:
+                # Passing the size keeps the upload unfinished if the source fails,
+                # so a partial file never replaces the stored object
+                blob.upload_from_file(
+                    source,
+                    size=source.size,
+                    rewind=False,
+                    content_type="application/octet-stream",
+                    checksum="crc32c",
+                    retry=DEFAULT_RETRY,
+                )
+            if blob.size != source.size:
+                raise ValueError(
+                    f"Stored {blob.size} bytes of gs://{target_bucket}/{file_path}, "
+                    f"expected {source.size}"
+                )
+            return
+        except Exception as e:
+            if attempt == max_retries:
+                raise
+            delay = _backoff(attempt)
+            logging.warning(
+                f"Transfer of {file_path} failed ({e}), retrying in {delay:.1f}s"
+            )
+            time.sleep(delay)
+
+
+class RangeResumingReader(io.RawIOBase):
+    """A readable stream over an HTTP resource. When the connection drops, the
+    rest of the resource is requested again with an HTTP Range header.
+    """
+
+    def __init__(self, session: requests.Session, url: str, max_retries: int):
+        self.session = session
+        self.url = url
+        self.max_retries = max_retries
+        self.position = 0
+        self.response = self._request()
+        self.size = int(self.response.headers["Content-Length"])
+
+    def _request(self) -> requests.Response:
+        headers = {"Range": f"bytes={self.position}-"} if self.position else {}
+        response = self.session.get(
+            self.url, headers=headers, stream=True, timeout=HTTP_TIMEOUT
         )
-        download_batch(batch, download_dir)
-        move_dir_contents_to_gcs(download_dir, target_bucket, date_prefix)
-        update_manifest_file(batch, download_dir, target_bucket, date_prefix)
-
-
-def download_batch(batch: typing.List[str], download_dir: pathlib.Path) -> None:
-    for file_path in batch:
-        logging.info(f"Downloading file to {download_dir}/{file_path}")
-        subprocess.check_call(
-            [
-                "wget",
-                f"{os.environ['BASE_URL']}/{file_path}",
-                "-O",
-                f"{download_dir}/{file_path}",
-                "-nv",
-            ]
+        response.raise_for_status()
+        if self.position and response.status_code != 206:
+            response.close()
+            raise ValueError(f"{self.url} does not support range requests")
+        return response
+
+    def _resume(self, retries: int, error: Exception) -> None:
+        if retries > self.max_retries:
+            raise IOError(
+                f"Gave up reading {self.url} at byte {self.position}: {error}"
+            )
+        self.response.close()
+        delay = _backoff(retries - 1)
+        logging.info(
+            f"Connection to {self.url} dropped at byte {self.position} ({error}), "
+            f"resuming in {delay:.1f}s"
         )
+        time.sleep(delay)
+        self.response = self._request()
 
+    def readable(self) -> bool:
+        return True
 
-def move_dir_contents_to_gcs(
-    dir_: pathlib.Path, target_bucket: str, date_prefix: str
-) -> None:
-    subprocess.check_call(
-        [
-            "gsutil",
-            "-m",
-            "-o",
-            "GSUtil:parallel_composite_upload_threshold=250M",
-            "cp",
-            f"{dir_}/{date_prefix}/*.nc4",
-            f"gs://{target_bucket}/{date_prefix}",
-        ]
-    )
-    delete_temp_pcu_objects(target_bucket)
-    delete_dir_contents(dir_ / date_prefix)
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            size = self.size - self.position
 
+        chunks = []
+        remaining = min(size, self.size - self.position)
+        retries = 0
+        while remaining > 0:
+            try:
+                data = self.response.raw.read(remaining)
+                error = "connection closed early"
+            except (
+                requests.RequestException,
+                urllib3.exceptions.HTTPError,
+                OSError,
+            ) as e:
+                data, error = None, e
 
-def delete_dir_contents(dir_to_delete: pathlib.Path) -> None:
-    """Delete directory contents, but not the dir itself. This is useful for keeping
-    date dirs such as Y2021/M07/D12 intact for the next batch of files to use.
-    """
-    [f.unlink() for f in dir_to_delete.glob("*") if f.is_file()]
+            if not data:
+                retries += 1
+                self._resume(retries, error)
+                continue
+
+            chunks.append(data)
+            self.position += len(data)
+            remaining -= len(data)
+        return b"".join(chunks)
+
+    def close(self) -> None:
+        self.response.close()
+        super().close()
+
+
+def _client() -> storage.Client:
+    if not hasattr(_thread_local, "client"):
+        _thread_local.client = storage.Client()
+    return _thread_local.client
+
+
+def _bucket(bucket_name: str) -> storage.Bucket:
+    return _client().bucket(bucket_name)
+
+
+def _backoff(attempt: int, base: float = 2.0, cap: float = 60.0) -> float:
+    """Exponential backoff with full jitter"""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
 
 
 def delete_temp_pcu_objects(target_bucket: str) -> None:
     """Delete temp GCS objects created by gsutil's parallel composite uploads.
-    See https://cloud.google.com/storage/docs/uploads-downloads#gsutil-pcu
+    Only the component prefixes are listed, and the objects are deleted in batch
+    requests.
     """
-    res = subprocess.run(
-        ["gsutil", "ls", f"gs://{target_bucket}"],
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        universal_newlines=True,
-    )
-    uris = res.stdout.split()
-    for uri in uris:
-        object_name = uri.split(target_bucket + "/")[-1]
-        if not object_name.startswith("Y"):
-            subprocess.check_call(
-                ["gsutil", "rm", "-r", f"gs://{target_bucket}/{object_name}"],
+    storage_client = _client()
+    for prefix in PCU_COMPONENT_PREFIXES:
+        blobs = list(
+            storage_client.list_blobs(
+                target_bucket, prefix=prefix, fields="items(name),nextPageToken"
             )
+        )
+        for i in range(0, len(blobs), GCS_BATCH_SIZE):
+            logging.info(
+                f"Deleting {len(blobs[i : i + GCS_BATCH_SIZE])} temp objects "
+                f"under gs://{target_bucket}/{prefix}"
+            )
+            with storage_client.batch():
+                for blob in blobs[i : i + GCS_BATCH_SIZE]:
+                    blob.delete()
 
 
 def update_manifest_file(
     paths: typing.List[str],
-    download_dir: pathlib.Path,
     target_bucket: str,
     date_prefix: str,
 ) -> None:
-    manifest_path = download_dir / MANIFEST_FILE
-    with open(manifest_path, "a") as f:
-        f.write("\n".join(paths))
-        f.write("\n")
-    subprocess.check_call(
-        [
-            "gsutil",
-            "cp",
-            str(manifest_path),
-            f"gs://{target_bucket}/{date_prefix}/{MANIFEST_FILE}",
-        ]
+    """Record a batch of stored files in a new manifest shard. The shards are
+    written once and never rewritten, so the cost of an update doesn't grow with
+    the number of files already stored.
+    """
+    timestamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime())
+    shard = f"{date_prefix}/{MANIFEST_DIR}/{timestamp}-{uuid.uuid4().hex[:8]}.txt"
+    _bucket(target_bucket).blob(shard).upload_from_string(
+        "\n".join(paths) + "\n", content_type="text/plain"
     )
 
 
-def batches(file_paths: typing.List[str], batch_size: int):
-    for i in range(0, len(file_paths), batch_size):
-        yield file_paths[i : i + batch_size]
-
-
 if __name__ == "__main__":
     logging.getLogger().setLevel(logging.INFO)
 
     assert os.environ["BASE_URL"]
-    assert os.environ["TODAY_DIFF"]
-    assert os.environ["DOWNLOAD_DIR"]
     assert os.environ["TARGET_BUCKET"]
 
+    # Backfill a range of dates when START_DATE and END_DATE (YYYY-MM-DD,
+    # inclusive) are set, otherwise copy the single date TODAY_DIFF days ago
+    if os.getenv("START_DATE") and os.getenv("END_DATE"):
+        dates = date_range(
+            date.fromisoformat(os.environ["START_DATE"]),
+            date.fromisoformat(os.environ["END_DATE"]),
+        )
+    else:
+        assert os.environ["TODAY_DIFF"]
+        dates = [date.today() - timedelta(days=int(os.environ["TODAY_DIFF"]))]
+
     main(
         base_url=os.environ["BASE_URL"],
-        dt=(date.today() - timedelta(days=int(os.environ["TODAY_DIFF"]))),
-        download_dir=pathlib.Path(os.environ["DOWNLOAD_DIR"]).expanduser(),
+        dates=dates,
         target_bucket=os.environ["TARGET_BUCKET"],
         batch_size=int(os.getenv("BATCH_SIZE", 10)),
+        concurrency=int(os.getenv("CONCURRENCY", 4)),
+        max_retries=int(os.getenv("MAX_RETRIES", 5)),
     )
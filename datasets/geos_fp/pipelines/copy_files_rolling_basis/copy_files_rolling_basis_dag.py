@@ -30,6 +30,7 @@ with DAG(
     schedule_interval="0 2 * * *",
     catchup=False,
     default_view="graph",
+    params={"profile": ""},
 ) as dag:
     create_cluster = kubernetes_engine.GKECreateClusterOperator(
         task_id="create_cluster",
@@ -37,10 +38,10 @@ with DAG(
         location="us-central1-c",
         body={
             "name": "geos-fp--copy-files-rolling-basis",
-            "initial_node_count": 8,
+            "initial_node_count": 1,
             "network": "{{ var.value.vpc_network }}",
             "node_config": {
-                "machine_type": "e2-small",
+                "machine_type": "e2-standard-2",
                 "oauth_scopes": [
                     "https://www.googleapis.com/auth/devstorage.read_write",
                     "https://www.googleapis.com/auth/cloud-platform",
@@ -49,9 +50,9 @@ with DAG(
         },
     )
 
-    # Copy files to GCS on the specified date
-    copy_files_dated_today = kubernetes_engine.GKEStartPodOperator(
-        task_id="copy_files_dated_today",
+    # Copy files to GCS for the last 8 days, newest first
+    copy_files_in_last_n_days = kubernetes_engine.GKEStartPodOperator(
+        task_id="copy_files_in_last_n_days",
         name="geosfp",
         project_id="{{ var.value.gcp_project }}",
         location="us-central1-c",
@@ -61,178 +62,14 @@ with DAG(
         image_pull_policy="Always",
         env_vars={
             "BASE_URL": "https://portal.nccs.nasa.gov/datashare/gmao/geos-fp/das",
-            "TODAY_DIFF": "0",
-            "DOWNLOAD_DIR": "/geos_fp/data",
+            "START_DATE": "{{ macros.ds_add(ds, -6) }}",
+            "END_DATE": "{{ macros.ds_add(ds, 1) }}",
             "TARGET_BUCKET": "{{ var.json.geos_fp.destination_bucket }}",
             "BATCH_SIZE": "10",
+            "CONCURRENCY": "8",
+            "PROFILE": "{{ dag_run.conf.get('profile', params.profile) if dag_run and dag_run.conf else params.profile }}",
         },
-        retries=3,
-        retry_delay=300,
-        retry_exponential_backoff=True,
-        startup_timeout_seconds=600,
-    )
-
-    # Copy files to GCS on the specified date
-    copy_files_dated_today_minus_1_day = kubernetes_engine.GKEStartPodOperator(
-        task_id="copy_files_dated_today_minus_1_day",
-        name="geosfp",
-        project_id="{{ var.value.gcp_project }}",
-        location="us-central1-c",
-        cluster_name="geos-fp--copy-files-rolling-basis",
-        namespace="default",
-        image="{{ var.json.geos_fp.container_registry.rolling_copy }}",
-        image_pull_policy="Always",
-        env_vars={
-            "BASE_URL": "https://portal.nccs.nasa.gov/datashare/gmao/geos-fp/das",
-            "TODAY_DIFF": "1",
-            "DOWNLOAD_DIR": "/geos_fp/data",
-            "TARGET_BUCKET": "{{ var.json.geos_fp.destination_bucket }}",
-            "BATCH_SIZE": "10",
-        },
-        retries=3,
-        retry_delay=300,
-        retry_exponential_backoff=True,
-        startup_timeout_seconds=600,
-    )
-
-    # Copy files to GCS on the specified date
-    copy_files_dated_today_minus_2_days = kubernetes_engine.GKEStartPodOperator(
-        task_id="copy_files_dated_today_minus_2_days",
-        name="geosfp",
-        project_id="{{ var.value.gcp_project }}",
-        location="us-central1-c",
-        cluster_name="geos-fp--copy-files-rolling-basis",
-        namespace="default",
-        image="{{ var.json.geos_fp.container_registry.rolling_copy }}",
-        image_pull_policy="Always",
-        env_vars={
-            "BASE_URL": "https://portal.nccs.nasa.gov/datashare/gmao/geos-fp/das",
-            "TODAY_DIFF": "2",
-            "DOWNLOAD_DIR": "/geos_fp/data",
-            "TARGET_BUCKET": "{{ var.json.geos_fp.destination_bucket }}",
-            "BATCH_SIZE": "10",
-        },
-        resources={"request_memory": "1G", "request_cpu": "1"},
-        retries=3,
-        retry_delay=300,
-        retry_exponential_backoff=True,
-        startup_timeout_seconds=600,
-    )
-
-    # Copy files to GCS on a 10-day rolling basis
-    copy_files_dated_today_minus_3_days = kubernetes_engine.GKEStartPodOperator(
-        task_id="copy_files_dated_today_minus_3_days",
-        name="geosfp",
-        project_id="{{ var.value.gcp_project }}",
-        location="us-central1-c",
-        cluster_name="geos-fp--copy-files-rolling-basis",
-        namespace="default",
-        image="{{ var.json.geos_fp.container_registry.rolling_copy }}",
-        image_pull_policy="Always",
-        env_vars={
-            "BASE_URL": "https://portal.nccs.nasa.gov/datashare/gmao/geos-fp/das",
-            "TODAY_DIFF": "3",
-            "DOWNLOAD_DIR": "/geos_fp/data",
-            "TARGET_BUCKET": "{{ var.json.geos_fp.destination_bucket }}",
-            "BATCH_SIZE": "10",
-        },
-        resources={"request_memory": "1G", "request_cpu": "1"},
-        retries=3,
-        retry_delay=300,
-        retry_exponential_backoff=True,
-        startup_timeout_seconds=600,
-    )
-
-    # Copy files to GCS on a 10-day rolling basis
-    copy_files_dated_today_minus_4_days = kubernetes_engine.GKEStartPodOperator(
-        task_id="copy_files_dated_today_minus_4_days",
-        name="geosfp",
-        project_id="{{ var.value.gcp_project }}",
-        location="us-central1-c",
-        cluster_name="geos-fp--copy-files-rolling-basis",
-        namespace="default",
-        image="{{ var.json.geos_fp.container_registry.rolling_copy }}",
-        image_pull_policy="Always",
-        env_vars={
-            "BASE_URL": "https://portal.nccs.nasa.gov/datashare/gmao/geos-fp/das",
-            "TODAY_DIFF": "4",
-            "DOWNLOAD_DIR": "/geos_fp/data",
-            "TARGET_BUCKET": "{{ var.json.geos_fp.destination_bucket }}",
-            "BATCH_SIZE": "10",
-        },
-        resources={"request_memory": "1G", "request_cpu": "1"},
-        retries=3,
-        retry_delay=300,
-        retry_exponential_backoff=True,
-        startup_timeout_seconds=600,
-    )
-
-    # Copy files to GCS on a 10-day rolling basis
-    copy_files_dated_today_minus_5_days = kubernetes_engine.GKEStartPodOperator(
-        task_id="copy_files_dated_today_minus_5_days",
-        name="geosfp",
-        project_id="{{ var.value.gcp_project }}",
-        location="us-central1-c",
-        cluster_name="geos-fp--copy-files-rolling-basis",
-        namespace="default",
-        image="{{ var.json.geos_fp.container_registry.rolling_copy }}",
-        image_pull_policy="Always",
-        env_vars={
-            "BASE_URL": "https://portal.nccs.nasa.gov/datashare/gmao/geos-fp/das",
-            "TODAY_DIFF": "5",
-            "DOWNLOAD_DIR": "/geos_fp/data",
-            "TARGET_BUCKET": "{{ var.json.geos_fp.destination_bucket }}",
-            "BATCH_SIZE": "10",
-        },
-        resources={"request_memory": "1G", "request_cpu": "1"},
-        retries=3,
-        retry_delay=300,
-        retry_exponential_backoff=True,
-        startup_timeout_seconds=600,
-    )
-
-    # Copy files to GCS on a 10-day rolling basis
-    copy_files_dated_today_minus_6_days = kubernetes_engine.GKEStartPodOperator(
-        task_id="copy_files_dated_today_minus_6_days",
-        name="geosfp",
-        project_id="{{ var.value.gcp_project }}",
-        location="us-central1-c",
-        cluster_name="geos-fp--copy-files-rolling-basis",
-        namespace="default",
-        image="{{ var.json.geos_fp.container_registry.rolling_copy }}",
-        image_pull_policy="Always",
-        env_vars={
-            "BASE_URL": "https://portal.nccs.nasa.gov/datashare/gmao/geos-fp/das",
-            "TODAY_DIFF": "6",
-            "DOWNLOAD_DIR": "/geos_fp/data",
-            "TARGET_BUCKET": "{{ var.json.geos_fp.destination_bucket }}",
-            "BATCH_SIZE": "10",
-        },
-        resources={"request_memory": "1G", "request_cpu": "1"},
-        retries=3,
-        retry_delay=300,
-        retry_exponential_backoff=True,
-        startup_timeout_seconds=600,
-    )
-
-    # Copy files to GCS on a 10-day rolling basis
-    copy_files_dated_today_minus_7_days = kubernetes_engine.GKEStartPodOperator(
-        task_id="copy_files_dated_today_minus_7_days",
-        name="geosfp",
-        project_id="{{ var.value.gcp_project }}",
-        location="us-central1-c",
-        cluster_name="geos-fp--copy-files-rolling-basis",
-        namespace="default",
-        image="{{ var.json.geos_fp.container_registry.rolling_copy }}",
-        image_pull_policy="Always",
-        env_vars={
-            "BASE_URL": "https://portal.nccs.nasa.gov/datashare/gmao/geos-fp/das",
-            "TODAY_DIFF": "7",
-            "DOWNLOAD_DIR": "/geos_fp/data",
-            "TARGET_BUCKET": "{{ var.json.geos_fp.destination_bucket }}",
-            "BATCH_SIZE": "10",
-        },
-        resources={"request_memory": "1G", "request_cpu": "1"},
+        resources={"request_memory": "2G", "request_cpu": "1"},
         retries=3,
         retry_delay=300,
         retry_exponential_backoff=True,
@@ -253,11 +90,4 @@ with DAG(
     )
 
     delete_old_data
-    create_cluster >> copy_files_dated_today >> delete_cluster
-    create_cluster >> copy_files_dated_today_minus_1_day >> delete_cluster
-    create_cluster >> copy_files_dated_today_minus_2_days >> delete_cluster
-    create_cluster >> copy_files_dated_today_minus_3_days >> delete_cluster
-    create_cluster >> copy_files_dated_today_minus_4_days >> delete_cluster
-    create_cluster >> copy_files_dated_today_minus_5_days >> delete_cluster
-    create_cluster >> copy_files_dated_today_minus_6_days >> delete_cluster
-    create_cluster >> copy_files_dated_today_minus_7_days >> delete_cluster
+    create_cluster >> copy_files_in_last_n_days >> delete_cluster
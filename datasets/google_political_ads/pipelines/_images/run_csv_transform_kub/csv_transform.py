@@ -13,8 +13,10 @@
 # limitations under the License.
 
 
+import concurrent.futures
 import datetime
 import fnmatch
+import functools
 import json
 import logging
 import math
@@ -23,25 +25,27 @@ import pathlib
 import typing
 from zipfile import ZipFile
 
+import csv_chunks
+import instrumentation
 import pandas as pd
+import profiler
 import requests
 from google.cloud import storage
 
 
+@profiler.profiled
 def main(
     source_url: str,
     source_file: pathlib.Path,
-    source_csv_name: str,
-    target_file: pathlib.Path,
     target_gcs_bucket: str,
-    target_gcs_path: str,
-    headers: typing.List[str],
-    rename_mappings: dict,
-    pipeline_name: str,
+    target_gcs_prefix: str,
+    tables: typing.Dict[str, dict],
+    chunksize: str,
+    num_workers: int = None,
 ) -> None:
 
     logging.info(
-        f"google political ads {pipeline_name} process started at "
+        "google political ads process started at "
         + str(datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
     )
 
@@ -51,56 +55,84 @@ def main(
     logging.info(f"Downloading file {source_url}")
     download_file(source_url, source_file)
 
-    logging.info(f"Opening file {source_file}")
-    df = read_csv_file(source_file, source_csv_name)
-
-    logging.info(f"Transforming.. {source_file}")
-
-    logging.info(f"Transform: Rename columns for {pipeline_name}..")
-    rename_headers(df, rename_mappings)
-
-    if pipeline_name == "creative_stats":
-        logging.info(f"Transform: converting to integer for {pipeline_name}..")
-        df["spend_range_max_usd"] = df["spend_range_max_usd"].apply(convert_to_int)
-        df["spend_range_max_eur"] = df["spend_range_max_eur"].apply(convert_to_int)
-        df["spend_range_max_inr"] = df["spend_range_max_inr"].apply(convert_to_int)
-        df["spend_range_max_bgn"] = df["spend_range_max_bgn"].apply(convert_to_int)
-        df["spend_range_max_hrk"] = df["spend_range_max_hrk"].apply(convert_to_int)
-        df["spend_range_max_czk"] = df["spend_range_max_czk"].apply(convert_to_int)
-        df["spend_range_max_dkk"] = df["spend_range_max_dkk"].apply(convert_to_int)
-        df["spend_range_max_huf"] = df["spend_range_max_huf"].apply(convert_to_int)
-        df["spend_range_max_pln"] = df["spend_range_max_pln"].apply(convert_to_int)
-        df["spend_range_max_ron"] = df["spend_range_max_ron"].apply(convert_to_int)
-        df["spend_range_max_gbp"] = df["spend_range_max_gbp"].apply(convert_to_int)
-        df["spend_range_max_sek"] = df["spend_range_max_sek"].apply(convert_to_int)
-        df["spend_range_max_nzd"] = df["spend_range_max_nzd"].apply(convert_to_int)
-    else:
-        df = df
+    # Every table is read from its own member(s) of the same bundle, so they are
+    # transformed and uploaded in parallel from the single download
+    num_workers = min(num_workers or os.cpu_count(), len(tables))
+    failed = []
+    with concurrent.futures.ProcessPoolExecutor(max_workers=num_workers) as executor:
+        futures = {
+            executor.submit(
+                process_table,
+                source_file,
+                pathlib.Path(f"./files/{table_name}.csv"),
+                target_gcs_bucket,
+                f"{target_gcs_prefix}/{table_name}/data_output.csv",
+                spec,
+                int(chunksize),
+            ): table_name
+            for table_name, spec in tables.items()
+        }
+        for future in concurrent.futures.as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                logging.error(f"Error processing table {futures[future]}: {e}")
+                failed.append(futures[future])
+
+    if failed:
+        raise RuntimeError(f"Failed to process tables: {sorted(failed)}")
 
-    logging.info(f"Transform: Reordering headers for {pipeline_name}.. ")
-    df = df[headers]
+    logging.info(
+        "Google Political Ads process completed at "
+        + str(datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+    )
+
+
+def process_table(
+    source_file: pathlib.Path,
+    target_file: pathlib.Path,
+    target_gcs_bucket: str,
+    target_gcs_path: str,
+    spec: dict,
+    chunksize: int,
+) -> None:
+    logging.info(f"Opening file {source_file} for {spec['file_name']}")
+    with ZipFile(source_file) as zipfiles:
+        csv_files = fnmatch.filter(zipfiles.namelist(), spec["file_name"])
+        if not csv_files:
+            raise FileNotFoundError(f"No files match {spec['file_name']}")
 
-    logging.info(f"Saving to output file.. {target_file}")
-    try:
-        save_to_new_file(df, file_path=str(target_file))
-    except Exception as e:
-        logging.error(f"Error saving output file: {e}.")
+        chunks = csv_chunks.read_csv(
+            [functools.partial(zipfiles.open, file_name) for file_name in csv_files],
+            chunksize,
+        )
+        for chunk_number, chunk in enumerate(instrumentation.iterate("parse", chunks)):
+            process_chunk(chunk, target_file, spec, append=(chunk_number > 0))
 
     logging.info(
         f"Uploading output file to.. gs://{target_gcs_bucket}/{target_gcs_path}"
     )
     upload_file_to_gcs(target_file, target_gcs_bucket, target_gcs_path)
+    instrumentation.upload_metrics(target_file, target_gcs_bucket, target_gcs_path)
 
-    logging.info(
-        f"Google Political Ads {pipeline_name} process completed at "
-        + str(datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-    )
+
+def process_chunk(
+    df: pd.DataFrame, target_file: pathlib.Path, spec: dict, append: bool
+) -> None:
+    rename_headers(df, spec["rename_mappings"])
+    # A member of the bundle can lack some of the columns, which are left empty
+    df = df.reindex(columns=spec["csv_headers"])
+    for column in spec.get("integer_columns", []):
+        df[column] = df[column].apply(convert_to_int)
+    save_to_new_file(df, file_path=str(target_file), append=append)
 
 
-def save_to_new_file(df: pd.DataFrame, file_path: str) -> None:
-    df.to_csv(file_path, index=False)
+@instrumentation.timed("write")
+def save_to_new_file(df: pd.DataFrame, file_path: str, append: bool = False) -> None:
+    df.to_csv(file_path, index=False, mode="a" if append else "w", header=not append)
 
 
+@instrumentation.timed("upload")
 def upload_file_to_gcs(file_path: pathlib.Path, gcs_bucket: str, gcs_path: str) -> None:
     storage_client = storage.Client()
     bucket = storage_client.bucket(gcs_bucket)
@@ -108,6 +140,7 @@ def upload_file_to_gcs(file_path: pathlib.Path, gcs_bucket: str, gcs_path: str)
     blob.upload_from_filename(file_path)
 
 
+@instrumentation.timed("download")
 def download_file(source_url: str, source_file: pathlib.Path) -> None:
     logging.info(f"Downloading {source_url} into {source_file}")
     r = requests.get(source_url, stream=True)
@@ -119,15 +152,7 @@ def download_file(source_url: str, source_file: pathlib.Path) -> None:
         logging.error(f"Couldn't download {source_url}: {r.text}")
 
 
-def read_csv_file(source_file: pathlib.Path, source_csv_name: str) -> pd.DataFrame:
-    with ZipFile(source_file) as zipfiles:
-        file_list = zipfiles.namelist()
-        csv_files = fnmatch.filter(file_list, source_csv_name)
-        data = [pd.read_csv(zipfiles.open(file_name)) for file_name in csv_files]
-    df = pd.concat(data)
-    return df
-
-
+@instrumentation.timed()
 def rename_headers(df: pd.DataFrame, rename_mappings: dict) -> None:
     df.rename(columns=rename_mappings, inplace=True)
 
@@ -147,11 +172,11 @@ if __name__ == "__main__":
     main(
         source_url=os.environ["SOURCE_URL"],
         source_file=pathlib.Path(os.environ["SOURCE_FILE"]).expanduser(),
-        source_csv_name=os.environ["FILE_NAME"],
-        target_file=pathlib.Path(os.environ["TARGET_FILE"]).expanduser(),
         target_gcs_bucket=os.environ["TARGET_GCS_BUCKET"],
-        target_gcs_path=os.environ["TARGET_GCS_PATH"],
-        headers=json.loads(os.environ["CSV_HEADERS"]),
-        rename_mappings=json.loads(os.environ["RENAME_MAPPINGS"]),
-        pipeline_name=os.environ["PIPELINE_NAME"],
+        target_gcs_prefix=os.environ["TARGET_GCS_PREFIX"],
+        tables=json.loads(os.environ["TABLES"]),
+        chunksize=os.environ["CHUNKSIZE"],
+        num_workers=int(os.environ["NUM_WORKERS"])
+        if os.getenv("NUM_WORKERS")
+        else None,
     )
@@ -12,18 +12,33 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import concurrent.futures
+import itertools
 import json
 import logging
 import operator
 import os
+import random
 import time
 import typing
 
+import profiler
 from google.api_core.exceptions import ResourceExhausted
 from google.cloud import bigquery_datatransfer_v1
 from google.protobuf.timestamp_pb2 import Timestamp
 
-RETRY_DELAY = 10
+# Polling starts at MIN_POLL_DELAY seconds and backs off exponentially, with
+# jitter, up to MAX_POLL_DELAY seconds between polls
+MIN_POLL_DELAY = 5
+MAX_POLL_DELAY = 60
+
+# Only the most recent runs of a config are fetched when looking for its latest run
+RUNS_PAGE_SIZE = 5
+
+TERMINAL_ERROR_STATES = (
+    bigquery_datatransfer_v1.TransferState.FAILED,
+    bigquery_datatransfer_v1.TransferState.CANCELLED,
+)
 
 
 class TimeoutError(Exception):
@@ -32,6 +47,13 @@ class TimeoutError(Exception):
     pass
 
 
+class TransferFailedError(Exception):
+    """Raised when a BQ transfer job ends in a failed or cancelled state"""
+
+    pass
+
+
+@profiler.profiled
 def main(
     source_project_id: str,
     target_project_id: str,
@@ -88,32 +110,74 @@ def wait_for_completion(
     running_configs: typing.List[bigquery_datatransfer_v1.types.TransferConfig],
     timeout: int,
 ) -> None:
-    _start = int(time.time())
+    _start = time.monotonic()
+    pending = {config.name: config for config in running_configs}
+    delay = MIN_POLL_DELAY
+
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=max(len(pending), 1)
+    ) as executor:
+        while pending:
+            latest_runs = dict(
+                zip(
+                    pending,
+                    executor.map(
+                        lambda config: latest_transfer_run(client, config),
+                        pending.values(),
+                    ),
+                )
+            )
 
-    while True:
-        latest_runs = []
-        for config in running_configs:
-            latest_runs.append(latest_transfer_run(client, config))
+            for name, run in latest_runs.items():
+                config = pending[name]
+                logging.info(f"{config.display_name}: {run.state.name}")
 
-        logging.info(f"States: {[str(run.state) for run in latest_runs]}")
+                # Stop the process as soon as any run has failed
+                if run.state in TERMINAL_ERROR_STATES:
+                    raise TransferFailedError(
+                        f"Transfer run {run.name} for config ({config.display_name}) "
+                        f"ended in state {run.state.name}: {run.error_status.message}"
+                    )
 
-        # Mark as complete when all runs have succeeded
-        if all([str(run.state) == "TransferState.SUCCEEDED" for run in latest_runs]):
-            return
+                if run.state == bigquery_datatransfer_v1.TransferState.SUCCEEDED:
+                    del pending[name]
 
-        # Stop the process when it's longer than the allotted time
-        if int(time.time()) - _start > timeout:
-            raise TimeoutError
+            completed = len(running_configs) - len(pending)
+            logging.info(f"{completed} of {len(running_configs)} transfers completed.")
 
-        time.sleep(RETRY_DELAY)
+            # Mark as complete when all runs have succeeded
+            if not pending:
+                return
+
+            # Stop the process when it's longer than the allotted time
+            remaining = timeout - (time.monotonic() - _start)
+            if remaining <= 0:
+                raise TimeoutError(
+                    f"Transfers still running after {timeout}s: "
+                    f"{[config.display_name for config in pending.values()]}"
+                )
+
+            time.sleep(min(random.uniform(delay / 2, delay), remaining))
+            delay = min(delay * 2, MAX_POLL_DELAY)
 
 
 def latest_transfer_run(
     client: bigquery_datatransfer_v1.DataTransferServiceClient,
     config: bigquery_datatransfer_v1.types.TransferConfig,
 ) -> bigquery_datatransfer_v1.types.TransferRun:
-    transfer_runs = client.list_transfer_runs(parent=config.name)
-    return max(transfer_runs, key=operator.attrgetter("run_time"))
+    transfer_runs = client.list_transfer_runs(
+        request=bigquery_datatransfer_v1.types.ListTransferRunsRequest(
+            parent=config.name,
+            page_size=RUNS_PAGE_SIZE,
+            run_attempt=bigquery_datatransfer_v1.types.ListTransferRunsRequest.RunAttempt.LATEST,
+        )
+    )
+
+    # Runs are listed most recent first, so the first page is enough
+    return max(
+        itertools.islice(transfer_runs, RUNS_PAGE_SIZE),
+        key=operator.attrgetter("run_time"),
+    )
 
 
 def create_transfer_config(
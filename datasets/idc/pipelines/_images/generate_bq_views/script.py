@@ -12,15 +12,28 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import hashlib
 import json
 import logging
 import os
 import pathlib
+import re
 import typing
 
+import profiler
+from google.api_core.exceptions import NotFound
 from google.cloud import bigquery
 
+# Table references in the queries are backquoted and use the PROJECT, DATASET and
+# CURRENT_VERSION template variables, e.g. `PROJECT.DATASET.dicom_all`
+TABLE_REFERENCE = re.compile(r"`([\w-]+)\.(\w+)\.(\w+)`")
+TEMPLATE_VARIABLE = re.compile(r"PROJECT|DATASET|CURRENT_VERSION")
 
+# Label holding the hash of the query a view was created from
+HASH_LABEL = "query_hash"
+
+
+@profiler.profiled
 def main(
     queries_dir: pathlib.Path,
     gcp_project: str,
@@ -29,37 +42,142 @@ def main(
     current_version: str,
 ):
     client = bigquery.Client()
+
+    views = {}
     for version in dataset_versions:
+        dataset = f"{dataset_name}_{version}"
         sql_files = [f for f in (queries_dir / version).iterdir() if f.suffix == ".sql"]
         for sql_file in sql_files:
             query = load_query(
                 sql_file=sql_file,
                 gcp_project=gcp_project,
-                dataset=f"{dataset_name}_{version}",
+                dataset=dataset,
                 current_version=current_version,
             )
+            views[f"{gcp_project}.{dataset}.{sql_file.stem}"] = query
+
+    deployed_hashes = get_deployed_hashes(
+        client, {view_id.rsplit(".", 1)[0] for view_id in views}
+    )
 
-            client.query(query)
+    for n, wave in enumerate(topological_waves(views), 1):
+        changed = [
+            view_id
+            for view_id in wave
+            if deployed_hashes.get(view_id) != query_hash(views[view_id])
+        ]
+        logging.info(
+            f"Wave {n}: creating {len(changed)} views, "
+            f"{len(wave) - len(changed)} unchanged"
+        )
+        create_views(client, {view_id: views[view_id] for view_id in changed})
 
 
 def load_query(
     sql_file: pathlib.Path, gcp_project: str, dataset: str, current_version: str
 ) -> str:
-    query = sql_file.read_text()
-
-    # Replace template variables
-    query = query.replace("PROJECT", gcp_project)
-    query = query.replace("DATASET", dataset)
-    query = query.replace("CURRENT_VERSION", current_version)
-    query = f"""
-        CREATE OR REPLACE VIEW
-            `{gcp_project}.{dataset}.{sql_file.stem}`
-        AS (
-            {query}
-        )
+    template_values = {
+        "PROJECT": gcp_project,
+        "DATASET": dataset,
+        "CURRENT_VERSION": current_version,
+    }
+
+    # Replace template variables in table references only
+    return TABLE_REFERENCE.sub(
+        lambda match: TEMPLATE_VARIABLE.sub(
+            lambda variable: template_values[variable.group()], match.group()
+        ),
+        sql_file.read_text(),
+    )
+
+
+def table_references(query: str) -> typing.Set[str]:
+    return {".".join(match.groups()) for match in TABLE_REFERENCE.finditer(query)}
+
+
+def topological_waves(views: typing.Dict[str, str]) -> typing.List[typing.List[str]]:
+    """Group views into waves, where every view only depends on views in earlier
+    waves. References to anything other than the views given, such as tables, are
+    not dependencies.
     """
+    dependencies = {
+        view_id: table_references(query) & views.keys() - {view_id}
+        for view_id, query in views.items()
+    }
+
+    waves = []
+    created = set()
+    while dependencies:
+        wave = sorted(
+            view_id for view_id, deps in dependencies.items() if deps <= created
+        )
+        if not wave:
+            raise ValueError(
+                f"Circular references between views: {sorted(dependencies)}"
+            )
+
+        waves.append(wave)
+        created.update(wave)
+        for view_id in wave:
+            del dependencies[view_id]
+
+    return waves
+
+
+def query_hash(query: str) -> str:
+    return hashlib.md5(query.encode()).hexdigest()
+
+
+def get_deployed_hashes(
+    client: bigquery.Client, dataset_ids: typing.Iterable[str]
+) -> typing.Dict[str, str]:
+    """Get the query hash labels of the views in the given datasets"""
+    deployed_hashes = {}
+    for dataset_id in dataset_ids:
+        try:
+            tables = list(client.list_tables(dataset_id))
+        except NotFound:
+            continue
+
+        for table in tables:
+            if table.table_type == "VIEW" and HASH_LABEL in (table.labels or {}):
+                deployed_hashes[
+                    f"{table.project}.{table.dataset_id}.{table.table_id}"
+                ] = table.labels[HASH_LABEL]
+
+    return deployed_hashes
+
+
+def create_views(client: bigquery.Client, views: typing.Dict[str, str]) -> None:
+    """Submit all view creation jobs at once, then wait for every one of them"""
+    jobs = {
+        view_id: client.query(
+            f"""
+            CREATE OR REPLACE VIEW
+                `{view_id}`
+            OPTIONS (
+                labels = [("{HASH_LABEL}", "{query_hash(query)}")]
+            )
+            AS (
+                {query}
+            )
+            """
+        )
+        for view_id, query in views.items()
+    }
+
+    errors = {}
+    for view_id, job in jobs.items():
+        try:
+            job.result()
+            logging.info(f"Created view {view_id}")
+        except Exception as e:
+            errors[view_id] = e
 
-    return query
+    if errors:
+        for view_id, error in errors.items():
+            logging.error(f"Failed to create view {view_id}: {error}")
+        raise RuntimeError(f"Failed to create views: {sorted(errors)}")
 
 
 if __name__ == "__main__":
@@ -31,6 +31,7 @@ with DAG(
     schedule_interval="@monthly",
     catchup=False,
     default_view="graph",
+    params={"profile": ""},
 ) as dag:
 
     # Task to run a GCS to GCS operation using Google resources
@@ -62,6 +63,7 @@ with DAG(
             "SERVICE_ACCOUNT": "{{ var.json.idc.service_account }}",
             "DATASET_NAME": "idc",
             "DATASET_VERSIONS": '["v1", "v2", "v3", "v4", "v5", "v6", "v7"]',
+            "PROFILE": "{{ dag_run.conf.get('profile', params.profile) if dag_run and dag_run.conf else params.profile }}",
         },
         resources={"request_memory": "128M", "request_cpu": "200m"},
     )
@@ -80,6 +82,7 @@ with DAG(
             "DATASET_NAME": "idc",
             "DATASET_VERSIONS": '["v1", "v2", "v3", "v4", "v5", "v6", "v7", "current"]',
             "CURRENT_VERSION": "v7",
+            "PROFILE": "{{ dag_run.conf.get('profile', params.profile) if dag_run and dag_run.conf else params.profile }}",
         },
         resources={"request_memory": "128M", "request_cpu": "200m"},
     )
@@ -18,11 +18,14 @@ import pathlib
 import subprocess
 from datetime import datetime
 
+import instrumentation
 import pandas as pd
+import profiler
 import requests
 from google.cloud import storage
 
 
+@profiler.profiled
 def main(
     source_url: str,
     source_file: pathlib.Path,
@@ -47,7 +50,7 @@ def main(
         quotechar='"',
         chunksize=chunksz,
     ) as reader:
-        for chunk_number, chunk in enumerate(reader):
+        for chunk_number, chunk in enumerate(instrumentation.iterate("parse", reader)):
             logging.info(f"Processing batch {chunk_number}")
             target_file_batch = str(target_file).replace(
                 ".csv", "-" + str(chunk_number) + ".csv"
@@ -70,6 +73,7 @@ def main(
         f"Uploading output file to.. gs://{target_gcs_bucket}/{target_gcs_path}"
     )
     upload_file_to_gcs(target_file, target_gcs_bucket, target_gcs_path)
+    instrumentation.upload_metrics(target_file, target_gcs_bucket, target_gcs_path)
 
 
 def processChunk(df: pd.DataFrame, target_file_batch: str) -> None:
@@ -120,6 +124,7 @@ def processChunk(df: pd.DataFrame, target_file_batch: str) -> None:
     logging.info("..Done!")
 
 
+@instrumentation.timed()
 def rename_headers(df: pd.DataFrame) -> None:
     header_names = {
         "Invoice/Item Number": "invoice_and_item_number",
@@ -158,10 +163,12 @@ def convert_dt_format(dt_str: str) -> str:
             return datetime.strptime(dt_str, "%m/%d/%Y").strftime("%Y-%m-%d")
 
 
+@instrumentation.timed("write")
 def save_to_new_file(df, file_path) -> None:
     df.to_csv(file_path, index=False)
 
 
+@instrumentation.timed("download")
 def download_file(source_url: str, source_file: pathlib.Path) -> None:
     logging.info(f"Downloading {source_url} into {source_file}")
     r = requests.get(source_url, stream=True)
@@ -173,6 +180,7 @@ def download_file(source_url: str, source_file: pathlib.Path) -> None:
         logging.error(f"Couldn't download {source_url}: {r.text}")
 
 
+@instrumentation.timed("upload")
 def upload_file_to_gcs(file_path: pathlib.Path, gcs_bucket: str, gcs_path: str) -> None:
     storage_client = storage.Client()
     bucket = storage_client.bucket(gcs_bucket)
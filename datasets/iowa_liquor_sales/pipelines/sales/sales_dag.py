@@ -31,6 +31,7 @@ with DAG(
     schedule_interval="@weekly",
     catchup=False,
     default_view="graph",
+    params={"profile": ""},
 ) as dag:
 
     # Run CSV transform within kubernetes pod
@@ -49,6 +50,7 @@ with DAG(
             "CHUNKSIZE": "1000000",
             "TARGET_GCS_BUCKET": "{{ var.value.composer_bucket }}",
             "TARGET_GCS_PATH": "data/iowa_liquor_sales/sales/data_output.csv",
+            "PROFILE": "{{ dag_run.conf.get('profile', params.profile) if dag_run and dag_run.conf else params.profile }}",
         },
         resources={
             "request_memory": "8G",
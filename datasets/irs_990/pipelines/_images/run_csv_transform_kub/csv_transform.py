@@ -23,11 +23,15 @@ import re
 import typing
 from urllib.parse import urlparse
 
+import instrumentation
 import pandas as pd
+import profiler
 import requests
+import source_cache
 from google.cloud import storage
 
 
+@profiler.profiled
 def main(
     source_url: str,
     source_file: pathlib.Path,
@@ -37,6 +41,8 @@ def main(
     headers: typing.List[str],
     rename_mappings: dict,
     pipeline_name: str,
+    cache_bucket: str = None,
+    cache_prefix: str = None,
 ) -> None:
 
     logging.info(
@@ -48,17 +54,19 @@ def main(
     pathlib.Path("./files").mkdir(parents=True, exist_ok=True)
 
     logging.info(f"Downloading file from {source_url}... ")
-    download_file(source_url, source_file)
+    download_file(source_url, source_file, cache_bucket, cache_prefix)
 
     logging.info(f"Opening file {source_file} ... ")
     str_value = os.path.basename(urlparse(source_url).path)
 
-    if re.search("zip", str_value):
-        df = pd.read_csv(
-            str(source_file), compression="zip", encoding="utf-8", sep=r"\s+"
-        )
-    else:
-        df = pd.read_csv(str(source_file), encoding="utf-8", sep=r"\s+")
+    with instrumentation.stage("parse") as stage:
+        if re.search("zip", str_value):
+            df = pd.read_csv(
+                str(source_file), compression="zip", encoding="utf-8", sep=r"\s+"
+            )
+        else:
+            df = pd.read_csv(str(source_file), encoding="utf-8", sep=r"\s+")
+        stage.rows = len(df)
 
     logging.info(f"Transforming {source_file} ...")
 
@@ -94,6 +102,7 @@ def main(
         f"Uploading output file to.. gs://{target_gcs_bucket}/{target_gcs_path}"
     )
     upload_file_to_gcs(target_file, target_gcs_bucket, target_gcs_path)
+    instrumentation.upload_metrics(target_file, target_gcs_bucket, target_gcs_path)
 
     logging.info(
         f"irs 990 {pipeline_name} process completed at "
@@ -101,28 +110,40 @@ def main(
     )
 
 
+@instrumentation.timed()
 def rename_headers(df: pd.DataFrame, rename_mappings: dict) -> None:
     df = df.rename(columns=rename_mappings, inplace=True)
 
 
+@instrumentation.timed()
 def filter_null_rows(df: pd.DataFrame) -> None:
     df = df[df.ein != ""]
 
 
+@instrumentation.timed("write")
 def save_to_new_file(df: pd.DataFrame, file_path: pathlib.Path) -> None:
     # df.export_csv(file_path)
     df.to_csv(file_path, index=False)
 
 
-def download_file(source_url: str, source_file: pathlib.Path) -> None:
-    logging.info(f"Downloading {source_url} into {source_file}")
-    r = requests.get(source_url, stream=True)
-    if r.status_code == 200:
-        with open(source_file, "wb") as f:
-            for chunk in r:
-                f.write(chunk)
-    else:
-        logging.error(f"Couldn't download {source_url}: {r.text}")
+@instrumentation.timed("download")
+def download_file(
+    source_url: str,
+    source_file: pathlib.Path,
+    cache_bucket: str = None,
+    cache_prefix: str = None,
+) -> None:
+    with requests.Session() as session:
+        if not cache_bucket:
+            source_cache.download(source_url, source_file, session)
+            return
+
+        # Every irs_990 pipeline has its own source URL, so none of them reuses
+        # another's entry. The yearly extracts don't change once published
+        # though, so the daily runs of a pipeline copy theirs from the bucket
+        # instead of downloading it from irs.gov again.
+        bucket = storage.Client().bucket(cache_bucket)
+        source_cache.fetch(source_url, source_file, bucket, cache_prefix, session)
 
 
 def convert_to_int(input: str) -> str:
@@ -134,6 +155,7 @@ def convert_to_int(input: str) -> str:
     return str_val
 
 
+@instrumentation.timed("upload")
 def upload_file_to_gcs(file_path: pathlib.Path, gcs_bucket: str, gcs_path: str) -> None:
     storage_client = storage.Client()
     bucket = storage_client.bucket(gcs_bucket)
@@ -153,4 +175,6 @@ if __name__ == "__main__":
         headers=json.loads(os.environ["CSV_HEADERS"]),
         rename_mappings=json.loads(os.environ["RENAME_MAPPINGS"]),
         pipeline_name=os.environ["PIPELINE_NAME"],
+        cache_bucket=os.getenv("CACHE_BUCKET"),
+        cache_prefix=os.getenv("CACHE_PREFIX", "data/irs_990/source_cache"),
     )
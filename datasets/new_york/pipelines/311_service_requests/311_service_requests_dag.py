@@ -14,7 +14,8 @@
 
 
 from airflow import DAG
-from airflow.providers.cncf.kubernetes.operators import kubernetes_pod
+from airflow.operators import bash
+from airflow.providers.google.cloud.operators import kubernetes_engine
 from airflow.providers.google.cloud.transfers import gcs_to_bigquery
 
 default_args = {
@@ -31,14 +32,34 @@ with DAG(
     schedule_interval="@daily",
     catchup=False,
     default_view="graph",
+    params={"profile": ""},
 ) as dag:
+    create_cluster = kubernetes_engine.GKECreateClusterOperator(
+        task_id="create_cluster",
+        project_id="{{ var.value.gcp_project }}",
+        location="us-central1-c",
+        body={
+            "name": "new-york--311-service-requests",
+            "initial_node_count": 1,
+            "network": "{{ var.value.vpc_network }}",
+            "node_config": {
+                "machine_type": "e2-small",
+                "oauth_scopes": [
+                    "https://www.googleapis.com/auth/devstorage.read_write",
+                    "https://www.googleapis.com/auth/cloud-platform",
+                ],
+            },
+        },
+    )
 
     # Run CSV transform within kubernetes pod
-    transform_csv = kubernetes_pod.KubernetesPodOperator(
+    transform_csv = kubernetes_engine.GKEStartPodOperator(
         task_id="transform_csv",
         name="311_service_requests",
-        namespace="composer",
-        service_account_name="datasets",
+        project_id="{{ var.value.gcp_project }}",
+        location="us-central1-c",
+        cluster_name="new-york--311-service-requests",
+        namespace="default",
         image_pull_policy="Always",
         image="{{ var.json.new_york.container_registry.run_csv_transform_kub_311_service_requests }}",
         env_vars={
@@ -48,10 +69,26 @@ with DAG(
             "CHUNKSIZE": "500000",
             "TARGET_GCS_BUCKET": "{{ var.value.composer_bucket }}",
             "TARGET_GCS_PATH": "data/new_york/311_service_requests/data_output.csv",
+            "PROFILE": "{{ dag_run.conf.get('profile', params.profile) if dag_run and dag_run.conf else params.profile }}",
         },
         resources={"limit_memory": "8G", "limit_cpu": "3"},
     )
 
+    # Skip the load if its output is already in the table
+    check_load_to_bq_output = bash.BashOperator(
+        task_id="check_load_to_bq_output",
+        bash_command="python $airflow_home/dags/$dataset/$pipeline/custom/output_check.py check",
+        env={
+            "airflow_home": "{{ var.value.airflow_home }}",
+            "dataset": "new_york",
+            "pipeline": "311_service_requests",
+            "BUCKET": "{{ var.value.composer_bucket }}",
+            "OBJECT": "data/new_york/311_service_requests/data_output.csv",
+            "TABLE": "new_york.311_service_requests",
+            "STATE_FILE": "{{ var.value.airflow_data_folder }}/new_york/311_service_requests/load_to_bq_output_state.json",
+        },
+    )
+
     # Task to load CSV data to a BigQuery table
     load_to_bq = gcs_to_bigquery.GCSToBigQueryOperator(
         task_id="load_to_bq",
@@ -292,4 +329,28 @@ with DAG(
         ],
     )
 
-    transform_csv >> load_to_bq
+    # Record the fingerprint of the loaded output
+    record_load_to_bq_output = bash.BashOperator(
+        task_id="record_load_to_bq_output",
+        bash_command="python $airflow_home/dags/$dataset/$pipeline/custom/output_check.py record",
+        env={
+            "airflow_home": "{{ var.value.airflow_home }}",
+            "dataset": "new_york",
+            "pipeline": "311_service_requests",
+            "BUCKET": "{{ var.value.composer_bucket }}",
+            "OBJECT": "data/new_york/311_service_requests/data_output.csv",
+            "TABLE": "new_york.311_service_requests",
+            "STATE_FILE": "{{ var.value.airflow_data_folder }}/new_york/311_service_requests/load_to_bq_output_state.json",
+        },
+    )
+    delete_cluster = kubernetes_engine.GKEDeleteClusterOperator(
+        task_id="delete_cluster",
+        project_id="{{ var.value.gcp_project }}",
+        location="us-central1-c",
+        name="new-york--311-service-requests",
+        trigger_rule="none_failed",
+    )
+
+    create_cluster >> transform_csv >> load_to_bq >> delete_cluster
+    [transform_csv] >> check_load_to_bq_output
+    check_load_to_bq_output >> load_to_bq >> record_load_to_bq_output
@@ -17,12 +17,15 @@ import logging
 import os
 import pathlib
 
+import gcs_upload
+import instrumentation
 import numpy as np
 import pandas as pd
-import requests
-from google.cloud import storage
+import profiler
+import ranged_download
 
 
+@profiler.profiled
 def main(
     source_url: str,
     source_file: pathlib.Path,
@@ -99,7 +102,7 @@ def main(
         dtype=dtypes,
         parse_dates=parse_dates,
     ) as reader:
-        for chunk_number, chunk in enumerate(reader):
+        for chunk_number, chunk in enumerate(instrumentation.iterate("parse", reader)):
             logging.info(f"Processing batch {chunk_number}")
             target_file_batch = str(target_file).replace(
                 ".csv", "-" + str(chunk_number) + ".csv"
@@ -109,10 +112,12 @@ def main(
             process_chunk(df, target_file_batch, target_file, (not chunk_number == 0))
 
     upload_file_to_gcs(target_file, target_gcs_bucket, target_gcs_path)
+    instrumentation.upload_metrics(target_file, target_gcs_bucket, target_gcs_path)
 
     logging.info("New York - 311 Service Requests process completed")
 
 
+@instrumentation.timed("append")
 def append_batch_file(
     batch_file_path: str, target_file_path: str, skip_header: bool, truncate_file: bool
 ) -> None:
@@ -147,6 +152,7 @@ def process_chunk(
     append_batch_file(target_file_batch, target_file, skip_header, not (skip_header))
 
 
+@instrumentation.timed()
 def reorder_headers(df: pd.DataFrame) -> pd.DataFrame:
     logging.info("Reordering headers..")
     df = df[
@@ -197,6 +203,7 @@ def reorder_headers(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+@instrumentation.timed()
 def resolve_date_format(df: pd.DataFrame) -> pd.DataFrame:
     logging.info("Resolve Date Format")
     date_fields = [
@@ -225,6 +232,7 @@ def convert_dt_format(dt_str: str) -> str:
         return str(dt_str)
 
 
+@instrumentation.timed()
 def rename_headers(df: pd.DataFrame) -> pd.DataFrame:
     logging.info("Renaming Headers")
     header_names = {
@@ -278,23 +286,21 @@ def rename_headers(df: pd.DataFrame) -> pd.DataFrame:
 
 def save_to_new_file(df: pd.DataFrame, file_path: str) -> None:
     logging.info(f"Saving data to target file.. {file_path} ...")
-    df.to_csv(file_path, index=False)
+    with instrumentation.stage("write", rows=len(df)) as stage:
+        df.to_csv(file_path, index=False)
+        stage.bytes = os.path.getsize(file_path)
 
 
 def download_file(source_url: str, source_file: pathlib.Path) -> None:
-    logging.info(f"Downloading file {source_url}")
-    r = requests.get(source_url, stream=True)
-    with open(source_file, "wb") as f:
-        for chunk in r:
-            f.write(chunk)
+    with instrumentation.stage("download") as stage:
+        ranged_download.download_file(source_url, source_file)
+        stage.bytes = os.path.getsize(source_file)
 
 
 def upload_file_to_gcs(file_path: pathlib.Path, gcs_bucket: str, gcs_path: str) -> None:
     logging.info(f"Uploading output file to.. gs://{gcs_bucket}/{gcs_path}")
-    storage_client = storage.Client()
-    bucket = storage_client.bucket(gcs_bucket)
-    blob = bucket.blob(gcs_path)
-    blob.upload_from_filename(file_path)
+    with instrumentation.stage("upload", bytes=os.path.getsize(file_path)):
+        gcs_upload.upload_file(file_path, gcs_bucket, gcs_path, fingerprint=True)
 
 
 if __name__ == "__main__":
@@ -14,22 +14,26 @@
 
 # CSV transform for: austin_311.311_service_request
 
+import concurrent.futures
 import datetime
 import logging
 import os
 import pathlib
 
+import instrumentation
 import pandas as pd
+import profiler
 import requests
 from google.cloud import storage
 
+HTTP_TIMEOUT = 60
 
+
+@profiler.profiled
 def main(
     source_url_stations_json: str,
     source_url_status_json: str,
-    source_file: pathlib.Path,
     target_file: pathlib.Path,
-    chunksize: str,
     target_gcs_bucket: str,
     target_gcs_path: str,
 ) -> None:
@@ -37,96 +41,72 @@ def main(
     logging.info("New York Citibike - Citibike Stations process started")
 
     pathlib.Path("./files").mkdir(parents=True, exist_ok=True)
-    download_and_merge_source_files(
-        source_url_stations_json, source_url_status_json, source_file
+    df = download_and_merge_source_files(
+        source_url_stations_json, source_url_status_json
     )
-
-    chunksz = int(chunksize)
-
-    logging.info(f"Opening source file {source_file}")
-    with pd.read_csv(
-        source_file,
-        engine="python",
-        encoding="utf-8",
-        quotechar='"',
-        sep=",",
-        chunksize=chunksz,
-    ) as reader:
-        for chunk_number, chunk in enumerate(reader):
-            target_file_batch = str(target_file).replace(
-                ".csv", "-" + str(chunk_number) + ".csv"
-            )
-            df = pd.DataFrame()
-            df = pd.concat([df, chunk])
-            process_chunk(df, target_file_batch, target_file, (not chunk_number == 0))
+    process_data(df, str(target_file))
 
     upload_file_to_gcs(target_file, target_gcs_bucket, target_gcs_path)
+    instrumentation.upload_metrics(target_file, target_gcs_bucket, target_gcs_path)
 
     logging.info("New York Citibike - Citibike Stations process completed")
 
 
 def download_and_merge_source_files(
-    source_url_stations_json: str, source_url_status_json: str, source_file: str
-) -> None:
-
-    source_file_stations_csv = str(source_file).replace(".csv", "") + "_stations.csv"
-    source_file_stations_json = str(source_file).replace(".csv", "") + "_stations"
-    source_file_status_csv = str(source_file).replace(".csv", "") + "_status.csv"
-    source_file_status_json = str(source_file).replace(".csv", "") + "_status"
-
-    download_file_json(
-        source_url_stations_json, source_file_stations_json, source_file_stations_csv
-    )
-
-    download_file_json(
-        source_url_status_json, source_file_status_json, source_file_status_csv
-    )
-
-    df_stations = pd.read_csv(
-        source_file_stations_csv, engine="python", encoding="utf-8", quotechar='"'
-    )
-
-    df_status = pd.read_csv(
-        source_file_status_csv, engine="python", encoding="utf-8", quotechar='"'
-    )
-
-    logging.info("Merging files")
-    df = df_stations.merge(df_status, left_on="station_id", right_on="station_id")
-
-    save_to_new_file(df, source_file)
-
+    source_url_stations_json: str, source_url_status_json: str
+) -> pd.DataFrame:
+    with requests.Session() as session, concurrent.futures.ThreadPoolExecutor(
+        max_workers=2
+    ) as executor:
+        stations, status = executor.map(
+            lambda source_url: download_stations(session, source_url),
+            [source_url_stations_json, source_url_status_json],
+        )
 
-def download_file_json(
-    source_url: str, source_file_json: pathlib.Path, source_file_csv: pathlib.Path
-) -> None:
-    logging.info(f"Downloading file {source_url}.json.")
-    r = requests.get(source_url + ".json", stream=True)
-    with open(source_file_json + ".json", "wb") as f:
-        for chunk in r:
-            f.write(chunk)
-    df = pd.read_json(source_file_json + ".json")["data"]["stations"]
-    df = pd.DataFrame(df)
-    df.to_csv(source_file_csv, index=False)
+    logging.info("Merging feeds")
+    return stations.merge(status, on="station_id")
+
+
+@instrumentation.timed("download")
+def download_stations(session: requests.Session, source_url: str) -> pd.DataFrame:
+    logging.info(f"Downloading feed {source_url}.json")
+    r = session.get(source_url + ".json", timeout=HTTP_TIMEOUT)
+    r.raise_for_status()
+    df = pd.DataFrame.from_records(r.json()["data"]["stations"])
+    return infer_numeric_columns(df)
+
+
+@instrumentation.timed()
+def infer_numeric_columns(df: pd.DataFrame) -> pd.DataFrame:
+    # The feeds encode ids as strings, convert every column holding only numeric
+    # strings to numbers, the way reading them from a CSV file would
+    for column in df.columns:
+        values = df[column].dropna()
+        if values.empty or not values.map(lambda x: isinstance(x, str)).all():
+            continue
+        try:
+            df[column] = pd.to_numeric(df[column])
+        except (ValueError, TypeError):
+            pass
+    return df
 
 
+@instrumentation.timed("write")
 def save_to_new_file(df, file_path) -> None:
     logging.info(f"Saving to output file.. {file_path}")
     df.to_csv(file_path, index=False)
 
 
-def process_chunk(
-    df: pd.DataFrame, target_file_batch: str, target_file: str, skip_header: bool
-) -> None:
-    logging.info(f"Processing batch file {target_file_batch}")
+def process_data(df: pd.DataFrame, target_file: str) -> None:
+    logging.info("Processing stations")
     df = convert_datetime_from_int(df)
     df = clean_data_points(df)
     df = rename_headers(df)
     df = reorder_headers(df)
-    save_to_new_file(df, file_path=str(target_file_batch))
-    append_batch_file(target_file_batch, target_file, skip_header, not (skip_header))
-    logging.info(f"Processing batch file {target_file_batch} completed")
+    save_to_new_file(df, file_path=target_file)
 
 
+@instrumentation.timed()
 def convert_datetime_from_int(df: pd.DataFrame) -> pd.DataFrame:
     logging.info("Converting Datetime columns")
     columns = ["last_reported"]
@@ -140,6 +120,7 @@ def datetime_from_int(dt_int: int) -> str:
     return datetime.datetime.fromtimestamp(dt_int).strftime("%Y-%m-%d %H:%M:%S")
 
 
+@instrumentation.timed()
 def clean_data_points(df: pd.DataFrame) -> pd.DataFrame:
     df = resolve_datatypes(df)
     df = normalize_data_list(df)
@@ -148,6 +129,7 @@ def clean_data_points(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+@instrumentation.timed()
 def resolve_datatypes(df: pd.DataFrame) -> pd.DataFrame:
     logging.info("Resolving datatypes")
     columns = {"station_id": "Int64", "region_id": "Int64", "rental_methods": "string"}
@@ -158,6 +140,7 @@ def resolve_datatypes(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+@instrumentation.timed()
 def normalize_data_list(df: pd.DataFrame) -> pd.DataFrame:
     logging.info("Normalizing data lists")
     columns = ["rental_methods"]
@@ -173,6 +156,7 @@ def normalize_data_list(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+@instrumentation.timed()
 def resolve_boolean_datapoints(df: pd.DataFrame) -> pd.DataFrame:
     logging.info("Resolving boolean datapoints")
     columns = ["eightd_has_key_dispenser", "is_installed", "is_renting", "is_returning"]
@@ -183,6 +167,7 @@ def resolve_boolean_datapoints(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+@instrumentation.timed()
 def rename_headers(df: pd.DataFrame) -> pd.DataFrame:
     header_names = {
         "lat": "latitude",
@@ -193,6 +178,7 @@ def rename_headers(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+@instrumentation.timed()
 def reorder_headers(df: pd.DataFrame) -> pd.DataFrame:
     logging.info("Re-ordering Headers")
     df = df[
@@ -221,27 +207,7 @@ def reorder_headers(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def append_batch_file(
-    batch_file_path: str, target_file_path: str, skip_header: bool, truncate_file: bool
-) -> None:
-    data_file = open(batch_file_path, "r")
-    if truncate_file:
-        target_file = open(target_file_path, "w+").close()
-    target_file = open(target_file_path, "a+")
-    if skip_header:
-        logging.info(
-            f"Appending batch file {batch_file_path} to {target_file_path} with skip header"
-        )
-        next(data_file)
-    else:
-        logging.info(f"Appending batch file {batch_file_path} to {target_file_path}")
-    target_file.write(data_file.read())
-    data_file.close()
-    target_file.close()
-    if os.path.exists(batch_file_path):
-        os.remove(batch_file_path)
-
-
+@instrumentation.timed("upload")
 def upload_file_to_gcs(file_path: pathlib.Path, gcs_bucket: str, gcs_path: str) -> None:
     logging.info(f"Uploading output file to.. gs://{gcs_bucket}/{gcs_path}")
     storage_client = storage.Client()
@@ -256,9 +222,7 @@ if __name__ == "__main__":
     main(
         source_url_stations_json=os.environ["SOURCE_URL_STATIONS_JSON"],
         source_url_status_json=os.environ["SOURCE_URL_STATUS_JSON"],
-        source_file=pathlib.Path(os.environ["SOURCE_FILE"]).expanduser(),
         target_file=pathlib.Path(os.environ["TARGET_FILE"]).expanduser(),
-        chunksize=os.environ["CHUNKSIZE"],
         target_gcs_bucket=os.environ["TARGET_GCS_BUCKET"],
         target_gcs_path=os.environ["TARGET_GCS_PATH"],
     )
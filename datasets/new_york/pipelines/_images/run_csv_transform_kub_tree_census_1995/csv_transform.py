@@ -16,11 +16,14 @@ import logging
 import os
 import pathlib
 
+import instrumentation
 import pandas as pd
+import profiler
 import requests
 from google.cloud import storage
 
 
+@profiler.profiled
 def main(
     source_url: str,
     source_file: pathlib.Path,
@@ -46,7 +49,7 @@ def main(
         sep=",",
         chunksize=chunksz,
     ) as reader:
-        for chunk_number, chunk in enumerate(reader):
+        for chunk_number, chunk in enumerate(instrumentation.iterate("parse", reader)):
             target_file_batch = str(target_file).replace(
                 ".csv", "-" + str(chunk_number) + ".csv"
             )
@@ -55,6 +58,7 @@ def main(
             process_chunk(df, target_file_batch, target_file, (not chunk_number == 0))
 
     upload_file_to_gcs(target_file, target_gcs_bucket, target_gcs_path)
+    instrumentation.upload_metrics(target_file, target_gcs_bucket, target_gcs_path)
 
     logging.info("New York Tree Census 1995 process completed")
 
@@ -71,6 +75,7 @@ def process_chunk(
     logging.info(f"Processing batch file {target_file_batch} completed")
 
 
+@instrumentation.timed()
 def rename_headers(df: pd.DataFrame) -> pd.DataFrame:
     header_names = {
         "RecordId": "recordid",
@@ -107,12 +112,14 @@ def rename_headers(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+@instrumentation.timed()
 def remove_whitespace(df: pd.DataFrame) -> pd.DataFrame:
     df["spc_latin"] = df["spc_latin"].apply(lambda x: str(x).strip())
 
     return df
 
 
+@instrumentation.timed()
 def reorder_headers(df: pd.DataFrame) -> pd.DataFrame:
     logging.info("Reordering headers..")
     df = df[
@@ -150,6 +157,7 @@ def reorder_headers(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+@instrumentation.timed("write")
 def save_to_new_file(df: pd.DataFrame, file_path: str) -> None:
     df.to_csv(file_path, index=False)
 
@@ -175,6 +183,7 @@ def append_batch_file(
         os.remove(batch_file_path)
 
 
+@instrumentation.timed("download")
 def download_file(source_url: str, source_file: pathlib.Path) -> None:
     r = requests.get(source_url, stream=True)
     if r.status_code == 200:
@@ -185,6 +194,7 @@ def download_file(source_url: str, source_file: pathlib.Path) -> None:
         logging.error(f"Couldn't download {source_url}: {r.text}")
 
 
+@instrumentation.timed("upload")
 def upload_file_to_gcs(file_path: pathlib.Path, gcs_bucket: str, gcs_path: str) -> None:
     storage_client = storage.Client()
     bucket = storage_client.bucket(gcs_bucket)
@@ -30,6 +30,7 @@ with DAG(
     schedule_interval="@daily",
     catchup=False,
     default_view="graph",
+    params={"profile": ""},
 ) as dag:
 
     # Run CSV transform within kubernetes pod
@@ -63,11 +64,13 @@ with DAG(
             "TARGET_FILE": "files/data_output.csv",
             "TARGET_GCS_BUCKET": "{{ var.value.composer_bucket }}",
             "TARGET_GCS_PATH": "data/news_hatecrimes/hatecrimes/data_output.csv",
+            "CHUNKSIZE": "100000",
             "PIPELINE_NAME": "hatecrimes",
             "CSV_HEADERS": '["date","title","organization","city","state","url","keyword","summary"]',
             "RENAME_MAPPINGS": '{"Date":"date","Title":"title","Organization":"organization","City":"city","State":"state","URL":"url","Keyword":"keyword","Summary":"summary"}',
+            "PROFILE": "{{ dag_run.conf.get('profile', params.profile) if dag_run and dag_run.conf else params.profile }}",
         },
-        resources={"request_memory": "2G", "request_cpu": "1"},
+        resources={"request_memory": "1G", "request_cpu": "1"},
     )
 
     # Task to load CSV data to a BigQuery table
@@ -20,11 +20,14 @@ import re
 import urllib.request
 from ftplib import FTP
 
+import instrumentation
 import pandas as pd
+import profiler
 import requests
 from google.cloud import storage
 
 
+@profiler.profiled
 def main(
     source_url: str,
     ftp_host: str,
@@ -77,7 +80,9 @@ def main(
             (82, 90),  # begin
             (91, 99),  # end
         ]
-        df = pd.read_fwf(str(source_file), colspecs=colspecs)
+        with instrumentation.stage("parse") as stage:
+            df = pd.read_fwf(str(source_file), colspecs=colspecs)
+            stage.rows = len(df)
 
         logging.info(f"Transform: Renaming Headers.. {source_file}")
         df.columns = [
@@ -149,6 +154,7 @@ def main(
             f"Uploading output file to.. gs://{target_gcs_bucket}/{target_gcs_path}"
         )
         upload_file_to_gcs(target_file, target_gcs_bucket, target_gcs_path)
+        instrumentation.upload_metrics(target_file, target_gcs_bucket, target_gcs_path)
 
         logging.info("NOAA GSOD Stations process completed")
 
@@ -168,6 +174,7 @@ def replace_value(val: str) -> str:
             return val
 
 
+@instrumentation.timed()
 def replace_values_regex(df: pd.DataFrame) -> None:
     header_names = {"checkout_time"}
 
@@ -176,6 +183,7 @@ def replace_values_regex(df: pd.DataFrame) -> None:
             df[dt_col] = df[dt_col].apply(replace_value)
 
 
+@instrumentation.timed("download")
 def download_file_ftp(
     ftp_host: str,
     ftp_dir: str,
@@ -228,6 +236,7 @@ def url_is_reachable(url: str) -> bool:
         return False
 
 
+@instrumentation.timed("download")
 def download_file(source_url: str, source_file: pathlib.Path) -> None:
     r = requests.get(source_url, stream=True)
     if r.status_code == 200:
@@ -238,6 +247,7 @@ def download_file(source_url: str, source_file: pathlib.Path) -> None:
         logging.error(f"Couldn't download {source_url}: {r.text}")
 
 
+@instrumentation.timed("upload")
 def upload_file_to_gcs(file_path: pathlib.Path, gcs_bucket: str, gcs_path: str) -> None:
     storage_client = storage.Client()
     bucket = storage_client.bucket(gcs_bucket)
@@ -18,11 +18,14 @@ import os
 import pathlib
 import urllib.request
 
+import instrumentation
 import pandas as pd
+import profiler
 import requests
 from google.cloud import storage
 
 
+@profiler.profiled
 def main(
     source_url: str,
     source_file: pathlib.Path,
@@ -54,7 +57,9 @@ def main(
         os.unlink(source_file_zipped)
 
         logging.info(f"Opening source file {source_file}")
-        df = pd.read_csv(str(source_file))
+        with instrumentation.stage("parse") as stage:
+            df = pd.read_csv(str(source_file))
+            stage.rows = len(df)
 
         logging.info(f"Transform: Renaming Headers.. {source_file}")
         df.columns = ["day_int", "centerlon", "centerlat", "number_of_strikes"]
@@ -86,6 +91,7 @@ def main(
             f"Uploading output file to.. gs://{target_gcs_bucket}/{target_gcs_path}"
         )
         upload_file_to_gcs(target_file, target_gcs_bucket, target_gcs_path)
+        instrumentation.upload_metrics(target_file, target_gcs_bucket, target_gcs_path)
 
         logging.info("NOAA Lightning Strikes By Year process completed")
 
@@ -113,6 +119,7 @@ def url_is_reachable(url: str) -> bool:
         return False
 
 
+@instrumentation.timed("download")
 def download_file(source_url: str, source_file: pathlib.Path) -> None:
     r = requests.get(source_url, stream=True)
     if r.status_code == 200:
@@ -123,6 +130,7 @@ def download_file(source_url: str, source_file: pathlib.Path) -> None:
         logging.error(f"Couldn't download {source_url}: {r.text}")
 
 
+@instrumentation.timed("upload")
 def upload_file_to_gcs(file_path: pathlib.Path, gcs_bucket: str, gcs_path: str) -> None:
     storage_client = storage.Client()
     bucket = storage_client.bucket(gcs_bucket)
@@ -30,6 +30,7 @@ with DAG(
     schedule_interval="@daily",
     catchup=False,
     default_view="graph",
+    params={"profile": ""},
 ) as dag:
 
     # Run CSV transform within kubernetes pod
@@ -63,11 +64,13 @@ with DAG(
             "TARGET_FILE": "files/data_output.csv",
             "TARGET_GCS_BUCKET": "{{ var.value.composer_bucket }}",
             "TARGET_GCS_PATH": "data/race_and_economic_opportunity/commuting_zone_income_rank_statistics_by_race_and_parent_income_percentile/data_output.csv",
+            "CHUNKSIZE": "100000",
             "CSV_HEADERS": '["cz","cz_name","cz_pop2000","cz_pop_black2000","cz_pop_hisp2000","cz_pop_white2000","kfr_pooled_p25","kfr_black_pooled_p25","kfr_white_pooled_p25","kir_black_female_p25","kir_black_female_p75","kir_black_male_p25","kir_black_male_p75","kir_hisp_female_p25","kir_hisp_female_p75","kir_hisp_male_p25","kir_hisp_male_p75","kir_white_female_p25","kir_white_female_p75","kir_white_male_p25","kir_white_male_p75"]',
             "RENAME_MAPPINGS": '{"cz": "cz","cz_name": "cz_name","cz_pop2000": "cz_pop2000","cz_pop_black2000": "cz_pop_black2000","cz_pop_hisp2000": "cz_pop_hisp2000","cz_pop_white2000": "cz_pop_white2000","kfr_pooled_p25": "kfr_pooled_p25","kfr_black_pooled_p25": "kfr_black_pooled_p25","kfr_white_pooled_p25": "kfr_white_pooled_p25","kir_black_female_p25": "kir_black_female_p25","kir_black_female_p75": "kir_black_female_p75","kir_black_male_p25": "kir_black_male_p25","kir_black_male_p75": "kir_black_male_p75","kir_hisp_female_p25": "kir_hisp_female_p25","kir_hisp_female_p75": "kir_hisp_female_p75","kir_hisp_male_p25": "kir_hisp_male_p25","kir_hisp_male_p75": "kir_hisp_male_p75","kir_white_female_p25": "kir_white_female_p25","kir_white_female_p75": "kir_white_female_p75","kir_white_male_p25": "kir_white_male_p25","kir_white_male_p75": "kir_white_male_p75"}',
             "PIPELINE_NAME": "commuting_zone_income_rank_statistics_by_race_and_parent_income_percentile",
+            "PROFILE": "{{ dag_run.conf.get('profile', params.profile) if dag_run and dag_run.conf else params.profile }}",
         },
-        resources={"limit_memory": "2G", "limit_cpu": "1"},
+        resources={"limit_memory": "1G", "limit_cpu": "1"},
     )
 
     # Task to load CSV data to a BigQuery table
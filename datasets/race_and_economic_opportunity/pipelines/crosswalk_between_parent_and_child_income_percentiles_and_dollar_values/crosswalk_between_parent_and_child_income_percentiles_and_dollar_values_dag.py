@@ -30,6 +30,7 @@ with DAG(
     schedule_interval="@daily",
     catchup=False,
     default_view="graph",
+    params={"profile": ""},
 ) as dag:
 
     # Run CSV transform within kubernetes pod
@@ -63,11 +64,13 @@ with DAG(
             "TARGET_FILE": "files/data_output.csv",
             "TARGET_GCS_BUCKET": "{{ var.value.composer_bucket }}",
             "TARGET_GCS_PATH": "data/race_and_economic_opportunity/crosswalk_between_parent_and_child_income_percentiles_and_dollar_values/data_output.csv",
+            "CHUNKSIZE": "100000",
             "CSV_HEADERS": '["percentile","kid_hh_income","kid_indiv_income","parent_hh_income"]',
             "RENAME_MAPPINGS": '{"percentile": "percentile","kid_hh_income": "kid_hh_income","kid_indiv_income": "kid_indiv_income","parent_hh_income": "parent_hh_income"}',
             "PIPELINE_NAME": "crosswalk_between_parent_and_child_income_percentiles_and_dollar_values",
+            "PROFILE": "{{ dag_run.conf.get('profile', params.profile) if dag_run and dag_run.conf else params.profile }}",
         },
-        resources={"limit_memory": "2G", "limit_cpu": "1"},
+        resources={"limit_memory": "1G", "limit_cpu": "1"},
     )
 
     # Task to load CSV data to a BigQuery table
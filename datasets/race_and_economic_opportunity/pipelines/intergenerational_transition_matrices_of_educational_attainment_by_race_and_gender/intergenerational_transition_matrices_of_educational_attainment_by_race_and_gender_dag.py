@@ -30,6 +30,7 @@ with DAG(
     schedule_interval="@daily",
     catchup=False,
     default_view="graph",
+    params={"profile": ""},
 ) as dag:
 
     # Run CSV transform within kubernetes pod
@@ -63,11 +64,13 @@ with DAG(
             "TARGET_FILE": "files/data_output.csv",
             "TARGET_GCS_BUCKET": "{{ var.value.composer_bucket }}",
             "TARGET_GCS_PATH": "data/race_and_economic_opportunity/intergenerational_transition_matrices_of_educational_attainment_by_race_and_gender/data_output.csv",
+            "CHUNKSIZE": "100000",
             "CSV_HEADERS": '["kid_race","gender","count","kid_edu1","kid_edu2","kid_edu3","kid_edu4","par_edu1","par_edu2","par_edu3","par_edu4","kid_edu1_cond_par_edu1","kid_edu1_cond_par_edu2","kid_edu1_cond_par_edu3","kid_edu1_cond_par_edu4","kid_edu2_cond_par_edu1","kid_edu2_cond_par_edu2","kid_edu2_cond_par_edu3","kid_edu2_cond_par_edu4","kid_edu3_cond_par_edu1","kid_edu3_cond_par_edu2","kid_edu3_cond_par_edu3","kid_edu3_cond_par_edu4","kid_edu4_cond_par_edu1","kid_edu4_cond_par_edu2","kid_edu4_cond_par_edu3","kid_edu4_cond_par_edu4"]',
             "RENAME_MAPPINGS": '{"kid_race": "kid_race","gender": "gender","count": "count","kid_edu1": "kid_edu1","kid_edu2": "kid_edu2","kid_edu3": "kid_edu3","kid_edu4": "kid_edu4","par_edu1": "par_edu1","par_edu2": "par_edu2","par_edu3": "par_edu3","par_edu4": "par_edu4","kid_edu1_cond_par_edu1": "kid_edu1_cond_par_edu1","kid_edu1_cond_par_edu2": "kid_edu1_cond_par_edu2","kid_edu1_cond_par_edu3": "kid_edu1_cond_par_edu3","kid_edu1_cond_par_edu4": "kid_edu1_cond_par_edu4","kid_edu2_cond_par_edu1": "kid_edu2_cond_par_edu1","kid_edu2_cond_par_edu2": "kid_edu2_cond_par_edu2","kid_edu2_cond_par_edu3": "kid_edu2_cond_par_edu3","kid_edu2_cond_par_edu4": "kid_edu2_cond_par_edu4","kid_edu3_cond_par_edu1": "kid_edu3_cond_par_edu1","kid_edu3_cond_par_edu2": "kid_edu3_cond_par_edu2","kid_edu3_cond_par_edu3": "kid_edu3_cond_par_edu3","kid_edu3_cond_par_edu4": "kid_edu3_cond_par_edu4","kid_edu4_cond_par_edu1": "kid_edu4_cond_par_edu1","kid_edu4_cond_par_edu2": "kid_edu4_cond_par_edu2","kid_edu4_cond_par_edu3": "kid_edu4_cond_par_edu3","kid_edu4_cond_par_edu4": "kid_edu4_cond_par_edu4"}',
             "PIPELINE_NAME": "intergenerational_transition_matrices_of_educational_attainment_by_race_and_gender",
+            "PROFILE": "{{ dag_run.conf.get('profile', params.profile) if dag_run and dag_run.conf else params.profile }}",
         },
-        resources={"limit_memory": "2G", "limit_cpu": "1"},
+        resources={"limit_memory": "1G", "limit_cpu": "1"},
     )
 
     # Task to load CSV data to a BigQuery table
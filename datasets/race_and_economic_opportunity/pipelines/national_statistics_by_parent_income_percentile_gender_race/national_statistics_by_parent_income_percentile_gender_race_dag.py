@@ -30,6 +30,7 @@ with DAG(
     schedule_interval="@daily",
     catchup=False,
     default_view="graph",
+    params={"profile": ""},
 ) as dag:
 
     # Run CSV transform within kubernetes pod
@@ -63,11 +64,13 @@ with DAG(
             "TARGET_FILE": "files/data_output.csv",
             "TARGET_GCS_BUCKET": "{{ var.value.composer_bucket }}",
             "TARGET_GCS_PATH": "data/race_and_economic_opportunity/national_statistics_by_parent_income_percentile_gender_race/data_output.csv",
+            "CHUNKSIZE": "100000",
             "CSV_HEADERS": '["par_pctile","count_pooled","count_aian_pooled","count_asian_pooled","count_black_pooled","count_hisp_pooled","count_white_pooled","density_aian_pooled","density_asian_pooled","density_black_pooled","density_hisp_pooled","density_white_pooled","kfr_aian_pooled","kfr_asian_pooled","kfr_black_female","kfr_black_male","kfr_black_pooled","kfr_hisp_pooled","kfr_nativemom_aian_pooled","kfr_nativemom_asian_pooled","kfr_nativemom_black_pooled","kfr_nativemom_hisp_pooled","kfr_nativemom_white_pooled","kfr_pooled","kfr_white_female","kfr_white_male","kfr_white_pooled","kid_college_black_female","kid_college_black_male","kid_college_white_female","kid_college_white_male","kid_hours_black_female","kid_hours_black_male","kid_hours_white_female","kid_hours_white_male","kid_jail_black_female","kid_jail_black_male","kid_jail_white_female","kid_jail_white_male","kid_married_black_pooled","kid_married_white_pooled","kid_no_hs_black_female","kid_no_hs_black_male","kid_no_hs_white_female","kid_no_hs_white_male","kid_pos_hours_black_female","kid_pos_hours_black_male","kid_pos_hours_white_female","kid_pos_hours_white_male","kid_wage_rank_black_female","kid_wage_rank_black_male","kid_wage_rank_white_female","kid_wage_rank_white_male","kir_black_female","kir_black_male","kir_black_pooled","kir_white_female","kir_white_male","kir_white_pooled","kir_1par_black_male","kir_1par_white_male","kir_2par_black_male","kir_2par_white_male","kir_par_nohome_black_male","kir_par_nohome_white_male","spouse_rank_black_female","spouse_rank_black_male","spouse_rank_white_female","spouse_rank_white_male"]',
             "RENAME_MAPPINGS": '{"par_pctile": "par_pctile","count_pooled": "count_pooled","count_aian_pooled": "count_aian_pooled","count_asian_pooled": "count_asian_pooled","count_black_pooled": "count_black_pooled","count_hisp_pooled": "count_hisp_pooled","count_white_pooled": "count_white_pooled","density_aian_pooled": "density_aian_pooled","density_asian_pooled": "density_asian_pooled","density_black_pooled": "density_black_pooled","density_hisp_pooled": "density_hisp_pooled","density_white_pooled": "density_white_pooled","kfr_aian_pooled": "kfr_aian_pooled","kfr_asian_pooled": "kfr_asian_pooled","kfr_black_female": "kfr_black_female","kfr_black_male": "kfr_black_male","kfr_black_pooled": "kfr_black_pooled","kfr_hisp_pooled": "kfr_hisp_pooled","kfr_nativemom_aian_pooled": "kfr_nativemom_aian_pooled","kfr_nativemom_asian_pooled": "kfr_nativemom_asian_pooled","kfr_nativemom_black_pooled": "kfr_nativemom_black_pooled","kfr_nativemom_hisp_pooled": "kfr_nativemom_hisp_pooled","kfr_nativemom_white_pooled": "kfr_nativemom_white_pooled","kfr_pooled": "kfr_pooled","kfr_white_female": "kfr_white_female","kfr_white_male": "kfr_white_male","kfr_white_pooled": "kfr_white_pooled","kid_college_black_female": "kid_college_black_female","kid_college_black_male": "kid_college_black_male","kid_college_white_female": "kid_college_white_female","kid_college_white_male": "kid_college_white_male","kid_hours_black_female": "kid_hours_black_female","kid_hours_black_male": "kid_hours_black_male","kid_hours_white_female": "kid_hours_white_female","kid_hours_white_male": "kid_hours_white_male","kid_jail_black_female": "kid_jail_black_female","kid_jail_black_male": "kid_jail_black_male","kid_jail_white_female": "kid_jail_white_female","kid_jail_white_male": "kid_jail_white_male","kid_married_black_pooled": "kid_married_black_pooled","kid_married_white_pooled": "kid_married_white_pooled","kid_no_hs_black_female": "kid_no_hs_black_female","kid_no_hs_black_male": "kid_no_hs_black_male","kid_no_hs_white_female": "kid_no_hs_white_female","kid_no_hs_white_male": "kid_no_hs_white_male","kid_pos_hours_black_female": "kid_pos_hours_black_female","kid_pos_hours_black_male": "kid_pos_hours_black_male","kid_pos_hours_white_female": "kid_pos_hours_white_female","kid_pos_hours_white_male": "kid_pos_hours_white_male","kid_wage_rank_black_female": "kid_wage_rank_black_female","kid_wage_rank_black_male": "kid_wage_rank_black_male","kid_wage_rank_white_female": "kid_wage_rank_white_female","kid_wage_rank_white_male": "kid_wage_rank_white_male","kir_black_female": "kir_black_female","kir_black_male": "kir_black_male","kir_black_pooled": "kir_black_pooled","kir_white_female": "kir_white_female","kir_white_male": "kir_white_male","kir_white_pooled ": "kir_white_pooled","kir_1par_black_male": "kir_1par_black_male","kir_1par_white_male": "kir_1par_white_male","kir_2par_black_male": "kir_2par_black_male","kir_2par_white_male": "kir_2par_white_male","kir_par_nohome_black_male": "kir_par_nohome_black_male","kir_par_nohome_white_male": "kir_par_nohome_white_male","spouse_rank_black_female": "spouse_rank_black_female","spouse_rank_black_male": "spouse_rank_black_male","spouse_rank_white_female": "spouse_rank_white_female","spouse_rank_white_male": "spouse_rank_white_male"}',
             "PIPELINE_NAME": "national_statistics_by_parent_income_percentile_gender_race",
+            "PROFILE": "{{ dag_run.conf.get('profile', params.profile) if dag_run and dag_run.conf else params.profile }}",
         },
-        resources={"limit_memory": "2G", "limit_cpu": "1"},
+        resources={"limit_memory": "1G", "limit_cpu": "1"},
     )
 
     # Task to load CSV data to a BigQuery table
@@ -30,6 +30,7 @@ with DAG(
     schedule_interval="@daily",
     catchup=False,
     default_view="graph",
+    params={"profile": ""},
 ) as dag:
 
     # Run CSV transform within kubernetes pod
@@ -63,11 +64,13 @@ with DAG(
             "TARGET_FILE": "files/data_output.csv",
             "TARGET_GCS_BUCKET": "{{ var.value.composer_bucket }}",
             "TARGET_GCS_PATH": "data/race_and_economic_opportunity/non_parametric_estimates_of_income_ranks_for_second_generation_immigrant/data_output.csv",
+            "CHUNKSIZE": "100000",
             "CSV_HEADERS": '["par_ventile","country","n_kfr_p","kfr_p","n_kir_f","kir_f","n_kir_m","kir_m"]',
             "RENAME_MAPPINGS": '{"par_ventile": "par_ventile","country": "country","n_kfr_P": "n_kfr_p","kfr_P": "kfr_p","n_kir_F": "n_kir_f","kir_F": "kir_f","n_kir_M": "n_kir_m","kir_M": "kir_m"}',
             "PIPELINE_NAME": "non_parametric_estimates_of_income_ranks_for_second_generation_immigrant",
+            "PROFILE": "{{ dag_run.conf.get('profile', params.profile) if dag_run and dag_run.conf else params.profile }}",
         },
-        resources={"limit_memory": "2G", "limit_cpu": "1"},
+        resources={"limit_memory": "1G", "limit_cpu": "1"},
     )
 
     # Task to load CSV data to a BigQuery table
@@ -30,6 +30,7 @@ with DAG(
     schedule_interval="@daily",
     catchup=False,
     default_view="graph",
+    params={"profile": ""},
 ) as dag:
 
     # Run CSV transform within kubernetes pod
@@ -63,11 +64,13 @@ with DAG(
             "TARGET_FILE": "files/data_output.csv",
             "TARGET_GCS_BUCKET": "{{ var.value.composer_bucket }}",
             "TARGET_GCS_PATH": "data/race_and_economic_opportunity/parametric_estimates_of_income_ranks_for_second_generation_immigrant_children/data_output.csv",
+            "CHUNKSIZE": "100000",
             "CSV_HEADERS": '["country","n_kfr_p","kfr_p_p25","kfr_p_p25_se","kfr_p_p75","kfr_p_p75_se","n_kir_f","kir_f_p25","kir_f_p25_se","kir_f_p75","kir_f_p75_se","n_kir_m","kir_m_p25","kir_m_p25_se","kir_m_p75","kir_m_p75_se","age_in2015_mom_p","age_in2015_dad_p","age_in2015_mom_f","age_in2015_dad_f","age_in2015_mom_m","age_in2015_dad_m","us_yrs_before_mom_p","us_yrs_before_dad_p","us_yrs_before_mom_f","us_yrs_before_dad_f","us_yrs_before_mom_m","us_yrs_before_dad_m"]',
             "RENAME_MAPPINGS": '{"country": "country","n_kfr_P": "n_kfr_p","kfr_P_p25": "kfr_p_p25","kfr_P_p25_se": "kfr_p_p25_se","kfr_P_p75": "kfr_p_p75","kfr_P_p75_se": "kfr_p_p75_se","n_kir_F": "n_kir_f","kir_F_p25": "kir_f_p25","kir_F_p25_se": "kir_f_p25_se","kir_F_p75": "kir_f_p75","kir_F_p75_se": "kir_f_p75_se","n_kir_M": "n_kir_m","kir_M_p25": "kir_m_p25","kir_M_p25_se": "kir_m_p25_se","kir_M_p75": "kir_m_p75","kir_M_p75_se": "kir_m_p75_se","age_in2015_mom_P": "age_in2015_mom_p","age_in2015_dad_P": "age_in2015_dad_p","age_in2015_mom_F": "age_in2015_mom_f","age_in2015_dad_F": "age_in2015_dad_f","age_in2015_mom_M": "age_in2015_mom_m","age_in2015_dad_M": "age_in2015_dad_m","us_yrs_before_mom_P": "us_yrs_before_mom_p","us_yrs_before_dad_P": "us_yrs_before_dad_p","us_yrs_before_mom_F": "us_yrs_before_mom_f","us_yrs_before_dad_F": "us_yrs_before_dad_f","us_yrs_before_mom_M": "us_yrs_before_mom_m","us_yrs_before_dad_M": "us_yrs_before_dad_m"}',
             "PIPELINE_NAME": "parametric_estimates_of_income_ranks_for_second_generation_immigrant_children",
+            "PROFILE": "{{ dag_run.conf.get('profile', params.profile) if dag_run and dag_run.conf else params.profile }}",
         },
-        resources={"limit_memory": "2G", "limit_cpu": "1"},
+        resources={"limit_memory": "1G", "limit_cpu": "1"},
     )
 
     # Task to load CSV data to a BigQuery table
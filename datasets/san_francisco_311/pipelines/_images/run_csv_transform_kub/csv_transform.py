@@ -17,11 +17,14 @@ import logging
 import os
 import pathlib
 
+import instrumentation
 import pandas as pd
+import profiler
 import requests
 from google.cloud import storage
 
 
+@profiler.profiled
 def main(
     source_url: str,
     source_file: pathlib.Path,
@@ -47,7 +50,7 @@ def main(
         sep=",",
         chunksize=chunksz,
     ) as reader:
-        for chunk_number, chunk in enumerate(reader):
+        for chunk_number, chunk in enumerate(instrumentation.iterate("parse", reader)):
             target_file_batch = str(target_file).replace(
                 ".csv", "-" + str(chunk_number) + ".csv"
             )
@@ -56,10 +59,12 @@ def main(
             process_chunk(df, target_file_batch, target_file, (not chunk_number == 0))
 
     upload_file_to_gcs(target_file, target_gcs_bucket, target_gcs_path)
+    instrumentation.upload_metrics(target_file, target_gcs_bucket, target_gcs_path)
 
     logging.info("San Francisco - 311 Service Requests process completed")
 
 
+@instrumentation.timed("download")
 def download_file(source_url: str, source_file: pathlib.Path) -> None:
     logging.info(f"downloading file {source_file} from {source_url}")
     r = requests.get(source_url, stream=True)
@@ -84,6 +89,7 @@ def process_chunk(
     logging.info(f"Processing batch file {target_file_batch} completed")
 
 
+@instrumentation.timed()
 def rename_headers(df: pd.DataFrame) -> pd.DataFrame:
     logging.info("Renaming headers")
     header_names = {
@@ -112,6 +118,7 @@ def rename_headers(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+@instrumentation.timed()
 def remove_empty_key_rows(df: pd.DataFrame, key_field: str) -> pd.DataFrame:
     logging.info("Removing rows with empty keys")
     df = df[df[key_field] != ""]
@@ -119,6 +126,7 @@ def remove_empty_key_rows(df: pd.DataFrame, key_field: str) -> pd.DataFrame:
     return df
 
 
+@instrumentation.timed()
 def resolve_datatypes(df: pd.DataFrame) -> pd.DataFrame:
     logging.info("Resolving datatypes")
     df["supervisor_district"] = df["supervisor_district"].astype("Int64")
@@ -126,6 +134,7 @@ def resolve_datatypes(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+@instrumentation.timed()
 def remove_parenthesis_long_lat(df: pd.DataFrame) -> pd.DataFrame:
     logging.info("Removing parenthesis from latitude and longitude")
     df["latitude"].replace("(", "", regex=False, inplace=True)
@@ -136,6 +145,7 @@ def remove_parenthesis_long_lat(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+@instrumentation.timed()
 def strip_whitespace(df: pd.DataFrame) -> pd.DataFrame:
     logging.info("Stripping whitespace")
     ws_fields = ["incident_address"]
@@ -146,6 +156,7 @@ def strip_whitespace(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+@instrumentation.timed()
 def resolve_date_format(df: pd.DataFrame) -> pd.DataFrame:
     logging.info("Resolving date formats")
     date_fields = [
@@ -173,6 +184,7 @@ def convert_dt_format(dt_str: str) -> str:
         return str(dt_str)
 
 
+@instrumentation.timed()
 def reorder_headers(df: pd.DataFrame) -> pd.DataFrame:
     logging.info("Reordering headers")
     df = df[
@@ -202,6 +214,7 @@ def reorder_headers(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+@instrumentation.timed("write")
 def save_to_new_file(df: pd.DataFrame, file_path) -> None:
     df.to_csv(file_path, index=False)
 
@@ -228,6 +241,7 @@ def append_batch_file(
         os.remove(batch_file_path)
 
 
+@instrumentation.timed("upload")
 def upload_file_to_gcs(file_path: pathlib.Path, gcs_bucket: str, gcs_path: str) -> None:
     storage_client = storage.Client()
     bucket = storage_client.bucket(gcs_bucket)
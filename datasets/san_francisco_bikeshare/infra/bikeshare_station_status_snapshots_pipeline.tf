@@ -0,0 +1,44 @@
+/**
+ * Copyright 2021 Google LLC
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *      http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+
+resource "google_bigquery_table" "san_francisco_bikeshare_bikeshare_station_status_snapshots" {
+  project    = var.project_id
+  dataset_id = "san_francisco_bikeshare"
+  table_id   = "bikeshare_station_status_snapshots"
+
+  description = "Station status of the San Francisco bikeshare, recorded every time it changes"
+  time_partitioning {
+    type = "DAY"
+
+    field = "snapshot_time"
+
+    require_partition_filter = false
+  }
+
+
+  depends_on = [
+    google_bigquery_dataset.san_francisco_bikeshare
+  ]
+}
+
+output "bigquery_table-san_francisco_bikeshare_bikeshare_station_status_snapshots-table_id" {
+  value = google_bigquery_table.san_francisco_bikeshare_bikeshare_station_status_snapshots.table_id
+}
+
+output "bigquery_table-san_francisco_bikeshare_bikeshare_station_status_snapshots-id" {
+  value = google_bigquery_table.san_francisco_bikeshare_bikeshare_station_status_snapshots.id
+}
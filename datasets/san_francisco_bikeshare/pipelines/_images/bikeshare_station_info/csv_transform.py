@@ -17,11 +17,14 @@ import logging
 import os
 import pathlib
 
+import instrumentation
 import pandas as pd
+import profiler
 import requests
 from google.cloud import storage
 
 
+@profiler.profiled
 def main(
     source_url_json: str,
     source_file: pathlib.Path,
@@ -48,7 +51,7 @@ def main(
         chunksize=chunksz,  # size of batch data, in no. of records
         sep=",",  # data column separator, typically ","
     ) as reader:
-        for chunk_number, chunk in enumerate(reader):
+        for chunk_number, chunk in enumerate(instrumentation.iterate("parse", reader)):
             target_file_batch = str(target_file).replace(
                 ".csv", "-" + str(chunk_number) + ".csv"
             )
@@ -57,6 +60,7 @@ def main(
             process_chunk(df, target_file_batch, target_file, (not chunk_number == 0))
 
     upload_file_to_gcs(target_file, target_gcs_bucket, target_gcs_path)
+    instrumentation.upload_metrics(target_file, target_gcs_bucket, target_gcs_path)
 
     logging.info("San Francisco Bikeshare Stations process completed")
 
@@ -73,6 +77,7 @@ def process_chunk(
     append_batch_file(target_file_batch, target_file, skip_header, not (skip_header))
 
 
+@instrumentation.timed()
 def rename_headers(df: pd.DataFrame) -> None:
     logging.info("Renaming Headers")
     header_names = {
@@ -94,6 +99,7 @@ def rename_headers(df: pd.DataFrame) -> None:
     return df
 
 
+@instrumentation.timed()
 def filter_empty_data(df: pd.DataFrame) -> pd.DataFrame:
     logging.info("Filter rows with empty key data")
     df = df[df["station_id"] != ""]
@@ -104,6 +110,7 @@ def filter_empty_data(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+@instrumentation.timed()
 def generate_location(df: pd.DataFrame) -> pd.DataFrame:
     logging.info("Generating location data")
     df["station_geom"] = (
@@ -117,6 +124,7 @@ def generate_location(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+@instrumentation.timed()
 def resolve_datatypes(df: pd.DataFrame) -> pd.DataFrame:
     logging.info("Resolving datatypes")
     df["region_id"] = df["region_id"].astype("Int64")
@@ -124,6 +132,7 @@ def resolve_datatypes(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+@instrumentation.timed()
 def reorder_headers(df: pd.DataFrame) -> pd.DataFrame:
     logging.info("Reordering Headers")
     df = df[
@@ -167,10 +176,12 @@ def append_batch_file(
         os.remove(batch_file_path)
 
 
+@instrumentation.timed("write")
 def save_to_new_file(df, file_path) -> None:
     df.to_csv(file_path, index=False)
 
 
+@instrumentation.timed("download")
 def download_file_json(
     source_url_json: str, source_file_json: str, source_file_csv: str
 ) -> None:
@@ -195,6 +206,7 @@ def download_file_json(
     df.to_csv(source_file_csv, index=False)
 
 
+@instrumentation.timed("upload")
 def upload_file_to_gcs(file_path: pathlib.Path, gcs_bucket: str, gcs_path: str) -> None:
     storage_client = storage.Client()
     bucket = storage_client.bucket(gcs_bucket)
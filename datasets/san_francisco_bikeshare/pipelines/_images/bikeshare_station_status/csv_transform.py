@@ -12,16 +12,54 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import csv
+import datetime
 import json
 import logging
 import os
 import pathlib
+import signal
+import threading
+import time
+import typing
 
+import instrumentation
 import pandas as pd
+import profiler
 import requests
+from google.api_core import exceptions
 from google.cloud import storage
 
-
+HTTP_TIMEOUT = 30
+# attempts at the last flush, as no later flush will retry it
+FINAL_FLUSH_ATTEMPTS = 4
+
+STATUS_COLUMNS = [
+    "station_id",
+    "num_bikes_available",
+    "num_bikes_disabled",
+    "num_docks_available",
+    "num_docks_disabled",
+    "is_installed",
+    "is_renting",
+    "is_returning",
+    "last_reported",
+    "num_ebikes_available",
+    "eightd_has_available_keys",
+]
+
+REQUIRED_COLUMNS = [
+    "station_id",
+    "num_bikes_available",
+    "num_docks_available",
+    "is_installed",
+    "is_renting",
+    "is_returning",
+    "last_reported",
+]
+
+
+@profiler.profiled
 def main(
     source_url_json: str,
     source_file: pathlib.Path,
@@ -52,7 +90,7 @@ def main(
         chunksize=chunksz,  # size of batch data, in no. of records
         sep=",",  # data column separator, typically ","
     ) as reader:
-        for chunk_number, chunk in enumerate(reader):
+        for chunk_number, chunk in enumerate(instrumentation.iterate("parse", reader)):
             target_file_batch = str(target_file).replace(
                 ".csv", "-" + str(chunk_number) + ".csv"
             )
@@ -61,6 +99,7 @@ def main(
             process_chunk(df, target_file_batch, target_file, (not chunk_number == 0))
 
     upload_file_to_gcs(target_file, target_gcs_bucket, target_gcs_path)
+    instrumentation.upload_metrics(target_file, target_gcs_bucket, target_gcs_path)
 
     logging.info("San Francisco - Bikeshare Status process completed")
 
@@ -75,6 +114,7 @@ def process_chunk(
     append_batch_file(target_file_batch, target_file, skip_header, not (skip_header))
 
 
+@instrumentation.timed()
 def rename_headers(df: pd.DataFrame) -> None:
     header_names = {
         "data.stations.eightd_has_available_keys": "eightd_has_available_keys",
@@ -95,6 +135,7 @@ def rename_headers(df: pd.DataFrame) -> None:
     return df
 
 
+@instrumentation.timed()
 def filter_empty_data(df: pd.DataFrame) -> pd.DataFrame:
     logging.info("Filter rows with empty key data")
     df = df[df["station_id"] != ""]
@@ -108,27 +149,15 @@ def filter_empty_data(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+@instrumentation.timed()
 def reorder_headers(df: pd.DataFrame) -> pd.DataFrame:
     logging.info("Re-ordering Headers")
-    df = df[
-        [
-            "station_id",
-            "num_bikes_available",
-            "num_bikes_disabled",
-            "num_docks_available",
-            "num_docks_disabled",
-            "is_installed",
-            "is_renting",
-            "is_returning",
-            "last_reported",
-            "num_ebikes_available",
-            "eightd_has_available_keys",
-        ]
-    ]
+    df = df[STATUS_COLUMNS]
 
     return df
 
 
+@instrumentation.timed("write")
 def save_to_new_file(df, file_path) -> None:
     df.to_csv(file_path, index=False)
 
@@ -154,6 +183,7 @@ def append_batch_file(
         os.remove(batch_file_path)
 
 
+@instrumentation.timed("download")
 def download_file_json(
     source_url_json: str, source_file_json: str, source_file_csv: str
 ) -> None:
@@ -180,6 +210,179 @@ def download_file_json(
     df.to_csv(source_file_csv, index=False)
 
 
+class StatusPoller:
+    """Polls a GBFS station_status feed for as long as the process runs.
+
+    The feed is requested again once its `ttl` has passed, with the validators
+    of the previous response so an unchanged feed costs a 304. Only the station
+    rows that changed since they were last seen are kept, and they are flushed
+    in micro-batches to one timestamped CSV object per `flush_interval`.
+
+    Only the snapshots of `poll_date` (UTC) are kept, so that the objects of a
+    run can be loaded into that day's partition, and polling stops at its end.
+    A batch that fails to upload is kept and retried at the next flush.
+    """
+
+    def __init__(
+        self,
+        source_url_json: str,
+        target_file: pathlib.Path,
+        target_gcs_bucket: str,
+        target_gcs_prefix: str,
+        min_poll_interval: int,
+        poll_date: datetime.date,
+    ):
+        self.source_url_json = source_url_json
+        self.target_file = target_file
+        self.target_gcs_bucket = target_gcs_bucket
+        self.target_gcs_prefix = target_gcs_prefix
+        self.min_poll_interval = min_poll_interval
+        self.poll_date = poll_date
+
+        self.session = requests.Session()
+        self.validators = {}
+        self.ttl = min_poll_interval
+        self.last_updated = None
+        self.last_rows = {}
+        self.batch = []
+        self.batch_started_at = datetime.datetime.utcnow()
+        self.stopping = threading.Event()
+
+    def run(self, duration: int, flush_interval: int) -> None:
+        end_of_day = datetime.datetime.combine(
+            self.poll_date + datetime.timedelta(days=1), datetime.time()
+        )
+        remaining = (end_of_day - datetime.datetime.utcnow()).total_seconds()
+        deadline = time.monotonic() + min(duration, remaining)
+        next_flush = time.monotonic() + flush_interval
+
+        while not self.stopping.is_set() and time.monotonic() < deadline:
+            polled_at = time.monotonic()
+            try:
+                self.poll()
+            except (requests.RequestException, ValueError, KeyError) as e:
+                logging.warning(f"Polling {self.source_url_json} failed: {e}")
+
+            if time.monotonic() >= next_flush:
+                self.flush()
+                next_flush += flush_interval
+
+            delay = max(self.ttl, self.min_poll_interval)
+            self.stopping.wait(max(polled_at + delay - time.monotonic(), 0))
+
+        self.session.close()
+        for attempt in range(FINAL_FLUSH_ATTEMPTS):
+            if self.flush():
+                return
+            time.sleep(2 ** attempt)
+        raise RuntimeError(
+            f"Failed to flush the last {len(self.batch)} rows after "
+            f"{FINAL_FLUSH_ATTEMPTS} attempts"
+        )
+
+    def stop(self, *args) -> None:
+        logging.info("Stopping, flushing the pending snapshots")
+        self.stopping.set()
+
+    def poll(self) -> None:
+        r = self.session.get(
+            self.source_url_json + ".json",
+            headers=self.validators,
+            timeout=HTTP_TIMEOUT,
+        )
+        if r.status_code == 304:
+            return
+        r.raise_for_status()
+
+        self.validators = {}
+        if r.headers.get("ETag"):
+            self.validators["If-None-Match"] = r.headers["ETag"]
+        if r.headers.get("Last-Modified"):
+            self.validators["If-Modified-Since"] = r.headers["Last-Modified"]
+
+        feed = r.json()
+        self.ttl = int(feed.get("ttl") or self.min_poll_interval)
+        if feed["last_updated"] == self.last_updated:
+            return
+        self.last_updated = feed["last_updated"]
+        self.add_snapshot(feed["data"]["stations"], feed["last_updated"])
+
+    def add_snapshot(self, stations: typing.List[dict], last_updated: int) -> None:
+        snapshot_datetime = datetime.datetime.utcfromtimestamp(last_updated)
+        snapshot_time = snapshot_datetime.strftime("%Y-%m-%d %H:%M:%S")
+        if snapshot_datetime.date() != self.poll_date:
+            logging.info(f"Skipping the snapshot at {snapshot_time}, of another day")
+            return
+        changed = 0
+        for station in stations:
+            if any(station.get(column) in (None, "") for column in REQUIRED_COLUMNS):
+                continue
+            row = [station.get(column) for column in STATUS_COLUMNS]
+            if self.last_rows.get(station["station_id"]) == row:
+                continue
+            self.last_rows[station["station_id"]] = row
+            self.batch.append(row + [snapshot_time])
+            changed += 1
+        logging.info(f"Snapshot at {snapshot_time}: {changed} stations changed")
+
+    def flush(self) -> bool:
+        """Uploads the pending rows, and returns whether none are left pending.
+        Rows that fail to upload stay pending, under the same object name.
+        """
+        if not self.batch:
+            return True
+
+        with open(self.target_file, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(STATUS_COLUMNS + ["snapshot_time"])
+            writer.writerows(self.batch)
+
+        gcs_path = (
+            f"{self.target_gcs_prefix}/"
+            f"station_status-{self.batch_started_at.strftime('%Y%m%dT%H%M%S')}.csv"
+        )
+        logging.info(
+            f"Flushing {len(self.batch)} rows to "
+            f"gs://{self.target_gcs_bucket}/{gcs_path}"
+        )
+        try:
+            upload_file_to_gcs(self.target_file, self.target_gcs_bucket, gcs_path)
+        except (exceptions.GoogleAPIError, requests.RequestException) as e:
+            logging.warning(f"Flushing to gs://{self.target_gcs_bucket} failed: {e}")
+            return False
+
+        self.batch, self.batch_started_at = [], datetime.datetime.utcnow()
+        return True
+
+
+def poll(
+    source_url_json: str,
+    target_file: pathlib.Path,
+    target_gcs_bucket: str,
+    target_gcs_prefix: str,
+    poll_duration: int,
+    flush_interval: int,
+    min_poll_interval: int,
+    poll_date: datetime.date,
+) -> None:
+    logging.info("San Francisco - Bikeshare Status poller started")
+
+    pathlib.Path("./files").mkdir(parents=True, exist_ok=True)
+    poller = StatusPoller(
+        source_url_json,
+        target_file,
+        target_gcs_bucket,
+        target_gcs_prefix,
+        min_poll_interval,
+        poll_date,
+    )
+    signal.signal(signal.SIGTERM, poller.stop)
+    poller.run(duration=poll_duration, flush_interval=flush_interval)
+
+    logging.info("San Francisco - Bikeshare Status poller completed")
+
+
+@instrumentation.timed("upload")
 def upload_file_to_gcs(file_path: pathlib.Path, gcs_bucket: str, gcs_path: str) -> None:
     storage_client = storage.Client()
     bucket = storage_client.bucket(gcs_bucket)
@@ -190,11 +393,23 @@ def upload_file_to_gcs(file_path: pathlib.Path, gcs_bucket: str, gcs_path: str)
 if __name__ == "__main__":
     logging.getLogger().setLevel(logging.INFO)
 
-    main(
-        source_url_json=os.environ["SOURCE_URL_JSON"],
-        source_file=pathlib.Path(os.environ["SOURCE_FILE"]).expanduser(),
-        target_file=pathlib.Path(os.environ["TARGET_FILE"]).expanduser(),
-        chunksize=os.environ["CHUNKSIZE"],
-        target_gcs_bucket=os.environ["TARGET_GCS_BUCKET"],
-        target_gcs_path=os.environ["TARGET_GCS_PATH"],
-    )
+    if os.getenv("MODE", "snapshot") == "poll":
+        poll(
+            source_url_json=os.environ["SOURCE_URL_JSON"],
+            target_file=pathlib.Path(os.environ["TARGET_FILE"]).expanduser(),
+            target_gcs_bucket=os.environ["TARGET_GCS_BUCKET"],
+            target_gcs_prefix=os.environ["TARGET_GCS_PREFIX"],
+            poll_duration=int(os.environ["POLL_DURATION_MINUTES"]) * 60,
+            flush_interval=int(os.getenv("FLUSH_INTERVAL_MINUTES", 10)) * 60,
+            min_poll_interval=int(os.getenv("MIN_POLL_INTERVAL_SECONDS", 10)),
+            poll_date=datetime.date.fromisoformat(os.environ["POLL_DATE"]),
+        )
+    else:
+        main(
+            source_url_json=os.environ["SOURCE_URL_JSON"],
+            source_file=pathlib.Path(os.environ["SOURCE_FILE"]).expanduser(),
+            target_file=pathlib.Path(os.environ["TARGET_FILE"]).expanduser(),
+            chunksize=os.environ["CHUNKSIZE"],
+            target_gcs_bucket=os.environ["TARGET_GCS_BUCKET"],
+            target_gcs_path=os.environ["TARGET_GCS_PATH"],
+        )
@@ -0,0 +1,173 @@
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from airflow import DAG
+from airflow.providers.google.cloud.operators import kubernetes_engine
+from airflow.providers.google.cloud.transfers import gcs_to_bigquery
+
+default_args = {
+    "owner": "Google",
+    "depends_on_past": False,
+    "start_date": "2021-03-01",
+}
+
+
+with DAG(
+    dag_id="san_francisco_bikeshare.bikeshare_station_status_snapshots",
+    default_args=default_args,
+    max_active_runs=1,
+    schedule_interval="@daily",
+    catchup=False,
+    default_view="graph",
+    params={"profile": ""},
+) as dag:
+    create_cluster = kubernetes_engine.GKECreateClusterOperator(
+        task_id="create_cluster",
+        project_id="{{ var.value.gcp_project }}",
+        location="us-central1-c",
+        body={
+            "name": "san-francisco-bikeshare--station-status-snapshots",
+            "initial_node_count": 1,
+            "network": "{{ var.value.vpc_network }}",
+            "node_config": {
+                "machine_type": "e2-small",
+                "oauth_scopes": [
+                    "https://www.googleapis.com/auth/devstorage.read_write",
+                    "https://www.googleapis.com/auth/cloud-platform",
+                ],
+            },
+        },
+    )
+
+    # Poll the station status feed for most of a day and write the changes to GCS every few minutes
+    poll_station_status = kubernetes_engine.GKEStartPodOperator(
+        task_id="poll_station_status",
+        name="bikeshare_station_status_snapshots",
+        project_id="{{ var.value.gcp_project }}",
+        location="us-central1-c",
+        cluster_name="san-francisco-bikeshare--station-status-snapshots",
+        namespace="default",
+        image_pull_policy="Always",
+        image="{{ var.json.san_francisco_bikeshare.container_registry.bikeshare_station_status }}",
+        env_vars={
+            "MODE": "poll",
+            "SOURCE_URL_JSON": "https://gbfs.baywheels.com/gbfs/en/station_status",
+            "TARGET_FILE": "files/data_output.csv",
+            "TARGET_GCS_BUCKET": "{{ var.value.composer_bucket }}",
+            "POLL_DATE": "{{ next_ds }}",
+            "TARGET_GCS_PREFIX": "data/san_francisco_bikeshare/bikeshare_station_status_snapshots/{{ next_ds }}",
+            "POLL_DURATION_MINUTES": "1380",
+            "FLUSH_INTERVAL_MINUTES": "10",
+            "MIN_POLL_INTERVAL_SECONDS": "10",
+            "PROFILE": "{{ dag_run.conf.get('profile', params.profile) if dag_run and dag_run.conf else params.profile }}",
+        },
+        resources={"limit_memory": "1G", "limit_cpu": "1"},
+    )
+
+    # Replace the day's partition with every snapshot flushed for the day, even if polling failed before the end of the day
+    load_to_bq = gcs_to_bigquery.GCSToBigQueryOperator(
+        task_id="load_to_bq",
+        bucket="{{ var.value.composer_bucket }}",
+        source_objects=[
+            "data/san_francisco_bikeshare/bikeshare_station_status_snapshots/{{ next_ds }}/*.csv"
+        ],
+        source_format="CSV",
+        destination_project_dataset_table="san_francisco_bikeshare.bikeshare_station_status_snapshots${{ next_ds_nodash }}",
+        skip_leading_rows=1,
+        write_disposition="WRITE_TRUNCATE",
+        trigger_rule="all_done",
+        schema_fields=[
+            {
+                "name": "station_id",
+                "type": "INTEGER",
+                "description": "Unique identifier of a station",
+                "mode": "REQUIRED",
+            },
+            {
+                "name": "num_bikes_available",
+                "type": "INTEGER",
+                "description": "Number of bikes available for rental",
+                "mode": "REQUIRED",
+            },
+            {
+                "name": "num_bikes_disabled",
+                "type": "INTEGER",
+                "description": "Number of disabled bikes at the station. Vendors who do not want to publicize the number of disabled bikes or docks in their system can opt to omit station capacity (in station_information), num_bikes_disabled and num_docks_disabled. If station capacity is published then broken docks/bikes can be inferred (though not specifically whether the decreased capacity is a broken bike or dock)",
+                "mode": "NULLABLE",
+            },
+            {
+                "name": "num_docks_available",
+                "type": "INTEGER",
+                "description": "Number of docks accepting bike returns",
+                "mode": "REQUIRED",
+            },
+            {
+                "name": "num_docks_disabled",
+                "type": "INTEGER",
+                "description": "Number of empty but disabled dock points at the station. This value remains as part of the spec as it is possibly useful during development",
+                "mode": "NULLABLE",
+            },
+            {
+                "name": "is_installed",
+                "type": "BOOLEAN",
+                "description": "1/0 boolean - is the station currently on the street",
+                "mode": "REQUIRED",
+            },
+            {
+                "name": "is_renting",
+                "type": "BOOLEAN",
+                "description": "1/0 boolean - is the station currently renting bikes (even if the station is empty, if it is set to allow rentals this value should be 1)",
+                "mode": "REQUIRED",
+            },
+            {
+                "name": "is_returning",
+                "type": "BOOLEAN",
+                "description": "1/0 boolean - is the station accepting bike returns (if a station is full but would allow a return if it was not full then this value should be 1)",
+                "mode": "REQUIRED",
+            },
+            {
+                "name": "last_reported",
+                "type": "INTEGER",
+                "description": "Integer POSIX timestamp indicating the last time this station reported its status to the backend",
+                "mode": "REQUIRED",
+            },
+            {
+                "name": "num_ebikes_available",
+                "type": "INTEGER",
+                "description": "",
+                "mode": "NULLABLE",
+            },
+            {
+                "name": "eightd_has_available_keys",
+                "type": "BOOLEAN",
+                "description": "",
+                "mode": "NULLABLE",
+            },
+            {
+                "name": "snapshot_time",
+                "type": "TIMESTAMP",
+                "description": "Time the feed was last updated when the station status was recorded",
+                "mode": "REQUIRED",
+            },
+        ],
+    )
+    delete_cluster = kubernetes_engine.GKEDeleteClusterOperator(
+        task_id="delete_cluster",
+        project_id="{{ var.value.gcp_project }}",
+        location="us-central1-c",
+        name="san-francisco-bikeshare--station-status-snapshots",
+    )
+
+    create_cluster >> poll_station_status >> load_to_bq >> delete_cluster
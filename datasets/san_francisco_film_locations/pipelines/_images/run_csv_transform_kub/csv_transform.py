@@ -16,11 +16,14 @@ import logging
 import os
 import pathlib
 
+import instrumentation
 import pandas as pd
+import profiler
 import requests
 from google.cloud import storage
 
 
+@profiler.profiled
 def main(
     source_url: str,
     source_file: pathlib.Path,
@@ -40,7 +43,7 @@ def main(
     with pd.read_csv(
         source_file, engine="python", encoding="utf-8", quotechar='"', chunksize=chunksz
     ) as reader:
-        for chunk_number, chunk in enumerate(reader):
+        for chunk_number, chunk in enumerate(instrumentation.iterate("parse", reader)):
             logging.info(f"Processing batch {chunk_number}")
             target_file_batch = str(target_file).replace(
                 ".csv", "-" + str(chunk_number) + ".csv"
@@ -50,10 +53,12 @@ def main(
             process_chunk(df, target_file_batch, target_file, (not chunk_number == 0))
 
     upload_file_to_gcs(target_file, target_gcs_bucket, target_gcs_path)
+    instrumentation.upload_metrics(target_file, target_gcs_bucket, target_gcs_path)
 
     logging.info("San Francisco - Film Locations process completed")
 
 
+@instrumentation.timed("download")
 def download_file(source_url: str, source_file: pathlib.Path) -> None:
     r = requests.get(source_url, stream=True)
     with open(source_file, "wb") as f:
@@ -71,6 +76,7 @@ def process_chunk(
     append_batch_file(target_file_batch, target_file, skip_header, not (skip_header))
 
 
+@instrumentation.timed()
 def rename_headers(df: pd.DataFrame) -> None:
     logging.info("Renaming Headers")
     header_names = {
@@ -92,6 +98,7 @@ def rename_headers(df: pd.DataFrame) -> None:
     return df
 
 
+@instrumentation.timed()
 def trim_whitespace(df: pd.DataFrame) -> None:
     logging.info("Trimming Whitespace")
     df["distributor"] = df["distributor"].apply(lambda x: str(x).strip())
@@ -101,6 +108,7 @@ def trim_whitespace(df: pd.DataFrame) -> None:
     return df
 
 
+@instrumentation.timed()
 def reorder_headers(df: pd.DataFrame) -> None:
     logging.info("Reordering headers..")
     df = df[
@@ -122,6 +130,7 @@ def reorder_headers(df: pd.DataFrame) -> None:
     return df
 
 
+@instrumentation.timed("write")
 def save_to_new_file(df: pd.DataFrame, file_path) -> None:
     df.to_csv(file_path, index=False)
 
@@ -147,6 +156,7 @@ def append_batch_file(
         os.remove(batch_file_path)
 
 
+@instrumentation.timed("upload")
 def upload_file_to_gcs(file_path: pathlib.Path, gcs_bucket: str, gcs_path: str) -> None:
     storage_client = storage.Client()
     bucket = storage_client.bucket(gcs_bucket)
@@ -30,6 +30,7 @@ with DAG(
     schedule_interval="@daily",
     catchup=False,
     default_view="graph",
+    params={"profile": ""},
 ) as dag:
 
     # Run CSV transform within kubernetes pod
@@ -50,6 +51,7 @@ with DAG(
             "PIPELINE_NAME": "street_trees",
             "CSV_HEADERS": '["tree_id","legal_status","species","address","site_order","site_info","plant_type","care_taker","care_assistant","plant_date","dbh","plot_size","permit_notes","x_coordinate","y_coordinate","latitude","longitude","location"]',
             "RENAME_MAPPINGS": '{"TreeID" : "tree_id" ,"qLegalStatus" : "legal_status" ,"qSpecies" : "species" ,"qAddress" : "address" ,"SiteOrder" : "site_order" ,"qSiteInfo" : "site_info" ,"PlantType" : "plant_type" ,"qCaretaker" : "care_taker" ,"qCareAssistant" : "care_assistant" ,"PlantDate" : "plant_date" ,"DBH" : "dbh" ,"PlotSize" : "plot_size" ,"PermitNotes" : "permit_notes" ,"XCoord" : "x_coordinate" ,"YCoord" : "y_coordinate" ,"Latitude" : "latitude" ,"Longitude" : "longitude" ,"Location" : "location"}',
+            "PROFILE": "{{ dag_run.conf.get('profile', params.profile) if dag_run and dag_run.conf else params.profile }}",
         },
         resources={"request_memory": "2G", "request_cpu": "1"},
     )
@@ -16,10 +16,14 @@ import logging
 import os
 import pathlib
 
+import instrumentation
 import pandas as pd
+import profiler
+import ranged_download
 from google.cloud import storage
 
 
+@profiler.profiled
 def main(
     source_url: str,
     source_file: pathlib.Path,
@@ -45,7 +49,7 @@ def main(
         chunksize=chunksz,  # size of batch data, in no. of records
         sep=",",  # data column separator, typically ","
     ) as reader:
-        for chunk_number, chunk in enumerate(reader):
+        for chunk_number, chunk in enumerate(instrumentation.iterate("parse", reader)):
             target_file_batch = str(target_file).replace(
                 ".csv", "-" + str(chunk_number) + ".csv"
             )
@@ -54,6 +58,7 @@ def main(
             process_chunk(df, target_file_batch, target_file, (not chunk_number == 0))
 
     upload_file_to_gcs(target_file, target_gcs_bucket, target_gcs_path)
+    instrumentation.upload_metrics(target_file, target_gcs_bucket, target_gcs_path)
 
     logging.info("Sunroof solar potential process completed")
 
@@ -90,6 +95,7 @@ def append_batch_file(
         os.remove(batch_file_path)
 
 
+@instrumentation.timed()
 def generate_location(df: pd.DataFrame) -> pd.DataFrame:
     logging.info("Generating location data")
     df["center_point"] = (
@@ -99,6 +105,7 @@ def generate_location(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+@instrumentation.timed()
 def reorder_headers(df: pd.DataFrame) -> pd.DataFrame:
     logging.info("Reordering headers..")
     df = df[
@@ -148,6 +155,7 @@ def remove_nan(dt_str: str) -> int:
         return int(dt_str)
 
 
+@instrumentation.timed()
 def remove_nan_cols(df: pd.DataFrame) -> pd.DataFrame:
     logging.info("Resolve NaN data")
     cols = {
@@ -168,6 +176,7 @@ def remove_nan_cols(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+@instrumentation.timed()
 def rename_headers(df: pd.DataFrame) -> pd.DataFrame:
     logging.info("Renaming columns")
     header_names = {"install_size_kw_buckets_json": "install_size_kw_buckets"}
@@ -176,15 +185,17 @@ def rename_headers(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+@instrumentation.timed("write")
 def save_to_new_file(df: pd.DataFrame, file_path) -> None:
     df.to_csv(file_path, index=False)
 
 
+@instrumentation.timed("download")
 def download_file_gs(source_url: str, source_file: pathlib.Path) -> None:
-    with open(source_file, "wb+") as file_obj:
-        storage.Client().download_blob_to_file(source_url, file_obj)
+    ranged_download.download_file(source_url, source_file)
 
 
+@instrumentation.timed("upload")
 def upload_file_to_gcs(file_path: pathlib.Path, gcs_bucket: str, gcs_path: str) -> None:
     storage_client = storage.Client()
     bucket = storage_client.bucket(gcs_bucket)
@@ -1,4 +1,5 @@
 import collections
+import concurrent.futures
 import csv
 import dataclasses
 import datetime
@@ -8,11 +9,13 @@ import json
 import logging
 import os
 import random
+import types
 import typing
 import uuid
 
 import faker
 import numpy as np
+import profiler
 from google.cloud import storage
 
 fake = faker.Faker()
@@ -23,6 +26,28 @@ order_items = list()
 events = list()
 inventory_items = list()
 
+TABLE_NAMES = ["users", "orders", "order_items", "events", "inventory_items"]
+
+# resumable upload chunk size, must be a multiple of 256 KiB
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
+# id sequences, reset per shard so that ids are unique across all shards
+USER_IDS = itertools.count(start=1)
+ORDER_IDS = itertools.count(start=1)
+ORDER_ITEM_IDS = itertools.count(start=1)
+EVENT_IDS = itertools.count(start=1)
+INVENTORY_ITEM_IDS = itertools.count(start=1)
+
+# incremental mode: generator state object and the user fields kept in its roster
+STATE_OBJECT = "generator_state.json"
+ROSTER_FIELDS = ["id", "gender", "created_at", "city", "state", "postal_code"]
+# the roster keeps a uniform sample of this many users to draw returning users from,
+# so the generator state stays the same size however many users were generated
+ROSTER_SIZE = 10000
+
+# when set, generated timestamps fall within this (start, end) interval
+TIME_WINDOW = None
+
 
 # read from local csv and return products
 def generate_products() -> typing.List[dict]:
@@ -138,14 +163,46 @@ PRODUCT_GENDER_DICT = products[0]
 PRODUCT_BY_ID_DICT = products[1]
 
 
+@profiler.profiled
 def main(
     num_of_users: int,
     target_gcs_prefix: str,
     target_gcs_bucket: str,
     source_dir: str,
     extraneous_headers: typing.List[str],
+    num_of_workers: int = 0,
+    seed: int = None,
+    incremental: bool = False,
+    new_users_per_day: float = 15,
+    repeat_order_rate: float = 0.001,
 ) -> None:
 
+    if incremental:
+        generate_incremental(
+            num_of_users=num_of_users,
+            num_of_workers=max(num_of_workers, 1),
+            seed=seed,
+            new_users_per_day=new_users_per_day,
+            repeat_order_rate=repeat_order_rate,
+            target_gcs_prefix=target_gcs_prefix,
+            target_gcs_bucket=target_gcs_bucket,
+            extraneous_headers=extraneous_headers,
+        )
+        upload_static_files(target_gcs_prefix, target_gcs_bucket, source_dir)
+        return
+
+    if num_of_workers > 0:
+        generate_sharded(
+            num_of_users=num_of_users,
+            num_of_workers=num_of_workers,
+            seed=seed,
+            target_gcs_prefix=target_gcs_prefix,
+            target_gcs_bucket=target_gcs_bucket,
+            extraneous_headers=extraneous_headers,
+        )
+        upload_static_files(target_gcs_prefix, target_gcs_bucket, source_dir)
+        return
+
     # read and generate location
     logging.info("generating data")
     for user_num in range(int(num_of_users)):
@@ -164,23 +221,32 @@ def main(
         logging.info(f"ghost event {user_num}")
         GhostEvents()
 
-    # write generated data to gcs
+    # write generated data to gcs, as the single shard of every table so that the
+    # `{table}-*.csv` load wildcard matches it
     table_dat = [users, orders, order_items, events, inventory_items]
     table_name = ["users", "orders", "order_items", "events", "inventory_items"]
     for name, table_dat in list(zip(table_name, table_dat)):
+        delete_shards(target_gcs_bucket, target_gcs_prefix, name)
         logging.info(f"converting {name} dict to csv")
         csv_data = dict_to_csv(table_dat)
+        object_name = shard_object_name(name, 0, 1)
         logging.info(
-            f"uploading output file to... gs://{target_gcs_bucket}/{target_gcs_prefix}/{name}.csv"
+            f"uploading output file to... gs://{target_gcs_bucket}/{target_gcs_prefix}/{object_name}"
         )
         upload_to_bucket(
             target_bucket=target_gcs_bucket,
             target_prefix=target_gcs_prefix,
-            target_object=f"{name}.csv",
+            target_object=object_name,
             source_data=csv_data,
         )
 
-    # upload static data to gcs
+    upload_static_files(target_gcs_prefix, target_gcs_bucket, source_dir)
+
+
+# upload static data to gcs
+def upload_static_files(
+    target_gcs_prefix: str, target_gcs_bucket: str, source_dir: str
+) -> None:
     file_names = ["products.csv", "distribution_centers.csv"]
     for file in file_names:
         logging.info(
@@ -194,6 +260,353 @@ def main(
         )
 
 
+# split users across worker processes, each streaming its own shard to gcs
+def generate_sharded(
+    num_of_users: int,
+    num_of_workers: int,
+    seed: typing.Optional[int],
+    target_gcs_prefix: str,
+    target_gcs_bucket: str,
+    extraneous_headers: typing.List[str],
+) -> dict:
+    if seed is None:
+        seed = random.SystemRandom().randrange(2 ** 32)
+    logging.info(f"generating {num_of_users} users in {num_of_workers} shards")
+    logging.info(f"base seed {seed}")
+    for name in TABLE_NAMES:
+        delete_shards(target_gcs_bucket, target_gcs_prefix, name)
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=num_of_workers) as pool:
+        futures = [
+            pool.submit(
+                generate_shard,
+                shard=shard,
+                num_of_shards=num_of_workers,
+                num_of_users=shard_size(num_of_users, num_of_workers, shard),
+                seed=seed,
+                target_gcs_prefix=target_gcs_prefix,
+                target_gcs_bucket=target_gcs_bucket,
+                extraneous_headers=extraneous_headers,
+            )
+            for shard in range(num_of_workers)
+        ]
+        row_counts = collections.Counter()
+        next_ids = collections.Counter()
+        # shards have the same number of users, give or take one, so the union of
+        # their samples is a uniform sample of all users
+        roster = []
+        for future in concurrent.futures.as_completed(futures):
+            result = future.result()
+            row_counts.update(result["row_counts"])
+            for name, next_id in result["next_ids"].items():
+                next_ids[name] = max(next_ids[name], next_id)
+            roster.extend(result["roster"])
+    for name in TABLE_NAMES:
+        logging.info(f"{name}: {row_counts[name]} rows")
+
+    # the generator state an incremental run continues from
+    return {
+        "seed": seed,
+        "run": 0,
+        "last_run_at": datetime.datetime.now(),
+        "next_ids": dict(next_ids),
+        "user_count": row_counts["users"],
+        "users": sorted(roster, key=lambda user: user["id"]),
+    }
+
+
+# number of users generated by a given shard
+def shard_size(num_of_users: int, num_of_shards: int, shard: int) -> int:
+    return num_of_users // num_of_shards + (
+        1 if shard < num_of_users % num_of_shards else 0
+    )
+
+
+# object path of a table shard, matched by the `{table}-*.csv` load wildcard
+def shard_object_name(name: str, shard: int, num_of_shards: int) -> str:
+    return f"{name}-{shard:05d}-of-{num_of_shards:05d}.csv"
+
+
+# remove shards left over from a previous run, which may have used more workers
+def delete_shards(target_bucket: str, target_prefix: str, name: str) -> None:
+    storage_client = storage.Client()
+    blobs = list(
+        storage_client.list_blobs(target_bucket, prefix=f"{target_prefix}/{name}-")
+    )
+    for blob in blobs:
+        logging.info(f"deleting stale shard gs://{target_bucket}/{blob.name}")
+        blob.delete()
+
+
+# seed every random source from the base seed and a spawn key, e.g. the shard number
+def seed_generators(seed: int, *spawn_key: int) -> None:
+    derived_seed = int(
+        np.random.SeedSequence(entropy=seed, spawn_key=spawn_key).generate_state(1)[0]
+    )
+    random.seed(derived_seed)
+    np.random.seed(derived_seed)
+    fake.seed_instance(derived_seed)
+
+
+# interleave id sequences so that shard k of n owns ids k+1, k+1+n, k+1+2n, ...
+def reset_id_counters(shard: int, num_of_shards: int) -> None:
+    global USER_IDS, ORDER_IDS, ORDER_ITEM_IDS, EVENT_IDS, INVENTORY_ITEM_IDS
+    USER_IDS = itertools.count(start=shard + 1, step=num_of_shards)
+    ORDER_IDS = itertools.count(start=shard + 1, step=num_of_shards)
+    ORDER_ITEM_IDS = itertools.count(start=shard + 1, step=num_of_shards)
+    EVENT_IDS = itertools.count(start=shard + 1, step=num_of_shards)
+    INVENTORY_ITEM_IDS = itertools.count(start=shard + 1, step=num_of_shards)
+
+
+# next unused id of every table, taken from the current id sequences
+def next_ids() -> typing.Dict[str, int]:
+    counters = [USER_IDS, ORDER_IDS, ORDER_ITEM_IDS, EVENT_IDS, INVENTORY_ITEM_IDS]
+    return {name: next(counter) for name, counter in zip(TABLE_NAMES, counters)}
+
+
+# continue id sequences from the ones recorded in the generator state
+def restore_id_counters(ids: typing.Dict[str, int]) -> None:
+    global USER_IDS, ORDER_IDS, ORDER_ITEM_IDS, EVENT_IDS, INVENTORY_ITEM_IDS
+    USER_IDS = itertools.count(start=ids["users"])
+    ORDER_IDS = itertools.count(start=ids["orders"])
+    ORDER_ITEM_IDS = itertools.count(start=ids["order_items"])
+    EVENT_IDS = itertools.count(start=ids["events"])
+    INVENTORY_ITEM_IDS = itertools.count(start=ids["inventory_items"])
+
+
+# runs inside a worker process and returns the number of rows written per table,
+# the next unused id of every table and the shard's sample of users
+def generate_shard(
+    shard: int,
+    num_of_shards: int,
+    num_of_users: int,
+    seed: int,
+    target_gcs_prefix: str,
+    target_gcs_bucket: str,
+    extraneous_headers: typing.List[str],
+) -> dict:
+    logging.getLogger().setLevel(logging.INFO)
+    seed_generators(seed, shard)
+    reset_id_counters(shard, num_of_shards)
+
+    bucket = storage.Client().bucket(target_gcs_bucket)
+    writers = {
+        name: TableWriter(
+            bucket.blob(
+                f"{target_gcs_prefix}/{shard_object_name(name, shard, num_of_shards)}"
+            )
+        )
+        for name in TABLE_NAMES
+    }
+    roster = Roster(max(ROSTER_SIZE // num_of_shards, 1), seed=f"{seed}/{shard}")
+
+    try:
+        logging.info(f"shard {shard}: generating {num_of_users} users")
+        for user_num in range(num_of_users):
+            if user_num % 1000 == 0:
+                logging.info(f"shard {shard}: user transaction {user_num}")
+            users.append(dataclasses.asdict(Users()))
+            flush_tables(writers, extraneous_headers, roster)
+
+        logging.info(f"shard {shard}: generating ghost events")
+        for _ in range(num_of_users):
+            GhostEvents()
+            flush_tables(writers, extraneous_headers, roster)
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    logging.info(f"shard {shard}: done")
+    return {
+        "row_counts": {name: writer.row_count for name, writer in writers.items()},
+        "next_ids": next_ids(),
+        "roster": roster.users,
+    }
+
+
+# write pending rows of every table and clear them, so memory stays bounded by the
+# upload buffer; new users are also recorded in the roster
+def flush_tables(
+    writers: typing.Dict[str, "TableWriter"],
+    extraneous_headers: typing.List[str],
+    roster: "Roster",
+) -> None:
+    for oi in order_items:
+        for key in extraneous_headers:
+            del oi[key]
+    for user in users:
+        roster.add({field: user[field] for field in ROSTER_FIELDS})
+    tables = [users, orders, order_items, events, inventory_items]
+    for name, rows in zip(TABLE_NAMES, tables):
+        writers[name].write_rows(rows)
+        rows.clear()
+
+
+# generate only the users, orders and events since the previous run, continuing
+# from the generator state stored in gcs; the first run generates the full history
+def generate_incremental(
+    num_of_users: int,
+    num_of_workers: int,
+    seed: typing.Optional[int],
+    new_users_per_day: float,
+    repeat_order_rate: float,
+    target_gcs_prefix: str,
+    target_gcs_bucket: str,
+    extraneous_headers: typing.List[str],
+) -> None:
+    global TIME_WINDOW
+
+    bucket = storage.Client().bucket(target_gcs_bucket)
+    state_blob = bucket.blob(f"{target_gcs_prefix}/{STATE_OBJECT}")
+    if not state_blob.exists():
+        logging.info("no generator state found, generating full history")
+        state = generate_sharded(
+            num_of_users=num_of_users,
+            num_of_workers=num_of_workers,
+            seed=seed,
+            target_gcs_prefix=target_gcs_prefix,
+            target_gcs_bucket=target_gcs_bucket,
+            extraneous_headers=extraneous_headers,
+        )
+        save_state(state_blob, state)
+        return
+
+    state = load_state(state_blob)
+    window_start = state["last_run_at"]
+    window_end = datetime.datetime.now()
+    days = (window_end - window_start).total_seconds() / (MINUTES_IN_DAY * 60)
+    logging.info(f"generating events between {window_start} and {window_end}")
+
+    TIME_WINDOW = (window_start, window_end)
+    run = state["run"] + 1
+    # two-element spawn keys never collide with the shard keys of the first run
+    seed_generators(state["seed"], run, 0)
+    restore_id_counters(state["next_ids"])
+    roster = Roster(
+        ROSTER_SIZE, state["users"], state["user_count"], seed=f"{state['seed']}/{run}"
+    )
+    # every user orders again with the same probability, and those who do are drawn
+    # from the sample of all users in the roster
+    num_of_returning_users = int(
+        np.random.binomial(roster.count, min(repeat_order_rate * days, 1.0))
+    )
+    returning_users = [
+        types.SimpleNamespace(**user)
+        for user in random.choices(roster.users, k=num_of_returning_users)
+    ]
+
+    # objects are named after the window start, so a retried run overwrites them
+    label = window_start.strftime("%Y%m%dT%H%M%S")
+    writers = {
+        name: TableWriter(bucket.blob(f"{target_gcs_prefix}/{name}-{label}.csv"))
+        for name in TABLE_NAMES
+    }
+    try:
+        num_of_new_users = int(np.random.poisson(new_users_per_day * days))
+        logging.info(f"generating {num_of_new_users} new users")
+        for _ in range(num_of_new_users):
+            users.append(dataclasses.asdict(Users()))
+            flush_tables(writers, extraneous_headers, roster)
+
+        logging.info(f"generating orders of {num_of_returning_users} returning users")
+        for user in returning_users:
+            orders.append(dataclasses.asdict(Order(user=user)))
+            flush_tables(writers, extraneous_headers, roster)
+
+        logging.info("generating ghost events")
+        for _ in range(num_of_new_users):
+            GhostEvents()
+            flush_tables(writers, extraneous_headers, roster)
+    finally:
+        for writer in writers.values():
+            writer.close()
+        TIME_WINDOW = None
+
+    for name, writer in writers.items():
+        logging.info(f"{name}: {writer.row_count} rows")
+
+    state.update(
+        run=run,
+        last_run_at=window_end,
+        next_ids=next_ids(),
+        user_count=roster.count,
+        users=roster.users,
+    )
+    save_state(state_blob, state)
+
+
+def load_state(blob: storage.Blob) -> dict:
+    state = json.loads(blob.download_as_bytes())
+    state["last_run_at"] = datetime.datetime.fromisoformat(state["last_run_at"])
+    # states saved before the roster was sampled list every user
+    state.setdefault("user_count", len(state["users"]))
+    for user in state["users"]:
+        user["created_at"] = datetime.datetime.fromisoformat(user["created_at"])
+    return state
+
+
+def save_state(blob: storage.Blob, state: dict) -> None:
+    logging.info(f"saving generator state to gs://{blob.bucket.name}/{blob.name}")
+    blob.upload_from_string(
+        json.dumps(state, default=datetime.datetime.isoformat),
+        content_type="application/json",
+    )
+
+
+# uniform sample of at most `size` of the users added so far (reservoir sampling),
+# drawn with its own random source so that it doesn't change the generated data
+class Roster:
+    def __init__(
+        self,
+        size: int,
+        users: typing.List[dict] = None,
+        count: int = 0,
+        seed: str = None,
+    ):
+        self.size = size
+        self.rng = random.Random(seed)
+        self.count = count
+        self.users = list(users or [])
+        if len(self.users) > size:
+            self.users = self.rng.sample(self.users, size)
+
+    def add(self, user: dict) -> None:
+        self.count += 1
+        if len(self.users) < self.size:
+            self.users.append(user)
+            return
+        index = self.rng.randrange(self.count)
+        if index < self.size:
+            self.users[index] = user
+
+
+# streams rows of a single table shard to gcs through a resumable upload
+class TableWriter:
+    def __init__(self, blob: storage.Blob):
+        self.blob = blob
+        self.file = None
+        self.writer = None
+        self.row_count = 0
+
+    def write_rows(self, rows: typing.List[dict]) -> None:
+        for row in rows:
+            if self.writer is None:
+                self.file = self.blob.open(
+                    "w",
+                    chunk_size=UPLOAD_CHUNK_SIZE,
+                    content_type="text/csv",
+                    newline="",
+                )
+                csv.DictWriter(self.file, fieldnames=row.keys()).writeheader()
+                self.writer = csv.writer(self.file, quoting=csv.QUOTE_NONNUMERIC)
+            self.writer.writerow(row.values())
+            self.row_count += 1
+
+    def close(self) -> None:
+        if self.file is not None:
+            self.file.close()
+
+
 # returns random address based off specified distribution
 def get_address(
     *, country: str = "*", state: str = "*", postal_code: str = "*"
@@ -287,8 +700,20 @@ def get_address(
     }
 
 
+# generates random timestamp between two dates
+def random_timestamp(
+    start_date: datetime.datetime, end_date: datetime.datetime
+) -> datetime.datetime:
+    seconds_between_dates = max((end_date - start_date).total_seconds(), 0)
+    return start_date + datetime.timedelta(
+        seconds=random.uniform(0, seconds_between_dates)
+    )
+
+
 # generates random date between now and specified date
 def created_at(start_date: datetime.datetime) -> datetime.datetime:
+    if TIME_WINDOW is not None:
+        return random_timestamp(max(start_date, TIME_WINDOW[0]), TIME_WINDOW[1])
     end_date = datetime.datetime.now()
     time_between_dates = end_date - start_date
     days_between_dates = time_between_dates.days
@@ -303,6 +728,11 @@ def created_at(start_date: datetime.datetime) -> datetime.datetime:
     return created_at
 
 
+# random uuid4 drawn from the seeded generator, so shards are reproducible
+def session_id() -> str:
+    return str(uuid.UUID(int=random.getrandbits(128), version=4))
+
+
 # generate URI for events table
 def generate_uri(event: str, product: str) -> str:
     if event == "product":
@@ -348,6 +778,10 @@ class DataUtil:
     def child_created_at(
         self, probability: str = "uniform"
     ) -> datetime.datetime:  # returns a random timestamp between now and parent date
+        if TIME_WINDOW is not None:
+            return random_timestamp(
+                max(self.parent.created_at, TIME_WINDOW[0]), TIME_WINDOW[1]
+            )
         time_between_dates = datetime.datetime.now() - self.parent.created_at
         days_between_dates = time_between_dates.days
         if days_between_dates <= 1:
@@ -389,7 +823,7 @@ class Address(object):
 @dataclasses.dataclass
 class Users(DataUtil):
     logging.info("generating user")
-    id: int = dataclasses.field(default_factory=itertools.count(start=1).__next__)
+    id: int = dataclasses.field(default_factory=lambda: next(USER_IDS))
     first_name: str = dataclasses.field(init=False)
     last_name: str = dataclasses.field(init=False)
     email: str = dataclasses.field(init=False)
@@ -484,7 +918,7 @@ class Product:
 @dataclasses.dataclass
 class Order(DataUtil):
     logging.info("generating order")
-    order_id: int = dataclasses.field(default_factory=itertools.count(start=1).__next__)
+    order_id: int = dataclasses.field(default_factory=lambda: next(ORDER_IDS))
     user_id: int = dataclasses.field(init=False)
     status: str = dataclasses.field(init=False)
     gender: str = dataclasses.field(init=False)
@@ -543,7 +977,7 @@ class Order(DataUtil):
 @dataclasses.dataclass
 class Events:
     logging.info("generating event")
-    id: int = dataclasses.field(default_factory=itertools.count(start=1).__next__)
+    id: int = dataclasses.field(default_factory=lambda: next(EVENT_IDS))
     user_id: int = dataclasses.field(init=False)
     sequence_number: int = dataclasses.field(init=False)
     session_id: str = dataclasses.field(init=False)
@@ -577,13 +1011,10 @@ class Events:
         return f"{self.created_at}, {self.ip_address}, {self.city}, {self.state}, {self.postal_code}"
 
 
-inv_item_id = 0
-
-
 @dataclasses.dataclass
 class OrderItem(DataUtil):
     logging.info("generating order item")
-    id: int = dataclasses.field(default_factory=itertools.count(start=1).__next__)
+    id: int = dataclasses.field(default_factory=lambda: next(ORDER_ITEM_IDS))
     order_id: int = dataclasses.field(init=False)
     user_id: int = dataclasses.field(init=False)
     product_id: int = dataclasses.field(init=False)
@@ -608,12 +1039,9 @@ class OrderItem(DataUtil):
     order: dataclasses.InitVar[typing.Any] = None
 
     def __post_init__(self, order=None):
-        global inv_item_id
-
         self.order_id = order.order_id
         self.user_id = order.user_id
-        inv_item_id = inv_item_id + 1
-        self.inventory_item_id = inv_item_id
+        self.inventory_item_id = next(INVENTORY_ITEM_IDS)
         self.created_at = order.created_at - datetime.timedelta(
             seconds=random.randrange(SECONDS_IN_MINUTE * 240)
         )  # order purchased within 4 hours
@@ -637,7 +1065,7 @@ class OrderItem(DataUtil):
             population=["Email", "Adwords", "Organic", "YouTube", "Facebook"],
             distribution=[0.45, 0.3, 0.05, 0.1, 0.1],
         )
-        self.session_id = str(uuid.uuid4())
+        self.session_id = session_id()
 
         self.person = order.user  # pass person object to events
         self.is_sold = True
@@ -685,8 +1113,7 @@ class OrderItem(DataUtil):
         )
         for _ in range(num_of_items):
             self.is_sold = False
-            inv_item_id += 1
-            self.inventory_item_id = inv_item_id
+            self.inventory_item_id = next(INVENTORY_ITEM_IDS)
             inventory_items.append(dataclasses.asdict(InventoryItem(order_item=self)))
 
 
@@ -755,7 +1182,7 @@ class GhostEvents(DataUtil):
         self.sequence_number = 0
         self.user_id = None
         self.created_at = created_at(datetime.datetime(2019, 1, 1))
-        self.session_id = str(uuid.uuid4())
+        self.session_id = session_id()
         self.ip_address = fake.ipv4()
         self.city = address["city"]
         self.state = address["state"]
@@ -790,11 +1217,8 @@ class GhostEvents(DataUtil):
         )
 
         for event in random_events:
-            # set ghost events ID to max of original
-            event_id = len(events)
-            self.id = event_id + 1
-            event_id = self.id
-
+            # ghost events continue the id sequence of the original events
+            self.id = next(EVENT_IDS)
             self.event_type = event
             self.uri = generate_uri(event, product)
             self.sequence_number += 1
@@ -815,4 +1239,9 @@ if __name__ == "__main__":
         target_gcs_bucket=os.environ["TARGET_GCS_BUCKET"],
         source_dir=os.environ["SOURCE_DIR"],
         extraneous_headers=json.loads(os.environ["EXTRANEOUS_HEADERS"]),
+        num_of_workers=int(os.environ.get("NUM_OF_WORKERS", "0")),
+        seed=int(os.environ["SEED"]) if os.environ.get("SEED") else None,
+        incremental=os.environ.get("INCREMENTAL", "false").lower() == "true",
+        new_users_per_day=float(os.environ.get("NEW_USERS_PER_DAY", "15")),
+        repeat_order_rate=float(os.environ.get("REPEAT_ORDER_RATE", "0.001")),
     )
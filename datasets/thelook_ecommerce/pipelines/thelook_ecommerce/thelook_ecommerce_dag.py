@@ -31,6 +31,7 @@ with DAG(
     schedule_interval="@daily",
     catchup=False,
     default_view="graph",
+    params={"profile": ""},
 ) as dag:
 
     # Run CSV transform within kubernetes pod
@@ -44,11 +45,17 @@ with DAG(
         image="{{ var.json.thelook_ecommerce.docker_image }}",
         env_vars={
             "NUM_OF_USERS": "15000",
+            "NUM_OF_WORKERS": "4",
+            "INCREMENTAL": "true",
+            "NEW_USERS_PER_DAY": "15",
+            "REPEAT_ORDER_RATE": "0.001",
             "TARGET_GCS_BUCKET": "{{ var.value.composer_bucket }}",
             "TARGET_GCS_PREFIX": "data/thelook_ecommerce",
             "SOURCE_DIR": "data",
             "EXTRANEOUS_HEADERS": '["event_type", "ip_address", "browser", "traffic_source", "session_id", "sequence_number", "uri", "is_sold"]',
+            "PROFILE": "{{ dag_run.conf.get('profile', params.profile) if dag_run and dag_run.conf else params.profile }}",
         },
+        resources={"request_memory": "4G", "request_cpu": "4"},
     )
 
     # Task to load Products data to a BigQuery table
@@ -77,7 +84,7 @@ with DAG(
     load_events_to_bq = gcs_to_bigquery.GCSToBigQueryOperator(
         task_id="load_events_to_bq",
         bucket="{{ var.value.composer_bucket }}",
-        source_objects=["data/thelook_ecommerce/events.csv"],
+        source_objects=["data/thelook_ecommerce/events-*.csv"],
         source_format="CSV",
         destination_project_dataset_table="thelook_ecommerce.events",
         skip_leading_rows=1,
@@ -103,7 +110,7 @@ with DAG(
     load_inventory_items_to_bq = gcs_to_bigquery.GCSToBigQueryOperator(
         task_id="load_inventory_items_to_bq",
         bucket="{{ var.value.composer_bucket }}",
-        source_objects=["data/thelook_ecommerce/inventory_items.csv"],
+        source_objects=["data/thelook_ecommerce/inventory_items-*.csv"],
         source_format="CSV",
         destination_project_dataset_table="thelook_ecommerce.inventory_items",
         skip_leading_rows=1,
@@ -132,7 +139,7 @@ with DAG(
     load_order_items_to_bq = gcs_to_bigquery.GCSToBigQueryOperator(
         task_id="load_order_items_to_bq",
         bucket="{{ var.value.composer_bucket }}",
-        source_objects=["data/thelook_ecommerce/order_items.csv"],
+        source_objects=["data/thelook_ecommerce/order_items-*.csv"],
         source_format="CSV",
         destination_project_dataset_table="thelook_ecommerce.order_items",
         skip_leading_rows=1,
@@ -155,7 +162,7 @@ with DAG(
     load_orders_to_bq = gcs_to_bigquery.GCSToBigQueryOperator(
         task_id="load_orders_to_bq",
         bucket="{{ var.value.composer_bucket }}",
-        source_objects=["data/thelook_ecommerce/orders.csv"],
+        source_objects=["data/thelook_ecommerce/orders-*.csv"],
         source_format="CSV",
         destination_project_dataset_table="thelook_ecommerce.orders",
         skip_leading_rows=1,
@@ -177,7 +184,7 @@ with DAG(
     load_users_to_bq = gcs_to_bigquery.GCSToBigQueryOperator(
         task_id="load_users_to_bq",
         bucket="{{ var.value.composer_bucket }}",
-        source_objects=["data/thelook_ecommerce/users.csv"],
+        source_objects=["data/thelook_ecommerce/users-*.csv"],
         source_format="CSV",
         destination_project_dataset_table="thelook_ecommerce.users",
         skip_leading_rows=1,
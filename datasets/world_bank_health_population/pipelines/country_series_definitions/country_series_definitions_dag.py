@@ -30,6 +30,7 @@ with DAG(
     schedule_interval="@daily",
     catchup=False,
     default_view="graph",
+    params={"profile": ""},
 ) as dag:
 
     # Run CSV transform within kubernetes pod
@@ -48,11 +49,13 @@ with DAG(
             "TARGET_FILE": "files/data_output.csv",
             "TARGET_GCS_BUCKET": "{{ var.value.composer_bucket }}",
             "TARGET_GCS_PATH": "data/world_bank_health_population/country_series_definitions/data_output.csv",
+            "CHUNKSIZE": "100000",
             "PIPELINE_NAME": "country_series_definitions",
             "CSV_HEADERS": '["country_code" ,"series_code" ,"description"]',
             "RENAME_MAPPINGS": '{"CountryCode":"country_code","SeriesCode":"series_code","DESCRIPTION":"description"}',
+            "PROFILE": "{{ dag_run.conf.get('profile', params.profile) if dag_run and dag_run.conf else params.profile }}",
         },
-        resources={"request_memory": "2G", "request_cpu": "1"},
+        resources={"request_memory": "1G", "request_cpu": "1"},
     )
 
     # Task to load CSV data to a BigQuery table
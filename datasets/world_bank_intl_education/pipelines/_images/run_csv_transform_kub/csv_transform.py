@@ -19,13 +19,17 @@ import logging
 import math
 import os
 import pathlib
-import subprocess
 import typing
 
+import csv_chunks
+import instrumentation
 import pandas as pd
+import profiler
+import ranged_download
 from google.cloud import storage
 
 
+@profiler.profiled
 def main(
     source_url: str,
     source_file: pathlib.Path,
@@ -36,6 +40,7 @@ def main(
     headers: typing.List[str],
     rename_mappings: dict,
     pipeline_name: str,
+    chunksize: str,
 ) -> None:
 
     logging.info(
@@ -50,9 +55,41 @@ def main(
     download_file(source_url, source_file)
 
     logging.info(f"Opening file {source_file}")
-    df = pd.read_csv(source_file, skip_blank_lines=True)
+    chunks = csv_chunks.read_csv([source_file], int(chunksize), skip_blank_lines=True)
+    for chunk_number, chunk in enumerate(instrumentation.iterate("parse", chunks)):
+        logging.info(f"Processing batch {chunk_number}")
+        process_chunk(
+            chunk,
+            target_file,
+            column_name,
+            headers,
+            rename_mappings,
+            pipeline_name,
+            append=(chunk_number > 0),
+        )
 
-    logging.info(f"Transforming {source_file} ... ")
+    logging.info(
+        f"Uploading output file to.. gs://{target_gcs_bucket}/{target_gcs_path}"
+    )
+    upload_file_to_gcs(target_file, target_gcs_bucket, target_gcs_path)
+    instrumentation.upload_metrics(target_file, target_gcs_bucket, target_gcs_path)
+
+    logging.info(
+        f"World Bank Intl Education {pipeline_name} process completed at "
+        + str(datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+    )
+
+
+def process_chunk(
+    df: pd.DataFrame,
+    target_file: pathlib.Path,
+    column_name: str,
+    headers: typing.List[str],
+    rename_mappings: dict,
+    pipeline_name: str,
+    append: bool,
+) -> None:
+    logging.info("Transforming batch ... ")
 
     logging.info(f"Transform: Dropping column {column_name} ...")
     delete_column(df, column_name)
@@ -76,35 +113,29 @@ def main(
 
     logging.info(f"Saving to output file.. {target_file}")
     try:
-        save_to_new_file(df, file_path=str(target_file))
+        save_to_new_file(df, file_path=str(target_file), append=append)
     except Exception as e:
         logging.error(f"Error saving output file: {e}.")
 
-    logging.info(
-        f"Uploading output file to.. gs://{target_gcs_bucket}/{target_gcs_path}"
-    )
-    upload_file_to_gcs(target_file, target_gcs_bucket, target_gcs_path)
-
-    logging.info(
-        f"World Bank Intl Education {pipeline_name} process completed at "
-        + str(datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-    )
-
 
+@instrumentation.timed("download")
 def download_file(source_url: str, source_file: pathlib.Path) -> None:
-    subprocess.check_call(["gsutil", "cp", f"{source_url}", f"{source_file}"])
+    ranged_download.download_file(source_url, source_file)
 
 
+@instrumentation.timed()
 def rename_headers(df: pd.DataFrame, rename_mappings: dict) -> None:
     df.rename(columns=rename_mappings, inplace=True)
 
 
+@instrumentation.timed()
 def delete_column(df: pd.DataFrame, column_name: str) -> None:
     df = df.drop(column_name, axis=1, inplace=True)
 
 
-def save_to_new_file(df: pd.DataFrame, file_path: str) -> None:
-    df.to_csv(file_path, index=False)
+@instrumentation.timed("write")
+def save_to_new_file(df: pd.DataFrame, file_path: str, append: bool = False) -> None:
+    df.to_csv(file_path, index=False, mode="a" if append else "w", header=not append)
 
 
 def change_to_integer_string(input: typing.Union[str, float]) -> str:
@@ -116,11 +147,13 @@ def change_to_integer_string(input: typing.Union[str, float]) -> str:
     return str_val
 
 
+@instrumentation.timed()
 def convert_to_integer_string(df: pd.DataFrame, columns: typing.List[str]):
     for col in columns:
         df[col] = df[col].apply(change_to_integer_string)
 
 
+@instrumentation.timed("upload")
 def upload_file_to_gcs(file_path: pathlib.Path, gcs_bucket: str, gcs_path: str) -> None:
     storage_client = storage.Client()
     bucket = storage_client.bucket(gcs_bucket)
@@ -141,4 +174,5 @@ if __name__ == "__main__":
         headers=json.loads(os.environ["CSV_HEADERS"]),
         rename_mappings=json.loads(os.environ["RENAME_MAPPINGS"]),
         pipeline_name=os.environ["PIPELINE_NAME"],
+        chunksize=os.environ["CHUNKSIZE"],
     )
@@ -0,0 +1,417 @@
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import argparse
+import ast
+import csv
+import functools
+import importlib.util
+import io
+import json
+import os
+import pathlib
+import platform
+import random
+import resource
+import shutil
+import string
+import subprocess
+import sys
+import tempfile
+import time
+import typing
+
+from ruamel import yaml
+
+try:
+    import generate_source_data
+except ModuleNotFoundError:
+    from scripts import generate_source_data
+
+yaml = yaml.YAML(typ="safe")
+
+
+CURRENT_PATH = pathlib.Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_PATH.parent
+DATASETS_PATH = PROJECT_ROOT / "datasets"
+SHARED_IMAGE_FILES_PATH = DATASETS_PATH / "_shared" / "images"
+SHARED_CUSTOM_FILES_PATH = DATASETS_PATH / "_shared" / "custom"
+BASELINE_FILE = CURRENT_PATH / "benchmark_baseline.json"
+
+DEFAULT_THRESHOLD = 0.2
+DEFAULT_REPEAT = 3
+SEED = 0
+CALIBRATION_ROWS = 200000
+
+# For each metric, whether a higher value is better
+METRICS = {
+    "rows_per_second": True,
+    "peak_memory_bytes": False,
+    "output_bytes": False,
+}
+
+
+def main(
+    dataset_id: str = None,
+    rows: int = None,
+    repeat: int = DEFAULT_REPEAT,
+    threshold: float = DEFAULT_THRESHOLD,
+    update_baseline: bool = False,
+    baseline_file: pathlib.Path = BASELINE_FILE,
+) -> int:
+    host = host_info(repeat)
+    print(f"Host: {host}")
+    results = {}
+    for image_dir in list_benchmarks(dataset_id):
+        key = benchmark_key(image_dir)
+        print(f"Benchmarking {key}")
+        results[key] = {**run_benchmark(image_dir, rows, repeat), "host": host}
+        print(format_result(key, results[key]))
+
+    baseline = json.loads(baseline_file.read_text()) if baseline_file.exists() else {}
+    if update_baseline:
+        baseline.update(results)
+        baseline_file.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        print(f"Updated the baseline in {baseline_file}")
+        return 0
+
+    regressions = compare(results, baseline, threshold)
+    for regression in regressions:
+        print(f"REGRESSION: {regression}")
+    return 1 if regressions else 0
+
+
+def host_info(repeat: int = DEFAULT_REPEAT) -> dict:
+    """Describes the machine that runs the benchmarks. Its calibration throughput,
+    of a fixed CSV workload, is recorded with every baseline, so that a baseline
+    from another machine can be scaled to this one.
+    """
+    return {
+        "cpu": cpu_model(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "calibration_rows_per_second": calibrate(CALIBRATION_ROWS, repeat),
+    }
+
+
+def cpu_model() -> str:
+    cpuinfo = pathlib.Path("/proc/cpuinfo")
+    if cpuinfo.exists():
+        for line in cpuinfo.read_text().splitlines():
+            if line.startswith("model name"):
+                return line.split(":", 1)[1].strip()
+    return platform.processor() or platform.machine()
+
+
+def calibrate(rows: int, repeat: int = DEFAULT_REPEAT) -> float:
+    """Returns the best throughput of writing and parsing back `rows` CSV rows"""
+    rng = random.Random(SEED)
+    records = [
+        (index, rng.random(), "".join(rng.choices(string.ascii_letters, k=12)))
+        for index in range(rows)
+    ]
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(records)
+        buffer.seek(0)
+        for _ in csv.reader(buffer):
+            pass
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    return round(rows / best, 1)
+
+
+def list_benchmarks(dataset_id: str = None) -> typing.List[pathlib.Path]:
+    """Returns the image folders that have a `benchmark.yaml` file"""
+    pattern = f"{dataset_id or '*'}/pipelines/_images/*/benchmark.yaml"
+    return sorted(path.parent for path in DATASETS_PATH.glob(pattern))
+
+
+def benchmark_key(image_dir: pathlib.Path) -> str:
+    return f"{image_dir.parent.parent.parent.name}/{image_dir.name}"
+
+
+def run_benchmark(
+    image_dir: pathlib.Path, rows: int = None, repeat: int = DEFAULT_REPEAT
+) -> dict:
+    """Runs the image's script `repeat` times on the same synthetic source, and
+    returns its best throughput and memory use, and the size of its output.
+    """
+    config = yaml.load((image_dir / "benchmark.yaml").read_text())
+    rows = rows or config["source"]["rows"]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        fixture = pathlib.Path(tmp_dir) / "source"
+        generate_fixture(image_dir, config, rows, fixture)
+
+        runs = []
+        for index in range(repeat):
+            work_dir = pathlib.Path(tmp_dir) / f"run_{index}"
+            work_dir.mkdir()
+            runs.append(run_once(image_dir, config, fixture, work_dir))
+
+    best = min(runs, key=lambda run: run["seconds"])
+    return {
+        "rows": rows,
+        "rows_per_second": round(rows / best["seconds"], 1),
+        "peak_memory_bytes": min(run["peak_memory_bytes"] for run in runs),
+        "output_bytes": best["output_bytes"],
+        "stage_seconds": best["stage_seconds"],
+    }
+
+
+def run_once(
+    image_dir: pathlib.Path, config: dict, fixture: pathlib.Path, work_dir: pathlib.Path
+) -> dict:
+    """Runs the image's script in a separate process, so that its peak memory use
+    and imports aren't shared with other runs.
+    """
+    env = {**os.environ, **image_env_vars(image_dir, config)}
+    result = subprocess.run(
+        [sys.executable, __file__, "--run-one", str(image_dir), str(fixture)],
+        cwd=work_dir,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(
+            f"Benchmark of {benchmark_key(image_dir)} failed:\n{result.stderr}"
+        )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def image_env_vars(image_dir: pathlib.Path, config: dict) -> typing.Dict[str, str]:
+    """Returns the env vars of the pipeline task that runs the image, with the
+    overrides of `benchmark.yaml`.
+    """
+    for task in pipeline_config(image_dir, config)["dag"]["tasks"]:
+        if task["args"]["task_id"] == config["task"]:
+            env_vars = task["args"].get("env_vars", {})
+            return {**env_vars, **config.get("env_vars", {})}
+    raise KeyError(f"Task {config['task']} not found in {config['pipeline']}")
+
+
+def pipeline_config(image_dir: pathlib.Path, config: dict) -> dict:
+    pipeline_dir = image_dir.parent.parent / config["pipeline"]
+    return yaml.load((pipeline_dir / "pipeline.yaml").read_text())
+
+
+def run_one(image_dir: pathlib.Path, fixture: pathlib.Path) -> dict:
+    """Imports the image's script, replaces its download and upload functions,
+    and runs its `if __name__ == "__main__":` block, which reads the env vars.
+    """
+    config = yaml.load((image_dir / "benchmark.yaml").read_text())
+    script = image_dir / config.get("script", "csv_transform.py")
+    sys.path[:0] = [
+        str(image_dir),
+        str(SHARED_IMAGE_FILES_PATH),
+        str(SHARED_CUSTOM_FILES_PATH),
+    ]
+
+    spec = importlib.util.spec_from_file_location(script.stem, script)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    for name in config["stubs"].get("download", []):
+        stub(module, name, functools.partial(copy_fixture, fixture))
+    for name in config["stubs"].get("upload", []):
+        stub(module, name, skip_upload)
+
+    start = time.perf_counter()
+    run_main_block(module, script)
+    seconds = time.perf_counter() - start
+
+    instrumentation = sys.modules.get("instrumentation")
+    return {
+        "seconds": seconds,
+        "peak_memory_bytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+        "output_bytes": os.path.getsize(os.environ["TARGET_FILE"]),
+        "stage_seconds": {
+            name: round(totals.seconds, 3)
+            for name, totals in (
+                instrumentation.totals if instrumentation else {}
+            ).items()
+        },
+    }
+
+
+def run_main_block(module, script: pathlib.Path) -> None:
+    tree = ast.parse(script.read_text())
+    for node in tree.body:
+        if (
+            isinstance(node, ast.If)
+            and isinstance(node.test, ast.Compare)
+            and isinstance(node.test.left, ast.Name)
+            and node.test.left.id == "__name__"
+        ):
+            code = compile(ast.Module(body=node.body, type_ignores=[]), script, "exec")
+            exec(code, vars(module))
+            return
+    raise ValueError(f"{script} has no `if __name__ == '__main__':` block")
+
+
+def stub(module, name: str, replacement: typing.Callable) -> None:
+    """Replaces a function of the script, or of a module it imports when `name`
+    is qualified, e.g. `instrumentation.upload_metrics`.
+    """
+    if "." in name:
+        module_name, name = name.rsplit(".", 1)
+        module = sys.modules[module_name]
+    setattr(module, name, replacement)
+
+
+def copy_fixture(fixture: pathlib.Path, source_url: str, source_file, *args, **kwargs):
+    pathlib.Path(source_file).parent.mkdir(parents=True, exist_ok=True)
+    shutil.copyfile(fixture, source_file)
+
+
+def skip_upload(*args, **kwargs) -> None:
+    pass
+
+
+def generate_fixture(
+    image_dir: pathlib.Path, config: dict, rows: int, file_path: pathlib.Path
+) -> None:
+    """Writes the synthetic source of the benchmark. Its columns are the ones
+    listed in `columns`, which have no nulls unless they set a `null_rate`, or
+    else the ones derived from the pipeline's schema, with the `overrides`.
+    """
+    source = config["source"]
+    if "columns" in source:
+        columns = [{"null_rate": 0, **column} for column in source["columns"]]
+    else:
+        columns = generate_source_data.source_columns(
+            pipeline_config(image_dir, config),
+            config["task"],
+            overrides=source.get("overrides"),
+        )
+    generate_source_data.generate_file(
+        columns, rows, file_path, source.get("compression"), seed=SEED
+    )
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> typing.List[str]:
+    """Returns a description of every metric that is worse than its baseline by
+    more than `threshold`, as a fraction of the baseline.
+    """
+    regressions = []
+    for key, result in results.items():
+        expected = baseline.get(key)
+        if not expected:
+            print(f"No baseline for {key}, run with --update-baseline to add one")
+            continue
+        if expected["rows"] != result["rows"]:
+            print(f"The baseline of {key} has {expected['rows']} rows, not compared")
+            continue
+
+        scale = calibration_scale(result, expected)
+        if scale != 1:
+            print(
+                f"This host calibrates at {scale:.2f} times the host of the "
+                f"baseline of {key}, its rows per second are scaled by as much"
+            )
+        for metric, higher_is_better in METRICS.items():
+            # Only the throughput depends on the speed of the host
+            value = expected[metric] * (scale if metric == "rows_per_second" else 1)
+            change = (result[metric] - value) / value
+            if (-change if higher_is_better else change) > threshold:
+                regressions.append(
+                    f"{key} {metric} went from {round(value, 1)} to "
+                    f"{result[metric]} ({change:+.1%})"
+                )
+    return regressions
+
+
+def calibration_scale(result: dict, expected: dict) -> float:
+    """Returns how much faster the host of the result is than the one of the
+    baseline, as the ratio of their calibration throughputs, or 1 when either of
+    them wasn't calibrated. The CPU model doesn't tell hosts apart: cloud VMs of
+    different speeds report the same generic model.
+    """
+    rates = [
+        host.get("calibration_rows_per_second")
+        for host in (result.get("host", {}), expected.get("host", {}))
+    ]
+    if not all(rates):
+        return 1
+    return rates[0] / rates[1]
+
+
+def format_result(key: str, result: dict) -> str:
+    stages = ", ".join(
+        f"{name}={seconds}s" for name, seconds in result["stage_seconds"].items()
+    )
+    return (
+        f"  {result['rows']} rows, {result['rows_per_second']} rows/s, "
+        f"peak memory {result['peak_memory_bytes']} bytes, "
+        f"output {result['output_bytes']} bytes"
+        + (f"\n  stages: {stages}" if stages else "")
+    )
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--run-one"]:
+        print(json.dumps(run_one(pathlib.Path(sys.argv[2]), pathlib.Path(sys.argv[3]))))
+        sys.exit(0)
+
+    parser = argparse.ArgumentParser(
+        description="Benchmark the images that have a benchmark.yaml file"
+    )
+    parser.add_argument(
+        "-d",
+        "--dataset",
+        type=str,
+        dest="dataset",
+        help="The directory name of the dataset. Defaults to all datasets.",
+    )
+    parser.add_argument(
+        "--rows",
+        type=int,
+        dest="rows",
+        help="The number of source rows, instead of the one in benchmark.yaml",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=DEFAULT_REPEAT,
+        dest="repeat",
+        help="The number of runs of each image, of which the best one is kept",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        dest="threshold",
+        help="The fraction by which a metric can be worse than its baseline",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        required=False,
+        dest="update_baseline",
+        action="store_true",
+    )
+
+    args = parser.parse_args()
+    sys.exit(
+        main(
+            dataset_id=args.dataset,
+            rows=args.rows,
+            repeat=args.repeat,
+            threshold=args.threshold,
+            update_baseline=args.update_baseline,
+        )
+    )
@@ -0,0 +1,427 @@
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""A local server that emulates GCS and HTTP(S) origins from a fixture store.
+
+The fixture store is a folder laid out as follows:
+
+    FIXTURES_DIR/gcs/BUCKET/OBJECT_NAME
+    FIXTURES_DIR/http/HOST/PATH
+
+The GCS JSON API is served on the root of the server, for clients that use
+`STORAGE_EMULATOR_HOST`, and covers what the images use: metadata, ranged
+downloads, multipart and resumable uploads, compose, listing and deletes.
+Objects written by clients are stored in a separate output folder, so the
+fixtures are never modified.
+
+HTTP(S) sources are served under `/http/HOST/PATH`, with ETag, Last-Modified,
+conditional requests and byte ranges.
+"""
+
+import base64
+import email
+import email.utils
+import hashlib
+import http.server
+import json
+import os
+import pathlib
+import re
+import shutil
+import threading
+import typing
+import urllib.parse
+import uuid
+
+import google_crc32c
+
+BUFFER_SIZE = 1024 * 1024
+
+
+class FixtureServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        fixtures_dir: pathlib.Path,
+        output_dir: pathlib.Path,
+        address: typing.Tuple[str, int] = ("127.0.0.1", 0),
+    ):
+        super().__init__(address, FixtureRequestHandler)
+        self.fixtures_dir = fixtures_dir
+        self.output_dir = output_dir
+        self.uploads_dir = output_dir / ".uploads"
+        self.uploads_dir.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+        self.objects = {}
+        self.deleted = set()
+        self.uploads = {}
+        self.generation = 0
+        self.checksums = {}
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FixtureServer":
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def http_url(self, source_url: str) -> typing.Optional[str]:
+        """Returns the URL that serves the fixture of an HTTP(S) source, if any"""
+        parsed = urllib.parse.urlparse(source_url)
+        if (
+            self.fixtures_dir / "http" / parsed.netloc / parsed.path.lstrip("/")
+        ).is_file():
+            return f"{self.url}/http/{parsed.netloc}{parsed.path}"
+        return None
+
+    def object_path(self, bucket: str, name: str) -> typing.Optional[pathlib.Path]:
+        if (bucket, name) in self.deleted:
+            return None
+        for root in (self.output_dir, self.fixtures_dir / "gcs"):
+            path = root / bucket / name
+            if path.is_file():
+                return path
+        return None
+
+    def object_resource(self, bucket: str, name: str) -> typing.Optional[dict]:
+        path = self.object_path(bucket, name)
+        if path is None:
+            return None
+        with self.lock:
+            info = self.objects.setdefault(
+                (bucket, name), {"generation": path.stat().st_mtime_ns}
+            )
+        stat = path.stat()
+        crc32c, md5 = self.checksum(path, stat)
+        return {
+            "kind": "storage#object",
+            "id": f"{bucket}/{name}/{info['generation']}",
+            "bucket": bucket,
+            "name": name,
+            "size": str(stat.st_size),
+            "generation": str(info["generation"]),
+            "metageneration": "1",
+            "etag": str(info["generation"]),
+            "contentType": info.get("contentType") or "application/octet-stream",
+            "crc32c": crc32c,
+            "md5Hash": md5,
+            "metadata": info.get("metadata"),
+            "componentCount": info.get("componentCount"),
+            "updated": email.utils.formatdate(stat.st_mtime, usegmt=True),
+        }
+
+    def checksum(
+        self, path: pathlib.Path, stat: os.stat_result
+    ) -> typing.Tuple[str, str]:
+        key = (path, stat.st_mtime_ns, stat.st_size)
+        if key not in self.checksums:
+            crc32c, md5 = google_crc32c.Checksum(), hashlib.md5()
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(BUFFER_SIZE), b""):
+                    crc32c.update(chunk)
+                    md5.update(chunk)
+            self.checksums[key] = (
+                base64.b64encode(crc32c.digest()).decode("utf-8"),
+                base64.b64encode(md5.digest()).decode("utf-8"),
+            )
+        return self.checksums[key]
+
+    def store_object(
+        self,
+        bucket: str,
+        name: str,
+        source: pathlib.Path,
+        resource: dict,
+        if_generation_match: str = None,
+    ) -> bool:
+        """Moves `source` into the output folder as the object. Returns False when
+        `if_generation_match` is 0 and the object exists.
+        """
+        with self.lock:
+            if if_generation_match == "0" and self.object_path(bucket, name):
+                source.unlink()
+                return False
+            target = self.output_dir / bucket / name
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(source, target)
+            self.generation += 1
+            self.deleted.discard((bucket, name))
+            self.objects[(bucket, name)] = {
+                "generation": self.generation,
+                "contentType": resource.get("contentType"),
+                "metadata": resource.get("metadata"),
+                "componentCount": resource.get("componentCount"),
+            }
+        return True
+
+    def delete_object(self, bucket: str, name: str) -> bool:
+        with self.lock:
+            path = self.object_path(bucket, name)
+            if path is None:
+                return False
+            if path.is_relative_to(self.output_dir):
+                path.unlink()
+            self.deleted.add((bucket, name))
+            self.objects.pop((bucket, name), None)
+        return True
+
+    def list_objects(self, bucket: str, prefix: str = "") -> typing.List[str]:
+        names = set()
+        for root in (self.output_dir / bucket, self.fixtures_dir / "gcs" / bucket):
+            if root.is_dir():
+                names.update(
+                    path.relative_to(root).as_posix()
+                    for path in root.rglob("*")
+                    if path.is_file()
+                )
+        return sorted(
+            name
+            for name in names
+            if name.startswith(prefix) and (bucket, name) not in self.deleted
+        )
+
+
+class FixtureRequestHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: FixtureServer
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+    def do_HEAD(self) -> None:
+        path, _ = self.route()
+        if path.startswith("/http/"):
+            return self.send_http_fixture(path, head=True)
+        self.send_json(404, error(404, path))
+
+    def do_GET(self) -> None:
+        path, query = self.route()
+        if path.startswith("/http/"):
+            return self.send_http_fixture(path)
+
+        match = re.fullmatch(r"(/download)?/storage/v1/b/([^/]+)/o/(.+)", path)
+        if match:
+            bucket, name = match.group(2), urllib.parse.unquote(match.group(3))
+            resource = self.server.object_resource(bucket, name)
+            if resource is None:
+                return self.send_json(404, error(404, f"{bucket}/{name}"))
+            if query.get("alt") == "media" or match.group(1):
+                return self.send_object(bucket, name, resource)
+            return self.send_json(200, resource)
+
+        match = re.fullmatch(r"/storage/v1/b/([^/]+)/o", path)
+        if match:
+            bucket = match.group(1)
+            items = [
+                self.server.object_resource(bucket, name)
+                for name in self.server.list_objects(bucket, query.get("prefix", ""))
+            ]
+            return self.send_json(200, {"kind": "storage#objects", "items": items})
+
+        match = re.fullmatch(r"/storage/v1/b/([^/]+)", path)
+        if match:
+            return self.send_json(
+                200, {"kind": "storage#bucket", "name": match.group(1)}
+            )
+        self.send_json(404, error(404, path))
+
+    def do_DELETE(self) -> None:
+        path, _ = self.route()
+        match = re.fullmatch(r"/storage/v1/b/([^/]+)/o/(.+)", path)
+        if match and self.server.delete_object(
+            match.group(1), urllib.parse.unquote(match.group(2))
+        ):
+            return self.send_json(204)
+        self.send_json(404, error(404, path))
+
+    def do_POST(self) -> None:
+        path, query = self.route()
+        match = re.fullmatch(r"/storage/v1/b/([^/]+)/o/(.+)/compose", path)
+        if match:
+            bucket, name = match.group(1), urllib.parse.unquote(match.group(2))
+            request = json.loads(self.read_body())
+            upload = self.new_upload_file()
+            with open(upload, "wb") as f:
+                for source in request["sourceObjects"]:
+                    source_path = self.server.object_path(bucket, source["name"])
+                    if source_path is None:
+                        upload.unlink()
+                        return self.send_json(404, error(404, source["name"]))
+                    with open(source_path, "rb") as part:
+                        shutil.copyfileobj(part, f, BUFFER_SIZE)
+            resource = {
+                **(request.get("destination") or {}),
+                "componentCount": len(request["sourceObjects"]),
+            }
+            self.server.store_object(bucket, name, upload, resource)
+            return self.send_json(200, self.server.object_resource(bucket, name))
+
+        match = re.fullmatch(r"/upload/storage/v1/b/([^/]+)/o", path)
+        if match and query.get("uploadType") == "multipart":
+            return self.multipart_upload(match.group(1), query)
+        if match and query.get("uploadType") == "resumable":
+            resource = json.loads(self.read_body() or b"{}")
+            upload_id = uuid.uuid4().hex
+            self.server.uploads[upload_id] = {
+                "bucket": match.group(1),
+                "name": resource.get("name") or query.get("name"),
+                "resource": resource,
+                "file": self.new_upload_file(),
+                "if_generation_match": query.get("ifGenerationMatch"),
+            }
+            location = f"{self.server.url}/upload/resumable/{upload_id}"
+            return self.send_json(200, {}, {"Location": location})
+        self.send_json(404, error(404, path))
+
+    def do_PUT(self) -> None:
+        path, _ = self.route()
+        match = re.fullmatch(r"/upload/resumable/(\w+)", path)
+        upload = self.server.uploads.get(match.group(1)) if match else None
+        if upload is None:
+            return self.send_json(404, error(404, path))
+
+        with open(upload["file"], "ab") as f:
+            f.write(self.read_body())
+        size = upload["file"].stat().st_size
+        total = self.headers.get("Content-Range", "").rpartition("/")[2]
+        if total in ("", "*") or size < int(total):
+            return self.send_json(308, None, {"Range": f"bytes=0-{size - 1}"})
+
+        del self.server.uploads[match.group(1)]
+        bucket, name = upload["bucket"], upload["name"]
+        if not self.server.store_object(
+            bucket,
+            name,
+            upload["file"],
+            upload["resource"],
+            upload["if_generation_match"],
+        ):
+            return self.send_json(412, error(412, "Precondition failed"))
+        self.send_json(200, self.server.object_resource(bucket, name))
+
+    def multipart_upload(self, bucket: str, query: typing.Dict[str, str]) -> None:
+        message = email.message_from_bytes(
+            f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode("utf-8")
+            + self.read_body()
+        )
+        metadata_part, media_part = message.get_payload()
+        resource = json.loads(metadata_part.get_payload())
+        upload = self.new_upload_file()
+        upload.write_bytes(media_part.get_payload(decode=True))
+        if not self.server.store_object(
+            bucket, resource["name"], upload, resource, query.get("ifGenerationMatch")
+        ):
+            return self.send_json(412, error(412, "Precondition failed"))
+        self.send_json(200, self.server.object_resource(bucket, resource["name"]))
+
+    def send_object(self, bucket: str, name: str, resource: dict) -> None:
+        path = self.server.object_path(bucket, name)
+        headers = {
+            "x-goog-hash": f"crc32c={resource['crc32c']},md5={resource['md5Hash']}",
+            "x-goog-generation": resource["generation"],
+            "Content-Type": resource["contentType"],
+        }
+        self.send_file(path, headers)
+
+    def send_http_fixture(self, path: str, head: bool = False) -> None:
+        file_path = self.server.fixtures_dir / "http" / urllib.parse.unquote(path[6:])
+        if not file_path.is_file():
+            return self.send_json(404, error(404, path))
+
+        stat = file_path.stat()
+        etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+        last_modified = email.utils.formatdate(stat.st_mtime, usegmt=True)
+        headers = {
+            "ETag": etag,
+            "Last-Modified": last_modified,
+            "Accept-Ranges": "bytes",
+            "Content-Type": "application/octet-stream",
+        }
+        if self.headers.get("If-None-Match") == etag or (
+            "If-None-Match" not in self.headers
+            and self.headers.get("If-Modified-Since") == last_modified
+        ):
+            self.send_response(304)
+            for header, value in headers.items():
+                self.send_header(header, value)
+            self.send_header("Content-Length", "0")
+            return self.end_headers()
+
+        if self.headers.get("If-Range") not in (None, etag, last_modified):
+            # The source changed, so the whole of it is sent instead of the range
+            del self.headers["Range"]
+        self.send_file(file_path, headers, head)
+
+    def send_file(
+        self, path: pathlib.Path, headers: typing.Dict[str, str], head: bool = False
+    ) -> None:
+        size = path.stat().st_size
+        start, end = 0, size - 1
+        status = 200
+        match = re.fullmatch(r"bytes=(\d*)-(\d*)", self.headers.get("Range", ""))
+        if match and size:
+            if match.group(1):
+                start = int(match.group(1))
+                end = min(int(match.group(2)), size - 1) if match.group(2) else end
+            else:
+                start = max(size - int(match.group(2)), 0)
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+            status = 206
+
+        self.send_response(status)
+        for header, value in headers.items():
+            self.send_header(header, value)
+        self.send_header("Content-Length", str(max(end - start + 1, 0)))
+        self.end_headers()
+        if head:
+            return
+
+        with open(path, "rb") as f:
+            f.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = f.read(min(BUFFER_SIZE, remaining))
+                if not chunk:
+                    break
+                self.wfile.write(chunk)
+                remaining -= len(chunk)
+
+    def send_json(
+        self, status: int, body: dict = None, headers: typing.Dict[str, str] = None
+    ) -> None:
+        raw = json.dumps(body).encode("utf-8") if body is not None else b""
+        self.send_response(status)
+        for header, value in (headers or {}).items():
+            self.send_header(header, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def route(self) -> typing.Tuple[str, typing.Dict[str, str]]:
+        parsed = urllib.parse.urlparse(self.path)
+        return parsed.path, dict(urllib.parse.parse_qsl(parsed.query))
+
+    def read_body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+    def new_upload_file(self) -> pathlib.Path:
+        return self.server.uploads_dir / uuid.uuid4().hex
+
+
+def error(code: int, message: str) -> dict:
+    return {"error": {"code": code, "message": message}}
@@ -14,6 +14,7 @@
 
 
 import argparse
+import itertools
 import json
 import pathlib
 import re
@@ -30,6 +31,8 @@ yaml = yaml.YAML(typ="safe")
 CURRENT_PATH = pathlib.Path(__file__).resolve().parent
 PROJECT_ROOT = CURRENT_PATH.parent
 DATASETS_PATH = PROJECT_ROOT / "datasets"
+SHARED_IMAGE_FILES_PATH = DATASETS_PATH / "_shared" / "images"
+SHARED_CUSTOM_FILES_PATH = DATASETS_PATH / "_shared" / "custom"
 AIRFLOW_TEMPLATES_PATH = PROJECT_ROOT / "templates" / "airflow"
 
 TEMPLATE_PATHS = {
@@ -43,6 +46,11 @@ TEMPLATE_PATHS = {
 DEFAULT_AIRFLOW_VERSION = 2
 AIRFLOW_IMPORTS = json.load(open(CURRENT_PATH / "dag_imports.json"))
 AIRFLOW_VERSIONS = list(AIRFLOW_IMPORTS.keys())
+POD_OPERATORS = ("KubernetesPodOperator", "GKEStartPodOperator")
+PROFILE_TEMPLATE = (
+    "{{ dag_run.conf.get('profile', params.profile) "
+    "if dag_run and dag_run.conf else params.profile }}"
+)
 
 
 def main(
@@ -70,6 +78,11 @@ def generate_pipeline_dag(dataset_id: str, pipeline_id: str, env: str):
 
     validate_airflow_version_existence_and_value(config)
     validate_dag_id_existence_and_format(config)
+    if config["dag"].get("output_check"):
+        add_output_check_tasks(config, dataset_id, pipeline_id)
+    if config["dag"].get("source_check"):
+        add_source_check_tasks(config, dataset_id, pipeline_id)
+    add_profile_param(config)
     dag_contents = generate_dag(config, dataset_id)
 
     dag_path = pipeline_dir / f"{pipeline_id}_dag.py"
@@ -82,6 +95,17 @@ def generate_pipeline_dag(dataset_id: str, pipeline_id: str, env: str):
         pipeline_id,
         PROJECT_ROOT / f".{env}",
     )
+    copy_shared_custom_files_to_dot_dir(
+        dataset_id,
+        pipeline_id,
+        PROJECT_ROOT / f".{env}",
+    )
+    copy_shared_custom_scripts_to_dot_dir(
+        dataset_id,
+        pipeline_id,
+        PROJECT_ROOT / f".{env}",
+        shared_custom_scripts(config),
+    )
 
     print_airflow_variables(dataset_id, dag_contents, env)
 
@@ -134,6 +158,191 @@ def generate_task_contents(task: dict, airflow_version: str) -> str:
     )
 
 
+def add_source_check_tasks(config: dict, dataset_id: str, pipeline_id: str):
+    """Adds a task that runs before all the others and skips the DAG run when none
+    of the sources in `dag.source_check.source_urls` changed since the last
+    successful run, and a task that records the state of the sources once all
+    the others succeeded.
+    """
+    if airflow_version(config) != "2":
+        raise ValueError("`dag.source_check` requires `dag.airflow_version: 2`")
+
+    source_urls = config["dag"]["source_check"].get("source_urls")
+    if not source_urls:
+        raise KeyError("Missing required parameter:`dag.source_check.source_urls`")
+
+    env = {
+        "airflow_home": "{{ var.value.airflow_home }}",
+        "dataset": dataset_id,
+        "pipeline": pipeline_id,
+        "STATE_FILE": "{{ var.value.airflow_data_folder }}"
+        f"/{dataset_id}/{pipeline_id}/source_state.json",
+    }
+    script = "python $airflow_home/dags/$dataset/$pipeline/custom/source_check.py"
+    roots, leaves = graph_roots_and_leaves(config)
+
+    config["dag"]["tasks"].insert(
+        0,
+        {
+            "operator": "BashOperator",
+            "description": "Skip the DAG run if none of the sources changed since the last successful run",
+            "args": {
+                "task_id": "check_source_changes",
+                "bash_command": f"{script} check",
+                "env": {**env, "SOURCE_URLS": json.dumps(source_urls)},
+            },
+        },
+    )
+    config["dag"]["tasks"].append(
+        {
+            "operator": "BashOperator",
+            "description": "Record the state of the sources once the DAG run succeeded",
+            "args": {
+                "task_id": "record_source_state",
+                "bash_command": f"{script} record",
+                "env": env,
+                # Loads skipped by an output check still count as a success
+                "trigger_rule": "none_failed",
+            },
+        }
+    )
+    config["dag"]["graph_paths"] = [
+        *config["dag"]["graph_paths"],
+        f"check_source_changes >> [{', '.join(roots)}]",
+        f"[{', '.join(leaves)}] >> record_source_state",
+    ]
+
+
+def add_output_check_tasks(config: dict, dataset_id: str, pipeline_id: str):
+    """Adds a task before each load task in `dag.output_check.load_tasks` that
+    skips the load when the fingerprint of its source object matches the one
+    recorded for the current version of the table, and a task after it that
+    records the fingerprint once the load succeeded.
+    """
+    if airflow_version(config) != "2":
+        raise ValueError("`dag.output_check` requires `dag.airflow_version: 2`")
+
+    load_task_ids = config["dag"]["output_check"].get("load_tasks")
+    if not load_task_ids:
+        raise KeyError("Missing required parameter:`dag.output_check.load_tasks`")
+
+    tasks = {task["args"]["task_id"]: task for task in config["dag"]["tasks"]}
+    edges = graph_edges(config)
+    script = "python $airflow_home/dags/$dataset/$pipeline/custom/output_check.py"
+    for load_task_id in load_task_ids:
+        load_task = tasks.get(load_task_id, {})
+        source_objects = load_task.get("args", {}).get("source_objects", [])
+        if (
+            load_task.get("operator") != "GoogleCloudStorageToBigQueryOperator"
+            or len(source_objects) != 1
+            or "*" in source_objects[0]
+        ):
+            raise ValueError(
+                f"`{load_task_id}` in `dag.output_check.load_tasks` must be a "
+                "GoogleCloudStorageToBigQueryOperator task with a single source object"
+            )
+
+        env = {
+            "airflow_home": "{{ var.value.airflow_home }}",
+            "dataset": dataset_id,
+            "pipeline": pipeline_id,
+            "BUCKET": load_task["args"]["bucket"],
+            "OBJECT": source_objects[0],
+            "TABLE": load_task["args"]["destination_project_dataset_table"],
+            "STATE_FILE": "{{ var.value.airflow_data_folder }}"
+            f"/{dataset_id}/{pipeline_id}/{load_task_id}_output_state.json",
+        }
+        check_task_id = f"check_{load_task_id}_output"
+        record_task_id = f"record_{load_task_id}_output"
+
+        index = config["dag"]["tasks"].index(load_task)
+        config["dag"]["tasks"][index:index] = [
+            {
+                "operator": "BashOperator",
+                "description": "Skip the load if its output is already in the table",
+                "args": {
+                    "task_id": check_task_id,
+                    "bash_command": f"{script} check",
+                    "env": env,
+                },
+            }
+        ]
+        config["dag"]["tasks"][index + 2 : index + 2] = [
+            {
+                "operator": "BashOperator",
+                "description": "Record the fingerprint of the loaded output",
+                "args": {
+                    "task_id": record_task_id,
+                    "bash_command": f"{script} record",
+                    "env": env,
+                },
+            }
+        ]
+
+        upstream = [up for up, down in edges if down == load_task_id]
+        for task_id in [down for up, down in edges if up == load_task_id]:
+            # A skipped load must not skip the tasks after it, e.g. deleting a cluster
+            tasks[task_id]["args"].setdefault("trigger_rule", "none_failed")
+
+        if upstream:
+            config["dag"]["graph_paths"].append(
+                f"[{', '.join(upstream)}] >> {check_task_id}"
+            )
+        config["dag"]["graph_paths"].append(
+            f"{check_task_id} >> {load_task_id} >> {record_task_id}"
+        )
+
+
+def add_profile_param(config: dict):
+    """Adds a `profile` DAG param, passed to every pod task as the `PROFILE` env
+    var, so that a single run can profile its images, e.g. by triggering it with
+    the config `{"profile": "sample"}`.
+
+    The env var is rendered from the run's config, falling back to the param: the
+    run's config only overrides params when `dag_run_conf_overrides_params` is set,
+    which it isn't by default on Airflow 2.1.
+    """
+    pod_tasks = [
+        task for task in config["dag"]["tasks"] if task["operator"] in POD_OPERATORS
+    ]
+    if airflow_version(config) != "2" or not pod_tasks:
+        return
+
+    dag_init(config).setdefault("params", {}).setdefault("profile", "")
+    for task in pod_tasks:
+        task["args"].setdefault("env_vars", {})
+        task["args"]["env_vars"].setdefault("PROFILE", PROFILE_TEMPLATE)
+
+
+def graph_edges(config: dict) -> typing.List[typing.Tuple[str, str]]:
+    """Returns the (upstream, downstream) task ID pairs laid out in
+    `dag.graph_paths`
+    """
+    edges = []
+    for path in config["dag"]["graph_paths"]:
+        steps = [re.findall(r"\w+", step) for step in path.split(">>")]
+        for upstream, downstream in zip(steps, steps[1:]):
+            edges.extend(itertools.product(upstream, downstream))
+    return edges
+
+
+def graph_roots_and_leaves(
+    config: dict,
+) -> typing.Tuple[typing.List[str], typing.List[str]]:
+    """Returns the IDs of the tasks without upstream tasks, and of the tasks
+    without downstream tasks, as laid out in `dag.graph_paths`
+    """
+    edges = graph_edges(config)
+    with_upstream = {down for _, down in edges}
+    with_downstream = {up for up, _ in edges}
+
+    task_ids = [task["args"]["task_id"] for task in config["dag"]["tasks"]]
+    return (
+        [task_id for task_id in task_ids if task_id not in with_upstream],
+        [task_id for task_id in task_ids if task_id not in with_downstream],
+    )
+
+
 def generate_shared_variables_file(env: str) -> None:
     shared_variables_file = pathlib.Path(
         PROJECT_ROOT / f".{env}" / "datasets" / "shared_variables.json"
@@ -233,6 +442,67 @@ def copy_files_to_dot_dir(dataset_id: str, pipeline_id: str, env_dir: pathlib.Pa
     )
 
 
+def copy_shared_custom_files_to_dot_dir(
+    dataset_id: str, pipeline_id: str, env_dir: pathlib.Path
+):
+    """Copies the files in the dataset's `pipelines/_custom` folder, which are
+    shared by the custom callables of its pipelines, into the pipeline's `custom`
+    folder.
+    """
+    shared_dir = DATASETS_PATH / dataset_id / "pipelines" / "_custom"
+    target_dir = (
+        env_dir / "datasets" / dataset_id / "pipelines" / pipeline_id / "custom"
+    )
+    if not shared_dir.exists() or not target_dir.exists():
+        return
+
+    subprocess.check_call(
+        ["cp", "-rf", f"{shared_dir}/.", str(target_dir)], cwd=PROJECT_ROOT
+    )
+
+
+def shared_custom_scripts(config: dict) -> typing.List[str]:
+    """Returns the scripts in `datasets/_shared/custom` that the pipeline runs:
+    the ones of its `source_check` and `output_check` tasks, and the ones its
+    own tasks run from their `custom` folder.
+    """
+    scripts = [
+        f"{check}.py"
+        for check in ("source_check", "output_check")
+        if config["dag"].get(check)
+    ]
+    commands = " ".join(
+        str(task["args"].get("bash_command", "")) for task in config["dag"]["tasks"]
+    )
+    for script in sorted(SHARED_CUSTOM_FILES_PATH.glob("*.py")):
+        if f"custom/{script.name}" in commands and script.name not in scripts:
+            scripts.append(script.name)
+    return scripts
+
+
+def copy_shared_custom_scripts_to_dot_dir(
+    dataset_id: str,
+    pipeline_id: str,
+    env_dir: pathlib.Path,
+    scripts: typing.List[str],
+):
+    """Copies the scripts in `datasets/_shared/custom` that the tasks generated
+    for the pipeline run into its `custom` folder
+    """
+    if not scripts:
+        return
+
+    target_dir = (
+        env_dir / "datasets" / dataset_id / "pipelines" / pipeline_id / "custom"
+    )
+    target_dir.mkdir(parents=True, exist_ok=True)
+    subprocess.check_call(
+        ["cp", "-f", *[str(SHARED_CUSTOM_FILES_PATH / script) for script in scripts]]
+        + [str(target_dir)],
+        cwd=PROJECT_ROOT,
+    )
+
+
 def build_images(dataset_id: str, env: str):
     parent_dir = DATASETS_PATH / dataset_id / "pipelines" / "_images"
     if not parent_dir.exists():
@@ -242,6 +512,7 @@ def build_images(dataset_id: str, env: str):
         dataset_id, parent_dir, PROJECT_ROOT / f".{env}"
     )
     for image_dir in image_dirs:
+        copy_shared_image_files(image_dir)
         build_and_push_image(dataset_id, image_dir)
 
 
@@ -257,6 +528,20 @@ def copy_image_files_to_dot_dir(
     return list_subdirs(target_dir / "_images")
 
 
+def copy_shared_image_files(image_dir: pathlib.Path):
+    """Copies the modules in `datasets/_shared/images`, which are shared by the
+    container images of all datasets, into the image's build context. The
+    scripts in `datasets/_shared/custom` are copied too, so that an image can
+    import them like its pipelines' custom scripts do.
+    """
+    for shared_dir in (SHARED_IMAGE_FILES_PATH, SHARED_CUSTOM_FILES_PATH):
+        if not shared_dir.exists():
+            continue
+        subprocess.check_call(
+            ["cp", "-rf", f"{shared_dir}/.", str(image_dir)], cwd=PROJECT_ROOT
+        )
+
+
 def build_and_push_image(dataset_id: str, image_dir: pathlib.Path):
     image_name = f"{dataset_id}__{image_dir.name}"
     tag = f"gcr.io/{gcp_project_id()}/{image_name}"
@@ -0,0 +1,460 @@
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import argparse
+import concurrent.futures
+import datetime
+import functools
+import gzip
+import itertools
+import json
+import math
+import os
+import pathlib
+import random
+import re
+import shutil
+import string
+import typing
+
+from ruamel import yaml
+
+yaml = yaml.YAML(typ="safe")
+
+
+CURRENT_PATH = pathlib.Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_PATH.parent
+DATASETS_PATH = PROJECT_ROOT / "datasets"
+
+BLOCK_ROWS = 10000
+ROWS_PER_PART = 1000000
+SAMPLE_ROWS = 1000
+DEFAULT_NULL_RATE = 0.05
+DEFAULT_CARDINALITY = 1000
+DEFAULT_LENGTH = 12
+ZIPF_EXPONENT = 1.1
+UNIQUE_FIELDS = ("id", "key", "unique_key")
+DATE_RANGE = (datetime.datetime(2001, 1, 1), datetime.datetime(2021, 12, 31))
+DATE_FORMATS = {
+    "DATE": "%Y-%m-%d",
+    "DATETIME": "%Y-%m-%d %H:%M:%S",
+    "TIMESTAMP": "%Y-%m-%d %H:%M:%S",
+}
+SIZE_UNITS = {
+    "B": 1,
+    "KB": 1000,
+    "MB": 1000 ** 2,
+    "GB": 1000 ** 3,
+    "KIB": 1024,
+    "MIB": 1024 ** 2,
+    "GIB": 1024 ** 3,
+}
+
+
+def main(
+    dataset_id: str,
+    pipeline_id: str,
+    output_file: pathlib.Path,
+    rows: int = None,
+    size: str = None,
+    task_id: str = None,
+    table_id: str = None,
+    overrides_file: pathlib.Path = None,
+    compression: str = None,
+    workers: int = None,
+    seed: int = 0,
+):
+    pipeline_dir = DATASETS_PATH / dataset_id / "pipelines" / pipeline_id
+    config = yaml.load((pipeline_dir / "pipeline.yaml").read_text())
+    overrides = yaml.load(overrides_file.read_text()) if overrides_file else None
+    columns = source_columns(config, task_id, table_id, overrides)
+
+    if rows is None:
+        rows = estimate_rows(columns, parse_size(size), seed)
+    print(f"Generating {rows} rows of {len(columns)} columns into {output_file}")
+    generate_file(columns, rows, output_file, compression, workers, seed)
+
+
+def source_columns(
+    config: dict,
+    task_id: str = None,
+    table_id: str = None,
+    overrides: typing.Dict[str, dict] = None,
+) -> typing.List[dict]:
+    """Returns the columns of the raw source of a pipeline: the fields of its
+    table, renamed back with the `RENAME_MAPPINGS` env var of the task that runs
+    the image. `overrides` are merged into the columns by raw name, and the ones
+    that match no column are added as extra source columns.
+    """
+    env_vars = {}
+    if task_id:
+        tasks = [
+            task
+            for task in config["dag"]["tasks"]
+            if task["args"]["task_id"] == task_id
+        ]
+        if not tasks:
+            raise KeyError(f"Task {task_id} not found in the pipeline")
+        env_vars = tasks[0]["args"].get("env_vars", {})
+    raw_names = {
+        name: raw_name
+        for raw_name, name in json.loads(env_vars.get("RENAME_MAPPINGS", "{}")).items()
+    }
+
+    columns = []
+    for field in table_schema(config, table_id):
+        column = {
+            "name": raw_names.get(field["name"], field["name"]),
+            "type": field.get("type", "STRING").upper(),
+        }
+        if field.get("mode", "NULLABLE").upper() == "REQUIRED":
+            column["null_rate"] = 0
+        if field["name"] in UNIQUE_FIELDS:
+            column.update(unique=True, null_rate=0)
+        columns.append(column)
+
+    overrides = dict(overrides or {})
+    for column in columns:
+        column.update(overrides.pop(column["name"], {}))
+    columns += [{"name": name, **column} for name, column in overrides.items()]
+    return [column for column in columns if not column.get("drop")]
+
+
+def table_schema(config: dict, table_id: str = None) -> typing.List[dict]:
+    """Returns the schema of the table loaded by the pipeline, from the
+    `schema_fields` of its load task or from the `schema` of its table resource.
+    """
+    for task in config["dag"]["tasks"]:
+        args = task["args"]
+        table = args.get("destination_project_dataset_table", "")
+        if args.get("schema_fields") and (
+            not table_id or table.split(".")[-1] == table_id
+        ):
+            return args["schema_fields"]
+
+    for resource in config.get("resources", []):
+        if (
+            resource.get("type") == "bigquery_table"
+            and resource.get("schema")
+            and (not table_id or resource.get("table_id") == table_id)
+        ):
+            return json.loads(resource["schema"])
+
+    raise ValueError("No `schema_fields` or table `schema` found in the pipeline")
+
+
+def parse_size(size: str) -> int:
+    match = re.fullmatch(r"\s*([\d.]+)\s*([A-Za-z]*)\s*", size)
+    unit = (match.group(2).upper() or "B") if match else None
+    if unit not in SIZE_UNITS:
+        raise ValueError(f"Invalid size: {size}")
+    return int(float(match.group(1)) * SIZE_UNITS[unit])
+
+
+def estimate_rows(columns: typing.List[dict], size: int, seed: int = 0) -> int:
+    """Returns the number of rows that make an uncompressed file of about `size`
+    bytes, based on the average size of a sample of rows.
+    """
+    sample = generate_rows(columns, 0, SAMPLE_ROWS, seed)
+    row_size = len(sample.encode("utf-8")) / SAMPLE_ROWS
+    return max(1, round(size / row_size))
+
+
+def generate_file(
+    columns: typing.List[dict],
+    rows: int,
+    file_path: pathlib.Path,
+    compression: str = None,
+    workers: int = None,
+    seed: int = 0,
+) -> None:
+    """Writes a CSV file with a header and `rows` rows of random values. The rows
+    are generated in parts, by parallel processes that stream them to disk. The
+    parts are then concatenated, which also works for gzip files since a gzip
+    file can hold several members.
+    """
+    # Parts are made of whole blocks, so that the blocks start at the same rows
+    # whatever the number of workers. With no rows, there are no parts and only
+    # the header is written.
+    part_blocks = max(1, math.ceil(rows / (workers or os.cpu_count()) / BLOCK_ROWS))
+    part_rows = min(ROWS_PER_PART, part_blocks * BLOCK_ROWS)
+    parts = [
+        (start, min(part_rows, rows - start)) for start in range(0, rows, part_rows)
+    ]
+    part_files = [
+        file_path.with_name(f"{file_path.name}.part{index:05d}")
+        for index in range(len(parts))
+    ]
+
+    try:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(
+                    generate_part, columns, start, count, part_file, compression, seed
+                )
+                for (start, count), part_file in zip(parts, part_files)
+            ]
+            for future in concurrent.futures.as_completed(futures):
+                future.result()
+
+        with open_file(file_path, compression) as f:
+            f.write(",".join(csv_value(column["name"]) for column in columns) + "\n")
+        with open(file_path, "ab") as f:
+            for part_file in part_files:
+                with open(part_file, "rb") as part:
+                    shutil.copyfileobj(part, f)
+    finally:
+        for part_file in part_files:
+            part_file.unlink(missing_ok=True)
+
+
+def generate_part(
+    columns: typing.List[dict],
+    start: int,
+    count: int,
+    part_file: pathlib.Path,
+    compression: str = None,
+    seed: int = 0,
+) -> None:
+    with open_file(part_file, compression) as f:
+        for block_start in range(start, start + count, BLOCK_ROWS):
+            block_rows = min(BLOCK_ROWS, start + count - block_start)
+            f.write(generate_rows(columns, block_start, block_rows, seed))
+
+
+def open_file(file_path: pathlib.Path, compression: str = None) -> typing.TextIO:
+    if compression == "gzip":
+        return gzip.open(file_path, "wt", newline="")
+    return open(file_path, "w", newline="")
+
+
+def generate_rows(columns: typing.List[dict], start: int, count: int, seed: int) -> str:
+    """Returns `count` CSV rows, starting at row `start`. The values only depend
+    on the seed and the position of the rows, not on how they are split in parts.
+    """
+    rng = random.Random(f"{seed}:{start}")
+    values = [column_values(column, start, count, rng, seed) for column in columns]
+    return "".join(",".join(row) + "\n" for row in zip(*values))
+
+
+def column_values(
+    column: dict, start: int, count: int, rng: random.Random, seed: int
+) -> typing.List[str]:
+    """Returns `count` values of the column, already quoted for CSV. Only values
+    that can contain separators or quotes are quoted, as that's the bulk of the
+    time spent otherwise.
+    """
+    column_type = column.get("type", "STRING").upper()
+    if column.get("unique"):
+        values = [str(index + 1) for index in range(start, start + count)]
+    elif "choices" in column:
+        values = rng.choices(
+            [csv_value(str(choice)) for choice in column["choices"]],
+            weights=column.get("weights"),
+            k=count,
+        )
+    elif column_type in ("INTEGER", "INT64"):
+        values = integer_values(column, count, rng)
+    elif column_type in ("FLOAT", "FLOAT64", "NUMERIC", "BIGNUMERIC"):
+        values = float_values(column, count, rng)
+    elif column_type in ("BOOLEAN", "BOOL"):
+        values = rng.choices(["true", "false"], k=count)
+    elif column_type in DATE_FORMATS:
+        values = date_values(column, count, rng)
+    elif column_type == "GEOGRAPHY":
+        values = [
+            f"POINT({rng.uniform(-180, 180):.6f} {rng.uniform(-90, 90):.6f})"
+            for _ in range(count)
+        ]
+    else:
+        cardinality = column.get("cardinality", DEFAULT_CARDINALITY)
+        values = rng.choices(
+            vocabulary(
+                column["name"], column.get("length", DEFAULT_LENGTH), cardinality, seed
+            ),
+            cum_weights=zipf_weights(cardinality),
+            k=count,
+        )
+
+    null_rate = column.get("null_rate", DEFAULT_NULL_RATE)
+    for index in rng.sample(range(count), round(count * null_rate)):
+        values[index] = ""
+    return values
+
+
+def integer_values(column: dict, count: int, rng: random.Random) -> typing.List[str]:
+    """Uniform between `min` and `max` when they're set, and log-uniform up to a
+    million otherwise, so that small values are the most frequent.
+    """
+    if "min" in column or "max" in column:
+        low, high = column.get("min", 0), column.get("max", 1000000)
+        return [str(rng.randint(low, high)) for _ in range(count)]
+    return [
+        str(int(math.exp(rng.uniform(0, math.log(1000001))) - 1)) for _ in range(count)
+    ]
+
+
+def float_values(column: dict, count: int, rng: random.Random) -> typing.List[str]:
+    name = column["name"].lower()
+    if "lat" in name:
+        low, high = column.get("min", -90.0), column.get("max", 90.0)
+    elif "lon" in name or "lng" in name:
+        low, high = column.get("min", -180.0), column.get("max", 180.0)
+    else:
+        low, high = column.get("min", 0.0), column.get("max", 1000.0)
+    decimals = column.get("decimals", 6)
+    return [f"{rng.uniform(low, high):.{decimals}f}" for _ in range(count)]
+
+
+def date_values(column: dict, count: int, rng: random.Random) -> typing.List[str]:
+    start = parse_date(column.get("start"), DATE_RANGE[0])
+    end = parse_date(column.get("end"), DATE_RANGE[1])
+    seconds = int((end - start).total_seconds())
+    date_format = column.get("format", DATE_FORMATS[column["type"].upper()])
+    values = [
+        (start + datetime.timedelta(seconds=rng.randint(0, seconds))).strftime(
+            date_format
+        )
+        for _ in range(count)
+    ]
+    if any(c in date_format for c in ',"'):
+        values = [csv_value(value) for value in values]
+    return values
+
+
+def parse_date(value, default: datetime.datetime) -> datetime.datetime:
+    if value is None:
+        return default
+    if isinstance(value, datetime.date):
+        return datetime.datetime.combine(value, datetime.time())
+    return datetime.datetime.fromisoformat(str(value))
+
+
+@functools.lru_cache()
+def vocabulary(name: str, length: int, cardinality: int, seed: int) -> typing.List[str]:
+    """Returns the distinct values of a string column. They only depend on the
+    column and the seed, so every part draws from the same values.
+    """
+    rng = random.Random(f"{seed}:{name}")
+    alphabet = string.ascii_uppercase + string.digits + "  -"
+    return [
+        "".join(rng.choices(alphabet, k=rng.randint(max(1, length // 2), length)))
+        .strip()
+        .replace("  ", " ")
+        or "X"
+        for _ in range(cardinality)
+    ]
+
+
+@functools.lru_cache()
+def zipf_weights(cardinality: int) -> typing.List[float]:
+    """Cumulative weights that make the first values of the vocabulary the most
+    frequent ones, like the categories of real data.
+    """
+    return list(
+        itertools.accumulate(
+            1 / (rank ** ZIPF_EXPONENT) for rank in range(1, cardinality + 1)
+        )
+    )
+
+
+def csv_value(value: str) -> str:
+    if "," in value or '"' in value or "\n" in value:
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Generate a synthetic source file for a pipeline"
+    )
+    parser.add_argument(
+        "-d",
+        "--dataset",
+        required=True,
+        type=str,
+        dest="dataset",
+        help="The directory name of the dataset.",
+    )
+    parser.add_argument(
+        "-p",
+        "--pipeline",
+        required=True,
+        type=str,
+        dest="pipeline",
+        help="The directory name of the pipeline",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        required=True,
+        type=pathlib.Path,
+        dest="output",
+        help="The source file to write",
+    )
+    size_group = parser.add_mutually_exclusive_group(required=True)
+    size_group.add_argument(
+        "--rows", type=int, dest="rows", help="The number of rows to generate"
+    )
+    size_group.add_argument(
+        "--size",
+        type=str,
+        dest="size",
+        help="The uncompressed size of the file to generate, e.g. 10GB",
+    )
+    parser.add_argument(
+        "-t",
+        "--task",
+        type=str,
+        dest="task",
+        help="The task that runs the image, to read its RENAME_MAPPINGS env var",
+    )
+    parser.add_argument(
+        "--table",
+        type=str,
+        dest="table",
+        help="The table whose schema is used, when the pipeline has several",
+    )
+    parser.add_argument(
+        "--overrides",
+        type=pathlib.Path,
+        dest="overrides",
+        help="A YAML file of column settings by source column name",
+    )
+    parser.add_argument(
+        "--compression", choices=["gzip"], dest="compression", help="Compress the file"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        dest="workers",
+        help="The number of parallel processes. Defaults to the number of CPUs.",
+    )
+    parser.add_argument("--seed", type=int, default=0, dest="seed")
+
+    args = parser.parse_args()
+    main(
+        dataset_id=args.dataset,
+        pipeline_id=args.pipeline,
+        output_file=args.output,
+        rows=args.rows,
+        size=args.size,
+        task_id=args.task,
+        table_id=args.table,
+        overrides_file=args.overrides,
+        compression=args.compression,
+        workers=args.workers,
+        seed=args.seed,
+    )
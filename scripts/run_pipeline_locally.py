@@ -0,0 +1,437 @@
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import argparse
+import concurrent.futures
+import datetime
+import fnmatch
+import json
+import os
+import pathlib
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import typing
+import uuid
+
+import jinja2
+from ruamel import yaml
+
+try:
+    import fixture_server
+    import generate_dag
+except ModuleNotFoundError:
+    from scripts import fixture_server, generate_dag
+
+yaml = yaml.YAML(typ="safe")
+
+
+CURRENT_PATH = pathlib.Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_PATH.parent
+DATASETS_PATH = PROJECT_ROOT / "datasets"
+SHARED_IMAGE_FILES_PATH = DATASETS_PATH / "_shared" / "images"
+SHARED_CUSTOM_FILES_PATH = DATASETS_PATH / "_shared" / "custom"
+
+DEFAULT_WORKERS = 4
+SKIP_EXIT_CODE = 99
+POD_OPERATORS = ("KubernetesPodOperator", "GKEStartPodOperator")
+NO_OP_OPERATORS = ("GKECreateClusterOperator", "GKEDeleteClusterOperator")
+FAILED_STATUSES = ("failed", "upstream_failed")
+
+
+def main(
+    dataset_id: str,
+    pipeline_id: str,
+    fixtures_dir: pathlib.Path,
+    variables_file: pathlib.Path = None,
+    execution_date: datetime.date = None,
+    workers: int = DEFAULT_WORKERS,
+    work_dir: pathlib.Path = None,
+) -> int:
+    pipeline_dir = DATASETS_PATH / dataset_id / "pipelines" / pipeline_id
+    config = yaml.load((pipeline_dir / "pipeline.yaml").read_text())
+    work_dir = pathlib.Path(
+        work_dir or tempfile.mkdtemp(prefix=f"{dataset_id}.{pipeline_id}.")
+    ).resolve()
+    work_dir.mkdir(parents=True, exist_ok=True)
+    print(f"Running {dataset_id}/{pipeline_id} locally in {work_dir}")
+
+    server = fixture_server.FixtureServer(fixtures_dir.resolve(), work_dir / "gcs")
+    server.start()
+    try:
+        variables = json.loads(variables_file.read_text()) if variables_file else {}
+        context = template_context(
+            variables, execution_date or datetime.date.today(), work_dir
+        )
+        start = time.perf_counter()
+        results = run_tasks(
+            config,
+            lambda task: run_task(task, dataset_id, context, server, work_dir),
+            workers,
+        )
+        seconds = time.perf_counter() - start
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print(format_report(results, seconds))
+    print(f"Objects written to the local GCS: {work_dir / 'gcs'}")
+    (work_dir / "report.json").write_text(
+        json.dumps({"seconds": round(seconds, 3), "tasks": results}, indent=2)
+    )
+    failed = any(result["status"] in FAILED_STATUSES for result in results.values())
+    return 1 if failed else 0
+
+
+def template_context(
+    variables: dict, execution_date: datetime.date, work_dir: pathlib.Path
+) -> dict:
+    """Returns the subset of the Airflow template context that the pipelines use,
+    with local defaults for the built-in variables.
+    """
+    values = {
+        "gcp_project": "local-project",
+        "composer_bucket": "local-composer-bucket",
+        "airflow_home": str(work_dir / "airflow"),
+        "airflow_data_folder": str(work_dir / "airflow" / "data"),
+        **variables,
+    }
+    return {
+        "ds": execution_date.isoformat(),
+        "ds_nodash": execution_date.strftime("%Y%m%d"),
+        "execution_date": datetime.datetime.combine(execution_date, datetime.time()),
+        "var": {"value": values, "json": values},
+        "macros": {"datetime": datetime, "ds_add": ds_add},
+    }
+
+
+def ds_add(ds: str, days: int) -> str:
+    return (datetime.date.fromisoformat(ds) + datetime.timedelta(days=days)).isoformat()
+
+
+def render(value: typing.Any, context: dict) -> typing.Any:
+    """Renders the Jinja templates in a task argument. Variables missing from the
+    context are rendered as empty strings.
+    """
+    if isinstance(value, str):
+        environment = jinja2.Environment(undefined=jinja2.ChainableUndefined)
+        return environment.from_string(value).render(context)
+    if isinstance(value, list):
+        return [render(item, context) for item in value]
+    if isinstance(value, dict):
+        return {key: render(item, context) for key, item in value.items()}
+    return value
+
+
+def run_tasks(
+    config: dict,
+    run: typing.Callable[[dict], dict],
+    workers: int = DEFAULT_WORKERS,
+) -> typing.Dict[str, dict]:
+    """Runs every task once all its upstream tasks in `dag.graph_paths` are done,
+    so that independent branches run in parallel, and returns the result of each
+    task in the order they finished.
+    """
+    tasks = {task["args"]["task_id"]: task for task in config["dag"]["tasks"]}
+    edges = generate_dag.graph_edges(config)
+    upstream = {
+        task_id: [up for up, down in edges if down == task_id] for task_id in tasks
+    }
+
+    results = {}
+    running = {}
+    with concurrent.futures.ThreadPoolExecutor(workers) as executor:
+        while len(results) < len(tasks):
+            progressed = False
+            for task_id, task in tasks.items():
+                if task_id in results or task_id in running.values():
+                    continue
+                if any(up not in results for up in upstream[task_id]):
+                    continue
+                progressed = True
+                status = blocked_status(
+                    task["args"].get("trigger_rule", "all_success"),
+                    [results[up]["status"] for up in upstream[task_id]],
+                )
+                if status:
+                    results[task_id] = {"status": status, "seconds": 0.0}
+                else:
+                    running[executor.submit(run, task)] = task_id
+
+            if not running:
+                if progressed:
+                    continue
+                raise ValueError(
+                    "`dag.graph_paths` has a cycle between "
+                    f"{sorted(set(tasks) - set(results))}"
+                )
+            done, _ = concurrent.futures.wait(
+                running, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                results[running.pop(future)] = future.result()
+    return results
+
+
+def blocked_status(
+    trigger_rule: str, upstream_statuses: typing.List[str]
+) -> typing.Optional[str]:
+    """Returns the status of a task that must not run given the statuses of its
+    upstream tasks and its trigger rule, or None if it can run.
+    """
+    if trigger_rule == "all_done":
+        return None
+    if any(status in FAILED_STATUSES for status in upstream_statuses):
+        return "upstream_failed"
+    if trigger_rule == "all_success" and "skipped" in upstream_statuses:
+        return "skipped"
+    return None
+
+
+def run_task(
+    task: dict,
+    dataset_id: str,
+    context: dict,
+    server: fixture_server.FixtureServer,
+    work_dir: pathlib.Path,
+) -> dict:
+    task_id = task["args"]["task_id"]
+    print(f"[{task_id}] started")
+    start = time.perf_counter()
+    try:
+        if task["operator"] in POD_OPERATORS:
+            status, note = run_pod(task, dataset_id, context, server, work_dir)
+        elif task["operator"] in NO_OP_OPERATORS:
+            status, note = "success", "no-op locally"
+        elif task["operator"] == "GoogleCloudStorageToGoogleCloudStorageOperator":
+            status, note = copy_objects(render(task["args"], context), server)
+        elif task["operator"] == "GoogleCloudStorageToBigQueryOperator":
+            status, note = check_load_sources(render(task["args"], context), server)
+        else:
+            status, note = "success", f"{task['operator']} is not run locally"
+    except Exception as e:
+        status, note = "failed", f"{type(e).__name__}: {e}"
+    seconds = round(time.perf_counter() - start, 3)
+    print(f"[{task_id}] {status} in {seconds}s" + (f" ({note})" if note else ""))
+    return {"status": status, "seconds": seconds, "note": note}
+
+
+def run_pod(
+    task: dict,
+    dataset_id: str,
+    context: dict,
+    server: fixture_server.FixtureServer,
+    work_dir: pathlib.Path,
+) -> typing.Tuple[str, str]:
+    """Runs the command of the task's image as a local process, in a copy of the
+    image folder, with the task's env vars. GCS requests go to the fixture server,
+    and so do the HTTP(S) URLs that have a fixture.
+    """
+    match = re.search(r"container_registry\.(\w+)", task["args"]["image"])
+    image_dir = (
+        DATASETS_PATH
+        / dataset_id
+        / "pipelines"
+        / "_images"
+        / (match.group(1) if match else "")
+    )
+    if not match or not image_dir.is_dir():
+        return "success", f"image {task['args']['image']} is not run locally"
+
+    task_id = task["args"]["task_id"]
+    app_dir = work_dir / task_id / "app"
+    shutil.copytree(image_dir, app_dir, dirs_exist_ok=True)
+    for shared_dir in (SHARED_IMAGE_FILES_PATH, SHARED_CUSTOM_FILES_PATH):
+        shutil.copytree(shared_dir, app_dir, dirs_exist_ok=True)
+
+    env_vars = {
+        key: rewrite_urls(str(value), server)
+        for key, value in render(task["args"].get("env_vars", {}), context).items()
+    }
+    env = {
+        **os.environ,
+        **env_vars,
+        "STORAGE_EMULATOR_HOST": server.url,
+        "GOOGLE_CLOUD_PROJECT": context["var"]["value"]["gcp_project"],
+    }
+    command = pod_command(task, image_dir, context)
+    log_file = work_dir / f"{task_id}.log"
+    with open(log_file, "w") as log:
+        returncode = subprocess.run(
+            command, cwd=app_dir, env=env, stdout=log, stderr=subprocess.STDOUT
+        ).returncode
+
+    if returncode == SKIP_EXIT_CODE:
+        return "skipped", f"log: {log_file}"
+    return ("success" if returncode == 0 else "failed"), f"log: {log_file}"
+
+
+def pod_command(task: dict, image_dir: pathlib.Path, context: dict) -> typing.List[str]:
+    """Returns the task's `cmds` and `arguments`, or the image's `CMD`, with the
+    Python interpreter replaced by the current one.
+    """
+    command = task["args"].get("cmds")
+    if not command:
+        match = re.search(
+            r"^CMD\s+(\[.*\])", (image_dir / "Dockerfile").read_text(), re.MULTILINE
+        )
+        command = json.loads(match.group(1))
+    command = render(command + task["args"].get("arguments", []), context)
+    if command[0] in ("python", "python3"):
+        command[0] = sys.executable
+    return command
+
+
+def rewrite_urls(value: str, server: fixture_server.FixtureServer) -> str:
+    """Replaces the HTTP(S) URLs in an env var that have a fixture with the URL of
+    that fixture on the server.
+    """
+    return re.sub(
+        r"https?://[^\s\"',\]]+",
+        lambda match: server.http_url(match.group(0)) or match.group(0),
+        value,
+    )
+
+
+def copy_objects(
+    args: dict, server: fixture_server.FixtureServer
+) -> typing.Tuple[str, str]:
+    source_bucket = args["source_bucket"]
+    destination_bucket = args.get("destination_bucket") or source_bucket
+    source_object = args["source_object"]
+    prefix = source_object.split("*")[0]
+
+    names = [
+        name
+        for name in server.list_objects(source_bucket, prefix)
+        if fnmatch.fnmatchcase(name, source_object)
+    ]
+    if not names:
+        return "failed", f"no objects match gs://{source_bucket}/{source_object}"
+
+    for name in names:
+        if "*" in source_object:
+            destination = (args.get("destination_object") or prefix) + name[
+                len(prefix) :
+            ]
+        else:
+            destination = args.get("destination_object") or name
+        copy = server.uploads_dir / uuid.uuid4().hex
+        shutil.copyfile(server.object_path(source_bucket, name), copy)
+        server.store_object(destination_bucket, destination, copy, {})
+        if args.get("move_object"):
+            server.delete_object(source_bucket, name)
+    return "success", f"copied {len(names)} objects"
+
+
+def check_load_sources(
+    args: dict, server: fixture_server.FixtureServer
+) -> typing.Tuple[str, str]:
+    """Checks that the objects that the task would load into BigQuery exist, as
+    the tables are not loaded locally.
+    """
+    missing = [
+        source_object
+        for source_object in args["source_objects"]
+        if not any(
+            fnmatch.fnmatchcase(name, source_object)
+            for name in server.list_objects(args["bucket"], source_object.split("*")[0])
+        )
+    ]
+    if missing:
+        return "failed", f"missing source objects in gs://{args['bucket']}: {missing}"
+    return "success", f"{args['destination_project_dataset_table']} not loaded locally"
+
+
+def format_report(results: typing.Dict[str, dict], seconds: float) -> str:
+    width = max([len(task_id) for task_id in results] + [4])
+    lines = [f"{'TASK':<{width}}  {'STATUS':<15}  {'SECONDS':>8}"]
+    for task_id, result in results.items():
+        lines.append(
+            f"{task_id:<{width}}  {result['status']:<15}  {result['seconds']:>8.3f}"
+        )
+    lines.append(f"Total wall time: {seconds:.3f}s")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Run a pipeline's tasks locally against a fixture store"
+    )
+    parser.add_argument(
+        "-d",
+        "--dataset",
+        required=True,
+        type=str,
+        dest="dataset",
+        help="The directory name of the dataset.",
+    )
+    parser.add_argument(
+        "-p",
+        "--pipeline",
+        required=True,
+        type=str,
+        dest="pipeline",
+        help="The directory name of the pipeline",
+    )
+    parser.add_argument(
+        "--fixtures",
+        required=True,
+        type=pathlib.Path,
+        dest="fixtures",
+        help="The folder with the gcs/BUCKET/OBJECT and http/HOST/PATH fixtures",
+    )
+    parser.add_argument(
+        "--variables",
+        type=pathlib.Path,
+        dest="variables",
+        help="A JSON file of Airflow variables, as used by `var.value` and `var.json`",
+    )
+    parser.add_argument(
+        "--execution-date",
+        type=datetime.date.fromisoformat,
+        dest="execution_date",
+        help="The execution date of the run, as YYYY-MM-DD. Defaults to today.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        dest="workers",
+        help="The maximum number of tasks that run at the same time",
+    )
+    parser.add_argument(
+        "--work-dir",
+        type=pathlib.Path,
+        dest="work_dir",
+        help="The folder for the task logs, copies and outputs. Defaults to a new "
+        "temporary folder.",
+    )
+
+    args = parser.parse_args()
+    sys.exit(
+        main(
+            dataset_id=args.dataset,
+            pipeline_id=args.pipeline,
+            fixtures_dir=args.fixtures,
+            variables_file=args.variables,
+            execution_date=args.execution_date,
+            workers=args.workers,
+            work_dir=args.work_dir,
+        )
+    )
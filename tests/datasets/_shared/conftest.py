@@ -0,0 +1,65 @@
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import pathlib
+import sys
+import typing
+
+import pytest
+from google.cloud import storage
+
+from scripts import fixture_server
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[3]
+SHARED_PATH = PROJECT_ROOT / "datasets" / "_shared"
+
+# The shared modules import each other as top-level modules, as they do once
+# copied into an image or a pipeline's `custom` folder
+sys.path[:0] = [str(SHARED_PATH / "images"), str(SHARED_PATH / "custom")]
+
+
+@pytest.fixture
+def server(tmp_path: pathlib.Path) -> typing.Iterator[fixture_server.FixtureServer]:
+    server = fixture_server.FixtureServer(
+        tmp_path / "fixtures", tmp_path / "output"
+    ).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(
+    server: fixture_server.FixtureServer, monkeypatch: pytest.MonkeyPatch
+) -> storage.Client:
+    monkeypatch.setenv("STORAGE_EMULATOR_HOST", server.url)
+    return storage.Client(project="test")
+
+
+@pytest.fixture
+def http_source(
+    server: fixture_server.FixtureServer,
+) -> typing.Callable[[str, bytes], str]:
+    """Returns a function that serves `content` as the HTTP(S) source `url`,
+    and returns the URL of the fixture server that serves it.
+    """
+
+    def write(url: str, content: bytes) -> str:
+        path = server.fixtures_dir / "http" / url.split("://", 1)[1]
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+        return server.http_url(url)
+
+    return write
@@ -0,0 +1,131 @@
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import datetime
+import json
+import pathlib
+import types
+import typing
+
+import gcs_upload
+import output_check
+import pytest
+from google.api_core import exceptions
+from google.cloud import storage
+
+TABLE = "project.dataset.table"
+
+
+class FakeBigQueryClient:
+    """Returns the tables in `tables`, by ID, with their last modification time"""
+
+    tables: typing.Dict[str, datetime.datetime] = {}
+
+    def get_table(self, table_id: str) -> types.SimpleNamespace:
+        if table_id not in self.tables:
+            raise exceptions.NotFound(table_id)
+        return types.SimpleNamespace(modified=self.tables[table_id])
+
+
+@pytest.fixture
+def tables(
+    client: storage.Client, monkeypatch: pytest.MonkeyPatch
+) -> typing.Dict[str, datetime.datetime]:
+    monkeypatch.setattr(output_check.bigquery, "Client", FakeBigQueryClient)
+    monkeypatch.setattr(FakeBigQueryClient, "tables", {})
+    return FakeBigQueryClient.tables
+
+
+@pytest.fixture
+def state_file(tmp_path: pathlib.Path) -> pathlib.Path:
+    return tmp_path / "state" / "output.json"
+
+
+def upload(
+    client: storage.Client, tmp_path: pathlib.Path, content: bytes, **kwargs
+) -> None:
+    (tmp_path / "data.csv").write_bytes(content)
+    gcs_upload.upload_file(
+        tmp_path / "data.csv", "bucket", "data/data.csv", client, **kwargs
+    )
+
+
+def load(tables: dict, day: int) -> None:
+    tables[TABLE] = datetime.datetime(2021, 1, day, tzinfo=datetime.timezone.utc)
+
+
+def test_check_skips_an_output_that_is_already_loaded(
+    client: storage.Client,
+    tables: dict,
+    state_file: pathlib.Path,
+    tmp_path: pathlib.Path,
+):
+    upload(client, tmp_path, b"a,b\n1,2\n", fingerprint=True)
+    assert output_check.check("bucket", "data/data.csv", TABLE, state_file)
+    load(tables, 1)
+    output_check.record("bucket", "data/data.csv", TABLE, state_file)
+
+    assert json.loads(state_file.read_text())["row_count"] == "1"
+    assert not output_check.check("bucket", "data/data.csv", TABLE, state_file)
+
+
+def test_check_loads_a_changed_output(
+    client: storage.Client,
+    tables: dict,
+    state_file: pathlib.Path,
+    tmp_path: pathlib.Path,
+):
+    upload(client, tmp_path, b"a,b\n1,2\n", fingerprint=True)
+    load(tables, 1)
+    output_check.record("bucket", "data/data.csv", TABLE, state_file)
+
+    upload(client, tmp_path, b"a,b\n1,2\n3,4\n", fingerprint=True)
+
+    assert output_check.check("bucket", "data/data.csv", TABLE, state_file)
+
+
+@pytest.mark.parametrize("day", [2, None])
+def test_check_reloads_a_table_modified_or_deleted_since(
+    client: storage.Client,
+    tables: dict,
+    state_file: pathlib.Path,
+    tmp_path: pathlib.Path,
+    day: typing.Optional[int],
+):
+    upload(client, tmp_path, b"a,b\n1,2\n", fingerprint=True)
+    load(tables, 1)
+    output_check.record("bucket", "data/data.csv", TABLE, state_file)
+
+    if day:
+        load(tables, day)
+    else:
+        del tables[TABLE]
+
+    assert output_check.check("bucket", "data/data.csv", TABLE, state_file)
+
+
+def test_check_always_loads_an_output_without_fingerprint(
+    client: storage.Client,
+    tables: dict,
+    state_file: pathlib.Path,
+    tmp_path: pathlib.Path,
+):
+    upload(client, tmp_path, b"a,b\n1,2\n")
+    load(tables, 1)
+    output_check.record("bucket", "data/data.csv", TABLE, state_file)
+
+    assert not state_file.exists()
+    assert output_check.check("bucket", "data/data.csv", TABLE, state_file)
+    assert output_check.check("bucket", "data/missing.csv", TABLE, state_file)
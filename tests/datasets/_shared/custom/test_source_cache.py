@@ -0,0 +1,98 @@
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import os
+import pathlib
+import typing
+
+import pytest
+import requests
+import source_cache
+from google.cloud import storage
+
+PREFIX = "data/source_cache"
+
+
+@pytest.fixture
+def session() -> typing.Iterator[requests.Session]:
+    with requests.Session() as session:
+        yield session
+
+
+def cache_entries(client: storage.Client) -> typing.List[str]:
+    return [blob.name for blob in client.list_blobs("bucket", prefix=f"{PREFIX}/")]
+
+
+def test_fetch_downloads_and_caches_a_miss_then_copies_the_hit(
+    client: storage.Client,
+    http_source: typing.Callable,
+    session: requests.Session,
+    tmp_path: pathlib.Path,
+):
+    url = http_source("https://example.com/data.csv", b"a,b\n1,2\n")
+    bucket = client.bucket("bucket")
+
+    first = source_cache.fetch(url, tmp_path / "1.csv", bucket, PREFIX, session)
+    second = source_cache.fetch(url, tmp_path / "2.csv", bucket, PREFIX, session)
+
+    assert (first, second) == (False, True)
+    assert (tmp_path / "2.csv").read_bytes() == b"a,b\n1,2\n"
+    [entry] = cache_entries(client)
+    assert entry.startswith(source_cache.url_prefix(PREFIX, url))
+    assert bucket.get_blob(entry).metadata["source_url"] == url
+
+
+def test_fetch_replaces_the_entry_of_a_changed_source(
+    client: storage.Client,
+    http_source: typing.Callable,
+    session: requests.Session,
+    tmp_path: pathlib.Path,
+):
+    url = http_source("https://example.com/data.csv", b"a\n1\n")
+    bucket = client.bucket("bucket")
+    source_cache.fetch(url, tmp_path / "1.csv", bucket, PREFIX, session)
+    [old_entry] = cache_entries(client)
+
+    http_source("https://example.com/data.csv", b"a\n1\n2\n")
+    hit = source_cache.fetch(url, tmp_path / "2.csv", bucket, PREFIX, session)
+
+    assert not hit
+    assert (tmp_path / "2.csv").read_bytes() == b"a\n1\n2\n"
+    [new_entry] = cache_entries(client)
+    assert new_entry != old_entry
+
+
+def test_fetch_keys_sources_without_a_validator_on_the_window(
+    client: storage.Client,
+    http_source: typing.Callable,
+    session: requests.Session,
+    tmp_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    url = http_source("https://example.com/data.csv", b"a\n1\n")
+    bucket = client.bucket("bucket")
+    monkeypatch.setattr(source_cache, "source_validator", lambda *args: None)
+
+    hits = [
+        source_cache.fetch(url, tmp_path / f"{i}.csv", bucket, PREFIX, session, window)
+        for i, window in enumerate(["2021-01-01", "2021-01-01", "2021-01-02"])
+    ]
+    assert hits == [False, True, False]
+    # The entry of the past window was deleted
+    assert len(cache_entries(client)) == 1
+
+    source_cache.fetch(url, tmp_path / "no_window.csv", bucket, "other", session)
+    assert os.path.getsize(tmp_path / "no_window.csv") == 4
+    assert not list(client.list_blobs("bucket", prefix="other/"))
@@ -0,0 +1,205 @@
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import json
+import os
+import pathlib
+import typing
+
+import pytest
+import requests
+import source_check
+
+from scripts import fixture_server
+
+URL = "https://example.com/data.csv"
+
+
+@pytest.fixture
+def source(
+    server: fixture_server.FixtureServer, http_source: typing.Callable
+) -> typing.Callable[[bytes], str]:
+    """Returns a function that serves new content as the source, with a new ETag
+    and Last-Modified, and returns its URL on the fixture server.
+    """
+    fixture = server.fixtures_dir / "http" / URL.split("://", 1)[1]
+    versions = []
+
+    def update(content: bytes) -> str:
+        url = http_source(URL, content)
+        versions.append(content)
+        os.utime(fixture, (1600000000 + len(versions), 1600000000 + len(versions)))
+        return url
+
+    return update
+
+
+@pytest.fixture
+def state_file(tmp_path: pathlib.Path) -> pathlib.Path:
+    return tmp_path / "state" / "sources.json"
+
+
+def headers_sent(monkeypatch: pytest.MonkeyPatch) -> typing.List[dict]:
+    """Records the headers of every HEAD request"""
+    sent = []
+    head = requests.Session.head
+
+    def record(self, url, headers=None, **kwargs) -> requests.Response:
+        sent.append(dict(headers or {}))
+        return head(self, url, headers=headers, **kwargs)
+
+    monkeypatch.setattr(requests.Session, "head", record)
+    return sent
+
+
+def test_check_stores_the_state_of_a_new_source_as_pending(
+    source: typing.Callable, state_file: pathlib.Path
+):
+    url = source(b"a,b\n1,2\n")
+
+    assert source_check.check([url], state_file)
+    assert not state_file.exists()
+    pending = json.loads(source_check.pending_file(state_file).read_text())
+    assert set(pending[url]) == {"ETag", "Last-Modified", "Content-Length"}
+
+
+def test_record_makes_the_pending_state_current(
+    source: typing.Callable, state_file: pathlib.Path
+):
+    url = source(b"a,b\n1,2\n")
+    source_check.check([url], state_file)
+    pending = source_check.pending_file(state_file).read_text()
+
+    source_check.record(state_file)
+
+    assert state_file.read_text() == pending
+    assert not source_check.pending_file(state_file).exists()
+    # Nothing is pending once it's recorded
+    source_check.record(state_file)
+    assert state_file.read_text() == pending
+
+
+def test_check_skips_a_source_that_answers_not_modified(
+    source: typing.Callable,
+    state_file: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    url = source(b"a,b\n1,2\n")
+    source_check.check([url], state_file)
+    source_check.record(state_file)
+    sent = headers_sent(monkeypatch)
+
+    assert not source_check.check([url], state_file)
+    assert set(sent[0]) == {"If-None-Match", "If-Modified-Since"}
+    assert not source_check.pending_file(state_file).exists()
+
+
+def test_check_skips_a_source_whose_validators_didnt_change(
+    source: typing.Callable,
+    state_file: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    url = source(b"a,b\n1,2\n")
+    source_check.check([url], state_file)
+    source_check.record(state_file)
+    head = requests.Session.head
+
+    def head_ignoring_conditions(self, url, headers=None, **kwargs):
+        return head(self, url, **kwargs)
+
+    monkeypatch.setattr(requests.Session, "head", head_ignoring_conditions)
+
+    assert not source_check.check([url], state_file)
+
+
+def test_check_detects_a_changed_source(
+    source: typing.Callable, state_file: pathlib.Path
+):
+    url = source(b"a,b\n1,2\n")
+    source_check.check([url], state_file)
+    source_check.record(state_file)
+    recorded = json.loads(state_file.read_text())
+
+    source(b"a,b\n1,2\n3,4\n")
+
+    assert source_check.check([url], state_file)
+    pending = json.loads(source_check.pending_file(state_file).read_text())
+    assert pending[url]["ETag"] != recorded[url]["ETag"]
+    assert pending[url]["Content-Length"] == "12"
+
+
+def test_check_drops_the_pending_state_of_a_failed_run(
+    source: typing.Callable, state_file: pathlib.Path
+):
+    url = source(b"a,b\n1,2\n")
+    source_check.check([url], state_file)
+    source_check.record(state_file)
+    recorded = state_file.read_text()
+    source_check.pending_file(state_file).write_text(json.dumps({url: None}))
+
+    assert not source_check.check([url], state_file)
+    assert not source_check.pending_file(state_file).exists()
+    source_check.record(state_file)
+    assert state_file.read_text() == recorded
+
+
+def test_check_never_skips_a_source_without_validators(
+    source: typing.Callable,
+    state_file: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    url = source(b"a,b\n1,2\n")
+    head = requests.Session.head
+
+    def head_without_validators(self, *args, **kwargs) -> requests.Response:
+        r = head(self, *args, **kwargs)
+        del r.headers["ETag"]
+        del r.headers["Last-Modified"]
+        return r
+
+    monkeypatch.setattr(requests.Session, "head", head_without_validators)
+
+    assert source_check.check([url], state_file)
+    source_check.record(state_file)
+    assert json.loads(state_file.read_text()) == {url: None}
+    assert source_check.check([url], state_file)
+
+
+def test_check_falls_back_to_get_when_head_is_refused(
+    source: typing.Callable,
+    state_file: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    url = source(b"a,b\n1,2\n")
+    monkeypatch.setattr(
+        fixture_server.FixtureRequestHandler,
+        "do_HEAD",
+        lambda self: self.send_json(405, fixture_server.error(405, "HEAD")),
+    )
+
+    assert source_check.check([url], state_file)
+    source_check.record(state_file)
+    assert json.loads(state_file.read_text())[url]["Content-Length"] == "8"
+    assert not source_check.check([url], state_file)
+
+
+def test_check_never_skips_a_source_that_cant_be_reached(
+    server: fixture_server.FixtureServer, state_file: pathlib.Path
+):
+    url = f"{server.url}/http/example.com/missing.csv"
+
+    assert source_check.check([url], state_file)
+    source_check.record(state_file)
+    assert source_check.check([url], state_file)
@@ -0,0 +1,84 @@
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import ast
+import pathlib
+import re
+import typing
+
+import pytest
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[4]
+SHARED_PATH = PROJECT_ROOT / "datasets" / "_shared"
+SHARED_MODULES = {
+    path.stem: path
+    for folder in ("images", "custom")
+    for path in (SHARED_PATH / folder).glob("*.py")
+}
+DOCKERFILES = sorted(PROJECT_ROOT.glob("datasets/*/pipelines/_images/*/Dockerfile"))
+
+
+def copied_scripts(dockerfile: pathlib.Path) -> typing.Optional[typing.Set[str]]:
+    """Returns the names of the Python scripts that the Dockerfile copies, or None
+    when it copies its whole folder
+    """
+    scripts = set()
+    for sources in re.findall(r"^COPY\s+(.+)\s+\S+$", dockerfile.read_text(), re.M):
+        for source in sources.split():
+            name = pathlib.PurePath(source).name
+            if name in ("", "."):
+                return None
+            if name.endswith(".py"):
+                scripts.add(name[: -len(".py")])
+    return scripts
+
+
+def imported_shared_modules(script: pathlib.Path) -> typing.Set[str]:
+    imported = set()
+    for node in ast.walk(ast.parse(script.read_text())):
+        if isinstance(node, ast.Import):
+            imported.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and not node.level:
+            imported.add(node.module)
+    return imported & SHARED_MODULES.keys()
+
+
+@pytest.mark.parametrize(
+    "dockerfile",
+    DOCKERFILES,
+    ids=[str(path.parent.relative_to(PROJECT_ROOT)) for path in DOCKERFILES],
+)
+def test_dockerfile_copies_every_shared_module_its_scripts_import(
+    dockerfile: pathlib.Path,
+):
+    copied = copied_scripts(dockerfile)
+    if copied is None:
+        pytest.skip("copies its whole folder")
+
+    # Shared modules import each other, e.g. ranged_download imports gcs_upload
+    pending = list(copied)
+    needed = set()
+    while pending:
+        name = pending.pop()
+        script = dockerfile.parent / f"{name}.py"
+        if not script.exists():
+            script = SHARED_MODULES.get(name)
+        if script is None:
+            continue
+        for module in imported_shared_modules(script) - needed:
+            needed.add(module)
+            pending.append(module)
+
+    assert needed <= copied, f"{dockerfile} doesn't copy {sorted(needed - copied)}"
@@ -0,0 +1,134 @@
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import hashlib
+import pathlib
+import typing
+
+import gcs_upload
+import pytest
+from google.cloud import storage
+
+CONTENT = b'id,text\n1,"one\ntwo"\n' + b"".join(
+    f"{i},row {i}\n".encode() for i in range(2, 50)
+)
+
+
+@pytest.fixture
+def source_file(tmp_path: pathlib.Path) -> pathlib.Path:
+    path = tmp_path / "data.csv"
+    path.write_bytes(CONTENT)
+    return path
+
+
+def object_names(client: storage.Client) -> typing.List[str]:
+    return [blob.name for blob in client.list_blobs("bucket")]
+
+
+def test_upload_file_below_the_threshold_uploads_a_single_stream(
+    client: storage.Client, source_file: pathlib.Path
+):
+    blob = gcs_upload.upload_file(
+        source_file, "bucket", "data/data.csv", client=client, fingerprint=True
+    )
+
+    assert object_names(client) == ["data/data.csv"]
+    uploaded = client.bucket("bucket").get_blob("data/data.csv")
+    assert uploaded.download_as_bytes() == CONTENT
+    assert uploaded.component_count is None
+    assert uploaded.content_type == "text/csv"
+    assert blob.metadata == {
+        "sha256": hashlib.sha256(CONTENT).hexdigest(),
+        "row_count": "49",
+    }
+
+
+def test_upload_file_composes_the_parts_and_deletes_them(
+    client: storage.Client, source_file: pathlib.Path
+):
+    gcs_upload.upload_file(
+        source_file,
+        "bucket",
+        "data/data.csv",
+        client=client,
+        threshold=64,
+        min_part_size=100,
+    )
+
+    assert object_names(client) == ["data/data.csv"]
+    uploaded = client.bucket("bucket").get_blob("data/data.csv")
+    assert uploaded.download_as_bytes() == CONTENT
+    assert uploaded.component_count == len(gcs_upload.part_ranges(len(CONTENT), 100))
+    assert uploaded.crc32c == gcs_upload.file_digests(source_file)[0]
+
+
+def test_upload_file_deletes_the_parts_when_a_part_fails(
+    client: storage.Client,
+    source_file: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    upload_part = gcs_upload.upload_part
+
+    def fail_last_part(file_path, part_blob, offset, length):
+        if offset + length == len(CONTENT):
+            raise ConnectionError("connection reset")
+        upload_part(file_path, part_blob, offset, length)
+
+    monkeypatch.setattr(gcs_upload, "upload_part", fail_last_part)
+
+    with pytest.raises(ConnectionError):
+        gcs_upload.upload_file(
+            source_file,
+            "bucket",
+            "data/data.csv",
+            client=client,
+            threshold=64,
+            min_part_size=100,
+        )
+    assert object_names(client) == []
+
+
+def test_upload_file_deletes_a_composed_object_that_doesnt_match(
+    client: storage.Client,
+    source_file: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(
+        gcs_upload, "file_digests", lambda file_path, fingerprint: ("AAAAAA==", None)
+    )
+
+    with pytest.raises(gcs_upload.ChecksumMismatch):
+        gcs_upload.upload_file(
+            source_file,
+            "bucket",
+            "data/data.csv",
+            client=client,
+            threshold=64,
+            min_part_size=100,
+        )
+    assert object_names(client) == []
+
+
+def test_part_ranges_never_exceed_the_compose_limit():
+    ranges = gcs_upload.part_ranges(1000, 1)
+
+    assert len(ranges) <= gcs_upload.MAX_COMPOSE_COMPONENTS
+    assert ranges[0] == (0, 32)
+    assert sum(length for _, length in ranges) == 1000
+
+
+def test_count_csv_records_ignores_line_breaks_in_quoted_fields():
+    assert gcs_upload.count_csv_records(b'a,b\n1,"x\ny"\n2,"z', False) == (2, True)
+    assert gcs_upload.count_csv_records(b'z\n"\n3,w\n', True) == (2, False)
@@ -0,0 +1,206 @@
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import os
+import pathlib
+import typing
+
+import gcs_upload
+import pytest
+import ranged_download
+import requests
+from google.cloud import storage
+
+from scripts import fixture_server
+
+CONTENT = bytes(range(256)) * 4
+URL = "https://example.com/data/source.bin"
+
+
+@pytest.fixture
+def ranges(monkeypatch: pytest.MonkeyPatch) -> typing.List[typing.Tuple[int, int]]:
+    """Records the (offset, length) of every range downloaded over HTTP"""
+    requested = []
+    download_http_range = ranged_download.download_http_range
+
+    def record(source_url, target_file, validator, session, offset, length):
+        requested.append((offset, length))
+        download_http_range(source_url, target_file, validator, session, offset, length)
+
+    monkeypatch.setattr(ranged_download, "download_http_range", record)
+    return requested
+
+
+@pytest.fixture
+def sleeps(monkeypatch: pytest.MonkeyPatch) -> typing.List[float]:
+    delays = []
+    monkeypatch.setattr(ranged_download.time, "sleep", delays.append)
+    return delays
+
+
+def test_download_file_writes_every_http_range_at_its_offset(
+    http_source: typing.Callable,
+    ranges: typing.List[typing.Tuple[int, int]],
+    tmp_path: pathlib.Path,
+):
+    url = http_source(URL, CONTENT)
+
+    ranged_download.download_file(
+        url, tmp_path / "source.bin", threshold=100, part_size=300
+    )
+
+    assert (tmp_path / "source.bin").read_bytes() == CONTENT
+    assert sorted(ranges) == [(0, 300), (300, 300), (600, 300), (900, 124)]
+
+
+def test_download_file_streams_a_source_below_the_threshold(
+    http_source: typing.Callable,
+    ranges: typing.List[typing.Tuple[int, int]],
+    tmp_path: pathlib.Path,
+):
+    url = http_source(URL, CONTENT)
+
+    ranged_download.download_file(url, tmp_path / "source.bin", threshold=2048)
+
+    assert (tmp_path / "source.bin").read_bytes() == CONTENT
+    assert ranges == []
+
+
+def test_download_file_streams_a_source_without_accept_ranges(
+    http_source: typing.Callable,
+    ranges: typing.List[typing.Tuple[int, int]],
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: pathlib.Path,
+):
+    url = http_source(URL, CONTENT)
+    head = requests.Session.head
+
+    def head_without_ranges(self, *args, **kwargs) -> requests.Response:
+        r = head(self, *args, **kwargs)
+        del r.headers["Accept-Ranges"]
+        return r
+
+    monkeypatch.setattr(requests.Session, "head", head_without_ranges)
+
+    ranged_download.download_file(
+        url, tmp_path / "source.bin", threshold=100, part_size=300
+    )
+
+    assert (tmp_path / "source.bin").read_bytes() == CONTENT
+    assert ranges == []
+
+
+def test_download_file_fails_when_the_source_changes_midway(
+    server: fixture_server.FixtureServer,
+    http_source: typing.Callable,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: pathlib.Path,
+):
+    url = http_source(URL, CONTENT)
+    fixture = server.fixtures_dir / "http" / URL.split("://", 1)[1]
+    download_parts = ranged_download.download_parts
+
+    def change_source(*args) -> None:
+        # Same size, new mtime: the ETag sent as If-Range no longer matches
+        fixture.write_bytes(CONTENT[::-1])
+        stat = fixture.stat()
+        os.utime(fixture, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        download_parts(*args)
+
+    monkeypatch.setattr(ranged_download, "download_parts", change_source)
+
+    with pytest.raises(ranged_download.IntegrityError, match="changed"):
+        ranged_download.download_file(
+            url, tmp_path / "source.bin", threshold=100, part_size=300
+        )
+
+
+@pytest.mark.parametrize("threshold", [2048, 100])
+def test_download_file_downloads_a_gcs_object(
+    client: storage.Client, tmp_path: pathlib.Path, threshold: int
+):
+    (tmp_path / "upload.bin").write_bytes(CONTENT)
+    gcs_upload.upload_file(tmp_path / "upload.bin", "bucket", "source.bin", client)
+
+    ranged_download.download_file(
+        "gs://bucket/source.bin",
+        tmp_path / "source.bin",
+        client,
+        threshold=threshold,
+        part_size=300,
+    )
+
+    assert (tmp_path / "source.bin").read_bytes() == CONTENT
+
+
+def test_download_file_fails_on_a_missing_gcs_object(
+    client: storage.Client, tmp_path: pathlib.Path
+):
+    with pytest.raises(FileNotFoundError):
+        ranged_download.download_file(
+            "gs://bucket/missing.bin", tmp_path / "source.bin", client
+        )
+
+
+def test_verify_checks_the_size_and_crc32c(tmp_path: pathlib.Path):
+    target_file = tmp_path / "source.bin"
+    target_file.write_bytes(CONTENT)
+    crc32c, _ = gcs_upload.file_digests(target_file)
+
+    ranged_download.verify(URL, target_file, len(CONTENT), crc32c)
+    ranged_download.verify(URL, target_file, None, None)
+    with pytest.raises(ranged_download.IntegrityError, match="bytes"):
+        ranged_download.verify(URL, target_file, len(CONTENT) + 1, crc32c)
+    with pytest.raises(ranged_download.IntegrityError, match="CRC32C"):
+        ranged_download.verify(URL, target_file, len(CONTENT), "AAAAAA==")
+
+
+def test_gcs_crc32c_reads_the_x_goog_hash_header():
+    headers = {"x-goog-hash": "crc32c=n03x6A==, md5=Ojk9c3dhfxgoKVVHYwFbHQ=="}
+
+    assert ranged_download.gcs_crc32c(headers) == "n03x6A=="
+    assert ranged_download.gcs_crc32c({}) is None
+
+
+def test_with_retries_backs_off_until_the_part_succeeds(sleeps: typing.List[float]):
+    calls = []
+
+    def download_part(offset: int, length: int) -> None:
+        calls.append((offset, length))
+        if len(calls) < 3:
+            raise requests.ConnectionError("connection reset")
+
+    ranged_download.with_retries(download_part, 300, 300)
+
+    assert calls == [(300, 300)] * 3
+    assert sleeps == [1, 2]
+
+
+def test_with_retries_raises_the_last_failure(sleeps: typing.List[float]):
+    def download_part(offset: int, length: int) -> None:
+        raise ConnectionError("connection reset")
+
+    with pytest.raises(ConnectionError):
+        ranged_download.with_retries(download_part, 0, 300)
+    assert sleeps == [1, 2, 4]
+
+
+def test_with_retries_doesnt_retry_an_integrity_error(sleeps: typing.List[float]):
+    def download_part(offset: int, length: int) -> None:
+        raise ranged_download.IntegrityError("changed")
+
+    with pytest.raises(ranged_download.IntegrityError):
+        ranged_download.with_retries(download_part, 0, 300)
+    assert sleeps == []
@@ -0,0 +1,231 @@
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import datetime
+import importlib.util
+import pathlib
+import sys
+import typing
+
+import pytest
+from google.api_core.exceptions import ResourceExhausted
+from google.cloud import bigquery_datatransfer_v1
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[3]
+IMAGE_DIR = (
+    PROJECT_ROOT / "datasets" / "idc" / "pipelines" / "_images" / "copy_bq_datasets"
+)
+
+sys.path[:0] = [str(IMAGE_DIR), str(PROJECT_ROOT / "datasets" / "_shared" / "images")]
+spec = importlib.util.spec_from_file_location(
+    "copy_bq_datasets", IMAGE_DIR / "script.py"
+)
+script = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(script)
+
+State = bigquery_datatransfer_v1.TransferState
+
+
+def transfer_run(
+    state: State, minute: int = 0, message: str = ""
+) -> bigquery_datatransfer_v1.TransferRun:
+    return bigquery_datatransfer_v1.TransferRun(
+        name=f"run-{minute}",
+        state=state,
+        run_time=datetime.datetime(2021, 1, 1, 0, minute, tzinfo=datetime.timezone.utc),
+        error_status={"message": message},
+    )
+
+
+def transfer_config(name: str) -> bigquery_datatransfer_v1.TransferConfig:
+    return bigquery_datatransfer_v1.TransferConfig(
+        name=f"projects/p/transferConfigs/{name}", display_name=name
+    )
+
+
+class FakeDataTransferServiceClient:
+    """Returns the next of the pages of runs given for a config on every poll,
+    and the last one once they are all used.
+    """
+
+    def __init__(
+        self,
+        runs: typing.Dict[
+            str, typing.List[typing.List[bigquery_datatransfer_v1.TransferRun]]
+        ],
+        configs: typing.List[bigquery_datatransfer_v1.TransferConfig] = (),
+        busy: typing.Tuple[str] = (),
+    ):
+        self.runs = runs
+        self.configs = list(configs)
+        self.busy = busy
+        self.polls = {name: 0 for name in runs}
+        self.created = []
+        self.started = []
+
+    def list_transfer_runs(self, request):
+        name = request.parent.split("/")[-1]
+        pages = self.runs[name]
+        page = pages[min(self.polls[name], len(pages) - 1)]
+        self.polls[name] += 1
+        return iter(page)
+
+    def list_transfer_configs(self, request):
+        return iter(self.configs)
+
+    def common_project_path(self, project: str) -> str:
+        return f"projects/{project}"
+
+    def create_transfer_config(self, request):
+        config = transfer_config(request.transfer_config.display_name)
+        self.created.append(config.display_name)
+        return config
+
+    def start_manual_transfer_runs(self, request):
+        name = request.parent.split("/")[-1]
+        if name in self.busy:
+            raise ResourceExhausted("A run is already in progress")
+        self.started.append(name)
+
+
+@pytest.fixture
+def sleeps(monkeypatch: pytest.MonkeyPatch) -> typing.List[float]:
+    """Replaces the clock with one that only advances when the script sleeps,
+    and the jitter with the longest delay, and returns the delays slept.
+    """
+    clock = [0.0]
+    delays = []
+
+    def sleep(seconds: float) -> None:
+        delays.append(seconds)
+        clock[0] += seconds
+
+    monkeypatch.setattr(script.time, "sleep", sleep)
+    monkeypatch.setattr(script.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(script.random, "uniform", lambda low, high: high)
+    return delays
+
+
+def test_wait_for_completion_backs_off_exponentially_up_to_the_max_delay(
+    sleeps: typing.List[float],
+):
+    pages = [[transfer_run(State.RUNNING)]] * 7 + [[transfer_run(State.SUCCEEDED)]]
+    client = FakeDataTransferServiceClient({"a": pages})
+
+    script.wait_for_completion(client, [transfer_config("a")], timeout=3600)
+
+    assert sleeps == [5, 10, 20, 40, 60, 60, 60]
+    assert client.polls["a"] == 8
+
+
+def test_wait_for_completion_jitters_each_delay_within_its_upper_half(
+    sleeps: typing.List[float], monkeypatch: pytest.MonkeyPatch
+):
+    bounds = []
+    monkeypatch.setattr(
+        script.random, "uniform", lambda low, high: bounds.append((low, high)) or low
+    )
+    pages = [[transfer_run(State.PENDING)]] * 3 + [[transfer_run(State.SUCCEEDED)]]
+    client = FakeDataTransferServiceClient({"a": pages})
+
+    script.wait_for_completion(client, [transfer_config("a")], timeout=3600)
+
+    assert bounds == [(2.5, 5), (5, 10), (10, 20)]
+    assert sleeps == [2.5, 5, 10]
+
+
+@pytest.mark.parametrize("state", [State.FAILED, State.CANCELLED])
+def test_wait_for_completion_fails_fast_when_a_run_ends_in_error(
+    sleeps: typing.List[float], state: State
+):
+    client = FakeDataTransferServiceClient(
+        {
+            "a": [[transfer_run(State.RUNNING)]],
+            "b": [[transfer_run(state, message="Permission denied")]],
+        }
+    )
+
+    with pytest.raises(script.TransferFailedError, match="Permission denied"):
+        script.wait_for_completion(
+            client, [transfer_config("a"), transfer_config("b")], timeout=3600
+        )
+    assert sleeps == []
+
+
+def test_wait_for_completion_times_out_without_sleeping_past_the_timeout(
+    sleeps: typing.List[float],
+):
+    client = FakeDataTransferServiceClient(
+        {
+            "a": [[transfer_run(State.SUCCEEDED)]],
+            "b": [[transfer_run(State.RUNNING)]],
+        }
+    )
+
+    with pytest.raises(script.TimeoutError, match="'b'"):
+        script.wait_for_completion(
+            client, [transfer_config("a"), transfer_config("b")], timeout=30
+        )
+    assert sleeps == [5, 10, 15]
+    # A config stops being polled once its run succeeded
+    assert client.polls == {"a": 1, "b": 4}
+
+
+def test_latest_transfer_run_takes_the_latest_run_of_an_unordered_page():
+    runs = [
+        transfer_run(State.FAILED, minute=2),
+        transfer_run(State.SUCCEEDED, minute=5),
+        transfer_run(State.CANCELLED, minute=1),
+        transfer_run(State.FAILED, minute=3),
+        transfer_run(State.FAILED, minute=4),
+        # Beyond the first page, which is never read
+        transfer_run(State.RUNNING, minute=9),
+    ]
+    client = FakeDataTransferServiceClient({"a": [runs]})
+
+    run = script.latest_transfer_run(client, transfer_config("a"))
+
+    assert run.name == "run-5"
+    assert run.state == State.SUCCEEDED
+
+
+def test_main_creates_the_missing_configs_and_triggers_every_version(
+    sleeps: typing.List[float], monkeypatch: pytest.MonkeyPatch
+):
+    client = FakeDataTransferServiceClient(
+        {
+            "idc-copy-v1": [[transfer_run(State.SUCCEEDED)]],
+            "idc-copy-v2": [[transfer_run(State.SUCCEEDED)]],
+        },
+        configs=[transfer_config("idc-copy-v1"), transfer_config("other-copy-v2")],
+        busy=("idc-copy-v1",),
+    )
+    monkeypatch.setattr(
+        script.bigquery_datatransfer_v1, "DataTransferServiceClient", lambda: client
+    )
+
+    script.main(
+        source_project_id="source",
+        target_project_id="target",
+        service_account="sa@example.com",
+        dataset_name="idc",
+        dataset_versions=["v1", "v2"],
+        timeout=60,
+    )
+
+    assert client.created == ["idc-copy-v2"]
+    # The run already in progress for v1 is waited for instead
+    assert client.started == ["idc-copy-v2"]
+    assert sleeps == []
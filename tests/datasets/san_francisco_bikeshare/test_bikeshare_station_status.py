@@ -0,0 +1,136 @@
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import datetime
+import importlib.util
+import pathlib
+import sys
+import typing
+
+import pytest
+from google.api_core.exceptions import ServiceUnavailable
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[3]
+IMAGE_DIR = (
+    PROJECT_ROOT
+    / "datasets"
+    / "san_francisco_bikeshare"
+    / "pipelines"
+    / "_images"
+    / "bikeshare_station_status"
+)
+
+sys.path[:0] = [str(IMAGE_DIR), str(PROJECT_ROOT / "datasets" / "_shared" / "images")]
+spec = importlib.util.spec_from_file_location(
+    "bikeshare_station_status", IMAGE_DIR / "csv_transform.py"
+)
+csv_transform = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(csv_transform)
+
+POLL_DATE = datetime.date(2021, 10, 19)
+
+
+def station(station_id: int, num_bikes_available: int) -> dict:
+    return {
+        "station_id": station_id,
+        "num_bikes_available": num_bikes_available,
+        "num_docks_available": 10,
+        "is_installed": 1,
+        "is_renting": 1,
+        "is_returning": 1,
+        "last_reported": 1634601600,
+    }
+
+
+def timestamp(hour: int, day: int = POLL_DATE.day) -> int:
+    return int(
+        datetime.datetime(2021, 10, day, hour, tzinfo=datetime.timezone.utc).timestamp()
+    )
+
+
+@pytest.fixture
+def poller(tmp_path: pathlib.Path) -> "csv_transform.StatusPoller":
+    return csv_transform.StatusPoller(
+        "https://example.com/station_status",
+        tmp_path / "data_output.csv",
+        "bucket",
+        "data/2021-10-19",
+        10,
+        POLL_DATE,
+    )
+
+
+@pytest.fixture
+def uploads(monkeypatch: pytest.MonkeyPatch) -> typing.List[typing.Tuple[str, str]]:
+    """Records the (GCS path, content) of every upload, failing while the list
+    holds a None
+    """
+    uploaded = []
+
+    def upload(file_path: pathlib.Path, gcs_bucket: str, gcs_path: str) -> None:
+        if None in uploaded:
+            uploaded.remove(None)
+            raise ServiceUnavailable("backend error")
+        uploaded.append((gcs_path, file_path.read_text()))
+
+    monkeypatch.setattr(csv_transform, "upload_file_to_gcs", upload)
+    monkeypatch.setattr(csv_transform.time, "sleep", lambda seconds: None)
+    return uploaded
+
+
+def test_add_snapshot_keeps_only_the_changed_stations_of_the_poll_date(poller):
+    poller.add_snapshot([station(1, 5), station(2, 3)], timestamp(1))
+    poller.add_snapshot([station(1, 5), station(2, 4)], timestamp(2))
+    poller.add_snapshot([station(1, 6)], timestamp(0, day=POLL_DATE.day + 1))
+
+    assert [(row[0], row[1], row[-1]) for row in poller.batch] == [
+        (1, 5, "2021-10-19 01:00:00"),
+        (2, 3, "2021-10-19 01:00:00"),
+        (2, 4, "2021-10-19 02:00:00"),
+    ]
+
+
+def test_flush_keeps_the_batch_that_fails_to_upload(poller, uploads):
+    poller.add_snapshot([station(1, 5)], timestamp(1))
+    uploads.append(None)
+
+    assert not poller.flush()
+    assert len(poller.batch) == 1
+
+    poller.add_snapshot([station(1, 6)], timestamp(2))
+    assert poller.flush()
+
+    assert poller.batch == []
+    [(gcs_path, content)] = uploads
+    assert gcs_path.startswith("data/2021-10-19/station_status-")
+    assert len(content.splitlines()) == 3
+
+
+def test_run_raises_when_the_last_flush_keeps_failing(poller, uploads):
+    poller.add_snapshot([station(1, 5)], timestamp(1))
+    uploads.extend([None] * csv_transform.FINAL_FLUSH_ATTEMPTS)
+
+    with pytest.raises(RuntimeError, match="1 rows"):
+        poller.run(duration=0, flush_interval=600)
+    assert uploads == []
+
+
+def test_run_retries_the_last_flush(poller, uploads):
+    poller.add_snapshot([station(1, 5)], timestamp(1))
+    uploads.append(None)
+
+    poller.run(duration=0, flush_interval=600)
+
+    assert len(uploads) == 1
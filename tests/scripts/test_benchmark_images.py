@@ -0,0 +1,134 @@
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import csv
+import gzip
+import pathlib
+
+import pytest
+
+from scripts import benchmark_images
+
+BASELINE = {
+    "sample/run_csv_transform_kub": {
+        "rows": 1000,
+        "rows_per_second": 10000.0,
+        "peak_memory_bytes": 100000000,
+        "output_bytes": 500000,
+        "stage_seconds": {},
+    }
+}
+
+
+def result(**metrics) -> dict:
+    return {
+        "sample/run_csv_transform_kub": {
+            **BASELINE["sample/run_csv_transform_kub"],
+            **metrics,
+        }
+    }
+
+
+def test_compare_returns_no_regressions_within_the_threshold():
+    regressions = benchmark_images.compare(
+        result(rows_per_second=9000.0, peak_memory_bytes=110000000), BASELINE, 0.2
+    )
+
+    assert regressions == []
+
+
+@pytest.mark.parametrize(
+    "metrics",
+    [
+        {"rows_per_second": 7000.0},
+        {"peak_memory_bytes": 130000000},
+        {"output_bytes": 700000},
+    ],
+)
+def test_compare_returns_regressions_beyond_the_threshold(metrics: dict):
+    regressions = benchmark_images.compare(result(**metrics), BASELINE, 0.2)
+
+    assert len(regressions) == 1
+    assert list(metrics)[0] in regressions[0]
+
+
+def test_compare_skips_results_with_a_different_number_of_rows():
+    regressions = benchmark_images.compare(
+        result(rows=2000, rows_per_second=1.0), BASELINE, 0.2
+    )
+
+    assert regressions == []
+
+
+@pytest.mark.parametrize(
+    "cpu, rows_per_second, regressed",
+    [
+        ("Other CPU", 5500.0, False),
+        ("Other CPU", 3500.0, True),
+        # Cloud VMs of different speeds report the same generic CPU model
+        ("Reference CPU", 5500.0, False),
+        ("Reference CPU", 3500.0, True),
+    ],
+)
+def test_compare_scales_the_throughput_by_the_calibration_of_the_hosts(
+    cpu: str, rows_per_second: float, regressed: bool
+):
+    host = {"cpu": "Reference CPU", "cpu_count": 8}
+    baseline = result(host={**host, "calibration_rows_per_second": 100000.0})
+    current = result(
+        rows_per_second=rows_per_second,
+        host={**host, "cpu": cpu, "calibration_rows_per_second": 50000.0},
+    )
+
+    regressions = benchmark_images.compare(current, baseline, 0.2)
+
+    assert bool(regressions) == regressed
+
+
+def test_calibrate_returns_a_throughput():
+    assert benchmark_images.calibrate(1000, repeat=1) > 0
+
+
+def test_generate_fixture_writes_the_rows_and_columns_of_the_source(
+    tmp_path: pathlib.Path,
+):
+    source = {
+        "compression": "gzip",
+        "columns": [
+            {"name": "id", "type": "INTEGER", "unique": True},
+            {"name": "created", "type": "DATETIME", "format": "%m/%d/%Y"},
+            {"name": "kind", "choices": ["a", "b"], "null_rate": 0.5},
+        ],
+    }
+
+    benchmark_images.generate_fixture(
+        tmp_path, {"source": source}, 100, tmp_path / "source"
+    )
+
+    with gzip.open(tmp_path / "source", "rt") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 100
+    assert [row["id"] for row in rows] == [str(index) for index in range(1, 101)]
+    assert all(row["created"][2] == "/" for row in rows)
+    assert {row["kind"] for row in rows} == {"a", "b", ""}
+
+
+def test_every_benchmark_refers_to_an_existing_pipeline_task():
+    for image_dir in benchmark_images.list_benchmarks():
+        config = benchmark_images.yaml.load((image_dir / "benchmark.yaml").read_text())
+
+        env_vars = benchmark_images.image_env_vars(image_dir, config)
+
+        assert "TARGET_FILE" in env_vars
@@ -0,0 +1,98 @@
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import pathlib
+import typing
+
+import pytest
+import requests
+from google.cloud import storage
+
+from scripts import fixture_server
+
+
+@pytest.fixture
+def server(tmp_path: pathlib.Path) -> typing.Iterator[fixture_server.FixtureServer]:
+    fixtures_dir = tmp_path / "fixtures"
+    (fixtures_dir / "gcs" / "bucket" / "data").mkdir(parents=True)
+    (fixtures_dir / "gcs" / "bucket" / "data" / "source.csv").write_text("a,b\n1,2\n")
+    (fixtures_dir / "http" / "example.com" / "files").mkdir(parents=True)
+    (fixtures_dir / "http" / "example.com" / "files" / "rows.csv").write_text(
+        "0123456789"
+    )
+
+    server = fixture_server.FixtureServer(fixtures_dir, tmp_path / "output").start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(
+    server: fixture_server.FixtureServer, monkeypatch: pytest.MonkeyPatch
+) -> storage.Client:
+    monkeypatch.setenv("STORAGE_EMULATOR_HOST", server.url)
+    return storage.Client(project="test")
+
+
+def test_objects_are_read_from_the_fixtures_and_written_to_the_output_folder(
+    server: fixture_server.FixtureServer, client: storage.Client
+):
+    bucket = client.bucket("bucket")
+
+    assert bucket.blob("data/source.csv").download_as_bytes() == b"a,b\n1,2\n"
+    assert bucket.blob("data/source.csv").download_as_bytes(start=2, end=4) == b"b\n1"
+
+    bucket.blob("data/output.csv").upload_from_string("c\n3\n")
+    bucket.blob("data/source.csv").delete()
+
+    assert [blob.name for blob in client.list_blobs("bucket", prefix="data/")] == [
+        "data/output.csv"
+    ]
+    assert (
+        server.output_dir / "bucket" / "data" / "output.csv"
+    ).read_text() == "c\n3\n"
+    assert (server.fixtures_dir / "gcs" / "bucket" / "data" / "source.csv").exists()
+
+
+def test_composed_objects_keep_their_metadata(client: storage.Client):
+    bucket = client.bucket("bucket")
+    parts = [bucket.blob("part_0"), bucket.blob("part_1")]
+    parts[0].upload_from_string("a,")
+    parts[1].upload_from_string("b\n")
+
+    blob = bucket.blob("composed.csv")
+    blob.metadata = {"row_count": "1"}
+    blob.compose(parts)
+
+    blob = bucket.get_blob("composed.csv")
+    assert blob.download_as_bytes() == b"a,b\n"
+    assert blob.metadata == {"row_count": "1"}
+    assert blob.component_count == 2
+
+
+def test_http_fixtures_support_ranges_and_conditional_requests(
+    server: fixture_server.FixtureServer,
+):
+    url = server.http_url("https://example.com/files/rows.csv")
+
+    response = requests.get(url, headers={"Range": "bytes=2-5"})
+    assert response.status_code == 206
+    assert response.content == b"2345"
+
+    etag = response.headers["ETag"]
+    assert requests.get(url, headers={"If-None-Match": etag}).status_code == 304
+    assert requests.head(url).headers["Content-Length"] == "10"
+    assert server.http_url("https://example.com/missing.csv") is None
@@ -19,8 +19,10 @@ import random
 import shutil
 import subprocess
 import tempfile
+import types
 import typing
 
+import jinja2
 import pytest
 from ruamel import yaml
 
@@ -161,6 +163,40 @@ def test_main_copies_custom_dir_if_it_exists(
         assert (path_prefix / "custom").is_dir()
 
 
+def test_main_copies_shared_custom_files_into_custom_dir(
+    dataset_path: pathlib.Path, pipeline_path: pathlib.Path, env: str
+):
+    copy_config_files_and_set_tmp_folder_names_as_ids(dataset_path, pipeline_path)
+    (pipeline_path / "custom").mkdir(parents=True, exist_ok=True)
+    shared_path = dataset_path / "pipelines" / "_custom"
+    shared_path.mkdir(parents=True, exist_ok=True)
+    (shared_path / "shared_module.py").touch()
+
+    generate_dag.main(dataset_path.name, pipeline_path.name, env)
+
+    env_pipeline_path = (
+        ENV_DATASETS_PATH / dataset_path.name / "pipelines" / pipeline_path.name
+    )
+    assert (env_pipeline_path / "custom" / "shared_module.py").exists()
+    assert not (pipeline_path / "custom" / "shared_module.py").exists()
+
+
+def test_main_skips_shared_custom_files_if_pipeline_has_no_custom_dir(
+    dataset_path: pathlib.Path, pipeline_path: pathlib.Path, env: str
+):
+    copy_config_files_and_set_tmp_folder_names_as_ids(dataset_path, pipeline_path)
+    shared_path = dataset_path / "pipelines" / "_custom"
+    shared_path.mkdir(parents=True, exist_ok=True)
+    (shared_path / "shared_module.py").touch()
+
+    generate_dag.main(dataset_path.name, pipeline_path.name, env)
+
+    env_pipeline_path = (
+        ENV_DATASETS_PATH / dataset_path.name / "pipelines" / pipeline_path.name
+    )
+    assert not (env_pipeline_path / "custom").exists()
+
+
 def test_main_creates_shared_variables_file_if_it_doesnt_exist(
     dataset_path: pathlib.Path, pipeline_path: pathlib.Path, env: str
 ):
@@ -224,6 +260,122 @@ def test_main_raises_an_error_when_airflow_version_is_incorrect(
         generate_dag.main(dataset_path.name, pipeline_path.name, env)
 
 
+def test_main_adds_source_check_tasks_around_the_graph(
+    dataset_path: pathlib.Path, pipeline_path: pathlib.Path, env: str
+):
+    copy_config_files_and_set_tmp_folder_names_as_ids(dataset_path, pipeline_path)
+    config = yaml.load(open(pipeline_path / "pipeline.yaml"))
+    config["dag"]["source_check"] = {"source_urls": ["https://example.com/a.csv"]}
+    with open(pipeline_path / "pipeline.yaml", "w") as file:
+        yaml.dump(config, file)
+
+    generate_dag.main(dataset_path.name, pipeline_path.name, env)
+
+    roots, leaves = generate_dag.graph_roots_and_leaves(config)
+    dag_py = pipeline_path / f"{pipeline_path.name}_dag.py"
+    dagpy_contents = dag_py.read_text()
+    assert 'task_id="check_source_changes"' in dagpy_contents
+    assert 'task_id="record_source_state"' in dagpy_contents
+    assert "https://example.com/a.csv" in dagpy_contents
+    assert "sample_bash_task" in roots
+    assert "sample_bash_task" not in leaves
+
+    env_custom_path = (
+        ENV_DATASETS_PATH
+        / dataset_path.name
+        / "pipelines"
+        / pipeline_path.name
+        / "custom"
+    )
+    assert (env_custom_path / "source_check.py").exists()
+    assert not (pipeline_path / "custom").exists()
+
+
+def test_main_copies_the_shared_custom_scripts_that_the_tasks_run(
+    dataset_path: pathlib.Path, pipeline_path: pathlib.Path, env: str
+):
+    copy_config_files_and_set_tmp_folder_names_as_ids(dataset_path, pipeline_path)
+    config = yaml.load(open(pipeline_path / "pipeline.yaml"))
+    for task in config["dag"]["tasks"]:
+        if task["operator"] == "BashOperator":
+            task["args"]["bash_command"] = (
+                "python $airflow_home/dags/$dataset/$pipeline/custom/source_cache.py"
+                " https://example.com/a.csv a.csv"
+            )
+    with open(pipeline_path / "pipeline.yaml", "w") as file:
+        yaml.dump(config, file)
+
+    generate_dag.main(dataset_path.name, pipeline_path.name, env)
+
+    env_custom_path = (
+        ENV_DATASETS_PATH
+        / dataset_path.name
+        / "pipelines"
+        / pipeline_path.name
+        / "custom"
+    )
+    assert (env_custom_path / "source_cache.py").exists()
+    assert not (env_custom_path / "source_check.py").exists()
+
+
+def test_main_raises_an_error_when_source_check_is_used_with_airflow_1(
+    dataset_path: pathlib.Path, pipeline_path: pathlib.Path, env: str
+):
+    copy_config_files_and_set_tmp_folder_names_as_ids(dataset_path, pipeline_path)
+    config = yaml.load(open(pipeline_path / "pipeline.yaml"))
+    config["dag"]["airflow_version"] = 1
+    config["dag"]["source_check"] = {"source_urls": ["https://example.com/a.csv"]}
+    with open(pipeline_path / "pipeline.yaml", "w") as file:
+        yaml.dump(config, file)
+
+    with pytest.raises(ValueError):
+        generate_dag.main(dataset_path.name, pipeline_path.name, env)
+
+
+def test_main_adds_output_check_tasks_around_the_load_task(
+    dataset_path: pathlib.Path, pipeline_path: pathlib.Path, env: str
+):
+    copy_config_files_and_set_tmp_folder_names_as_ids(dataset_path, pipeline_path)
+    config = yaml.load(open(pipeline_path / "pipeline.yaml"))
+    config["dag"]["output_check"] = {"load_tasks": ["sample_gcs_to_bq_task"]}
+    with open(pipeline_path / "pipeline.yaml", "w") as file:
+        yaml.dump(config, file)
+
+    generate_dag.main(dataset_path.name, pipeline_path.name, env)
+
+    dag_py = pipeline_path / f"{pipeline_path.name}_dag.py"
+    dagpy_contents = dag_py.read_text()
+    assert 'task_id="check_sample_gcs_to_bq_task_output"' in dagpy_contents
+    assert 'task_id="record_sample_gcs_to_bq_task_output"' in dagpy_contents
+    assert "check_sample_gcs_to_bq_task_output >> sample_gcs_to_bq_task" in (
+        " ".join(dagpy_contents.split())
+    )
+    assert 'trigger_rule="none_failed"' in dagpy_contents
+
+    env_custom_path = (
+        ENV_DATASETS_PATH
+        / dataset_path.name
+        / "pipelines"
+        / pipeline_path.name
+        / "custom"
+    )
+    assert (env_custom_path / "output_check.py").exists()
+    assert not (env_custom_path / "source_check.py").exists()
+
+
+def test_main_raises_an_error_when_output_check_lists_a_non_load_task(
+    dataset_path: pathlib.Path, pipeline_path: pathlib.Path, env: str
+):
+    copy_config_files_and_set_tmp_folder_names_as_ids(dataset_path, pipeline_path)
+    config = yaml.load(open(pipeline_path / "pipeline.yaml"))
+    config["dag"]["output_check"] = {"load_tasks": ["sample_bash_task"]}
+    with open(pipeline_path / "pipeline.yaml", "w") as file:
+        yaml.dump(config, file)
+
+    with pytest.raises(ValueError):
+        generate_dag.main(dataset_path.name, pipeline_path.name, env)
+
+
 def test_main_uses_airflow_operators_based_on_airflow_version_specified_in_the_config(
     dataset_path: pathlib.Path, pipeline_path: pathlib.Path, env: str
 ):
@@ -411,6 +563,37 @@ def test_build_images_copies_image_files_to_env_dir(
         assert (copied_image_dir / "Dockerfile").exists()
 
 
+def test_build_images_copies_shared_image_files_into_image_dirs(
+    dataset_path: pathlib.Path, pipeline_path: pathlib.Path, env: str, mocker
+):
+    copy_config_files_and_set_tmp_folder_names_as_ids(dataset_path, pipeline_path)
+    generate_image_files(dataset_path, num_containers=random.randint(1, 3))
+
+    mocker.patch("scripts.generate_dag.build_and_push_image")
+    generate_dag.main(dataset_path.name, pipeline_path.name, env)
+
+    shared_files = [
+        f.name
+        for shared_dir in (
+            generate_dag.SHARED_IMAGE_FILES_PATH,
+            generate_dag.SHARED_CUSTOM_FILES_PATH,
+        )
+        for f in shared_dir.iterdir()
+    ]
+    assert shared_files
+    for image_dir in (dataset_path / "pipelines" / "_images").iterdir():
+        copied_image_dir = (
+            ENV_DATASETS_PATH
+            / dataset_path.name
+            / "pipelines"
+            / "_images"
+            / image_dir.name
+        )
+        for shared_file in shared_files:
+            assert (copied_image_dir / shared_file).exists()
+            assert not (image_dir / shared_file).exists()
+
+
 def test_build_images_called_when_dataset_has_images_dir(
     dataset_path: pathlib.Path, pipeline_path: pathlib.Path, env: str, mocker
 ):
@@ -453,3 +636,25 @@ def test_build_and_push_image_not_called_when_no_image_dirs_exist(
     mocker.patch("scripts.generate_dag.build_and_push_image")
     generate_dag.main(dataset_path.name, pipeline_path.name, env)
     assert not generate_dag.build_and_push_image.called
+
+
+def test_main_passes_the_profile_param_to_the_pod_tasks(
+    dataset_path: pathlib.Path, pipeline_path: pathlib.Path, env: str
+):
+    copy_config_files_and_set_tmp_folder_names_as_ids(dataset_path, pipeline_path)
+
+    generate_dag.main(dataset_path.name, pipeline_path.name, env)
+
+    dag_py = pipeline_path / f"{pipeline_path.name}_dag.py"
+    dagpy_contents = dag_py.read_text()
+    assert 'params={"profile": ""}' in dagpy_contents
+    assert f'"PROFILE": "{generate_dag.PROFILE_TEMPLATE}"' in dagpy_contents
+
+    # Airflow 2.1 doesn't override params with the run's config by default
+    profile = jinja2.Template(generate_dag.PROFILE_TEMPLATE)
+    params = {"profile": ""}
+    triggered_with = types.SimpleNamespace(conf={"profile": "sample"})
+    scheduled = types.SimpleNamespace(conf={})
+    assert profile.render(dag_run=triggered_with, params=params) == "sample"
+    assert profile.render(dag_run=scheduled, params=params) == ""
+    assert profile.render(dag_run=None, params={"profile": "cprofile"}) == "cprofile"
@@ -0,0 +1,152 @@
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import csv
+import gzip
+import json
+import pathlib
+
+import pytest
+
+from scripts import generate_source_data
+
+CONFIG = {
+    "resources": [
+        {
+            "type": "bigquery_table",
+            "table_id": "other_table",
+            "schema": json.dumps([{"name": "other", "type": "STRING"}]),
+        }
+    ],
+    "dag": {
+        "tasks": [
+            {
+                "operator": "KubernetesPodOperator",
+                "args": {
+                    "task_id": "transform_csv",
+                    "env_vars": {
+                        "RENAME_MAPPINGS": json.dumps(
+                            {"Unique Key": "unique_key", "Created": "created_date"}
+                        )
+                    },
+                },
+            },
+            {
+                "operator": "GoogleCloudStorageToBigQueryOperator",
+                "args": {
+                    "task_id": "load_to_bq",
+                    "destination_project_dataset_table": "dataset.table",
+                    "schema_fields": [
+                        {"name": "unique_key", "type": "INTEGER", "mode": "REQUIRED"},
+                        {"name": "created_date", "type": "DATETIME"},
+                        {"name": "status", "type": "STRING"},
+                        {"name": "generated", "type": "STRING"},
+                    ],
+                },
+            },
+        ]
+    },
+}
+
+
+def test_source_columns_are_renamed_back_with_the_rename_mappings_of_the_task():
+    columns = generate_source_data.source_columns(CONFIG, "transform_csv")
+
+    assert [column["name"] for column in columns] == [
+        "Unique Key",
+        "Created",
+        "status",
+        "generated",
+    ]
+    assert columns[0]["null_rate"] == 0
+    assert columns[1]["type"] == "DATETIME"
+
+
+def test_source_columns_apply_the_overrides_by_raw_name():
+    columns = generate_source_data.source_columns(
+        CONFIG,
+        "transform_csv",
+        overrides={
+            "Created": {"format": "%m/%d/%Y"},
+            "generated": {"drop": True},
+            "Dropped By The Image": {"type": "STRING"},
+        },
+    )
+
+    assert [column["name"] for column in columns] == [
+        "Unique Key",
+        "Created",
+        "status",
+        "Dropped By The Image",
+    ]
+    assert columns[1]["format"] == "%m/%d/%Y"
+
+
+def test_table_schema_falls_back_to_the_schema_of_the_table_resource():
+    schema = generate_source_data.table_schema(CONFIG, "other_table")
+
+    assert schema == [{"name": "other", "type": "STRING"}]
+
+
+@pytest.mark.parametrize(
+    "size, expected", [("10GB", 10 ** 10), ("1.5 MiB", 1572864), ("100", 100)]
+)
+def test_parse_size(size: str, expected: int):
+    assert generate_source_data.parse_size(size) == expected
+
+
+def test_generate_file_writes_the_same_rows_whatever_the_number_of_workers(
+    tmp_path: pathlib.Path,
+):
+    columns = generate_source_data.source_columns(CONFIG, "transform_csv")
+
+    generate_source_data.generate_file(
+        columns, 25000, tmp_path / "one.csv.gz", "gzip", workers=1
+    )
+    generate_source_data.generate_file(
+        columns, 25000, tmp_path / "two.csv.gz", "gzip", workers=2
+    )
+
+    with gzip.open(tmp_path / "one.csv.gz", "rt") as one, gzip.open(
+        tmp_path / "two.csv.gz", "rt"
+    ) as two:
+        assert one.read() == two.read()
+    with gzip.open(tmp_path / "one.csv.gz", "rt") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 25000
+    assert rows[-1]["Unique Key"] == "25000"
+    assert not list(tmp_path.glob("*.part*"))
+
+
+@pytest.mark.parametrize("rows", [0, -1])
+def test_generate_file_writes_only_the_header_without_rows(
+    tmp_path: pathlib.Path, rows: int
+):
+    columns = generate_source_data.source_columns(CONFIG, "transform_csv")
+
+    generate_source_data.generate_file(columns, rows, tmp_path / "data.csv")
+
+    assert (tmp_path / "data.csv").read_text() == (
+        "Unique Key,Created,status,generated\n"
+    )
+
+
+def test_estimate_rows_matches_the_requested_size(tmp_path: pathlib.Path):
+    columns = generate_source_data.source_columns(CONFIG, "transform_csv")
+
+    rows = generate_source_data.estimate_rows(columns, 1000000)
+    generate_source_data.generate_file(columns, rows, tmp_path / "data.csv")
+
+    assert 900000 < (tmp_path / "data.csv").stat().st_size < 1100000
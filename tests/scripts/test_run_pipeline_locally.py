@@ -0,0 +1,113 @@
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import datetime
+import pathlib
+import threading
+
+import pytest
+
+from scripts import run_pipeline_locally
+
+
+def task(task_id: str, **args) -> dict:
+    return {"operator": "BashOperator", "args": {"task_id": task_id, **args}}
+
+
+def test_run_tasks_runs_independent_branches_in_parallel():
+    config = {
+        "dag": {
+            "tasks": [task("start"), task("left"), task("right"), task("end")],
+            "graph_paths": ["start >> [left, right] >> end"],
+        }
+    }
+    barrier = threading.Barrier(2, timeout=5)
+    order = []
+
+    def run(task: dict) -> dict:
+        if task["args"]["task_id"] in ("left", "right"):
+            barrier.wait()
+        order.append(task["args"]["task_id"])
+        return {"status": "success", "seconds": 0.0}
+
+    results = run_pipeline_locally.run_tasks(config, run, workers=2)
+
+    assert order[0] == "start" and order[-1] == "end"
+    assert all(result["status"] == "success" for result in results.values())
+
+
+@pytest.mark.parametrize(
+    "trigger_rule, upstream_status, expected",
+    [
+        ("all_success", "failed", "upstream_failed"),
+        ("all_success", "skipped", "skipped"),
+        ("none_failed", "skipped", "success"),
+        ("none_failed", "failed", "upstream_failed"),
+        ("all_done", "failed", "success"),
+    ],
+)
+def test_run_tasks_follows_the_trigger_rules(
+    trigger_rule: str, upstream_status: str, expected: str
+):
+    config = {
+        "dag": {
+            "tasks": [task("first"), task("second", trigger_rule=trigger_rule)],
+            "graph_paths": ["first >> second"],
+        }
+    }
+
+    def run(task: dict) -> dict:
+        if task["args"]["task_id"] == "first":
+            return {"status": upstream_status, "seconds": 0.0}
+        return {"status": "success", "seconds": 0.0}
+
+    results = run_pipeline_locally.run_tasks(config, run)
+
+    assert results["second"]["status"] == expected
+
+
+def test_run_tasks_raises_an_error_on_a_cycle():
+    config = {
+        "dag": {
+            "tasks": [task("first"), task("second")],
+            "graph_paths": ["first >> second >> first"],
+        }
+    }
+
+    with pytest.raises(ValueError):
+        run_pipeline_locally.run_tasks(config, lambda task: {})
+
+
+def test_render_uses_the_variables_and_the_execution_date():
+    context = run_pipeline_locally.template_context(
+        {"dataset": {"container_registry": {"image": "gcr.io/image"}}},
+        datetime.date(2021, 3, 1),
+        pathlib.Path("/work"),
+    )
+
+    rendered = run_pipeline_locally.render(
+        {
+            "image": "{{ var.json.dataset.container_registry.image }}",
+            "paths": ["{{ var.value.composer_bucket }}/{{ ds_nodash }}"],
+            "missing": "{{ var.json.other.value }}",
+        },
+        context,
+    )
+
+    assert rendered == {
+        "image": "gcr.io/image",
+        "paths": ["local-composer-bucket/20210301"],
+        "missing": "",
+    }
@@ -113,3 +113,16 @@ def test_check_all_dags_have_no_import_errors():
             in dagbag.dag_ids
         )
         assert len(dagbag.import_errors) == 0
+
+
+def test_check_all_dags_with_pod_tasks_have_the_profile_param():
+    for _, pipeline_path in all_pipelines():
+        dag_py = (pipeline_path / f"{pipeline_path.name}_dag.py").read_text()
+        pod_tasks = dag_py.count("PodOperator(")
+
+        if pod_tasks:
+            assert 'params={"profile": ""}' in dag_py
+            assert (
+                dag_py.count(f'"PROFILE": "{generate_dag.PROFILE_TEMPLATE}"')
+                == pod_tasks
+            )